@@ -1620,6 +1620,21 @@ async def api_container_stats(container_id: str):
         return exception_response(e)
 
 
+@router.get("/containers/{container_id}/stats/history")
+async def api_container_stats_history(container_id: str, seconds: int = 300, limit: int = 0):
+    """Recent stats samples from the background collector (sparklines)."""
+    try:
+        from container_commander.engine import get_container_stats_history
+
+        return get_container_stats_history(
+            container_id,
+            seconds=max(1, min(3600, seconds)),
+            limit=limit if limit > 0 else None,
+        )
+    except Exception as e:
+        return exception_response(e)
+
+
 @router.get("/quota")
 async def api_get_quota():
     """Get current session quota usage."""
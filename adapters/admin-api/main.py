@@ -48,6 +48,8 @@ from config import (
     get_autonomy_cron_max_pending_runs,
     get_autonomy_cron_max_pending_runs_per_job,
     get_autonomy_cron_manual_run_cooldown_s,
+    get_autonomy_cron_journal_compact_records,
+    get_autonomy_cron_journal_fsync,
     get_autonomy_cron_trion_safe_mode,
     get_autonomy_cron_trion_min_interval_s,
     get_autonomy_cron_trion_max_loops,
@@ -2264,6 +2266,13 @@ async def startup_event():
             logger.info(f"[Startup] Container recovery: {result}")
         except Exception as e:
             logger.warning(f"[Startup] Container recovery failed (non-critical): {e}")
+        # danach hält der Docker-Event-Stream _active/Quota aktuell (kein Polling)
+        try:
+            from container_commander.engine import start_runtime_event_watcher
+            started = await asyncio.to_thread(start_runtime_event_watcher)
+            logger.info(f"[Startup] Docker event watcher started={started}")
+        except Exception as e:
+            logger.warning(f"[Startup] Docker event watcher failed (non-critical): {e}")
 
     asyncio.create_task(_recover_containers())
 
@@ -2310,6 +2319,8 @@ async def startup_event():
             hardware_guard_enabled=get_autonomy_cron_hardware_guard_enabled(),
             hardware_cpu_max_percent=get_autonomy_cron_hardware_cpu_max_percent(),
             hardware_mem_max_percent=get_autonomy_cron_hardware_mem_max_percent(),
+            journal_compact_records=get_autonomy_cron_journal_compact_records(),
+            journal_fsync=get_autonomy_cron_journal_fsync(),
         )
         set_autonomy_cron_runtime_scheduler(_autonomy_cron_scheduler)
         await _autonomy_cron_scheduler.start()
@@ -2340,4 +2351,15 @@ async def shutdown_event():
             logger.warning(f"[Shutdown] Autonomy cron scheduler stop failed: {e}")
         _autonomy_cron_scheduler = None
     clear_autonomy_cron_runtime_scheduler()
+    try:
+        from core.llm_provider_client import aclose_http_pool
+        closed = await aclose_http_pool()
+        logger.info(f"[Shutdown] Closed {closed} pooled LLM HTTP client(s)")
+    except Exception as e:
+        logger.warning(f"[Shutdown] LLM HTTP pool close failed: {e}")
+    try:
+        from container_commander.engine import stop_runtime_event_watcher
+        await asyncio.to_thread(stop_runtime_event_watcher)
+    except Exception as e:
+        logger.warning(f"[Shutdown] Docker event watcher stop failed: {e}")
     logger.info("Jarvis Admin API Shutting down...")
@@ -322,13 +322,15 @@ async def get_digest_state():
 async def get_runtime_session():
     """
     Session telemetry for UI dashboards.
-    Includes request/tokens/latency aggregates and latest cloud rate-limit snapshots.
+    Includes request/tokens/latency aggregates, latest cloud rate-limit snapshots
+    and the pooled LLM HTTP client stats.
     """
-    from core.llm_provider_client import get_rate_limit_snapshot
+    from core.llm_provider_client import get_http_pool_snapshot, get_rate_limit_snapshot
     from core.session_metrics import get_session_snapshot
 
     session = get_session_snapshot()
     rate_limits = get_rate_limit_snapshot()
+    http_pools = get_http_pool_snapshot()
     provider_rows = {
         str((row or {}).get("provider", "")).strip().lower(): (row or {})
         for row in (session.get("providers", []) if isinstance(session, dict) else [])
@@ -384,6 +386,7 @@ async def get_runtime_session():
         {
             **session,
             "rate_limits": rate_limits,
+            "http_pools": http_pools,
             "cloud_budget": cloud_budget,
         }
     )
@@ -57,6 +57,11 @@ from config.models.providers import (  # noqa: F401
     get_control_provider,
     get_output_provider,
     _normalize_provider,
+    get_llm_http_pool_enable,
+    get_llm_http_pool_max_connections,
+    get_llm_http_pool_max_keepalive,
+    get_llm_http_pool_keepalive_expiry_s,
+    get_llm_http2_enable,
 )
 from config.models.embedding import (  # noqa: F401
     get_embedding_model,
@@ -66,6 +71,7 @@ from config.models.embedding import (  # noqa: F401
     get_embedding_cpu_endpoint,
     get_embedding_endpoint_mode,
     get_embedding_runtime_policy,
+    get_embedding_prototype_cache_path,
     EMBEDDING_MODEL,
 )
 from config.models.tool_selector import (  # noqa: F401
@@ -89,6 +95,7 @@ from config.pipeline.query_budget import (  # noqa: F401
     get_query_budget_skip_thinking_min_confidence,
     get_query_budget_max_tools_factual_low,
     get_tone_signal_override_confidence,
+    get_layer0_signal_deadline_s,
 )
 from config.pipeline.domain_router import (  # noqa: F401
     get_domain_router_enable,
@@ -110,6 +117,9 @@ from config.pipeline.grounding import (  # noqa: F401
     get_context_memory_fallback_recall_only_enable,
     get_context_memory_fallback_recall_only_rollout_pct,
     get_memory_lookup_timeout_s,
+    get_memory_retrieval_cache_enable,
+    get_memory_retrieval_cache_ttl_s,
+    get_memory_retrieval_cache_max_entries,
     get_memory_keys_max_per_request,
     get_context_retrieval_budget_s,
     get_effective_context_guardrail_chars,
@@ -168,6 +178,8 @@ from config.autonomy.scheduler import (  # noqa: F401
     get_autonomy_cron_max_pending_runs,
     get_autonomy_cron_max_pending_runs_per_job,
     get_autonomy_cron_manual_run_cooldown_s,
+    get_autonomy_cron_journal_compact_records,
+    get_autonomy_cron_journal_fsync,
 )
 from config.autonomy.trion_policy import (  # noqa: F401
     get_autonomy_cron_trion_safe_mode,
@@ -227,6 +239,7 @@ from config.features.typedstate import (  # noqa: F401
     get_typedstate_csv_enable,
     get_typedstate_csv_jit_only,
     get_typedstate_skills_mode,
+    get_typedstate_incremental_enable,
     TYPEDSTATE_MODE,
     TYPEDSTATE_ENABLE_SMALL_ONLY,
 )
@@ -20,6 +20,8 @@ from config.autonomy.scheduler import (
     get_autonomy_cron_max_pending_runs,
     get_autonomy_cron_max_pending_runs_per_job,
     get_autonomy_cron_manual_run_cooldown_s,
+    get_autonomy_cron_journal_compact_records,
+    get_autonomy_cron_journal_fsync,
 )
 
 from config.autonomy.trion_policy import (
@@ -41,7 +43,8 @@ __all__ = [
     "get_autonomy_cron_max_concurrency", "get_autonomy_cron_max_jobs",
     "get_autonomy_cron_max_jobs_per_conversation", "get_autonomy_cron_min_interval_s",
     "get_autonomy_cron_max_pending_runs", "get_autonomy_cron_max_pending_runs_per_job",
-    "get_autonomy_cron_manual_run_cooldown_s",
+    "get_autonomy_cron_manual_run_cooldown_s", "get_autonomy_cron_journal_compact_records",
+    "get_autonomy_cron_journal_fsync",
     # trion_policy
     "get_autonomy_cron_trion_safe_mode", "get_autonomy_cron_trion_min_interval_s",
     "get_autonomy_cron_trion_max_loops", "get_autonomy_cron_trion_require_approval_for_risky",
@@ -8,6 +8,7 @@ Steuert wie der Cron-Scheduler läuft und wie viele Jobs er verwalten darf:
 - Wie oft schlägt der Tick zu?
 - Wie viele Jobs / Pending-Runs sind erlaubt?
 - Wie lang ist der Cooldown nach einem manuellen Run-Now?
+- Wann wird das State-Journal kompaktiert, wird jeder Record ge-fsync't?
 """
 import os
 
@@ -92,3 +93,21 @@ def get_autonomy_cron_manual_run_cooldown_s() -> int:
         os.getenv("AUTONOMY_CRON_MANUAL_RUN_COOLDOWN_S", "30"),
     ))
     return max(0, min(3600, val))
+
+
+def get_autonomy_cron_journal_compact_records() -> int:
+    """Journal-Records bis zur Hintergrund-Kompaktierung in den State-Snapshot."""
+    val = int(settings.get(
+        "AUTONOMY_CRON_JOURNAL_COMPACT_RECORDS",
+        os.getenv("AUTONOMY_CRON_JOURNAL_COMPACT_RECORDS", "1000"),
+    ))
+    return max(10, min(100000, val))
+
+
+def get_autonomy_cron_journal_fsync() -> bool:
+    """fsync nach jedem Journal-Record (Crash verliert höchstens den letzten Record)."""
+    val = settings.get(
+        "AUTONOMY_CRON_JOURNAL_FSYNC",
+        os.getenv("AUTONOMY_CRON_JOURNAL_FSYNC", "true"),
+    )
+    return str(val).strip().lower() in {"1", "true", "yes", "on"}
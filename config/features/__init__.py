@@ -19,6 +19,7 @@ from config.features.typedstate import (
     get_typedstate_csv_enable,
     get_typedstate_csv_jit_only,
     get_typedstate_skills_mode,
+    get_typedstate_incremental_enable,
     TYPEDSTATE_MODE,
     TYPEDSTATE_ENABLE_SMALL_ONLY,
 )
@@ -33,6 +34,7 @@ __all__ = [
     "get_typedstate_mode", "get_typedstate_enable_small_only",
     "get_typedstate_csv_path", "get_typedstate_csv_enable",
     "get_typedstate_csv_jit_only", "get_typedstate_skills_mode",
+    "get_typedstate_incremental_enable",
     "TYPEDSTATE_MODE", "TYPEDSTATE_ENABLE_SMALL_ONLY",
     # security
     "get_signature_verify_mode", "SIGNATURE_VERIFY_MODE",
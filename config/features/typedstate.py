@@ -86,6 +86,18 @@ def get_typedstate_skills_mode() -> str:
     ).lower()
 
 
+def get_typedstate_incremental_enable() -> bool:
+    """
+    True (default): build_compact_context projiziert pro Konversation
+    inkrementell (Checkpoint + Delta-Events, Full-Replay nur bei Bedarf).
+    False: jeder Call baut den TypedState komplett neu (Rollback).
+    """
+    return settings.get(
+        "TYPEDSTATE_INCREMENTAL",
+        os.getenv("TYPEDSTATE_INCREMENTAL", "true"),
+    ).lower() == "true"
+
+
 # Backward-compat — beim Import eingefroren, Getter bevorzugen
 TYPEDSTATE_MODE = get_typedstate_mode()
 TYPEDSTATE_ENABLE_SMALL_ONLY = get_typedstate_enable_small_only()
@@ -26,6 +26,11 @@ from config.models.providers import (
     get_thinking_provider,
     get_control_provider,
     _normalize_provider,
+    get_llm_http_pool_enable,
+    get_llm_http_pool_max_connections,
+    get_llm_http_pool_max_keepalive,
+    get_llm_http_pool_keepalive_expiry_s,
+    get_llm_http2_enable,
 )
 
 from config.models.embedding import (
@@ -36,6 +41,7 @@ from config.models.embedding import (
     get_embedding_cpu_endpoint,
     get_embedding_endpoint_mode,
     get_embedding_runtime_policy,
+    get_embedding_prototype_cache_path,
     EMBEDDING_MODEL,
 )
 
@@ -55,10 +61,12 @@ __all__ = [
     "THINKING_MODEL", "CONTROL_MODEL", "OUTPUT_MODEL",
     # providers
     "get_output_provider", "get_thinking_provider", "get_control_provider", "_normalize_provider",
+    "get_llm_http_pool_enable", "get_llm_http_pool_max_connections", "get_llm_http_pool_max_keepalive",
+    "get_llm_http_pool_keepalive_expiry_s", "get_llm_http2_enable",
     # embedding
     "get_embedding_model", "get_embedding_execution_mode", "get_embedding_fallback_policy",
     "get_embedding_gpu_endpoint", "get_embedding_cpu_endpoint", "get_embedding_endpoint_mode",
-    "get_embedding_runtime_policy", "EMBEDDING_MODEL",
+    "get_embedding_runtime_policy", "get_embedding_prototype_cache_path", "EMBEDDING_MODEL",
     # tool_selector
     "get_tool_selector_model", "get_tool_selector_candidate_limit", "get_tool_selector_min_similarity",
     "TOOL_SELECTOR_MODEL", "TOOL_SELECTOR_CANDIDATE_LIMIT", "TOOL_SELECTOR_MIN_SIMILARITY",
@@ -76,5 +76,16 @@ def get_embedding_runtime_policy() -> str:
     return get_embedding_execution_mode()
 
 
+def get_embedding_prototype_cache_path() -> str:
+    """
+    Persistente Prototyp-Vektoren der Layer-0-Klassifikatoren (Tone/QueryBudget/DomainRouter),
+    gekeyt nach Embedding-Modell + Version. Leer = keine Persistenz.
+    """
+    return str(settings.get(
+        "EMBEDDING_PROTOTYPE_CACHE_PATH",
+        os.getenv("EMBEDDING_PROTOTYPE_CACHE_PATH", "memory_speicher/embedding_prototypes.json"),
+    ))
+
+
 # Backward-compat — beim Import eingefroren, Getter bevorzugen
 EMBEDDING_MODEL = get_embedding_model()
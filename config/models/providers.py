@@ -43,3 +43,60 @@ def get_control_provider() -> str:
     if str(raw or "").strip() == "":
         raw = os.getenv("CONTROL_PROVIDER", "")
     return _normalize_provider(raw, default=get_output_provider())
+
+
+# ─── HTTP-Client-Pool für Provider-Calls ──────────────────────────────────────
+
+def get_llm_http_pool_enable() -> bool:
+    """
+    Wiederverwendete Keep-Alive-Clients pro (Provider, Endpoint) statt eines
+    neuen httpx.AsyncClient pro Call. Default: true.
+    """
+    return str(settings.get(
+        "LLM_HTTP_POOL_ENABLE",
+        os.getenv("LLM_HTTP_POOL_ENABLE", "true"),
+    )).lower() == "true"
+
+
+def get_llm_http_pool_max_connections() -> int:
+    """Max. gleichzeitige Verbindungen pro Provider-Endpoint."""
+    try:
+        val = int(settings.get(
+            "LLM_HTTP_POOL_MAX_CONNECTIONS",
+            os.getenv("LLM_HTTP_POOL_MAX_CONNECTIONS", "32"),
+        ))
+    except Exception:
+        val = 32
+    return max(1, min(512, val))
+
+
+def get_llm_http_pool_max_keepalive() -> int:
+    """Max. offen gehaltene Idle-Verbindungen pro Provider-Endpoint."""
+    try:
+        val = int(settings.get(
+            "LLM_HTTP_POOL_MAX_KEEPALIVE",
+            os.getenv("LLM_HTTP_POOL_MAX_KEEPALIVE", "8"),
+        ))
+    except Exception:
+        val = 8
+    return max(0, min(512, val))
+
+
+def get_llm_http_pool_keepalive_expiry_s() -> float:
+    """Idle-Verbindungen werden nach dieser Zeit geschlossen."""
+    try:
+        val = float(settings.get(
+            "LLM_HTTP_POOL_KEEPALIVE_EXPIRY_S",
+            os.getenv("LLM_HTTP_POOL_KEEPALIVE_EXPIRY_S", "60"),
+        ))
+    except Exception:
+        val = 60.0
+    return max(1.0, min(3600.0, val))
+
+
+def get_llm_http2_enable() -> bool:
+    """HTTP/2 für Cloud-Provider (https), sofern das h2-Paket installiert ist. Default: true."""
+    return str(settings.get(
+        "LLM_HTTP2_ENABLE",
+        os.getenv("LLM_HTTP2_ENABLE", "true"),
+    )).lower() == "true"
@@ -22,6 +22,7 @@ from config.pipeline.query_budget import (
     get_query_budget_skip_thinking_min_confidence,
     get_query_budget_max_tools_factual_low,
     get_tone_signal_override_confidence,
+    get_layer0_signal_deadline_s,
 )
 
 from config.pipeline.domain_router import (
@@ -45,6 +46,9 @@ from config.pipeline.grounding import (
     get_context_memory_fallback_recall_only_enable,
     get_context_memory_fallback_recall_only_rollout_pct,
     get_memory_lookup_timeout_s,
+    get_memory_retrieval_cache_enable,
+    get_memory_retrieval_cache_ttl_s,
+    get_memory_retrieval_cache_max_entries,
     get_memory_keys_max_per_request,
     get_context_retrieval_budget_s,
     get_effective_context_guardrail_chars,
@@ -78,7 +82,7 @@ __all__ = [
     "get_sequential_timeout_s", "get_query_budget_enable",
     "get_query_budget_embedding_enable", "get_query_budget_skip_thinking_enable",
     "get_query_budget_skip_thinking_min_confidence", "get_query_budget_max_tools_factual_low",
-    "get_tone_signal_override_confidence",
+    "get_tone_signal_override_confidence", "get_layer0_signal_deadline_s",
     # domain_router
     "get_domain_router_enable", "get_domain_router_embedding_enable",
     "get_domain_router_lock_min_confidence", "get_policy_conflict_resolver_enable",
@@ -90,6 +94,8 @@ __all__ = [
     "get_followup_tool_reuse_ttl_turns", "get_followup_tool_reuse_ttl_s",
     "get_daily_context_followup_enable", "get_context_memory_fallback_recall_only_enable",
     "get_context_memory_fallback_recall_only_rollout_pct", "get_memory_lookup_timeout_s",
+    "get_memory_retrieval_cache_enable", "get_memory_retrieval_cache_ttl_s",
+    "get_memory_retrieval_cache_max_entries",
     "get_memory_keys_max_per_request", "get_context_retrieval_budget_s",
     "get_effective_context_guardrail_chars",
     # control_layer
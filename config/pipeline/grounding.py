@@ -130,6 +130,43 @@ def get_memory_lookup_timeout_s() -> float:
     return max(0.2, min(10.0, val))
 
 
+def get_memory_retrieval_cache_enable() -> bool:
+    """
+    Prozessweiter Retrieval-Cache für den Memory-Fan-out im ContextManager.
+    Invalidierung über Memory-Writes (Versionszähler, MCPHub inkl. Fast Lane).
+    Der Zähler ist pro Prozess: Writes aus anderen Workern/Services
+    (sql-memory, Archiv) sieht der Cache erst nach Ablauf der TTL. Default: true.
+    """
+    return str(settings.get(
+        "MEMORY_RETRIEVAL_CACHE_ENABLE",
+        os.getenv("MEMORY_RETRIEVAL_CACHE_ENABLE", "true"),
+    )).lower() == "true"
+
+
+def get_memory_retrieval_cache_ttl_s() -> float:
+    """TTL pro Retrieval-Cache-Eintrag (Sekunden)."""
+    try:
+        val = float(settings.get(
+            "MEMORY_RETRIEVAL_CACHE_TTL_S",
+            os.getenv("MEMORY_RETRIEVAL_CACHE_TTL_S", "120"),
+        ))
+    except Exception:
+        val = 120.0
+    return max(1.0, min(3600.0, val))
+
+
+def get_memory_retrieval_cache_max_entries() -> int:
+    """LRU-Kapazität des Retrieval-Caches."""
+    try:
+        val = int(settings.get(
+            "MEMORY_RETRIEVAL_CACHE_MAX_ENTRIES",
+            os.getenv("MEMORY_RETRIEVAL_CACHE_MAX_ENTRIES", "2048"),
+        ))
+    except Exception:
+        val = 2048
+    return max(16, min(100000, val))
+
+
 def get_memory_keys_max_per_request() -> int:
     """Hard-Cap für Memory-Key-Fan-out pro Request (nach Deduplizierung)."""
     try:
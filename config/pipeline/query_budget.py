@@ -114,3 +114,19 @@ def get_tone_signal_override_confidence() -> float:
     except Exception:
         val = 0.82
     return max(0.0, min(1.0, val))
+
+
+def get_layer0_signal_deadline_s() -> float:
+    """
+    Gemeinsame Deadline für die parallelen Layer-0-Signale
+    (ToolSelector, QueryBudget, DomainRouter). Langsamere Signale fallen
+    auf ihren Default zurück.
+    """
+    try:
+        val = float(settings.get(
+            "LAYER0_SIGNAL_DEADLINE_S",
+            os.getenv("LAYER0_SIGNAL_DEADLINE_S", "5.0"),
+        ))
+    except Exception:
+        val = 5.0
+    return max(0.5, min(30.0, val))
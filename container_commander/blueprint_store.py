@@ -6,6 +6,7 @@ Manages blueprint persistence in SQLite with:
 - YAML import/export
 - Blueprint inheritance resolution (extends field)
 - Tag-based search
+- Versioned in-process cache of decoded + resolved blueprints
 """
 
 import os
@@ -25,6 +26,44 @@ _INIT_LOCK = threading.Lock()
 _INIT_DONE = False
 
 
+class BlueprintCycleError(ValueError):
+    """Raised when the extends chain of a blueprint loops back on itself."""
+
+
+# ── Blueprint Cache ───────────────────────────────────────
+# Dekodierte Zeilen + aufgelöste Blueprints. Jeder Schreibpfad erhöht die
+# Generation; der Cache gilt nur für (DB_PATH, Generation), damit invalidiert
+# eine Änderung am Parent automatisch alle Kinder. Leser bekommen Deep-Copies.
+
+_CACHE_LOCK = threading.RLock()
+_GENERATION = 0
+_cache_key: Optional[tuple] = None
+_row_cache: Dict[str, Blueprint] = {}  # id -> Blueprint, nach Name sortiert
+_resolved_cache: Dict[str, Blueprint] = {}
+_cache_stats = {"loads": 0, "hits": 0, "resolves": 0}
+
+
+def _bump_generation() -> None:
+    global _GENERATION
+    with _CACHE_LOCK:
+        _GENERATION += 1
+
+
+def invalidate_blueprint_cache() -> None:
+    """Drop cached blueprints (e.g. after writing the DB outside this module)."""
+    _bump_generation()
+
+
+def get_blueprint_cache_stats() -> dict:
+    with _CACHE_LOCK:
+        return {
+            "generation": _GENERATION,
+            "cached": len(_row_cache),
+            "resolved": len(_resolved_cache),
+            **_cache_stats,
+        }
+
+
 def _get_conn() -> sqlite3.Connection:
     os.makedirs(os.path.dirname(DB_PATH), exist_ok=True)
     conn = sqlite3.connect(DB_PATH)
@@ -350,6 +389,7 @@ def create_blueprint(bp: Blueprint) -> Blueprint:
                 :network, :tags_json, :exec_policy_json, :icon, :created_at, :updated_at)
         """, params)
         conn.commit()
+        _bump_generation()
         bp.created_at = params["created_at"]
         bp.updated_at = params["updated_at"]
         return bp
@@ -357,49 +397,56 @@ def create_blueprint(bp: Blueprint) -> Blueprint:
         conn.close()
 
 
+def _cached_rows() -> Dict[str, Blueprint]:
+    """Active blueprints of the current generation (loads once per generation)."""
+    global _cache_key
+    with _CACHE_LOCK:
+        key = (DB_PATH, _GENERATION)
+        if _cache_key == key:
+            _cache_stats["hits"] += 1
+            return _row_cache
+        conn = _get_conn()
+        try:
+            rows = conn.execute(
+                "SELECT * FROM blueprints WHERE (is_deleted IS NULL OR is_deleted = 0) ORDER BY name"
+            ).fetchall()
+        finally:
+            conn.close()
+        _row_cache.clear()
+        _row_cache.update((r["id"], _row_to_blueprint(r)) for r in rows)
+        _resolved_cache.clear()
+        # Key der Generation *vor* dem Query: ein paralleler Write erzwingt Reload
+        _cache_key = key
+        _cache_stats["loads"] += 1
+        return _row_cache
+
+
 def get_blueprint(blueprint_id: str) -> Optional[Blueprint]:
     """Get a single blueprint by ID (excluding soft-deleted)."""
-    ensure_store_initialized()
-    conn = _get_conn()
-    try:
-        row = conn.execute(
-            "SELECT * FROM blueprints WHERE id = ? AND (is_deleted IS NULL OR is_deleted = 0)",
-            (blueprint_id,)
-        ).fetchone()
-        return _row_to_blueprint(row) if row else None
-    finally:
-        conn.close()
+    ensure_store_initialized()  # vor _CACHE_LOCK: Seeding schreibt selbst
+    with _CACHE_LOCK:
+        bp = _cached_rows().get(blueprint_id)
+        return bp.model_copy(deep=True) if bp else None
 
 
 def list_blueprints(tag: Optional[str] = None) -> List[Blueprint]:
     """List all active (non-deleted) blueprints, optionally filtered by tag."""
     ensure_store_initialized()
-    conn = _get_conn()
-    try:
-        rows = conn.execute(
-            "SELECT * FROM blueprints WHERE (is_deleted IS NULL OR is_deleted = 0) ORDER BY name"
-        ).fetchall()
-        blueprints = [_row_to_blueprint(r) for r in rows]
-        if tag:
-            blueprints = [b for b in blueprints if tag.lower() in [t.lower() for t in b.tags]]
-        return blueprints
-    finally:
-        conn.close()
+    with _CACHE_LOCK:
+        blueprints = list(_cached_rows().values())
+    if tag:
+        blueprints = [b for b in blueprints if tag.lower() in [t.lower() for t in b.tags]]
+    return [b.model_copy(deep=True) for b in blueprints]
 
 
 def get_active_blueprint_ids() -> set:
     """Return the set of active (non-deleted) blueprint IDs for cross-checking."""
-    ensure_store_initialized()
-    conn = _get_conn()
     try:
-        rows = conn.execute(
-            "SELECT id FROM blueprints WHERE (is_deleted IS NULL OR is_deleted = 0)"
-        ).fetchall()
-        return {row["id"] for row in rows}
+        ensure_store_initialized()
+        with _CACHE_LOCK:
+            return set(_cached_rows().keys())
     except Exception:
         return set()
-    finally:
-        conn.close()
 
 
 def update_blueprint(blueprint_id: str, updates: dict) -> Optional[Blueprint]:
@@ -454,6 +501,7 @@ def update_blueprint(blueprint_id: str, updates: dict) -> Optional[Blueprint]:
             WHERE id=:id
         """, params)
         conn.commit()
+        _bump_generation()
         return existing
     finally:
         conn.close()
@@ -473,6 +521,7 @@ def delete_blueprint(blueprint_id: str) -> bool:
             (datetime.utcnow().isoformat(), blueprint_id)
         )
         conn.commit()
+        _bump_generation()
         return cursor.rowcount > 0
     finally:
         conn.close()
@@ -484,20 +533,36 @@ def resolve_blueprint(blueprint_id: str) -> Optional[Blueprint]:
     """
     Resolve a blueprint with inheritance (extends field).
     Child overrides parent. Merges: tags, secrets, mounts.
+    Memoized per store generation; raises BlueprintCycleError on extends loops.
     """
     ensure_store_initialized()
-    bp = get_blueprint(blueprint_id)
+    with _CACHE_LOCK:
+        rows = _cached_rows()
+        resolved = _resolve_cached(blueprint_id, rows, ())
+        return resolved.model_copy(deep=True) if resolved else None
+
+
+def _resolve_cached(blueprint_id: str, rows: Dict[str, Blueprint], chain: tuple) -> Optional[Blueprint]:
+    if blueprint_id in chain:
+        raise BlueprintCycleError(
+            f"Blueprint inheritance cycle: {' -> '.join(chain + (blueprint_id,))}"
+        )
+    cached = _resolved_cache.get(blueprint_id)
+    if cached is not None:
+        return cached
+    bp = rows.get(blueprint_id)
     if not bp:
         return None
-    if not bp.extends:
-        return bp
+    _cache_stats["resolves"] += 1
+    parent = _resolve_cached(bp.extends, rows, chain + (blueprint_id,)) if bp.extends else None
+    resolved = _merge_blueprint(parent, bp) if parent else bp
+    _resolved_cache[blueprint_id] = resolved
+    return resolved
 
-    parent = resolve_blueprint(bp.extends)  # Recursive
-    if not parent:
-        return bp
 
+def _merge_blueprint(parent: Blueprint, bp: Blueprint) -> Blueprint:
     # Merge: child overrides parent, lists are combined
-    merged = parent.model_copy()
+    merged = parent.model_copy(deep=True)
     merged.id = bp.id
     merged.name = bp.name
     merged.icon = bp.icon
@@ -741,6 +806,8 @@ def backfill_exec_policies():
                 )
                 updated += 1
         conn.commit()
+        if updated:
+            _bump_generation()
         if updated:
             _log.getLogger(__name__).info(f"[BlueprintStore] Backfilled exec policies for {updated} blueprints")
     finally:
@@ -104,7 +104,7 @@ def _get_resource_summary() -> Dict:
 
 def _get_container_summary() -> Dict:
     try:
-        from .engine import list_containers, get_container_stats
+        from .engine import list_containers, get_container_stats, get_container_stats_history
         cts = list_containers()
         running = [c for c in cts if c.status.value == "running"]
         stopped = [c for c in cts if c.status.value == "stopped"]
@@ -113,6 +113,7 @@ def _get_container_summary() -> Dict:
         for c in running:
             try:
                 stats = get_container_stats(c.container_id)
+                history = get_container_stats_history(c.container_id, seconds=120, limit=60)
                 container_details.append({
                     "id": c.container_id[:12],
                     "name": c.name,
@@ -121,6 +122,8 @@ def _get_container_summary() -> Dict:
                     "memory_mb": stats.get("memory_mb", 0),
                     "efficiency": stats.get("efficiency", {}).get("level", "?"),
                     "runtime_sec": c.runtime_seconds,
+                    "cpu_history": [x.get("cpu_percent", 0) for x in history.get("samples", [])],
+                    "memory_history": [x.get("memory_mb", 0) for x in history.get("samples", [])],
                 })
             except Exception:
                 container_details.append({
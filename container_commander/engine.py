@@ -8,6 +8,7 @@ Docker SDK integration for container lifecycle:
 - Stream logs
 - Collect stats
 - Auto-cleanup (TTL)
+- Keep the runtime registry current from the Docker event stream
 
 Uses docker.from_env() to connect to the host Docker daemon.
 """
@@ -47,10 +48,13 @@ from .engine_runtime_blueprint import (
 )
 from .engine_runtime_state import (
     RuntimeStateRefs,
+    apply_container_event as _apply_container_event_impl,
     check_quota as _check_quota_impl,
     cleanup_all as _cleanup_all_impl,
     commit_quota_reservation as _commit_quota_reservation_impl,
+    docker_status_to_container_status as _docker_status_to_container_status,
     get_quota as _get_quota_impl,
+    known_entry as _known_entry,
     recover_runtime_state as _recover_runtime_state_impl,
     release_quota_reservation as _release_quota_reservation_impl,
     reserve_quota as _reserve_quota_impl,
@@ -97,6 +101,8 @@ from .hardware_block_engine_opt_in import (
     select_block_engine_handoffs as _select_block_engine_handoffs_impl,
 )
 from .secret_store import get_secrets_for_blueprint, get_secret_value, log_secret_access
+from .stats_collector import ContainerStatsCollector, parse_stats_sample
+from .runtime_events import DockerEventWatcher
 
 logger = logging.getLogger(__name__)
 
@@ -137,6 +143,10 @@ TRION_PREFIX = "trion_"
 NETWORK_NAME = "trion-sandbox"
 COMMANDER_AUTO_PORT_MIN = int(os.environ.get("COMMANDER_AUTO_PORT_MIN", "20000"))
 COMMANDER_AUTO_PORT_MAX = int(os.environ.get("COMMANDER_AUTO_PORT_MAX", "29999"))
+COMMANDER_STATS_COLLECTOR = os.environ.get("COMMANDER_STATS_COLLECTOR", "true").strip().lower() not in ("0", "false", "no", "off")
+COMMANDER_STATS_HISTORY = int(os.environ.get("COMMANDER_STATS_HISTORY", "120"))
+COMMANDER_STATS_STALE_S = float(os.environ.get("COMMANDER_STATS_STALE_S", "10"))
+COMMANDER_DOCKER_EVENTS = os.environ.get("COMMANDER_DOCKER_EVENTS", "true").strip().lower() not in ("0", "false", "no", "off")
 DEFAULT_QUOTA = SessionQuota()
 
 
@@ -177,6 +187,17 @@ def _ensure_network():
 _active: Dict[str, ContainerInstance] = {}
 _ttl_timers: Dict[str, threading.Timer] = {}
 _last_runtime_sync_monotonic: float = 0.0
+# Alle TRION-Container (jeder Status), gepflegt vom Docker-Event-Stream
+_known_containers: Dict[str, Dict[str, Any]] = {}
+_event_watcher: Optional[DockerEventWatcher] = None
+
+# Streaming-Stats je laufendem Container (Threads starten erst beim ersten Read)
+_stats_collector = ContainerStatsCollector(
+    lambda: get_client(),
+    label=TRION_LABEL,
+    history=COMMANDER_STATS_HISTORY,
+    stale_s=COMMANDER_STATS_STALE_S,
+)
 
 
 def _build_initial_quota() -> SessionQuota:
@@ -599,7 +620,15 @@ def start_container(
             session_id=session_id or "",
         )
 
-        _commit_quota_reservation(instance, reserved_mem_mb, reserved_cpu)
+        with _state_lock:
+            _commit_quota_reservation(instance, reserved_mem_mb, reserved_cpu)
+            # Registry sofort pflegen, nicht erst wenn der Watcher das Start-Event liefert
+            _known_containers[container.id] = {
+                **_known_entry(container_name, "running", {}),
+                "blueprint_id": blueprint_id,
+                "started_at": instance.started_at,
+                "volume_name": volume_name,
+            }
         reservation_active = False
 
         # 7. TTL timer
@@ -711,12 +740,18 @@ def stop_container(container_id: str, remove: Optional[bool] = None) -> bool:
         if should_remove:
             container.remove(force=True)
 
+        _stats_collector.forget(container_id)
+
         # Cancel TTL timer + in-memory registry updates
         with _state_lock:
             timer = _ttl_timers.pop(container_id, None)
             if container_id in _active:
                 _active[container_id].status = ContainerStatus.STOPPED
                 del _active[container_id]
+            if should_remove:
+                _known_containers.pop(container_id, None)
+            elif container_id in _known_containers:
+                _known_containers[container_id]["status"] = "exited"
             _update_quota_used_unlocked()
         if timer:
             timer.cancel()
@@ -739,6 +774,7 @@ def stop_container(container_id: str, remove: Optional[bool] = None) -> bool:
     except NotFound:
         with _state_lock:
             _active.pop(container_id, None)
+            _known_containers.pop(container_id, None)
             _ttl_timers.pop(container_id, None)
             _update_quota_used_unlocked()
         _emit_ws_activity(
@@ -773,6 +809,7 @@ def remove_stopped_container(container_id: str) -> Dict:
         with _state_lock:
             timer = _ttl_timers.pop(container_id, None)
             _active.pop(container_id, None)
+            _known_containers.pop(container_id, None)
             _update_quota_used_unlocked()
         if timer:
             timer.cancel()
@@ -791,6 +828,7 @@ def remove_stopped_container(container_id: str) -> Dict:
     except NotFound:
         with _state_lock:
             _active.pop(container_id, None)
+            _known_containers.pop(container_id, None)
             _ttl_timers.pop(container_id, None)
             _update_quota_used_unlocked()
         return {"removed": False, "container_id": container_id, "reason": "not_found"}
@@ -826,6 +864,9 @@ def start_stopped_container(container_id: str) -> bool:
                 volume_name=container.labels.get("trion.volume", ""),
                 session_id=container.labels.get("trion.session_id", ""),
             )
+            entry = _known_containers.get(container.id) or _known_entry(container.name, "", container.labels or {})
+            entry["status"] = "running"
+            _known_containers[container.id] = entry
             _update_quota_used_unlocked()
 
         log_action(container.id, blueprint_id, "start_existing")
@@ -1053,39 +1094,38 @@ def get_container_logs(container_id: str, tail: int = 100) -> str:
 
 
 def get_container_stats(container_id: str) -> Dict:
-    """Get live resource stats from a container."""
-    client = get_client()
+    """Get live resource stats from a container.
+
+    Warm path: latest sample + cached attrs from the background stats
+    collector (no Docker round-trip). Cold/stale containers fall back to one
+    blocking `stats(stream=False)` read, which also starts the stream.
+    """
     try:
-        container = client.containers.get(container_id)
-        attrs = container.attrs or {}
-        stats = container.stats(stream=False)
+        cached = _stats_collector.latest(container_id) if COMMANDER_STATS_COLLECTOR else None
+        if cached is not None:
+            sample, attrs = cached
+        else:
+            client = get_client()
+            container = client.containers.get(container_id)
+            attrs = container.attrs or {}
+            sample = parse_stats_sample(container.stats(stream=False))
+            if COMMANDER_STATS_COLLECTOR:
+                _stats_collector.seed(container_id, sample, attrs)
         network_settings = attrs.get("NetworkSettings", {})
         networks = network_settings.get("Networks", {})
         ip_address = next(
             (v.get("IPAddress") for v in networks.values() if v.get("IPAddress")),
             None
         )
-        labels = container.labels
+        labels = (attrs.get("Config") or {}).get("Labels") or {}
         blueprint_id = labels.get("trion.blueprint", "unknown")
         ports = _extract_port_details(attrs)
         ports, connection = _merge_host_companion_access_info(blueprint_id, ip_address, ports)
 
-        # Parse CPU
-        cpu_delta = stats["cpu_stats"]["cpu_usage"]["total_usage"] - \
-                    stats["precpu_stats"]["cpu_usage"]["total_usage"]
-        system_delta = stats["cpu_stats"]["system_cpu_usage"] - \
-                       stats["precpu_stats"]["system_cpu_usage"]
-        num_cpus = stats["cpu_stats"].get("online_cpus", 1)
-        cpu_percent = (cpu_delta / system_delta) * num_cpus * 100.0 if system_delta > 0 else 0.0
-
-        # Parse Memory
-        mem_usage = stats["memory_stats"].get("usage", 0)
-        mem_limit = stats["memory_stats"].get("limit", 1)
-        mem_mb = mem_usage / (1024 * 1024)
-
-        # Parse Network
-        net_rx = sum(v.get("rx_bytes", 0) for v in stats.get("networks", {}).values())
-        net_tx = sum(v.get("tx_bytes", 0) for v in stats.get("networks", {}).values())
+        cpu_percent = sample.cpu_percent
+        mem_mb = sample.memory_mb
+        net_rx = sample.network_rx_bytes
+        net_tx = sample.network_tx_bytes
 
         # Update active instance
         with _state_lock:
@@ -1108,9 +1148,12 @@ def get_container_stats(container_id: str) -> Dict:
             "container_id": container_id,
             "cpu_percent": round(cpu_percent, 1),
             "memory_mb": round(mem_mb, 1),
-            "memory_limit_mb": round(mem_limit / (1024 * 1024), 1),
+            "memory_limit_mb": sample.memory_limit_mb,
             "network_rx_bytes": net_rx,
             "network_tx_bytes": net_tx,
+            "network_rx_bps": sample.network_rx_bps,
+            "network_tx_bps": sample.network_tx_bps,
+            "sampled_at": datetime.utcfromtimestamp(sample.ts).isoformat() + "Z",
             "ports": ports,
             "connection": connection,
             "efficiency": {
@@ -1126,10 +1169,31 @@ def get_container_stats(container_id: str) -> Dict:
         return {"error": str(e)}
 
 
+def get_container_stats_history(container_id: str, seconds: int = 300, limit: Optional[int] = None) -> Dict:
+    """Recent stats samples from the collector ring buffer (for sparklines)."""
+    samples = _stats_collector.history(container_id, seconds=seconds, limit=limit)
+    if not samples and COMMANDER_STATS_COLLECTOR:
+        current = get_container_stats(container_id)
+        if "error" in current:
+            return current
+        samples = _stats_collector.history(container_id, seconds=seconds, limit=limit)
+    return {"container_id": container_id, "seconds": seconds, "samples": samples}
+
+
+def get_stats_collector_snapshot() -> Dict:
+    return _stats_collector.snapshot()
+
+
 # ── List Containers ───────────────────────────────────────
 
 def list_containers() -> List[ContainerInstance]:
-    """List all TRION-managed containers."""
+    """List all TRION-managed containers.
+
+    While the Docker event watcher is live this is a snapshot read of the
+    event-maintained registry (no Docker round-trip); otherwise Docker is polled.
+    """
+    if _event_watcher is not None and _event_watcher.is_live():
+        return _list_containers_from_registry()
     client = get_client()
     result = []
 
@@ -1167,6 +1231,24 @@ def list_containers() -> List[ContainerInstance]:
     return result
 
 
+def _list_containers_from_registry() -> List[ContainerInstance]:
+    result = []
+    with _state_lock:
+        for container_id, entry in _known_containers.items():
+            status = _docker_status_to_container_status(entry.get("status", ""))
+            instance = _active.get(container_id) or ContainerInstance(
+                container_id=container_id,
+                blueprint_id=entry.get("blueprint_id", "unknown"),
+                name=entry.get("name", ""),
+                status=status,
+                started_at=entry.get("started_at", ""),
+                volume_name=entry.get("volume_name", ""),
+            )
+            instance.status = status
+            result.append(instance)
+    return result
+
+
 def inspect_container(container_id: str) -> Dict:
     """
     Return detailed information about a specific TRION container.
@@ -1298,7 +1380,12 @@ def _sync_runtime_state_from_docker(force: bool = False) -> None:
     events can still drift if a deploy/approval path aborts in the middle or if
     other processes manipulated Docker state. For quota checks we prefer the
     actual Docker runtime as source of truth.
+
+    While the Docker event watcher is live the registry is already current,
+    so only forced syncs (resync after (re)connect) hit Docker.
     """
+    if not force and _event_watcher is not None and _event_watcher.is_live():
+        return
     state = _runtime_state_refs()
     _sync_runtime_state_from_docker_impl(
         state,
@@ -1310,6 +1397,87 @@ def _sync_runtime_state_from_docker(force: bool = False) -> None:
     _sync_runtime_state_refs(state)
 
 
+# ── Docker Event Stream ──────────────────────────────────
+
+def _default_events_factory():
+    return get_client().events(
+        decode=True,
+        filters={"type": "container", "label": TRION_LABEL},
+    )
+
+
+def _on_runtime_resync() -> None:
+    """Full resync after (re)connect: events during the gap may be lost."""
+    containers = get_client().containers.list(all=True, filters={"label": TRION_LABEL})
+    known = {}
+    for c in containers:
+        known[c.id] = _known_entry(c.name, c.status, c.labels or {})
+    with _state_lock:
+        _known_containers.clear()
+        _known_containers.update(known)
+    _sync_runtime_state_from_docker(force=True)
+    if COMMANDER_STATS_COLLECTOR:
+        _stats_collector.sync(cid for cid, entry in known.items() if entry["status"] == "running")
+
+
+def _on_runtime_event(event: Dict[str, Any]) -> None:
+    handled = _apply_container_event_impl(
+        _runtime_state_refs(),
+        _known_containers,
+        event,
+        trion_label=TRION_LABEL,
+        get_client=get_client,
+        logger=logger,
+    )
+    if handled is None:
+        return
+    action, container_id = handled
+    if action == "oom":
+        with _state_lock:
+            name = (_known_containers.get(container_id) or {}).get("name", "")
+        _emit_ws_activity(
+            "container_oom",
+            level="error",
+            message=f"Container {name or container_id[:12]} was OOM-killed",
+            container_id=container_id,
+        )
+    elif action in ("start", "unpause", "restart"):
+        if COMMANDER_STATS_COLLECTOR:
+            _stats_collector.ensure(container_id)
+    elif action in ("die", "destroy"):
+        _stats_collector.forget(container_id)
+
+
+def start_runtime_event_watcher(events_factory=None) -> bool:
+    """Start the Docker event subscriber (idempotent). False if disabled."""
+    global _event_watcher
+    if not COMMANDER_DOCKER_EVENTS:
+        return False
+    if _event_watcher is None:
+        _event_watcher = DockerEventWatcher(
+            events_factory=events_factory or _default_events_factory,
+            on_event=_on_runtime_event,
+            on_resync=_on_runtime_resync,
+        )
+    _event_watcher.start()
+    return True
+
+
+def stop_runtime_event_watcher() -> None:
+    global _event_watcher
+    watcher, _event_watcher = _event_watcher, None
+    if watcher is not None:
+        watcher.stop()
+
+
+def get_runtime_event_snapshot() -> Dict:
+    if _event_watcher is None:
+        return {"enabled": COMMANDER_DOCKER_EVENTS, "live": False}
+    with _state_lock:
+        known = len(_known_containers)
+    return {"enabled": COMMANDER_DOCKER_EVENTS, "known_containers": known, **_event_watcher.snapshot()}
+
+
 # ── TTL / Auto-Cleanup ───────────────────────────────────
 
 def _set_ttl_timer(container_id: str, seconds: int):
@@ -1,5 +1,6 @@
 """
-Internal helpers for engine quota tracking, TTL timers, and runtime recovery.
+Internal helpers for engine quota tracking, TTL timers, runtime recovery and
+Docker-event driven registry updates.
 """
 
 from __future__ import annotations
@@ -8,7 +9,7 @@ import threading
 import time
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Any, Callable, Dict, Tuple
+from typing import Any, Callable, Dict, Optional, Tuple
 
 from .models import ContainerInstance, ContainerStatus, ResourceLimits, SessionQuota
 
@@ -117,6 +118,46 @@ def update_quota_used_unlocked(state: RuntimeStateRefs) -> None:
     state.quota.cpu_used = sum(i.cpu_limit_alloc for i in state.active.values())
 
 
+def running_instance_from_container(container: Any) -> ContainerInstance:
+    """ContainerInstance for a running container from its labels + HostConfig."""
+    labels = container.labels or {}
+    blueprint_id = labels.get("trion.blueprint", "unknown")
+    started_at = labels.get("trion.started", "")
+    session_id = labels.get("trion.session_id", "")
+    volume_name = labels.get("trion.volume", "")
+
+    try:
+        ttl_seconds = int(labels.get("trion.ttl_seconds", "0") or "0")
+        expires_at_epoch = int(labels.get("trion.expires_at", "0") or "0")
+    except ValueError:
+        ttl_seconds = 0
+        expires_at_epoch = 0
+    remaining = max(0, expires_at_epoch - int(time.time())) if expires_at_epoch > 0 else 0
+
+    try:
+        host_config = container.attrs.get("HostConfig", {})
+        mem_bytes = host_config.get("Memory", 0)
+        mem_mb = mem_bytes / (1024 * 1024) if mem_bytes else 512.0
+        nano_cpus = host_config.get("NanoCpus", 0)
+        cpu_alloc = round(nano_cpus / 1e9, 2) if nano_cpus else 1.0
+    except Exception:
+        mem_mb = 512.0
+        cpu_alloc = 1.0
+
+    return ContainerInstance(
+        container_id=container.id,
+        blueprint_id=blueprint_id,
+        name=container.name,
+        status=ContainerStatus.RUNNING,
+        started_at=started_at,
+        ttl_remaining=remaining if ttl_seconds > 0 else 0,
+        memory_limit_mb=mem_mb,
+        cpu_limit_alloc=cpu_alloc,
+        volume_name=volume_name,
+        session_id=session_id,
+    )
+
+
 def sync_runtime_state_from_docker(
     state: RuntimeStateRefs,
     *,
@@ -139,43 +180,7 @@ def sync_runtime_state_from_docker(
 
     reconciled: Dict[str, ContainerInstance] = {}
     for container in containers:
-        container_id = container.id
-        labels = container.labels or {}
-        blueprint_id = labels.get("trion.blueprint", "unknown")
-        started_at = labels.get("trion.started", "")
-        session_id = labels.get("trion.session_id", "")
-        volume_name = labels.get("trion.volume", "")
-
-        try:
-            ttl_seconds = int(labels.get("trion.ttl_seconds", "0") or "0")
-            expires_at_epoch = int(labels.get("trion.expires_at", "0") or "0")
-        except ValueError:
-            ttl_seconds = 0
-            expires_at_epoch = 0
-        remaining = max(0, expires_at_epoch - int(time.time())) if expires_at_epoch > 0 else 0
-
-        try:
-            host_config = container.attrs.get("HostConfig", {})
-            mem_bytes = host_config.get("Memory", 0)
-            mem_mb = mem_bytes / (1024 * 1024) if mem_bytes else 512.0
-            nano_cpus = host_config.get("NanoCpus", 0)
-            cpu_alloc = round(nano_cpus / 1e9, 2) if nano_cpus else 1.0
-        except Exception:
-            mem_mb = 512.0
-            cpu_alloc = 1.0
-
-        reconciled[container_id] = ContainerInstance(
-            container_id=container_id,
-            blueprint_id=blueprint_id,
-            name=container.name,
-            status=ContainerStatus.RUNNING,
-            started_at=started_at,
-            ttl_remaining=remaining if ttl_seconds > 0 else 0,
-            memory_limit_mb=mem_mb,
-            cpu_limit_alloc=cpu_alloc,
-            volume_name=volume_name,
-            session_id=session_id,
-        )
+        reconciled[container.id] = running_instance_from_container(container)
 
     with state.state_lock:
         stale_ids = [cid for cid in state.active.keys() if cid not in reconciled]
@@ -192,6 +197,110 @@ def sync_runtime_state_from_docker(
         state.last_runtime_sync_monotonic = time.monotonic()
 
 
+# ── Docker events → Registry ──────────────────────────────
+
+def known_entry(name: str, status: str, labels: Dict[str, Any]) -> Dict[str, Any]:
+    """Registry entry for list_containers() (all TRION containers, any state)."""
+    return {
+        "name": str(name or "").lstrip("/"),
+        "status": str(status or ""),
+        "blueprint_id": labels.get("trion.blueprint", "unknown"),
+        "started_at": labels.get("trion.started", ""),
+        "volume_name": labels.get("trion.volume", ""),
+        "oom_killed": False,
+    }
+
+
+def docker_status_to_container_status(status: str) -> ContainerStatus:
+    if status == "running":
+        return ContainerStatus.RUNNING
+    if status in ("exited", "dead"):
+        return ContainerStatus.STOPPED
+    return ContainerStatus.ERROR
+
+
+def _cancel_timer_unlocked(state: RuntimeStateRefs, container_id: str) -> None:
+    timer = state.ttl_timers.pop(container_id, None)
+    if timer:
+        try:
+            timer.cancel()
+        except Exception:
+            pass
+
+
+def apply_container_event(
+    state: RuntimeStateRefs,
+    known: Dict[str, Dict[str, Any]],
+    event: Dict[str, Any],
+    *,
+    trion_label: str,
+    get_client: Callable[[], Any],
+    logger: Any,
+) -> Optional[Tuple[str, str]]:
+    """Apply one Docker container event to `known` + `state.active` + quota.
+
+    Returns (action, container_id) for handled events, None otherwise.
+    """
+    if str(event.get("Type") or "container") != "container":
+        return None
+    actor = event.get("Actor") or {}
+    attrs = dict(actor.get("Attributes") or {})
+    container_id = str(actor.get("ID") or event.get("id") or "")
+    action = str(event.get("Action") or event.get("status") or "").split(":", 1)[0].strip()
+    if not container_id or trion_label not in attrs:
+        return None
+
+    if action in ("start", "unpause", "restart"):
+        instance = None
+        with state.state_lock:
+            existing = state.active.get(container_id)
+        if existing is None:
+            try:
+                container = get_client().containers.get(container_id)
+                instance = running_instance_from_container(container)
+            except Exception as exc:
+                logger.debug(f"[Engine] Event inspect failed for {container_id[:12]}: {exc}")
+        with state.state_lock:
+            entry = known.get(container_id) or known_entry(attrs.get("name", ""), "", attrs)
+            entry["status"] = "running"
+            entry["oom_killed"] = False
+            known[container_id] = entry
+            if container_id in state.active:
+                state.active[container_id].status = ContainerStatus.RUNNING
+            elif instance is not None:
+                state.active[container_id] = instance
+            update_quota_used_unlocked(state)
+        return action, container_id
+
+    with state.state_lock:
+        if action == "create":
+            known[container_id] = known_entry(attrs.get("name", ""), "created", attrs)
+        elif action == "pause":
+            if container_id in known:
+                known[container_id]["status"] = "paused"
+        elif action == "oom":
+            entry = known.setdefault(container_id, known_entry(attrs.get("name", ""), "running", attrs))
+            entry["oom_killed"] = True
+        elif action == "die":
+            entry = known.setdefault(container_id, known_entry(attrs.get("name", ""), "exited", attrs))
+            entry["status"] = "exited"
+            entry["exit_code"] = attrs.get("exitCode", "")
+            if state.active.pop(container_id, None) is not None:
+                _cancel_timer_unlocked(state, container_id)
+            update_quota_used_unlocked(state)
+        elif action == "destroy":
+            known.pop(container_id, None)
+            state.active.pop(container_id, None)
+            _cancel_timer_unlocked(state, container_id)
+            update_quota_used_unlocked(state)
+        elif action == "rename":
+            if container_id in known:
+                known[container_id]["name"] = str(attrs.get("name", "")).lstrip("/")
+        else:
+            return None
+    return action, container_id
+
+
 def set_ttl_timer(
     container_id: str,
     seconds: int,
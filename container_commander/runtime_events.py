@@ -0,0 +1,109 @@
+"""
+Container Commander — Docker Event Watcher
+═══════════════════════════════════════════════════
+Keeps the engine's in-memory container registry current from the Docker
+events API instead of polling `containers.list()`:
+
+- subscribes to container events for TRION-managed containers
+- after every (re)connect: one full resync (events may have been missed)
+- reconnects with exponential backoff when the stream breaks
+
+The event source is injectable (`events_factory`), so the watcher runs
+against a fake event iterator in tests.
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DockerEventWatcher:
+    def __init__(
+        self,
+        *,
+        events_factory: Callable[[], Iterable[Dict[str, Any]]],
+        on_event: Callable[[Dict[str, Any]], None],
+        on_resync: Callable[[], None],
+        reconnect_backoff_s: float = 1.0,
+        max_backoff_s: float = 30.0,
+    ):
+        self._events_factory = events_factory
+        self._on_event = on_event
+        self._on_resync = on_resync
+        self._backoff_s = max(0.01, float(reconnect_backoff_s))
+        self._max_backoff_s = max(self._backoff_s, float(max_backoff_s))
+        self._stop = threading.Event()
+        self._live = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._stream: Any = None
+        self.events = 0
+        self.resyncs = 0
+        self.reconnects = 0
+        self.last_error = ""
+
+    def is_live(self) -> bool:
+        """True while subscribed and resynced: registry reads need no Docker call."""
+        return self._live.is_set()
+
+    def wait_live(self, timeout: float) -> bool:
+        return self._live.wait(timeout)
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="trion-docker-events", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        self._live.clear()
+        close = getattr(self._stream, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception:
+                pass
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "live": self.is_live(),
+            "events": self.events,
+            "resyncs": self.resyncs,
+            "reconnects": self.reconnects,
+            "last_error": self.last_error,
+        }
+
+    def _run(self) -> None:
+        backoff = self._backoff_s
+        while not self._stop.is_set():
+            try:
+                # erst abonnieren, dann resyncen: keine Lücke zwischen Liste und Stream
+                self._stream = self._events_factory()
+                self._on_resync()
+                self.resyncs += 1
+                self._live.set()
+                backoff = self._backoff_s
+                for event in self._stream:
+                    if self._stop.is_set():
+                        break
+                    try:
+                        self._on_event(event)
+                        self.events += 1
+                    except Exception as e:
+                        logger.warning(f"[Engine] Docker event handling failed: {e}")
+            except Exception as e:
+                self.last_error = str(e)[:300]
+                if not self._stop.is_set():
+                    logger.warning(f"[Engine] Docker event stream lost: {e}")
+            finally:
+                self._live.clear()
+                self._stream = None
+            if self._stop.wait(backoff):
+                break
+            backoff = min(backoff * 2, self._max_backoff_s)
+            self.reconnects += 1
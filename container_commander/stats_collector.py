@@ -0,0 +1,298 @@
+"""
+Container Commander — Stats Collector
+═══════════════════════════════════════════════════
+Background collector for container resource stats:
+- One streaming `container.stats(stream=True)` subscription per running
+  TRION container (one daemon thread each)
+- Ring buffer of recent samples per container (CPU %, memory, network
+  totals + rates) for sparklines / short history queries
+- Cached container attrs, so warm reads need no Docker round-trip
+
+`get_container_stats` reads the latest sample from here; only a cold or
+stale container falls back to the blocking `stats(stream=False)` read.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from docker.errors import NotFound
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class StatsSample:
+    ts: float
+    cpu_percent: float
+    memory_mb: float
+    memory_limit_mb: float
+    network_rx_bytes: int
+    network_tx_bytes: int
+    network_rx_bps: float = 0.0
+    network_tx_bps: float = 0.0
+    # Rohzähler für CPU-Deltas zwischen Stream-Samples
+    cpu_total_usage: int = 0
+    system_cpu_usage: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = asdict(self)
+        out.pop("cpu_total_usage", None)
+        out.pop("system_cpu_usage", None)
+        return out
+
+
+def parse_stats_sample(
+    raw: Dict[str, Any],
+    prev: Optional[StatsSample] = None,
+    ts: Optional[float] = None,
+) -> StatsSample:
+    """Docker stats payload -> StatsSample (CPU/net deltas against `prev` if needed)."""
+    ts = time.time() if ts is None else ts
+    cpu_stats = raw.get("cpu_stats") or {}
+    precpu_stats = raw.get("precpu_stats") or {}
+    total = int((cpu_stats.get("cpu_usage") or {}).get("total_usage", 0) or 0)
+    system = int(cpu_stats.get("system_cpu_usage", 0) or 0)
+    pre_total = int((precpu_stats.get("cpu_usage") or {}).get("total_usage", 0) or 0)
+    pre_system = int(precpu_stats.get("system_cpu_usage", 0) or 0)
+    if not pre_system and prev is not None:
+        # erstes Stream-Sample hat leere precpu_stats
+        pre_total, pre_system = prev.cpu_total_usage, prev.system_cpu_usage
+    num_cpus = cpu_stats.get("online_cpus", 1) or 1
+    cpu_delta = total - pre_total
+    system_delta = system - pre_system
+    cpu_percent = (cpu_delta / system_delta) * num_cpus * 100.0 if system_delta > 0 and pre_system else 0.0
+
+    memory_stats = raw.get("memory_stats") or {}
+    mem_usage = memory_stats.get("usage", 0) or 0
+    mem_limit = memory_stats.get("limit", 1) or 1
+
+    networks = raw.get("networks") or {}
+    net_rx = sum(v.get("rx_bytes", 0) for v in networks.values())
+    net_tx = sum(v.get("tx_bytes", 0) for v in networks.values())
+    rx_bps = tx_bps = 0.0
+    if prev is not None and ts > prev.ts:
+        dt = ts - prev.ts
+        rx_bps = max(0, net_rx - prev.network_rx_bytes) / dt
+        tx_bps = max(0, net_tx - prev.network_tx_bytes) / dt
+
+    return StatsSample(
+        ts=ts,
+        cpu_percent=round(max(0.0, cpu_percent), 1),
+        memory_mb=round(mem_usage / (1024 * 1024), 1),
+        memory_limit_mb=round(mem_limit / (1024 * 1024), 1),
+        network_rx_bytes=net_rx,
+        network_tx_bytes=net_tx,
+        network_rx_bps=round(rx_bps, 1),
+        network_tx_bps=round(tx_bps, 1),
+        cpu_total_usage=total,
+        system_cpu_usage=system,
+    )
+
+
+class _Subscription:
+    def __init__(self, container_id: str, history: int):
+        self.container_id = container_id
+        self.samples: Deque[StatsSample] = deque(maxlen=history)
+        self.attrs: Dict[str, Any] = {}
+        self.stop = threading.Event()
+        self.thread: Optional[threading.Thread] = None
+        self.stream: Any = None
+
+
+class ContainerStatsCollector:
+    """Streaming stats subscriptions + ring buffers, keyed by container id."""
+
+    def __init__(
+        self,
+        get_client: Callable[[], Any],
+        *,
+        label: str,
+        history: int = 120,
+        stale_s: float = 10.0,
+        resync_s: float = 15.0,
+    ):
+        self._get_client = get_client
+        self._label = label
+        self._history = max(2, int(history))
+        self._stale_s = max(1.0, float(stale_s))
+        self._resync_s = max(1.0, float(resync_s))
+        self._lock = threading.Lock()
+        self._subs: Dict[str, _Subscription] = {}
+        # kurze IDs / Namen -> volle Container-ID (Docker liefert beim Resync volle IDs)
+        self._aliases: Dict[str, str] = {}
+        self._supervisor: Optional[threading.Thread] = None
+        self._shutdown = threading.Event()
+        self.samples_total = 0
+        self.subscriptions_started = 0
+
+    # ── Reads (nur Lock + Deque, keine Docker-Calls) ──────────
+
+    def latest(self, container_id: str) -> Optional[Tuple[StatsSample, Dict[str, Any]]]:
+        """Newest sample + cached attrs, or None if missing/stale."""
+        with self._lock:
+            sub = self._subs.get(self._aliases.get(container_id, container_id))
+            if sub is None or not sub.samples:
+                return None
+            sample = sub.samples[-1]
+            attrs = sub.attrs
+        if time.time() - sample.ts > self._stale_s:
+            return None
+        return sample, attrs
+
+    def history(
+        self,
+        container_id: str,
+        seconds: Optional[float] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        with self._lock:
+            sub = self._subs.get(self._aliases.get(container_id, container_id))
+            samples = list(sub.samples) if sub is not None else []
+        if seconds is not None:
+            cutoff = time.time() - float(seconds)
+            samples = [s for s in samples if s.ts >= cutoff]
+        if limit is not None:
+            samples = samples[-max(0, int(limit)):]
+        return [s.to_dict() for s in samples]
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            subs = {cid: len(sub.samples) for cid, sub in self._subs.items()}
+        return {
+            "subscriptions": len(subs),
+            "samples_buffered": sum(subs.values()),
+            "samples_total": self.samples_total,
+            "subscriptions_started": self.subscriptions_started,
+            "history_size": self._history,
+        }
+
+    # ── Subscriptions ─────────────────────────────────────────
+
+    def seed(self, container_id: str, sample: StatsSample, attrs: Dict[str, Any]) -> None:
+        """Store a sample from a blocking read and start streaming for this container."""
+        full_id = str((attrs or {}).get("Id") or container_id)
+        if full_id != container_id:
+            with self._lock:
+                self._aliases[container_id] = full_id
+        sub = self._ensure_sub(full_id, attrs)
+        with self._lock:
+            if not sub.samples or sub.samples[-1].ts <= sample.ts:
+                sub.samples.append(sample)
+                self.samples_total += 1
+
+    def ensure(self, container_id: str) -> None:
+        self._ensure_sub(container_id, None)
+
+    def _ensure_sub(self, container_id: str, attrs: Optional[Dict[str, Any]]) -> _Subscription:
+        start = False
+        with self._lock:
+            sub = self._subs.get(container_id)
+            if sub is None:
+                sub = _Subscription(container_id, self._history)
+                self._subs[container_id] = sub
+                start = True
+            if attrs:
+                sub.attrs = attrs
+        if start:
+            sub.thread = threading.Thread(
+                target=self._run,
+                args=(sub,),
+                name=f"trion-stats-{container_id[:12]}",
+                daemon=True,
+            )
+            self.subscriptions_started += 1
+            sub.thread.start()
+            self._ensure_supervisor()
+        return sub
+
+    def forget(self, container_id: str) -> None:
+        with self._lock:
+            full_id = self._aliases.get(container_id, container_id)
+            sub = self._subs.pop(full_id, None)
+            for alias in [a for a, target in self._aliases.items() if target == full_id]:
+                del self._aliases[alias]
+        if sub is not None:
+            self._close_sub(sub)
+
+    def sync(self, running_ids: Iterable[str]) -> None:
+        """Subscribe to new running containers, drop the ones that are gone."""
+        running = set(running_ids)
+        with self._lock:
+            gone = [cid for cid in self._subs if cid not in running]
+        for cid in gone:
+            self.forget(cid)
+        for cid in running:
+            self.ensure(cid)
+
+    def shutdown(self) -> None:
+        self._shutdown.set()
+        with self._lock:
+            subs = list(self._subs.values())
+            self._subs.clear()
+            self._aliases.clear()
+        for sub in subs:
+            self._close_sub(sub)
+
+    @staticmethod
+    def _close_sub(sub: _Subscription) -> None:
+        sub.stop.set()
+        stream = sub.stream
+        close = getattr(stream, "close", None)
+        if callable(close):
+            try:
+                close()
+            except Exception:
+                pass
+
+    def _run(self, sub: _Subscription) -> None:
+        cid = sub.container_id
+        try:
+            container = self._get_client().containers.get(cid)
+            attrs = container.attrs or {}
+            with self._lock:
+                sub.attrs = attrs
+            sub.stream = container.stats(stream=True, decode=True)
+            for raw in sub.stream:
+                if sub.stop.is_set():
+                    break
+                with self._lock:
+                    prev = sub.samples[-1] if sub.samples else None
+                sample = parse_stats_sample(raw, prev)
+                with self._lock:
+                    sub.samples.append(sample)
+                    self.samples_total += 1
+        except NotFound:
+            pass
+        except Exception as e:
+            if not sub.stop.is_set():
+                logger.debug(f"[Stats] stream ended for {cid[:12]}: {e}")
+        finally:
+            with self._lock:
+                if self._subs.get(cid) is sub:
+                    del self._subs[cid]
+
+    # ── Supervisor: hält die Subscriptions deckungsgleich mit Docker ──
+
+    def _ensure_supervisor(self) -> None:
+        with self._lock:
+            if self._supervisor is not None and self._supervisor.is_alive():
+                return
+            self._shutdown.clear()
+            self._supervisor = threading.Thread(
+                target=self._supervise, name="trion-stats-supervisor", daemon=True
+            )
+            self._supervisor.start()
+
+    def _supervise(self) -> None:
+        while not self._shutdown.wait(self._resync_s):
+            try:
+                containers = self._get_client().containers.list(
+                    filters={"label": self._label, "status": "running"}
+                )
+                self.sync(c.id for c in containers)
+            except Exception as e:
+                logger.debug(f"[Stats] resync failed: {e}")
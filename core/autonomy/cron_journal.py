@@ -0,0 +1,223 @@
+"""
+Autonomy Cron State Journal
+
+Append-only JSONL-Journal neben dem JSON-Snapshot des Cron-Schedulers.
+
+- Jede Mutation ist genau eine Zeile (Job-Upsert, Job-Delete, Run-Record)
+  mit fortlaufender ``seq`` -> Schreibkosten O(1) statt O(jobs).
+- Kompaktierung: das aktive Journal wird (O(1), unter dem Scheduler-Lock)
+  in ein Segment umbenannt; das Einmischen der Segmente in den Snapshot
+  läuft danach ohne Lock in einem Worker-Thread.
+- Replay: Snapshot + Segmente + aktives Journal; Records mit
+  ``seq <= snapshot.journal_seq`` werden übersprungen, damit ein Absturz
+  zwischen Snapshot-Write und Segment-Löschen nichts doppelt anwendet.
+- Ein abgeschnittener letzter Record (Crash mitten im Write) wird beim
+  Laden verworfen; mehr als dieser eine Record geht nicht verloren.
+"""
+
+from __future__ import annotations
+
+import glob
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+
+from utils.logger import log_warning
+
+HISTORY_LIMIT = 200
+
+
+def _apply_record(jobs: Dict[str, Dict[str, Any]], history: List[Dict[str, Any]], rec: Dict[str, Any]) -> None:
+    op = rec.get("op")
+    if op == "job":
+        job = rec.get("job")
+        if isinstance(job, dict) and str(job.get("id") or "").strip():
+            jobs[str(job["id"]).strip()] = job
+    elif op == "delete":
+        jobs.pop(str(rec.get("id") or ""), None)
+    elif op == "run":
+        entry = rec.get("entry")
+        if isinstance(entry, dict):
+            history.append(entry)
+            if len(history) > 2 * HISTORY_LIMIT:
+                del history[:-HISTORY_LIMIT]
+
+
+def _read_records(path: str) -> Tuple[List[Dict[str, Any]], int]:
+    """Returns (records, byte offset after the last complete line)."""
+    records: List[Dict[str, Any]] = []
+    good_end = 0
+    with open(path, "rb") as f:
+        data = f.read()
+    pos = 0
+    while pos < len(data):
+        nl = data.find(b"\n", pos)
+        if nl < 0:
+            break  # abgeschnittene letzte Zeile
+        line = data[pos:nl].strip()
+        pos = nl + 1
+        if not line:
+            good_end = pos
+            continue
+        try:
+            rec = json.loads(line)
+        except ValueError:
+            log_warning(f"[AutonomyCron] journal: skipping corrupt record in {path}")
+            good_end = pos
+            continue
+        if isinstance(rec, dict):
+            records.append(rec)
+        good_end = pos
+    return records, good_end
+
+
+class CronStateJournal:
+    def __init__(self, state_path: str, *, fsync: bool = True):
+        self.state_path = str(state_path)
+        self.journal_path = f"{self.state_path}.journal"
+        self._fsync = bool(fsync)
+        self._fh = None
+        self._seq = 0
+        self._compact_lock = threading.Lock()
+        self.records_since_compact = 0
+        self.appended = 0
+        self.compactions = 0
+
+    # ── Laden ───────────────────────────────────────────────────────────
+
+    def _segment_paths(self) -> List[str]:
+        prefix = f"{self.journal_path}."
+        return sorted(
+            p for p in glob.glob(glob.escape(prefix) + "*")
+            if p[len(prefix):].isdigit()
+        )
+
+    def _read_snapshot(self) -> Tuple[Dict[str, Dict[str, Any]], List[Dict[str, Any]], int]:
+        jobs: Dict[str, Dict[str, Any]] = {}
+        history: List[Dict[str, Any]] = []
+        if not os.path.exists(self.state_path):
+            return jobs, history, 0
+        with open(self.state_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        for job in (data.get("jobs") or []):
+            if not isinstance(job, dict):
+                continue
+            job_id = str(job.get("id") or "").strip()
+            if job_id:
+                jobs[job_id] = job
+        hist = data.get("history") or []
+        if isinstance(hist, list):
+            history = [x for x in hist if isinstance(x, dict)][-HISTORY_LIMIT:]
+        return jobs, history, int(data.get("journal_seq") or 0)
+
+    def load(self) -> Tuple[Dict[str, Dict[str, Any]], List[Dict[str, Any]]]:
+        """Snapshot + Journal-Replay. Repariert ein abgeschnittenes Journal-Ende."""
+        self.close()
+        with self._compact_lock:
+            jobs, history, seq = self._read_snapshot()
+            pending = 0
+            for path in [*self._segment_paths(), self.journal_path]:
+                if not os.path.exists(path):
+                    continue
+                records, good_end = _read_records(path)
+                if path == self.journal_path and good_end < os.path.getsize(path):
+                    log_warning("[AutonomyCron] journal: dropping truncated last record")
+                    with open(path, "r+b") as f:
+                        f.truncate(good_end)
+                for rec in records:
+                    rec_seq = int(rec.get("seq") or 0)
+                    if rec_seq <= seq:
+                        continue
+                    _apply_record(jobs, history, rec)
+                    seq = rec_seq
+                    pending += 1
+            self._seq = seq
+            self.records_since_compact = pending
+        return jobs, history[-HISTORY_LIMIT:]
+
+    # ── Schreiben ───────────────────────────────────────────────────────
+
+    def _open(self):
+        if self._fh is None:
+            parent = os.path.dirname(self.journal_path) or "."
+            os.makedirs(parent, exist_ok=True)
+            self._fh = open(self.journal_path, "a", encoding="utf-8")
+        return self._fh
+
+    def append(self, op: str, **payload: Any) -> int:
+        self._seq += 1
+        rec = {"seq": self._seq, "op": op, **payload}
+        fh = self._open()
+        fh.write(json.dumps(rec, separators=(",", ":")) + "\n")
+        fh.flush()
+        if self._fsync:
+            os.fsync(fh.fileno())
+        self.records_since_compact += 1
+        self.appended += 1
+        return self._seq
+
+    def rotate(self) -> bool:
+        """Aktives Journal -> Segment (O(1)); False wenn nichts zu kompaktieren ist."""
+        self.close()
+        self.records_since_compact = 0
+        if not os.path.exists(self.journal_path) or os.path.getsize(self.journal_path) == 0:
+            return bool(self._segment_paths())
+        os.replace(self.journal_path, f"{self.journal_path}.{self._seq:012d}")
+        return True
+
+    def compact(self) -> int:
+        """Mischt alle Segmente in den Snapshot (blockierend, für Worker-Threads)."""
+        with self._compact_lock:
+            segments = self._segment_paths()
+            if not segments:
+                return 0
+            jobs, history, seq = self._read_snapshot()
+            applied = 0
+            for path in segments:
+                records, _ = _read_records(path)
+                for rec in records:
+                    rec_seq = int(rec.get("seq") or 0)
+                    if rec_seq <= seq:
+                        continue
+                    _apply_record(jobs, history, rec)
+                    seq = rec_seq
+                    applied += 1
+            data = {
+                "version": 1,
+                "updated_at": datetime.now(timezone.utc).isoformat(),
+                "journal_seq": seq,
+                "jobs": list(jobs.values()),
+                "history": history[-HISTORY_LIMIT:],
+            }
+            tmp = f"{self.state_path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+                f.flush()
+                if self._fsync:
+                    os.fsync(f.fileno())
+            os.replace(tmp, self.state_path)
+            for path in segments:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            self.compactions += 1
+            return applied
+
+    def close(self) -> None:
+        if self._fh is not None:
+            try:
+                self._fh.close()
+            finally:
+                self._fh = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "seq": self._seq,
+            "appended": self.appended,
+            "records_since_compact": self.records_since_compact,
+            "compactions": self.compactions,
+            "segments": len(self._segment_paths()),
+        }
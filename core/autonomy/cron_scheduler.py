@@ -8,15 +8,17 @@ the existing /api/autonomous/jobs queue.
 from __future__ import annotations
 
 import asyncio
-import json
+import heapq
 import os
 import re
 import uuid
+from bisect import bisect_left
 from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any, Awaitable, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
 from zoneinfo import ZoneInfo
 
+from core.autonomy.cron_journal import CronStateJournal
 from utils.logger import log_info, log_warning, log_error
 
 
@@ -210,6 +212,14 @@ def _build_default_job_note_md(job: Dict[str, Any]) -> str:
 class _CronField:
     values: Set[int]
     any: bool
+    ordered: Tuple[int, ...] = ()
+
+    def __post_init__(self) -> None:
+        self.ordered = tuple(sorted(self.values))
+
+    def next_at_or_after(self, value: int) -> Optional[int]:
+        idx = bisect_left(self.ordered, value)
+        return self.ordered[idx] if idx < len(self.ordered) else None
 
 
 def _parse_int(token: str, lo: int, hi: int, label: str) -> int:
@@ -286,20 +296,10 @@ def parse_cron_expression(expr: str) -> Dict[str, Any]:
     }
 
 
-def cron_matches(parsed: Dict[str, Any], local_dt: datetime) -> bool:
-    minute = parsed["minute"]
-    hour = parsed["hour"]
+def _day_matches(parsed: Dict[str, Any], local_dt: datetime) -> bool:
     dom = parsed["day_of_month"]
-    month = parsed["month"]
     dow = parsed["day_of_week"]
 
-    if local_dt.minute not in minute.values:
-        return False
-    if local_dt.hour not in hour.values:
-        return False
-    if local_dt.month not in month.values:
-        return False
-
     dom_match = local_dt.day in dom.values
     cron_dow = (local_dt.weekday() + 1) % 7  # 0=sunday
     dow_match = cron_dow in dow.values
@@ -313,22 +313,95 @@ def cron_matches(parsed: Dict[str, Any], local_dt: datetime) -> bool:
     return dom_match or dow_match
 
 
+def cron_matches(parsed: Dict[str, Any], local_dt: datetime) -> bool:
+    if local_dt.minute not in parsed["minute"].values:
+        return False
+    if local_dt.hour not in parsed["hour"].values:
+        return False
+    if local_dt.month not in parsed["month"].values:
+        return False
+    return _day_matches(parsed, local_dt)
+
+
+# 8 Jahre: deckt auch "0 0 29 2 *" (Schaltjahr-Lücke 2096 -> 2104) ab.
+_NEXT_FIRE_HORIZON_DAYS = 8 * 366
+
+
+def next_fire_utc(
+    parsed: Dict[str, Any],
+    tz: ZoneInfo,
+    from_utc: datetime,
+    max_days: int = _NEXT_FIRE_HORIZON_DAYS,
+) -> Optional[datetime]:
+    """
+    Next fire time strictly after ``from_utc`` (minute resolution).
+
+    Springt feldweise auf Wanduhrzeit in ``tz`` (Monat -> Tag -> Stunde ->
+    Minute) statt minutenweise zu zählen; die Anzahl der Schritte ist durch
+    die Feldgrößen begrenzt, nicht durch den Abstand zum nächsten Treffer.
+
+    DST, konsistent mit dem Wanduhr-Trigger-Key des Schedulers:
+    - nicht existierende Zeiten (Sprung vorwärts) werden übersprungen
+    - doppelte Zeiten (Sprung zurück) feuern nur beim ersten Auftreten
+    """
+    months = parsed["month"]
+    hours = parsed["hour"]
+    minutes = parsed["minute"]
+
+    floor_utc = from_utc.astimezone(timezone.utc).replace(second=0, microsecond=0)
+    horizon_utc = floor_utc + timedelta(days=max(1, int(max_days)))
+    horizon_local = horizon_utc.astimezone(tz).replace(tzinfo=None) + timedelta(days=1)
+    cand = floor_utc.astimezone(tz).replace(tzinfo=None) + timedelta(minutes=1)
+
+    while cand <= horizon_local:
+        if cand.month not in months.values:
+            month = months.next_at_or_after(cand.month + 1)
+            if month is None:
+                cand = datetime(cand.year + 1, months.ordered[0], 1)
+            else:
+                cand = datetime(cand.year, month, 1)
+            continue
+        if not _day_matches(parsed, cand):
+            cand = datetime(cand.year, cand.month, cand.day) + timedelta(days=1)
+            continue
+        if cand.hour not in hours.values:
+            hour = hours.next_at_or_after(cand.hour + 1)
+            if hour is None:
+                cand = datetime(cand.year, cand.month, cand.day) + timedelta(days=1)
+            else:
+                cand = cand.replace(hour=hour, minute=0)
+            continue
+        if cand.minute not in minutes.values:
+            minute = minutes.next_at_or_after(cand.minute + 1)
+            if minute is None:
+                cand = cand.replace(minute=0) + timedelta(hours=1)
+            else:
+                cand = cand.replace(minute=minute)
+            continue
+
+        fire = cand.replace(tzinfo=tz).astimezone(timezone.utc)  # fold=0 -> erstes Auftreten
+        if fire.astimezone(tz).replace(tzinfo=None) != cand:
+            # Wanduhrzeit existiert nicht (DST-Lücke)
+            cand += timedelta(minutes=1)
+            continue
+        if fire <= floor_utc:
+            # erstes Auftreten einer doppelten Stunde liegt schon zurück
+            cand += timedelta(minutes=1)
+            continue
+        if fire > horizon_utc:
+            return None
+        return fire
+    return None
+
+
 def next_matching_utc(
     parsed: Dict[str, Any],
     timezone_name: str,
     from_utc: Optional[datetime] = None,
-    max_days: int = 35,
+    max_days: int = _NEXT_FIRE_HORIZON_DAYS,
 ) -> str:
-    now_utc = from_utc or _utcnow()
-    tz = ZoneInfo(timezone_name)
-    local = now_utc.astimezone(tz).replace(second=0, microsecond=0)
-    max_minutes = max_days * 24 * 60
-
-    for i in range(1, max_minutes + 1):
-        candidate = local + timedelta(minutes=i)
-        if cron_matches(parsed, candidate):
-            return _iso(candidate.astimezone(timezone.utc))
-    return ""
+    fire = next_fire_utc(parsed, ZoneInfo(timezone_name), from_utc or _utcnow(), max_days=max_days)
+    return _iso(fire) if fire is not None else ""
 
 
 def validate_cron_expression(expr: str) -> Dict[str, Any]:
@@ -343,19 +416,18 @@ def estimate_min_interval_seconds(
     max_hits: int = 40,
 ) -> int:
     """
-    Best-effort lower bound of schedule interval by minute-scan.
+    Best-effort lower bound of schedule interval by walking fire times.
     Returns a large value when no second hit is found in scan window.
     """
     base = datetime(2026, 1, 1, 0, 0, tzinfo=timezone.utc)
-    max_minutes = max_days * 24 * 60
+    horizon = base + timedelta(days=max_days)
+    utc = ZoneInfo("UTC")
     prev: Optional[datetime] = None
     min_delta: Optional[int] = None
     hits = 0
 
-    for i in range(max_minutes + 1):
-        candidate = base + timedelta(minutes=i)
-        if not cron_matches(parsed, candidate):
-            continue
+    candidate = base if cron_matches(parsed, base) else next_fire_utc(parsed, utc, base, max_days=max_days)
+    while candidate is not None and candidate <= horizon:
         hits += 1
         if prev is not None:
             delta = max(60, int((candidate - prev).total_seconds()))
@@ -365,6 +437,7 @@ def estimate_min_interval_seconds(
         prev = candidate
         if hits >= max_hits and min_delta is not None:
             break
+        candidate = next_fire_utc(parsed, utc, candidate, max_days=max_days)
 
     return min_delta if min_delta is not None else (366 * 24 * 60 * 60)
 
@@ -446,6 +519,8 @@ class AutonomyCronScheduler:
         hardware_cpu_max_percent: int = 90,
         hardware_mem_max_percent: int = 92,
         hardware_probe_cb: Optional[Callable[[], Dict[str, Any]]] = None,
+        journal_compact_records: int = 1000,
+        journal_fsync: bool = True,
     ):
         self._state_path = str(state_path or "").strip()
         self._tick_s = max(5, int(tick_s))
@@ -465,6 +540,11 @@ class AutonomyCronScheduler:
         self._hardware_cpu_max_percent = max(50, min(99, int(hardware_cpu_max_percent)))
         self._hardware_mem_max_percent = max(50, min(99, int(hardware_mem_max_percent)))
         self._hardware_probe_cb = hardware_probe_cb
+        self._journal_compact_records = max(1, int(journal_compact_records))
+        self._journal: Optional[CronStateJournal] = (
+            CronStateJournal(self._state_path, fsync=journal_fsync) if self._state_path else None
+        )
+        self._compact_task: Optional[asyncio.Task] = None
 
         self._lock = asyncio.Lock()
         self._queue: asyncio.Queue[Dict[str, Any]] = asyncio.Queue()
@@ -474,6 +554,12 @@ class AutonomyCronScheduler:
         self._jobs: Dict[str, Dict[str, Any]] = {}
         self._expr_cache: Dict[str, Dict[str, Any]] = {}
 
+        # Min-Heap (fire_ts, job_id) mit lazy deletion: gültig ist nur der
+        # Eintrag, dessen fire_ts in _next_fire[job_id] steht.
+        self._heap: List[Tuple[float, str]] = []
+        self._next_fire: Dict[str, float] = {}
+        self._wakeup = asyncio.Event()
+
         self._tick_task: Optional[asyncio.Task] = None
         self._workers: List[asyncio.Task] = []
         self._stopping = False
@@ -499,6 +585,7 @@ class AutonomyCronScheduler:
             tasks = [t for t in [self._tick_task, *self._workers] if t]
             self._tick_task = None
             self._workers = []
+            compact_task = self._compact_task
         for task in tasks:
             if task and not task.done():
                 task.cancel()
@@ -511,49 +598,66 @@ class AutonomyCronScheduler:
                 pass
             except Exception:
                 pass
+        if compact_task is not None:
+            try:
+                await compact_task
+            except Exception as exc:
+                log_warning(f"[AutonomyCron] journal compaction failed: {exc}")
+        if self._journal is not None:
+            self._journal.close()
         log_info("[AutonomyCron] stopped")
 
-    def _ensure_parent_dir(self) -> None:
-        parent = os.path.dirname(self._state_path) or "."
-        os.makedirs(parent, exist_ok=True)
+    # ── Persistenz (append-only Journal, siehe cron_journal.py) ─────────
 
-    def _save_state_locked(self) -> None:
-        if not self._state_path:
+    def _persist_job_locked(self, job_id: str) -> None:
+        if self._journal is None:
             return
-        self._ensure_parent_dir()
-        data = {
-            "version": 1,
-            "updated_at": _iso(),
-            "jobs": list(self._jobs.values()),
-            "history": self._history[-200:],
-        }
-        tmp = f"{self._state_path}.tmp"
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2)
-        os.replace(tmp, self._state_path)
+        job = self._jobs.get(job_id)
+        if job is None:
+            self._journal.append("delete", id=job_id)
+        else:
+            self._journal.append("job", job=job)
+        self._maybe_compact_locked()
+
+    def _append_history_locked(self, entry: Dict[str, Any]) -> None:
+        self._history.append(entry)
+        self._history = self._history[-200:]
+        if self._journal is not None:
+            self._journal.append("run", entry=entry)
+            self._maybe_compact_locked()
+
+    def _maybe_compact_locked(self, force: bool = False) -> None:
+        journal = self._journal
+        if journal is None:
+            return
+        if not force and journal.records_since_compact < self._journal_compact_records:
+            return
+        if self._compact_task is not None and not self._compact_task.done():
+            return
+        if not journal.rotate():
+            return
+        self._compact_task = asyncio.get_running_loop().create_task(
+            asyncio.to_thread(journal.compact), name="autonomy-cron-compact"
+        )
 
     def _load_state_locked(self) -> None:
         self._jobs = {}
         self._history = []
         self._pending = []
         self._running = {}
-        if not self._state_path or not os.path.exists(self._state_path):
+        self._heap = []
+        self._next_fire = {}
+        if self._journal is None:
             return
         try:
-            with open(self._state_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            for job in (data.get("jobs") or []):
-                if not isinstance(job, dict):
-                    continue
-                job_id = str(job.get("id") or "").strip()
-                if not job_id:
-                    continue
-                self._jobs[job_id] = job
-            hist = data.get("history") or []
-            if isinstance(hist, list):
-                self._history = [x for x in hist if isinstance(x, dict)][-200:]
+            self._jobs, self._history = self._journal.load()
         except Exception as exc:
             log_warning(f"[AutonomyCron] failed to load state: {exc}")
+        if self._journal.records_since_compact:
+            self._maybe_compact_locked(force=True)
+        now_utc = _utcnow()
+        for job_id in list(self._jobs):
+            self._schedule_job_locked(job_id, now_utc)
 
     def _parsed_expr(self, expr: str) -> Dict[str, Any]:
         key = str(expr or "").strip()
@@ -587,6 +691,56 @@ class AutonomyCronScheduler:
         except Exception:
             return ""
 
+    def _schedule_job_locked(self, job_id: str, now_utc: Optional[datetime] = None) -> None:
+        """(Re-)computes the next fire of one job and pushes it onto the heap."""
+        self._next_fire.pop(job_id, None)
+        job = self._jobs.get(job_id)
+        if not job or not bool(job.get("enabled", True)):
+            return
+        now_utc = now_utc or _utcnow()
+        if self._is_one_shot_mode(job):
+            if self._is_one_shot_consumed(job):
+                return
+            fire = _parse_iso_datetime(str(job.get("run_at", "")))
+            if fire is None:
+                job["last_status"] = "error"
+                job["last_error"] = "one_shot_run_at_invalid"
+                return
+        else:
+            try:
+                parsed = self._parsed_expr(str(job.get("cron", "")))
+                fire = next_fire_utc(parsed, ZoneInfo(str(job.get("timezone", "UTC"))), now_utc)
+            except Exception as exc:
+                job["last_status"] = "error"
+                job["last_error"] = f"cron_parse_error:{exc}"
+                return
+            if fire is None:
+                return
+        self._push_fire_locked(job_id, fire.timestamp())
+
+    def _push_fire_locked(self, job_id: str, fire_ts: float) -> None:
+        self._next_fire[job_id] = fire_ts
+        heapq.heappush(self._heap, (fire_ts, job_id))
+        # Heap nach vielen Updates kompakt halten (veraltete Einträge verwerfen)
+        if len(self._heap) > 2 * len(self._next_fire) + 64:
+            self._heap = [(ts, jid) for jid, ts in self._next_fire.items()]
+            heapq.heapify(self._heap)
+        self._wakeup.set()
+
+    def _next_fire_iso_locked(self) -> str:
+        delay = self._seconds_until_next_fire_locked(_utcnow())
+        if delay is None:
+            return ""
+        return _iso(datetime.fromtimestamp(self._heap[0][0], timezone.utc))
+
+    def _seconds_until_next_fire_locked(self, now_utc: datetime) -> Optional[float]:
+        while self._heap:
+            fire_ts, job_id = self._heap[0]
+            if self._next_fire.get(job_id) == fire_ts:
+                return max(0.0, fire_ts - now_utc.timestamp())
+            heapq.heappop(self._heap)
+        return None
+
     async def list_jobs(self) -> List[Dict[str, Any]]:
         async with self._lock:
             out = []
@@ -1085,7 +1239,8 @@ class AutonomyCronScheduler:
                 "last_manual_trigger_at": "",
             }
             self._jobs[job_id] = job
-            self._save_state_locked()
+            self._schedule_job_locked(job_id)
+            self._persist_job_locked(job_id)
             out = dict(job)
             out["next_run_at"] = self._next_run_iso(job) if bool(job.get("enabled", True)) else ""
             out["runtime_state"] = self._runtime_state_for_job_locked(job_id)
@@ -1103,7 +1258,8 @@ class AutonomyCronScheduler:
             self._enforce_job_policy_locked(normalized, existing=current, job_id=job_id)
             normalized["updated_at"] = _iso()
             self._jobs[job_id] = {**current, **normalized}
-            self._save_state_locked()
+            self._schedule_job_locked(job_id)
+            self._persist_job_locked(job_id)
             out = dict(self._jobs[job_id])
             out["next_run_at"] = self._next_run_iso(out) if bool(out.get("enabled", True)) else ""
             out["runtime_state"] = self._runtime_state_for_job_locked(job_id)
@@ -1116,9 +1272,10 @@ class AutonomyCronScheduler:
         async with self._lock:
             existed = job_id in self._jobs
             self._jobs.pop(job_id, None)
+            self._next_fire.pop(job_id, None)
             self._pending = [x for x in self._pending if x.get("cron_job_id") != job_id]
             if existed:
-                self._save_state_locked()
+                self._persist_job_locked(job_id)
             return existed
 
     async def pause_job(self, cron_job_id: str) -> Optional[Dict[str, Any]]:
@@ -1156,11 +1313,12 @@ class AutonomyCronScheduler:
             if self._is_one_shot_mode(job):
                 self._jobs[job_id]["last_trigger_key"] = f"one_shot:manual:{item['queued_at']}"
                 self._jobs[job_id]["enabled"] = False
+                self._next_fire.pop(job_id, None)
             else:
                 self._jobs[job_id]["last_trigger_key"] = ""
             if str(item.get("reason", "")) in {"manual", "tool"}:
                 self._jobs[job_id]["last_manual_trigger_at"] = item["queued_at"]
-            self._save_state_locked()
+            self._persist_job_locked(job_id)
             out = dict(job)
             out["runtime_state"] = self._runtime_state_for_job_locked(job_id)
             out["next_run_at"] = self._next_run_iso(job) if bool(job.get("enabled", True)) else ""
@@ -1179,6 +1337,9 @@ class AutonomyCronScheduler:
                     "tick_s": self._tick_s,
                     "max_concurrency": self._max_concurrency,
                     "state_path": self._state_path,
+                    "scheduled_jobs": len(self._next_fire),
+                    "next_fire_at": self._next_fire_iso_locked(),
+                    "journal": self._journal.stats() if self._journal is not None else {},
                 },
                 "policy": self._policy_snapshot_locked(),
                 "counts": {
@@ -1200,6 +1361,11 @@ class AutonomyCronScheduler:
             }
 
     async def _tick_loop(self) -> None:
+        """
+        Schläft bis zur frühesten Fälligkeit im Heap (oder bis ein Job
+        geändert wird). tick_s ist nur noch die Obergrenze pro Schlaf, damit
+        Wanduhr-Sprünge (NTP, Suspend) spätestens nach einem Tick auffallen.
+        """
         while not self._stopping:
             try:
                 await self._tick_once()
@@ -1207,27 +1373,37 @@ class AutonomyCronScheduler:
                 raise
             except Exception as exc:
                 log_warning(f"[AutonomyCron] tick error: {exc}")
-            await asyncio.sleep(self._tick_s)
+            async with self._lock:
+                delay = self._seconds_until_next_fire_locked(_utcnow())
+                self._wakeup.clear()
+            timeout = self._tick_s if delay is None else min(float(self._tick_s), delay)
+            if timeout <= 0:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
 
     async def _tick_once(self) -> None:
         now_utc = _utcnow()
-        changed = False
+        now_ts = now_utc.timestamp()
+        # Ein Cron-Treffer gilt so lange wie ein Tick (mind. die Trefferminute);
+        # danach wird er wie beim Neustart übersprungen statt nachgeholt.
+        grace_s = max(60, self._tick_s)
+        changed: Set[str] = set()
         queued = 0
         async with self._lock:
-            for job_id, job in self._jobs.items():
-                if not bool(job.get("enabled", True)):
+            while self._heap and self._heap[0][0] <= now_ts:
+                fire_ts, job_id = heapq.heappop(self._heap)
+                if self._next_fire.get(job_id) != fire_ts:
+                    continue
+                self._next_fire.pop(job_id, None)
+                job = self._jobs.get(job_id)
+                if not job or not bool(job.get("enabled", True)):
                     continue
                 if self._is_one_shot_mode(job):
                     if self._is_one_shot_consumed(job):
                         continue
-                    run_at = _parse_iso_datetime(str(job.get("run_at", "")))
-                    if run_at is None:
-                        job["last_status"] = "error"
-                        job["last_error"] = "one_shot_run_at_invalid"
-                        changed = True
-                        continue
-                    if now_utc < run_at:
-                        continue
                     allowed, policy_error = self._check_enqueue_policy_locked(
                         cron_job_id=job_id,
                         reason="schedule_one_shot",
@@ -1238,7 +1414,9 @@ class AutonomyCronScheduler:
                             job["last_status"] = "throttled"
                             job["last_error"] = policy_error.error_code
                             job["updated_at"] = _iso()
-                            changed = True
+                            changed.add(job_id)
+                        # one-shot bleibt fällig: nächster Versuch nach einem Tick
+                        self._push_fire_locked(job_id, now_ts + self._tick_s)
                         continue
 
                     run_id = uuid.uuid4().hex[:12]
@@ -1253,23 +1431,18 @@ class AutonomyCronScheduler:
                     job["last_triggered_at"] = item["queued_at"]
                     job["last_trigger_key"] = f"one_shot:{str(job.get('run_at', ''))}"
                     job["enabled"] = False
-                    changed = True
+                    changed.add(job_id)
                     queued += 1
                     continue
-                cron_expr = str(job.get("cron", ""))
+
                 tz_name = str(job.get("timezone", "UTC"))
-                try:
-                    parsed = self._parsed_expr(cron_expr)
-                    local = now_utc.astimezone(ZoneInfo(tz_name))
-                    local = local.replace(second=0, microsecond=0)
-                except Exception as exc:
-                    job["last_status"] = "error"
-                    job["last_error"] = f"cron_parse_error:{exc}"
-                    changed = True
+                fire_utc = datetime.fromtimestamp(fire_ts, timezone.utc)
+                self._schedule_job_locked(job_id, max(now_utc, fire_utc))
+                if now_ts - fire_ts >= grace_s:
                     continue
-
-                minute_key = local.strftime("%Y-%m-%dT%H:%M")
-                if not cron_matches(parsed, local):
+                try:
+                    minute_key = fire_utc.astimezone(ZoneInfo(tz_name)).strftime("%Y-%m-%dT%H:%M")
+                except Exception:
                     continue
                 if str(job.get("last_trigger_key", "")) == minute_key:
                     continue
@@ -1283,7 +1456,7 @@ class AutonomyCronScheduler:
                         job["last_status"] = "throttled"
                         job["last_error"] = policy_error.error_code
                         job["updated_at"] = _iso()
-                        changed = True
+                        changed.add(job_id)
                     continue
 
                 run_id = uuid.uuid4().hex[:12]
@@ -1297,11 +1470,11 @@ class AutonomyCronScheduler:
                 await self._queue.put(item)
                 job["last_triggered_at"] = item["queued_at"]
                 job["last_trigger_key"] = minute_key
-                changed = True
+                changed.add(job_id)
                 queued += 1
 
-            if changed:
-                self._save_state_locked()
+            for job_id in changed:
+                self._persist_job_locked(job_id)
 
         if queued:
             log_info(f"[AutonomyCron] queued scheduled runs: {queued}")
@@ -1322,7 +1495,7 @@ class AutonomyCronScheduler:
                 if job:
                     job["last_run_at"] = running_entry["started_at"]
                     job["last_status"] = "dispatching"
-                self._save_state_locked()
+                    self._persist_job_locked(str(item.get("cron_job_id", "")))
 
             try:
                 job_id = str(item.get("cron_job_id", ""))
@@ -1347,7 +1520,8 @@ class AutonomyCronScheduler:
                             job_ref["last_status"] = "deferred_hardware"
                             job_ref["last_error"] = guard_reason[:300]
                             job_ref["updated_at"] = finish
-                        self._history.append(
+                            self._persist_job_locked(job_id)
+                        self._append_history_locked(
                             {
                                 "run_id": run_id,
                                 "cron_job_id": job_id,
@@ -1362,8 +1536,6 @@ class AutonomyCronScheduler:
                                 },
                             }
                         )
-                        self._history = self._history[-200:]
-                        self._save_state_locked()
                     continue
 
                 conversation_id = str(job.get("conversation_id", "")).strip()
@@ -1406,9 +1578,8 @@ class AutonomyCronScheduler:
                         job_ref["updated_at"] = finish
                         if self._is_one_shot_mode(job_ref):
                             job_ref["enabled"] = False
-                    self._history.append(hist)
-                    self._history = self._history[-200:]
-                    self._save_state_locked()
+                        self._persist_job_locked(job_id)
+                    self._append_history_locked(hist)
             except asyncio.CancelledError:
                 raise
             except Exception as exc:
@@ -1425,7 +1596,8 @@ class AutonomyCronScheduler:
                         job_ref["updated_at"] = finish
                         if self._is_one_shot_mode(job_ref):
                             job_ref["enabled"] = False
-                    self._history.append(
+                        self._persist_job_locked(job_id)
+                    self._append_history_locked(
                         {
                             "run_id": run_id,
                             "cron_job_id": job_id,
@@ -1437,7 +1609,5 @@ class AutonomyCronScheduler:
                             "reason": item.get("reason", "schedule"),
                         }
                     )
-                    self._history = self._history[-200:]
-                    self._save_state_locked()
             finally:
                 self._queue.task_done()
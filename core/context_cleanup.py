@@ -8,6 +8,11 @@ Pipeline (Phase 3):
     merge → normalize → dedupe → sort(ASC) → correlate → apply_to_state
     → select_top → render
 
+Incremental projection: with a conversation_id the TypedState is checkpointed
+per conversation and only new events are applied as deltas; a full replay
+happens on config change, evicted events, dedupe collisions or out-of-order
+events (same result as the full rebuild).
+
 Usage:
     from core.context_cleanup import build_compact_context, format_compact_context
     ctx = build_compact_context(events, entries=None, limits=None)
@@ -15,13 +20,17 @@ Usage:
 """
 from __future__ import annotations
 
+import bisect
+import copy
 import hashlib
 import json
 import os
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from dataclasses import field as _dc_field
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from core.work_context.readers.workspace_events import build_work_context_from_workspace_events
 from core.work_context.selectors import visible_next_step
@@ -236,6 +245,22 @@ def _event_core_hash(event: dict) -> str:
     return hashlib.md5(raw.encode("utf-8")).hexdigest()[:12]
 
 
+def _dedupe_scope_by_conv() -> bool:
+    try:
+        from config import get_digest_dedupe_include_conv as _include_conv
+        return bool(_include_conv())
+    except Exception:
+        return False
+
+
+def _dedupe_key(ev: dict, scope_by_conv: bool) -> str:
+    ev_type = ev.get("event_type", "")
+    ev_hash = _event_core_hash(ev)
+    if scope_by_conv:
+        return f"{ev.get('conversation_id', '')}:{ev_type}:{ev_hash}"
+    return f"{ev_type}:{ev_hash}"
+
+
 def _dedupe_events(events: List[dict]) -> List[dict]:
     """
     Remove duplicate events within DEDUPE_WINDOW_SECS.
@@ -247,22 +272,12 @@ def _dedupe_events(events: List[dict]) -> List[dict]:
     conflated (cross-conversation safe).
     Rollback: DIGEST_DEDUPE_INCLUDE_CONV=false restores original behaviour.
     """
-    try:
-        from config import get_digest_dedupe_include_conv as _include_conv
-        _scope_by_conv = _include_conv()
-    except Exception:
-        _scope_by_conv = False
+    _scope_by_conv = _dedupe_scope_by_conv()
 
     seen: Dict[str, float] = {}   # dedupe_key -> first seen timestamp
     result: List[dict] = []
     for ev in events:
-        ev_type = ev.get("event_type", "")
-        ev_hash = _event_core_hash(ev)
-        if _scope_by_conv:
-            conv_id = ev.get("conversation_id", "")
-            key = f"{conv_id}:{ev_type}:{ev_hash}"
-        else:
-            key = f"{ev_type}:{ev_hash}"
+        key = _dedupe_key(ev, _scope_by_conv)
         created_at = ev.get("created_at", "")
         try:
             ts = datetime.fromisoformat(created_at.rstrip("Z")).timestamp()
@@ -300,13 +315,53 @@ _DEFAULT_RULES = [
 ]
 
 
+_RULES_PATH = os.path.join(os.path.dirname(__file__), "mapping_rules.yaml")
+_rules_lock = threading.Lock()
+_rules_cache: dict = {"key": None, "data": None, "error": None}
+
+
+def _rules_file_key() -> Optional[Tuple[str, int, int]]:
+    """(path, mtime_ns, size) of mapping_rules.yaml, None if missing."""
+    try:
+        st = os.stat(_RULES_PATH)
+    except OSError:
+        return None
+    return (_RULES_PATH, st.st_mtime_ns, st.st_size)
+
+
+def _load_mapping_rules():
+    """
+    Parsed mapping_rules.yaml, re-read only when mtime/size change.
+
+    Returns None when YAML or the file is unavailable. A parse error is cached
+    like a result and re-raised, so each loader keeps its own warning.
+    Callers must treat the returned dict as read-only.
+    """
+    if not _YAML_AVAILABLE:
+        return None
+    key = _rules_file_key()
+    if key is None:
+        return None
+    with _rules_lock:
+        if _rules_cache["key"] != key:
+            try:
+                with open(_RULES_PATH, "r", encoding="utf-8") as f:
+                    _rules_cache["data"] = yaml.safe_load(f)
+                _rules_cache["error"] = None
+            except Exception as exc:
+                _rules_cache["data"] = None
+                _rules_cache["error"] = exc
+            _rules_cache["key"] = key
+        if _rules_cache["error"] is not None:
+            raise _rules_cache["error"]
+        return _rules_cache["data"]
+
+
 def _load_limits() -> dict:
     """Load limits from mapping_rules.yaml (if available), else use defaults."""
-    rules_path = os.path.join(os.path.dirname(__file__), "mapping_rules.yaml")
-    if _YAML_AVAILABLE and os.path.exists(rules_path):
+    if _YAML_AVAILABLE and _rules_file_key() is not None:
         try:
-            with open(rules_path, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f)
+            data = _load_mapping_rules()
             return {**_DEFAULT_LIMITS, **(data.get("limits", {}))}
         except Exception as e:
             log_warn(f"[ContextCleanup] Could not load mapping_rules.yaml: {e}")
@@ -328,11 +383,9 @@ def _load_confidence_config() -> dict:
 
     Falls back to empty dict (callers use _SOURCE_RELIABILITY_DEFAULTS).
     """
-    rules_path = os.path.join(os.path.dirname(__file__), "mapping_rules.yaml")
-    if _YAML_AVAILABLE and os.path.exists(rules_path):
+    if _YAML_AVAILABLE and _rules_file_key() is not None:
         try:
-            with open(rules_path, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f)
+            data = _load_mapping_rules()
             return {
                 "source_reliability": data.get("source_reliability", {}),
                 "entity_match":       data.get("confidence", {}).get("entity_match", {}),
@@ -447,15 +500,16 @@ def _sort_events_asc(events: List[dict]) -> List[dict]:
     Input order does NOT affect the result — any permutation of the same events
     yields the same sorted list.
     """
-    def _sort_key(ev: dict):
-        ts_str = ev.get("created_at", "")
-        try:
-            ts = datetime.fromisoformat(ts_str.rstrip("Z")).timestamp()
-        except Exception:
-            ts = 0.0
-        return (ts, ev.get("id", ""))
+    return sorted(events, key=_event_sort_key)
 
-    return sorted(events, key=_sort_key)
+
+def _event_sort_key(ev: dict) -> Tuple[float, str]:
+    ts_str = ev.get("created_at", "")
+    try:
+        ts = datetime.fromisoformat(ts_str.rstrip("Z")).timestamp()
+    except Exception:
+        ts = 0.0
+    return (ts, ev.get("id", ""))
 
 
 # ---------------------------------------------------------------------------
@@ -1046,11 +1100,9 @@ def _load_output_config() -> dict:
 
     Falls back to empty dict; callers use module-level defaults.
     """
-    rules_path = os.path.join(os.path.dirname(__file__), "mapping_rules.yaml")
-    if _YAML_AVAILABLE and os.path.exists(rules_path):
+    if _YAML_AVAILABLE and _rules_file_key() is not None:
         try:
-            with open(rules_path, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f)
+            data = _load_mapping_rules()
             return data.get("output", {}).get("compact_context", {})
         except Exception as exc:
             log_warn(f"[ContextCleanup] Could not load output config: {exc}")
@@ -1534,6 +1586,396 @@ def _minimal_fail_context(meta: Optional[dict] = None) -> "CompactContext":
     return CompactContext(now=now, rules=[], next_steps=next_steps, meta=_meta)
 
 
+# ---------------------------------------------------------------------------
+# Incremental projection — per-conversation TypedState checkpoints
+# ---------------------------------------------------------------------------
+
+_PROJECTION_MAX_CONVERSATIONS = 64
+# Cursor mode: after this many appended events the caller re-reads the full
+# window once, so the checkpoint never drifts far from what a replay would see.
+_PROJECTION_REFRESH_EVENTS = 100
+
+_Fingerprint = Tuple[str, str, str, str, str, int]
+
+
+def _event_fingerprint(ev: dict) -> _Fingerprint:
+    """Identity of a raw event incl. content (same id with changed content = new event).
+
+    repr() statt json.dumps: ~10x billiger; eine andere Key-Reihenfolge gilt nur
+    als neues Event und erzwingt schlimmstenfalls einen Replay.
+    """
+    return (
+        str(ev.get("id", "")),
+        ev.get("event_type", ""),
+        ev.get("created_at", ""),
+        ev.get("conversation_id", ""),
+        repr(ev.get("event_data")),
+        len(ev),
+    )
+
+
+def _numeric_event_id(ev: dict) -> Optional[int]:
+    try:
+        return int(str(ev.get("id", "")).strip())
+    except ValueError:
+        return None
+
+
+class _ProjectionCheckpoint:
+    def __init__(self, config_key: tuple):
+        self.config_key = config_key
+        self.state = TypedState()
+        self.fingerprints: set = set()       # raw events folded into state
+        self.raw_events: List[dict] = []     # the same events, replay base in cursor mode
+        self.raw_fps: List[_Fingerprint] = []
+        self.key_times: Dict[str, List[float]] = {}  # dedupe key -> sorted event times
+        self.crowded_keys: set = set()       # keys with events inside the dedupe window
+        self.last_sort_key: Optional[Tuple[float, str]] = None
+        self.events_processed = 0            # events applied after dedupe
+        self.cursor: Optional[int] = None    # highest numeric event id folded in
+        self.cursor_fp: Optional[_Fingerprint] = None
+        self.appended = 0                    # events appended by cursor since the last window read
+        self.mode = "full"                   # last projection mode (full|delta|noop)
+
+    def remember(self, raw_events: List[dict], fps: List[_Fingerprint]) -> None:
+        self.raw_events = raw_events
+        self.raw_fps = fps
+        self.cursor = None
+        self.cursor_fp = None
+        for ev, fp in zip(raw_events, fps):
+            num = _numeric_event_id(ev)
+            if num is not None and (self.cursor is None or num > self.cursor):
+                self.cursor, self.cursor_fp = num, fp
+
+
+class TypedStateProjector:
+    """
+    Checkpointed TypedState per conversation (LRU-bounded).
+
+    A call applies only the events it has not seen yet, as long as that is
+    equivalent to the full rebuild of the given event set:
+      - config unchanged (mapping_rules.yaml mtime, dedupe scope, source filter)
+      - every checkpointed event is still present (nothing evicted)
+      - events sharing a dedupe key are all >= _DEDUPE_WINDOW_SECS apart
+        (then dedupe keeps them regardless of input order)
+      - all new events sort strictly after the last applied event
+    Otherwise the checkpoint is rebuilt by a full replay.
+
+    Two ways to feed it:
+      - project_locked(): the caller passes its whole event window
+      - advance_locked(): the caller passes only events with id >= cursor();
+        the checkpoint keeps the raw events it folded, so a replay needs no
+        re-read. A sliding fetch window therefore no longer forces a replay.
+    Synthetic extra events (work context, CSV) are never checkpointed; state_for()
+    applies them to a copy of the checkpointed state.
+
+    Callers hold `lock` while projecting and reading the returned state.
+    """
+
+    def __init__(self, max_conversations: int = _PROJECTION_MAX_CONVERSATIONS):
+        self.lock = threading.RLock()
+        self._max = max(1, int(max_conversations))
+        self._checkpoints: "OrderedDict[str, _ProjectionCheckpoint]" = OrderedDict()
+        self.stats: Dict[str, int] = {"full": 0, "delta": 0, "noop": 0, "events_applied": 0}
+
+    def reset(self, conversation_id: Optional[str] = None) -> None:
+        with self.lock:
+            if conversation_id is None:
+                self._checkpoints.clear()
+            else:
+                self._checkpoints.pop(conversation_id, None)
+
+    @staticmethod
+    def _config_key(source_key: Optional[tuple]) -> tuple:
+        return (_rules_file_key(), _dedupe_scope_by_conv(), source_key)
+
+    def _checkpoint(self, conversation_id: str, source_key: Optional[tuple]) -> Optional[_ProjectionCheckpoint]:
+        cp = self._checkpoints.get(conversation_id)
+        if cp is None or cp.config_key != self._config_key(source_key):
+            return None
+        return cp
+
+    def _store(self, conversation_id: str, cp: _ProjectionCheckpoint, mode: str) -> None:
+        cp.mode = mode
+        self.stats[mode] += 1
+        self._checkpoints[conversation_id] = cp
+        self._checkpoints.move_to_end(conversation_id)
+        while len(self._checkpoints) > self._max:
+            self._checkpoints.popitem(last=False)
+
+    def cursor_locked(self, conversation_id: str, source_key: Optional[tuple] = None) -> Optional[int]:
+        """Highest folded event id, or None when the caller has to send its full window."""
+        cp = self._checkpoint(conversation_id, source_key)
+        if cp is None or cp.cursor is None or cp.appended >= _PROJECTION_REFRESH_EVENTS:
+            return None
+        return cp.cursor
+
+    def project_locked(
+        self,
+        conversation_id: str,
+        raw_events: List[dict],
+        conf_cfg: dict,
+        source_key: Optional[tuple] = None,
+    ) -> _ProjectionCheckpoint:
+        """Project the caller's full event window."""
+        config_key = self._config_key(source_key)
+        fps = [_event_fingerprint(ev) for ev in raw_events]
+        cp = self._checkpoint(conversation_id, source_key)
+        mode = None
+        if cp is not None and cp.fingerprints.issubset(fps):
+            new = [(ev, fp) for ev, fp in zip(raw_events, fps) if fp not in cp.fingerprints]
+            mode = self._apply_delta(cp, [ev for ev, _ in new], [fp for _, fp in new], conf_cfg)
+        if mode is None:
+            cp = self._rebuild(config_key, raw_events, fps, conf_cfg)
+            mode = "full"
+        cp.remember(list(raw_events), fps)
+        cp.appended = 0
+        self._store(conversation_id, cp, mode)
+        return cp
+
+    def advance_locked(
+        self,
+        conversation_id: str,
+        events_since_cursor: List[dict],
+        conf_cfg: dict,
+        source_key: Optional[tuple] = None,
+    ) -> Optional[_ProjectionCheckpoint]:
+        """
+        Apply the events a cursor read returned (ids >= cursor). The cursor
+        event itself must come back unchanged; otherwise the store was reset
+        or the event expired, and None tells the caller to read its window.
+        """
+        cp = self._checkpoint(conversation_id, source_key)
+        if cp is None or cp.cursor is None:
+            return None
+        new_raw: List[dict] = []
+        new_fps: List[_Fingerprint] = []
+        anchored = False
+        for ev in events_since_cursor:
+            num = _numeric_event_id(ev)
+            if num is None or num < cp.cursor:
+                continue
+            fp = _event_fingerprint(ev)
+            if num == cp.cursor:
+                anchored = anchored or fp == cp.cursor_fp
+            elif fp not in cp.fingerprints:
+                new_raw.append(ev)
+                new_fps.append(fp)
+        if not anchored:
+            return None
+        mode = self._apply_delta(cp, new_raw, new_fps, conf_cfg) if new_raw else "noop"
+        all_raw = cp.raw_events + new_raw
+        all_fps = cp.raw_fps + new_fps
+        appended = cp.appended + len(new_raw)
+        if mode is None:
+            cp = self._rebuild(cp.config_key, all_raw, all_fps, conf_cfg)
+            mode = "full"
+        cp.remember(all_raw, all_fps)
+        cp.appended = appended
+        self._store(conversation_id, cp, mode)
+        return cp
+
+    def state_for(
+        self,
+        cp: _ProjectionCheckpoint,
+        extra_events: Optional[List[dict]],
+        conf_cfg: dict,
+    ) -> Tuple[TypedState, int, str]:
+        """(state, events_processed, mode) of the checkpoint plus synthetic extra events."""
+        if not extra_events:
+            return cp.state, cp.events_processed, cp.mode
+        normalized = _normalize_events(extra_events)
+        events = _sort_events_asc(_dedupe_events(normalized))
+        if self._appendable(cp, normalized, events):
+            state = copy.deepcopy(cp.state)
+            _apply_events_to_state(state, events, _correlate_events(events), conf_cfg)
+            return state, cp.events_processed + len(events), cp.mode
+        # Extras sortieren vor bekannte Events: einmaliger Replay, Checkpoint bleibt unberuehrt
+        merged = self._rebuild(cp.config_key, cp.raw_events + list(extra_events), [], conf_cfg)
+        self.stats["full"] += 1
+        return merged.state, merged.events_processed, "full"
+
+    def _rebuild(
+        self,
+        config_key: tuple,
+        raw_events: List[dict],
+        fps: List[_Fingerprint],
+        conf_cfg: dict,
+    ) -> _ProjectionCheckpoint:
+        cp = _ProjectionCheckpoint(config_key)
+        normalized = _normalize_events(raw_events)
+        scope = config_key[1]
+        for ev in normalized:
+            cp.key_times.setdefault(_dedupe_key(ev, scope), []).append(_event_sort_key(ev)[0])
+        for key, times in cp.key_times.items():
+            times.sort()
+            if any(b - a < _DEDUPE_WINDOW_SECS for a, b in zip(times, times[1:])):
+                cp.crowded_keys.add(key)
+        events = _sort_events_asc(_dedupe_events(normalized))
+        _apply_events_to_state(cp.state, events, _correlate_events(events), conf_cfg)
+        cp.fingerprints = set(fps)
+        cp.last_sort_key = _event_sort_key(events[-1]) if events else None
+        cp.events_processed = len(events)
+        self.stats["events_applied"] += cp.events_processed
+        return cp
+
+    def _appendable(self, cp: _ProjectionCheckpoint, normalized: List[dict], events: List[dict]) -> bool:
+        """True if folding `events` onto the checkpoint equals a replay including them."""
+        scope = cp.config_key[1]
+        new_times: Dict[str, List[float]] = {}
+        for ev in normalized:
+            new_times.setdefault(_dedupe_key(ev, scope), []).append(_event_sort_key(ev)[0])
+        for key, times in new_times.items():
+            old = cp.key_times.get(key)
+            if not old:
+                continue
+            # Dedupe-Ergebnis hinge sonst von der Eingabe-Reihenfolge ab
+            if key in cp.crowded_keys or not _times_spaced(sorted(times), old):
+                return False
+        # out-of-order
+        return not (events and cp.last_sort_key is not None and _event_sort_key(events[0]) <= cp.last_sort_key)
+
+    def _apply_delta(
+        self,
+        cp: _ProjectionCheckpoint,
+        new_raw: List[dict],
+        new_fps: List[_Fingerprint],
+        conf_cfg: dict,
+    ) -> Optional[str]:
+        if not new_raw:
+            return "noop"
+        normalized = _normalize_events(new_raw)
+        events = _sort_events_asc(_dedupe_events(normalized))
+        if not self._appendable(cp, normalized, events):
+            return None
+        _apply_events_to_state(cp.state, events, _correlate_events(events), conf_cfg)
+        cp.fingerprints.update(new_fps)
+        scope = cp.config_key[1]
+        for ev in normalized:
+            key = _dedupe_key(ev, scope)
+            merged = cp.key_times.setdefault(key, [])
+            bisect.insort(merged, _event_sort_key(ev)[0])
+            if any(b - a < _DEDUPE_WINDOW_SECS for a, b in zip(merged, merged[1:])):
+                cp.crowded_keys.add(key)
+        if events:
+            cp.last_sort_key = _event_sort_key(events[-1])
+        cp.events_processed += len(events)
+        self.stats["events_applied"] += len(events)
+        return "delta"
+
+
+def _times_spaced(new: List[float], old: List[float]) -> bool:
+    """True if no two times of new ∪ old lie within the dedupe window."""
+    for a, b in zip(new, new[1:]):
+        if b - a < _DEDUPE_WINDOW_SECS:
+            return False
+    for t in new:
+        i = bisect.bisect_left(old, t)
+        if i < len(old) and old[i] - t < _DEDUPE_WINDOW_SECS:
+            return False
+        if i > 0 and t - old[i - 1] < _DEDUPE_WINDOW_SECS:
+            return False
+    return True
+
+
+_PROJECTOR = TypedStateProjector()
+
+
+def get_projection_stats() -> dict:
+    with _PROJECTOR.lock:
+        return {"conversations": len(_PROJECTOR._checkpoints), **_PROJECTOR.stats}
+
+
+def reset_typedstate_projection(conversation_id: Optional[str] = None) -> None:
+    """Drop the checkpoint of one conversation (or all)."""
+    _PROJECTOR.reset(conversation_id)
+
+
+def get_projection_cursor(conversation_id: str, source_key: Optional[tuple] = None) -> Optional[int]:
+    """
+    Highest workspace event id folded into the conversation's checkpoint.
+    Callers then fetch only events with id >= cursor and pass them to
+    build_compact_context_since(). None: fetch the full window instead.
+    """
+    if not conversation_id or not _incremental_enabled():
+        return None
+    with _PROJECTOR.lock:
+        return _PROJECTOR.cursor_locked(str(conversation_id), source_key)
+
+
+def get_projection_window(
+    conversation_id: str,
+    limit: int,
+    source_key: Optional[tuple] = None,
+    newer: Optional[List[dict]] = None,
+) -> List[dict]:
+    """
+    The newest `limit` raw events of the checkpoint plus `newer` (newest first):
+    the window a full read would return, e.g. for work-context readers.
+    """
+    with _PROJECTOR.lock:
+        cp = _PROJECTOR._checkpoint(str(conversation_id), source_key)
+        by_id = {str(ev.get("id", "")): ev for ev in (cp.raw_events if cp is not None else ())}
+    for ev in newer or ():
+        by_id[str(ev.get("id", ""))] = ev
+    events = sorted(by_id.values(), key=_event_sort_key, reverse=True)
+    return events[: max(0, int(limit))]
+
+
+def _render_state(state: TypedState, cfg: dict) -> tuple:
+    """select_top + render + V1 extras. Reads the state only."""
+    # ── Step 7: select_top — global priority selection ────────────────────
+    output_cfg = _load_output_config()
+    candidates = _build_candidates_from_state(state, cfg, output_cfg)
+    # Global budget: configurable via limits["top_budget"].
+    # Default = sum of section caps so normal operation is unchanged.
+    top_budget = cfg.get(
+        "top_budget",
+        cfg.get("now_max", _DEFAULT_LIMITS["now_max"])
+        + cfg.get("rules_max", _DEFAULT_LIMITS["rules_max"])
+        + cfg.get("next_max", _DEFAULT_LIMITS["next_max"]),
+    )
+    selected = select_top(candidates, top_budget)
+
+    # ── Step 8: Render — materialize into NOW / RULES / NEXT sections ─────
+    now, rules, next_steps = _candidates_to_sections(selected, cfg)
+
+    # Fail-closed: NEXT fallback if select_top yielded nothing for that section
+    # (RULES is guaranteed by _build_candidates_from_state's own fallback).
+    if not next_steps:
+        next_steps = ["Await user instruction"]
+
+    # ── Commit 4: V1 extra NOW bullets (from V1 state fields not used by legacy pipeline) ──
+    # These are stored in meta so format_typedstate_v1() can extend NOW without re-running
+    # the full pipeline. Computed fail-open (extras are informational only).
+    _v1_extra_now: List[str] = []
+    try:
+        _legacy_now_set = set(now)
+        # last_errors history: entries beyond the most-recent (singular last_error covers last one).
+        # Only adds entries not already rendered as LAST_ERROR bullets.
+        for _err in state.last_errors[:-1]:
+            _b = f"V1_ERR_HIST: {_err[:100]}"[:_ITEM_CHAR_CAP]
+            if _b not in _legacy_now_set:
+                _v1_extra_now.append(_b)
+        # last_tool_results: recent tool operation refs (not shown in legacy NOW).
+        for _ref in state.last_tool_results[-2:]:
+            _b = f"V1_TOOL: {_ref[:80]}"[:_ITEM_CHAR_CAP]
+            if _b not in _legacy_now_set:
+                _v1_extra_now.append(_b)
+    except Exception:
+        pass  # fail-open: V1 extras are informational, never block rendering
+
+    summary = {
+        "focus_entity": state.focus_entity or "",
+        "entities_tracked": len(state.entities),
+        "typedstate_version": state.version,
+        "source_event_ids_count": len(state.source_event_ids),
+        "v1_last_errors": list(state.last_errors),
+        "v1_last_tool_results": list(state.last_tool_results),
+    }
+    return now, rules, next_steps, _v1_extra_now, summary
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
@@ -1543,6 +1985,8 @@ def build_compact_context(
     entries: Optional[List[dict]] = None,
     limits: Optional[dict] = None,
     extra_events: Optional[List[dict]] = None,
+    conversation_id: Optional[str] = None,
+    source_key: Optional[tuple] = None,
 ) -> CompactContext:
     """
     Convert workspace_events (and optional workspace_entries) into a CompactContext.
@@ -1552,15 +1996,22 @@ def build_compact_context(
         → select_top → render
 
     Args:
-        events:       List of event dicts from workspace_event_list (any order).
-        entries:      Optional list of editable entry dicts from workspace_list.
-        limits:       Override dict for now_max, rules_max, next_max, top_budget, etc.
-        extra_events: Optional supplementary events (e.g. from CSV loader).
-                      Merged before normalize; same pipeline applies.
+        events:          List of event dicts from workspace_event_list (any order).
+        entries:         Optional list of editable entry dicts from workspace_list.
+        limits:          Override dict for now_max, rules_max, next_max, top_budget, etc.
+        extra_events:    Optional supplementary events (e.g. from CSV loader).
+                         Merged before normalize; same pipeline applies.
+        conversation_id: Enables the incremental projection: the TypedState of
+                         this conversation is checkpointed and only new events
+                         are applied (TYPEDSTATE_INCREMENTAL=false disables it).
+                         extra_events are applied on top, never checkpointed.
+        source_key:      Identifies the caller's event filter; a checkpoint is
+                         only reused for the same filter.
 
     Determinism guarantee:
         The same set of events in any input order produces identical
         TypedState and therefore identical NOW / RULES / NEXT output.
+        The incremental path yields the same state as the full rebuild.
 
     Returns:
         CompactContext with now/rules/next populated within hard limits.
@@ -1570,75 +2021,83 @@ def build_compact_context(
     conf_cfg = _load_confidence_config()
 
     try:
-        # ── Step 1: Merge all event sources ──────────────────────────────────
-        all_events: List[dict] = list(events)
-        if extra_events:
-            all_events.extend(extra_events)
-
-        # ── Step 2: Normalize ─────────────────────────────────────────────────
-        all_events = _normalize_events(all_events, entries)
-
-        # ── Step 3: Dedupe (2-second window, first-occurrence kept) ───────────
-        all_events = _dedupe_events(all_events)
-
-        # ── Step 4: Sort deterministically (created_at ASC, id ASC) ──────────
-        all_events = _sort_events_asc(all_events)
-
-        # ── Step 5: Correlate ─────────────────────────────────────────────────
-        correlations = _correlate_events(all_events)
-
-        # ── Step 6: Apply to TypedState ───────────────────────────────────────
-        state = TypedState()
-        _apply_events_to_state(state, all_events, correlations, conf_cfg)
-
-        # ── Step 7: select_top — global priority selection ────────────────────
-        output_cfg = _load_output_config()
-        candidates = _build_candidates_from_state(state, cfg, output_cfg)
-        # Global budget: configurable via limits["top_budget"].
-        # Default = sum of section caps so normal operation is unchanged.
-        top_budget = cfg.get(
-            "top_budget",
-            cfg.get("now_max", _DEFAULT_LIMITS["now_max"])
-            + cfg.get("rules_max", _DEFAULT_LIMITS["rules_max"])
-            + cfg.get("next_max", _DEFAULT_LIMITS["next_max"]),
-        )
-        selected = select_top(candidates, top_budget)
+        if conversation_id and _incremental_enabled():
+            # ── Steps 2–6 incrementally on the conversation checkpoint ───────
+            with _PROJECTOR.lock:
+                cp = _PROJECTOR.project_locked(str(conversation_id), list(events), conf_cfg, source_key)
+                state, events_processed, projection = _PROJECTOR.state_for(cp, extra_events, conf_cfg)
+                rendered = _render_state(state, cfg)
+        else:
+            # ── Step 1: Merge all event sources ──────────────────────────────
+            all_events: List[dict] = list(events)
+            if extra_events:
+                all_events.extend(extra_events)
 
-        # ── Step 8: Render — materialize into NOW / RULES / NEXT sections ─────
-        now, rules, next_steps = _candidates_to_sections(selected, cfg)
+            # ── Step 2: Normalize ─────────────────────────────────────────────
+            all_events = _normalize_events(all_events, entries)
 
-        # Fail-closed: NEXT fallback if select_top yielded nothing for that section
-        # (RULES is guaranteed by _build_candidates_from_state's own fallback).
-        if not next_steps:
-            next_steps = ["Await user instruction"]
+            # ── Step 3: Dedupe (2-second window, first-occurrence kept) ───────
+            all_events = _dedupe_events(all_events)
+
+            # ── Step 4: Sort deterministically (created_at ASC, id ASC) ──────
+            all_events = _sort_events_asc(all_events)
+
+            # ── Step 5: Correlate ─────────────────────────────────────────────
+            correlations = _correlate_events(all_events)
+
+            # ── Step 6: Apply to TypedState ───────────────────────────────────
+            state = TypedState()
+            _apply_events_to_state(state, all_events, correlations, conf_cfg)
+            events_processed = len(all_events)
+            projection = "none"
+
+            rendered = _render_state(state, cfg)
 
     except Exception as exc:
         log_warn(f"[ContextCleanup] Fatal pipeline error: {exc} — fail-closed")
         return _minimal_fail_context()
 
-    focus_entity = state.focus_entity or ""
-    context_chars = sum(len(s) for s in now + rules + next_steps)
-    retrieval_count = (limits or {}).get("retrieval_count", 1)
+    return _compact_context_from_render(rendered, events_processed, projection, limits)
 
-    # ── Commit 4: V1 extra NOW bullets (from V1 state fields not used by legacy pipeline) ──
-    # These are stored in meta so format_typedstate_v1() can extend NOW without re-running
-    # the full pipeline. Computed fail-open (extras are informational only).
-    _v1_extra_now: List[str] = []
+
+def build_compact_context_since(
+    events_since_cursor: List[dict],
+    conversation_id: str,
+    limits: Optional[dict] = None,
+    extra_events: Optional[List[dict]] = None,
+    source_key: Optional[tuple] = None,
+) -> Optional[CompactContext]:
+    """
+    Cursor variant of build_compact_context(): `events_since_cursor` are the
+    events with id >= get_projection_cursor(conversation_id) (cursor included).
+    Returns None when the checkpoint cannot be advanced (evicted, config or
+    filter changed, cursor event gone); the caller then reads its full window.
+    """
+    cfg = {**_load_limits(), **(limits or {})}
+    conf_cfg = _load_confidence_config()
     try:
-        _legacy_now_set = set(now)
-        # last_errors history: entries beyond the most-recent (singular last_error covers last one).
-        # Only adds entries not already rendered as LAST_ERROR bullets.
-        for _err in state.last_errors[:-1]:
-            _b = f"V1_ERR_HIST: {_err[:100]}"[:_ITEM_CHAR_CAP]
-            if _b not in _legacy_now_set:
-                _v1_extra_now.append(_b)
-        # last_tool_results: recent tool operation refs (not shown in legacy NOW).
-        for _ref in state.last_tool_results[-2:]:
-            _b = f"V1_TOOL: {_ref[:80]}"[:_ITEM_CHAR_CAP]
-            if _b not in _legacy_now_set:
-                _v1_extra_now.append(_b)
-    except Exception:
-        pass  # fail-open: V1 extras are informational, never block rendering
+        with _PROJECTOR.lock:
+            cp = _PROJECTOR.advance_locked(str(conversation_id), list(events_since_cursor), conf_cfg, source_key)
+            if cp is None:
+                return None
+            state, events_processed, projection = _PROJECTOR.state_for(cp, extra_events, conf_cfg)
+            rendered = _render_state(state, cfg)
+    except Exception as exc:
+        log_warn(f"[ContextCleanup] Fatal pipeline error: {exc} — fail-closed")
+        return _minimal_fail_context()
+    return _compact_context_from_render(rendered, events_processed, projection, limits)
+
+
+def _compact_context_from_render(
+    rendered: tuple,
+    events_processed: int,
+    projection: str,
+    limits: Optional[dict],
+) -> CompactContext:
+    now, rules, next_steps, _v1_extra_now, summary = rendered
+    focus_entity = summary["focus_entity"]
+    context_chars = sum(len(s) for s in now + rules + next_steps)
+    retrieval_count = (limits or {}).get("retrieval_count", 1)
 
     meta = {
         "small_model_mode": True,
@@ -1646,29 +2105,39 @@ def build_compact_context(
         "focus_entity": focus_entity,
         "retrieval_count": retrieval_count,
         "context_chars": context_chars,
-        "events_processed": len(all_events),
-        "entities_tracked": len(state.entities),
+        "events_processed": events_processed,
+        "entities_tracked": summary["entities_tracked"],
         "generated_at": datetime.utcnow().isoformat() + "Z",
         # Commit C: Observability fields
-        "typedstate_version": state.version,
-        "source_event_ids_count": len(state.source_event_ids),
+        "typedstate_version": summary["typedstate_version"],
+        "source_event_ids_count": summary["source_event_ids_count"],
         "fail_closed": False,
+        "projection": projection,
         # Commit 4: V1 wiring fields (used by format_typedstate_v1 + _log_typedstate_diff)
         "v1_extra_now": _v1_extra_now,
-        "v1_last_errors": list(state.last_errors),
-        "v1_last_tool_results": list(state.last_tool_results),
+        "v1_last_errors": summary["v1_last_errors"],
+        "v1_last_tool_results": summary["v1_last_tool_results"],
     }
 
     log_info(
         f"[ContextCleanup] cleanup_used=True focus_entity={focus_entity!r} "
         f"retrieval_count={retrieval_count} context_chars={context_chars} "
         f"now={len(now)} rules={len(rules)} next={len(next_steps)} "
-        f"events={len(all_events)} entities={len(state.entities)} "
-        f"typedstate_version={state.version} source_event_ids={len(state.source_event_ids)}"
+        f"events={events_processed} entities={summary['entities_tracked']} "
+        f"typedstate_version={summary['typedstate_version']} "
+        f"source_event_ids={summary['source_event_ids_count']} projection={projection}"
     )
     return CompactContext(now=now, rules=rules, next_steps=next_steps, meta=meta)
 
 
+def _incremental_enabled() -> bool:
+    try:
+        from config import get_typedstate_incremental_enable
+        return bool(get_typedstate_incremental_enable())
+    except Exception:
+        return True
+
+
 # ---------------------------------------------------------------------------
 # Commit 4: TypedState V1 diff-log helper + V1 renderer
 # ---------------------------------------------------------------------------
@@ -1747,11 +2216,9 @@ _RENDERER_CHAR_CAP_DEFAULT = 2200
 
 def _get_renderer_char_cap() -> int:
     """Load renderer char_cap from mapping_rules.yaml limits.char_cap, else default 2200."""
-    rules_path = os.path.join(os.path.dirname(__file__), "mapping_rules.yaml")
-    if _YAML_AVAILABLE and os.path.exists(rules_path):
+    if _YAML_AVAILABLE and _rules_file_key() is not None:
         try:
-            with open(rules_path, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f)
+            data = _load_mapping_rules()
             val = data.get("limits", {}).get("char_cap")
             if val is not None:
                 return int(val)
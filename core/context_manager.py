@@ -34,6 +34,7 @@ from mcp.client import (
     search_memory_fallback,
 )
 from core.trion_laws_policy import load_trion_laws_policy
+from core.memory_retrieval_cache import get_memory_retrieval_cache, get_memory_version
 from core.task_loop.store import get_task_loop_store
 from core.work_context.service import load_work_context
 from core.work_context.writers.workspace_events import build_workspace_event_from_work_context
@@ -696,6 +697,11 @@ class ContextManager:
         backend_values: Dict[str, Dict[str, Any]] = {ctx: {} for ctx in contexts}
         future_map = {}
         cache_hits = 0
+        # Prozessweiter Cache (über Requests hinweg); Version vor den Calls
+        # festhalten, damit parallele Memory-Writes keine alten Werte einlagern.
+        shared_cache = get_memory_retrieval_cache()
+        shared_version = get_memory_version()
+        shared_hits = 0
 
         for ctx in contexts:
             if not _budget_ok("context_submit"):
@@ -727,6 +733,13 @@ class ContextManager:
                     backend_values[ctx][backend_name] = request_cache[ck]
                     cache_hits += 1
                     continue
+                if shared_cache is not None:
+                    hit, cached_value = shared_cache.get(shared_cache.make_key(ctx, backend_name, key))
+                    if hit:
+                        backend_values[ctx][backend_name] = cached_value
+                        request_cache[ck] = cached_value
+                        shared_hits += 1
+                        continue
                 future = executor.submit(fn, ctx, key, timeout_s=stage_timeout)
                 future_map[future] = (ctx, backend_name, ck, default_value)
 
@@ -743,6 +756,14 @@ class ContextManager:
                         f"[ContextManager-Memory] backend failed key='{key}' "
                         f"ctx='{ctx}' backend='{backend_name}' err={e}"
                     )
+                else:
+                    # Nur nicht-leere Ergebnisse teilen: die MCP-Wrapper liefern bei
+                    # Hub-Fehlern/Timeouts None/""/[] ohne Exception, ein leeres
+                    # Ergebnis ist daher nicht von einem Ausfall unterscheidbar.
+                    if shared_cache is not None and value:
+                        shared_cache.put(
+                            shared_cache.make_key(ctx, backend_name, key), value, version=shared_version
+                        )
                 backend_values[ctx][backend_name] = value
                 request_cache[ck] = value
 
@@ -808,10 +829,10 @@ class ContextManager:
                     found_content += f"{key}: {fallback}\n"
                     found = True
 
-        if future_map or cache_hits:
+        if future_map or cache_hits or shared_hits:
             log_info(
                 f"[ContextManager-Memory] key='{key}' contexts={len(contexts)} "
-                f"backend_calls={len(future_map)} cache_hits={cache_hits}"
+                f"backend_calls={len(future_map)} cache_hits={cache_hits} shared_hits={shared_hits}"
             )
 
         return found_content, found
@@ -1394,6 +1415,35 @@ class ContextManager:
         )
         return [extra_event] if isinstance(extra_event, dict) else []
 
+    def _exclude_event_types(self, events: List[dict], exclude_event_types: Optional[set]) -> List[dict]:
+        """SINGLE_TRUTH_GUARD: filter event types already claimed by another channel.
+
+        Prevents tool_result events (in tool_ctx) from also appearing in compact context.
+        """
+        if not exclude_event_types:
+            return events
+        kept = [e for e in events if e.get("event_type") not in exclude_event_types]
+        if len(kept) < len(events):
+            log_info(
+                f"[ContextManager] Single-Truth filter: "
+                f"{len(events) - len(kept)} events excluded (types={exclude_event_types})"
+            )
+        return kept
+
+    def _compact_extra_events(
+        self,
+        conversation_id: Optional[str],
+        workspace_events: List[dict],
+        csv_events: Optional[List[dict]],
+    ) -> Optional[List[dict]]:
+        """CSV- und Work-Context-Events; werden nie in den Projektions-Checkpoint übernommen."""
+        extra_events = list(csv_events or [])
+        extra_events.extend(self._build_work_context_extra_events(
+            conversation_id=conversation_id,
+            workspace_events=workspace_events,
+        ))
+        return extra_events or None
+
     # ═══════════════════════════════════════════════════════════
     # SMALL-MODEL CONTEXT CLEANUP
     # ═══════════════════════════════════════════════════════════
@@ -1428,28 +1478,24 @@ class ContextManager:
             Formatted string, empty if no events found.
         """
         try:
-            from core.context_cleanup import build_compact_context, format_compact_context
+            from core.context_cleanup import (
+                build_compact_context,
+                build_compact_context_since,
+                format_compact_context,
+                get_projection_cursor,
+                get_projection_window,
+            )
             from mcp.hub import get_hub
 
             hub = get_hub()
             hub.initialize()
 
-            # Load events from Fast-Lane event store
-            args: dict = {"limit": 100}
+            window_limit = 100
+            args: dict = {"limit": window_limit}
             if conversation_id:
                 args["conversation_id"] = conversation_id
-            ev_result = hub.call_tool("workspace_event_list", args)
-            events = self._extract_workspace_events(ev_result)
-            # SINGLE_TRUTH_GUARD: filter event types already claimed by another channel.
-            # Prevents tool_result events (in tool_ctx) from also appearing in compact context.
-            if exclude_event_types:
-                _before = len(events)
-                events = [e for e in events if e.get("event_type") not in exclude_event_types]
-                if len(events) < _before:
-                    log_info(
-                        f"[ContextManager] Single-Truth filter: "
-                        f"{_before - len(events)} events excluded (types={exclude_event_types})"
-                    )
+            # Checkpoints der inkrementellen Projektion gelten nur für denselben Filter.
+            source_key = tuple(sorted(exclude_event_types)) if exclude_event_types else None
 
             entries = None
             if include_entries:
@@ -1470,15 +1516,39 @@ class ContextManager:
                 conversation_id=conversation_id or None,
             )
 
-            work_context_events = self._build_work_context_extra_events(
-                conversation_id=conversation_id,
-                workspace_events=events,
-            )
-            extra_events = list(csv_events or [])
-            extra_events.extend(work_context_events)
+            ctx = None
+            # Inkrementell: nur Events ab dem Projektions-Cursor laden statt das
+            # 100er-Fenster (das bei jedem neuen Event rutscht) neu zu replayen.
+            cursor = get_projection_cursor(conversation_id, source_key) if conversation_id else None
+            if cursor is not None:
+                fresh = self._extract_workspace_events(
+                    hub.call_tool("workspace_event_list", {**args, "min_id": cursor})
+                )
+                if len(fresh) < window_limit:  # sonst evtl. abgeschnitten → volles Fenster
+                    fresh = self._exclude_event_types(fresh, exclude_event_types)
+                    window = get_projection_window(conversation_id, window_limit, source_key, newer=fresh)
+                    ctx = build_compact_context_since(
+                        fresh,
+                        conversation_id,
+                        limits=limits,
+                        extra_events=self._compact_extra_events(conversation_id, window, csv_events),
+                        source_key=source_key,
+                    )
 
-            ctx = build_compact_context(events, entries=entries, limits=limits,
-                                        extra_events=extra_events or None)
+            if ctx is None:
+                # Load events from Fast-Lane event store
+                ev_result = hub.call_tool("workspace_event_list", args)
+                events = self._exclude_event_types(
+                    self._extract_workspace_events(ev_result), exclude_event_types
+                )
+                ctx = build_compact_context(
+                    events,
+                    entries=entries,
+                    limits=limits,
+                    extra_events=self._compact_extra_events(conversation_id, events, csv_events),
+                    conversation_id=conversation_id or None,
+                    source_key=source_key,
+                )
 
             # TypedState V1 wiring (Commit 4: shadow=log-diff, active=use-v1-render)
             # off (default) → legacy path (format_compact_context), behavior unchanged.
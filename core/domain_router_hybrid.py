@@ -9,9 +9,7 @@ Design goals:
 
 from __future__ import annotations
 
-import math
 import re
-import time
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -23,6 +21,7 @@ from config import (
     get_domain_router_lock_min_confidence,
     get_embedding_model,
 )
+from core.prototype_registry import get_prototype_registry
 from utils.logger import log_debug
 from utils.role_endpoint_resolver import resolve_role_endpoint
 
@@ -150,9 +149,6 @@ class DomainRouterHybridClassifier:
 
     def __init__(self) -> None:
         self._embed_timeout_s = 1.5
-        self._proto_cache: Dict[str, List[float]] = {}
-        self._proto_ts = 0.0
-        self._proto_ttl_s = 6 * 60 * 60
 
     @classmethod
     def _extract_tool_domain_tag(cls, text: str) -> str:
@@ -235,21 +231,6 @@ class DomainRouterHybridClassifier:
         )
         return any(marker in lower for marker in creative_markers)
 
-    @staticmethod
-    def _cos(a: List[float], b: List[float]) -> float:
-        if not a or not b or len(a) != len(b):
-            return 0.0
-        dot = 0.0
-        na = 0.0
-        nb = 0.0
-        for x, y in zip(a, b):
-            dot += x * y
-            na += x * x
-            nb += y * y
-        if na <= 0.0 or nb <= 0.0:
-            return 0.0
-        return dot / (math.sqrt(na) * math.sqrt(nb))
-
     async def _embed(self, text: str) -> Optional[List[float]]:
         route = resolve_role_endpoint("embedding", default_endpoint=OLLAMA_BASE)
         if route.get("hard_error"):
@@ -268,20 +249,15 @@ class DomainRouterHybridClassifier:
             log_debug(f"[DomainRouter] embedding unavailable: {type(exc).__name__}: {exc}")
         return None
 
+    async def _embed_query(self, text: str, embedding_ctx: Any = None) -> Optional[List[float]]:
+        if embedding_ctx is None:
+            return await self._embed(text)
+        return await embedding_ctx.embed(text, self._embed)
+
     async def _ensure_prototypes(self) -> bool:
-        now = time.time()
-        if self._proto_cache and (now - self._proto_ts) < self._proto_ttl_s:
-            return True
-        cache: Dict[str, List[float]] = {}
-        for label, text in self._PROTOTYPES.items():
-            vec = await self._embed(text)
-            if vec:
-                cache[label] = vec
-        if not cache:
-            return False
-        self._proto_cache = cache
-        self._proto_ts = now
-        return True
+        registry = get_prototype_registry()
+        registry.register("domain", self._PROTOTYPES)
+        return await registry.ensure("domain", self._embed) is not None
 
     @classmethod
     def _extract_cron_expression(cls, lower: str) -> str:
@@ -653,6 +629,7 @@ class DomainRouterHybridClassifier:
         user_text: str,
         *,
         selected_tools: Optional[List[Any]] = None,
+        embedding_ctx: Any = None,
     ) -> Dict[str, Any]:
         lower = (user_text or "").lower()
         tagged_domain = self._extract_tool_domain_tag(lower)
@@ -759,11 +736,10 @@ class DomainRouterHybridClassifier:
                 confidence = 0.88
             # ambiguous/low-signal path
             elif get_domain_router_embedding_enable() and await self._ensure_prototypes():
-                text_vec = await self._embed(user_text)
-                if text_vec:
-                    sims: Dict[str, float] = {}
-                    for label, vec in self._proto_cache.items():
-                        sims[label] = self._cos(text_vec, vec)
+                text_vec = await self._embed_query(user_text, embedding_ctx)
+                matrix = get_prototype_registry().get("domain")
+                if text_vec and matrix is not None:
+                    sims = matrix.scores(text_vec)
                     ranked = sorted(sims.items(), key=lambda kv: kv[1], reverse=True)
                     if ranked:
                         best_label, best_sim = ranked[0]
@@ -22,6 +22,8 @@ import requests
 import logging
 import math
 import hashlib
+import struct
+import threading
 from datetime import datetime
 from typing import Dict, Any, Optional, List
 
@@ -34,9 +36,15 @@ from config import (
 )
 from utils.embedding_resolver import resolve_embedding_target
 from utils.embedding_metrics import increment_fallback, increment_error, record_latency
+from utils.embedding.cache import cache_enabled, get_embedding_cache
 from utils.role_endpoint_resolver import resolve_role_endpoint
 from utils.service_endpoint_resolver import default_service_endpoint
 
+try:  # optional: vectorized scoring
+    import numpy as _np
+except ImportError:  # pragma: no cover - exercised via patch in tests
+    _np = None
+
 # ═══════════════════════════════════════════════════════════
 # CONFIGURATION
 # ═══════════════════════════════════════════════════════════
@@ -44,6 +52,9 @@ from utils.service_endpoint_resolver import default_service_endpoint
 DB_PATH = os.getenv("MEMORY_DB_PATH", "/app/memory_data/memory.db")
 OLLAMA_URL = os.getenv("OLLAMA_BASE", default_service_endpoint("ollama", 11434))
 
+# Batch size for Ollama /api/embed during pending/backfill processing
+EMBEDDING_BATCH_SIZE = max(1, int(os.getenv("EMBEDDING_BATCH_SIZE", "32")))
+
 # Search defaults
 DEFAULT_SEARCH_LIMIT = 5
 DEFAULT_MIN_SIMILARITY = 0.5
@@ -114,6 +125,7 @@ def _ensure_embeddings_schema(conn: sqlite3.Connection) -> None:
             embedding_model TEXT,
             embedding_dim INTEGER,
             embedding_version TEXT,
+            embedding_norm REAL,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         )
         """
@@ -126,6 +138,8 @@ def _ensure_embeddings_schema(conn: sqlite3.Connection) -> None:
         cur.execute("ALTER TABLE embeddings ADD COLUMN embedding_dim INTEGER")
     if "embedding_version" not in cols:
         cur.execute("ALTER TABLE embeddings ADD COLUMN embedding_version TEXT")
+    if "embedding_norm" not in cols:
+        cur.execute("ALTER TABLE embeddings ADD COLUMN embedding_norm REAL")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_conv ON embeddings(conversation_id)")
     cur.execute("CREATE INDEX IF NOT EXISTS idx_embeddings_version ON embeddings(embedding_version)")
     cur.execute(
@@ -161,7 +175,7 @@ def _request_embedding(
 ) -> Optional[List[float]]:
     """Single Ollama /api/embeddings call; returns None on any failure."""
     try:
-        payload: dict = {"model": model, "prompt": text.strip()[:2000]}
+        payload: dict = {"model": model, "prompt": _embedding_input(text)}
         if options:
             payload["options"] = options
         response = requests.post(f"{url}/api/embeddings", json=payload, timeout=60)
@@ -175,23 +189,53 @@ def _request_embedding(
         return None
 
 
-def _get_embedding(text: str) -> Optional[List[float]]:
-    """
-    Generate embedding vector via Ollama API.
+# endpoint -> False once the server answered 404/405 on /api/embed
+_BATCH_SUPPORT: Dict[str, bool] = {}
 
-    Self-contained (no dependency on sql-memory container).
-    Routes to GPU or CPU endpoint based on embedding_runtime_policy.
-    Emits structured log per Scope 3.1 observability spec.
-    Increments routing metrics on fallback or hard error.
-    """
-    if not text or not text.strip():
+
+def _request_embeddings_batch(
+    url: str,
+    model: str,
+    texts: List[str],
+    options: dict,
+) -> Optional[List[List[float]]]:
+    """Ollama /api/embed batch call; None on failure or unsupported endpoint."""
+    if _BATCH_SUPPORT.get(url) is False:
+        return None
+    try:
+        payload: dict = {"model": model, "input": [_embedding_input(t) for t in texts]}
+        if options:
+            payload["options"] = options
+        response = requests.post(f"{url}/api/embed", json=payload, timeout=120)
+        if response.status_code in (404, 405):
+            _BATCH_SUPPORT[url] = False
+            log_warning(f"[ArchiveManager] /api/embed not supported @ {url}, using per-text calls")
+            return None
+        response.raise_for_status()
+        embeddings = response.json().get("embeddings") or []
+        if len(embeddings) != len(texts) or not all(embeddings):
+            log_error(
+                f"[ArchiveManager] Batch size mismatch @ {url}: "
+                f"sent={len(texts)} got={len(embeddings)}"
+            )
+            return None
+        _BATCH_SUPPORT[url] = True
+        return embeddings
+    except requests.Timeout:
+        log_error(f"[ArchiveManager] Batch embedding timed out (120s) @ {url}")
+        return None
+    except Exception as e:
+        log_error(f"[ArchiveManager] Batch embedding failed @ {url}: {e}")
         return None
 
-    import time as _time
-    _start_ms = _time.monotonic() * 1000
 
-    policy = get_embedding_runtime_policy()
+def _resolve_embedding_decision(policy: str) -> Optional[Dict[str, Any]]:
+    """
+    Resolve GPU/CPU routing decision for archive embeddings.
 
+    Emits structured log per Scope 3.1 observability spec.
+    Returns None (and increments error metric) on hard routing errors.
+    """
     # Phase C: explicit per-layer pinning for embedding role.
     # Auto-mode continues to use embedding_runtime_policy resolver.
     role_route = resolve_role_endpoint("embedding", default_endpoint=OLLAMA_URL)
@@ -254,6 +298,53 @@ def _get_embedding(text: str) -> Optional[List[float]]:
         log_warning(_log_msg)
     else:
         log_info(_log_msg)
+    return decision
+
+
+def _embedding_cache():
+    """Shared content-addressed cache, or None when EMBEDDING_CACHE_ENABLED=false."""
+    if not cache_enabled():
+        return None
+    return get_embedding_cache(DB_PATH)
+
+
+def _embedding_input(text: str) -> str:
+    """
+    Model input for archive embeddings (stripped, capped at 2000 chars).
+    Also used as cache text: the shared cache keys on the exact model input
+    (utils.embedding.cache.cache_key_text), so entries match sql-memory's
+    for identical inputs. Longer texts are embedded truncated here and in
+    full by sql-memory - different inputs, deliberately different entries.
+    """
+    return text.strip()[:2000]
+
+
+def _get_embedding(text: str) -> Optional[List[float]]:
+    """
+    Generate embedding vector via Ollama API.
+
+    Self-contained (no dependency on sql-memory container).
+    Routes to GPU or CPU endpoint based on embedding_runtime_policy.
+    Emits structured log per Scope 3.1 observability spec.
+    Increments routing metrics on fallback or hard error.
+    """
+    if not text or not text.strip():
+        return None
+
+    cache = _embedding_cache()
+    version = _get_active_embedding_context()["embedding_version"] if cache else ""
+    if cache:
+        cached = cache.get(_embedding_input(text), version)
+        if cached:
+            return cached
+
+    import time as _time
+    _start_ms = _time.monotonic() * 1000
+
+    policy = get_embedding_runtime_policy()
+    decision = _resolve_embedding_decision(policy)
+    if decision is None:
+        return None
 
     model = get_embedding_model()
     embedding = _request_embedding(decision["endpoint"], model, text, decision["options"])
@@ -272,10 +363,101 @@ def _get_embedding(text: str) -> Optional[List[float]]:
     if embedding is not None:
         _latency_ms = _time.monotonic() * 1000 - _start_ms
         record_latency(decision["effective_target"] or "unknown", _latency_ms)
+        if cache:
+            cache.put(_embedding_input(text), version, embedding)
 
     return embedding
 
 
+def _get_embeddings_batch(
+    texts: List[str],
+    batch_size: Optional[int] = None,
+) -> List[Optional[List[float]]]:
+    """
+    Batch variant of _get_embedding (Ollama /api/embed).
+
+    Results keep input order; None marks empty or failed entries.
+    Falls back to per-text /api/embeddings calls on servers without /api/embed,
+    and to the fallback endpoint (policy=best_effort) for failed chunks.
+    """
+    results: List[Optional[List[float]]] = [None] * len(texts)
+    pending = [i for i, t in enumerate(texts) if t and t.strip()]
+    if not pending:
+        return results
+
+    cache = _embedding_cache()
+    version = _get_active_embedding_context()["embedding_version"] if cache else ""
+    if cache:
+        for i in pending:
+            results[i] = cache.get(_embedding_input(texts[i]), version)
+        pending = [i for i in pending if results[i] is None]
+        if not pending:
+            return results
+    requested = list(pending)
+
+    import time as _time
+
+    policy = get_embedding_runtime_policy()
+    decision = _resolve_embedding_decision(policy)
+    if decision is None:
+        return results
+
+    model = get_embedding_model()
+    endpoints = [decision["endpoint"]]
+    if decision.get("fallback_endpoint"):
+        endpoints.append(decision["fallback_endpoint"])
+    size = max(1, int(batch_size or EMBEDDING_BATCH_SIZE))
+
+    for start in range(0, len(pending), size):
+        chunk = pending[start:start + size]
+        _start_ms = _time.monotonic() * 1000
+        for idx, url in enumerate(endpoints):
+            chunk_texts = [texts[i] for i in chunk]
+            vectors = _request_embeddings_batch(url, model, chunk_texts, decision["options"])
+            if vectors is None and _BATCH_SUPPORT.get(url) is False:
+                vectors = [
+                    _request_embedding(url, model, t, decision["options"]) for t in chunk_texts
+                ]
+            if vectors is None:
+                continue
+            for i, vec in zip(chunk, vectors):
+                if vec:
+                    results[i] = vec
+                    if idx > 0:
+                        increment_fallback()
+            chunk = [i for i in chunk if results[i] is None]
+            if not chunk:
+                break
+        record_latency(
+            decision["effective_target"] or "unknown",
+            _time.monotonic() * 1000 - _start_ms,
+        )
+
+    if cache:
+        for i in requested:
+            if results[i]:
+                cache.put(_embedding_input(texts[i]), version, results[i])
+    return results
+
+
+def _decode_embedding(raw: Any) -> Optional[List[float]]:
+    """
+    Decode a stored embedding from the shared embeddings table.
+
+    sql-memory stores float32 little-endian BLOBs; legacy/archive rows
+    may still hold JSON text until they are migrated.
+    """
+    if raw is None:
+        return None
+    if isinstance(raw, memoryview):
+        raw = raw.tobytes()
+    if isinstance(raw, (bytes, bytearray)):
+        if not raw or len(raw) % 4 != 0:
+            return None
+        return list(struct.unpack(f"<{len(raw) // 4}f", raw))
+    return json.loads(raw)
+
+
 def _cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
     """Cosine similarity between two vectors."""
     if not vec1 or not vec2 or len(vec1) != len(vec2):
@@ -291,6 +473,144 @@ def _cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
     return dot_product / (norm1 * norm2)
 
 
+# ═══════════════════════════════════════════════════════════
+# TASK VECTOR INDEX (compact matrix, no archive_content)
+# ═══════════════════════════════════════════════════════════
+
+_TASK_JOIN_SQL = """
+    FROM embeddings e
+    JOIN task_archive a ON a.embedding_id = e.id
+    WHERE e.content_type = 'task'
+      AND e.embedding_version = ?
+"""
+
+
+def _task_checksum(conn: sqlite3.Connection, version: str) -> tuple:
+    row = conn.execute(
+        "SELECT COUNT(*), COALESCE(MAX(e.id), 0), COALESCE(SUM(e.id), 0) " + _TASK_JOIN_SQL,
+        (version,),
+    ).fetchone()
+    return (int(row[0]), int(row[1]), int(row[2]))
+
+
+class _TaskVectorIndex:
+    """
+    In-process cache of all task embeddings of one embedding_version.
+
+    Holds only (embedding id, conversation_id, unit vector) per dimension —
+    no summaries, no archive JSON. Validated per search via an aggregate
+    checksum over the join (no decoding); appended incrementally when only
+    new rows arrived, rebuilt otherwise.
+    """
+
+    def __init__(self, version: str):
+        self.version = version
+        self.checksum = (0, 0, 0)
+        self.rows: Dict[int, Dict[str, Any]] = {}  # dim -> {"ids", "convs", "vectors", "matrix"}
+
+    def _add_rows(self, rows) -> None:
+        for row in rows:
+            try:
+                vec = _decode_embedding(row["embedding"])
+            except (json.JSONDecodeError, TypeError, struct.error):
+                continue
+            if not vec:
+                continue
+            norm = math.sqrt(sum(v * v for v in vec))
+            part = self.rows.setdefault(len(vec), {"ids": [], "convs": [], "vectors": [], "matrix": None})
+            part["ids"].append(int(row["id"]))
+            part["convs"].append(row["conversation_id"])
+            part["vectors"].append([v / norm for v in vec] if norm else [0.0] * len(vec))
+            part["matrix"] = None
+
+    def refresh(self, conn: sqlite3.Connection) -> None:
+        expected = _task_checksum(conn, self.version)
+        if expected == self.checksum:
+            return
+        old_count, old_max, old_sum = self.checksum
+        new_rows = conn.execute(
+            "SELECT e.id, e.conversation_id, e.embedding " + _TASK_JOIN_SQL + " AND e.id > ? ORDER BY e.id",
+            (self.version, old_max),
+        ).fetchall()
+        appended = (
+            old_count + len(new_rows),
+            max([old_max] + [int(r["id"]) for r in new_rows]),
+            old_sum + sum(int(r["id"]) for r in new_rows),
+        )
+        if appended != expected:
+            # Deletes/relinks/re-embeds -> vollständiger Neuaufbau
+            self.rows = {}
+            new_rows = conn.execute(
+                "SELECT e.id, e.conversation_id, e.embedding " + _TASK_JOIN_SQL + " ORDER BY e.id",
+                (self.version,),
+            ).fetchall()
+        self._add_rows(new_rows)
+        self.checksum = expected
+
+    def top_k(
+        self,
+        query: List[float],
+        conversation_id: Optional[str],
+        limit: int,
+        min_similarity: float,
+    ) -> List[tuple]:
+        """Ranked [(embedding_id, similarity)] for rows matching the query dimension."""
+        part = self.rows.get(len(query))
+        if not part or not part["ids"] or limit <= 0:
+            return []
+        qnorm = math.sqrt(sum(v * v for v in query))
+        if qnorm == 0:
+            return []
+
+        if _np is not None:
+            if part["matrix"] is None:
+                part["matrix"] = _np.asarray(part["vectors"], dtype=_np.float32)
+                part["convs_arr"] = _np.asarray(part["convs"], dtype=object)
+            q = _np.asarray(query, dtype=_np.float32) / _np.float32(qnorm)
+            scores = part["matrix"] @ q
+            valid = scores >= min_similarity
+            if conversation_id:
+                convs = part["convs_arr"]
+                valid &= (convs == conversation_id) | (convs == "global")
+            idx = _np.flatnonzero(valid)
+            if idx.size > limit:
+                idx = idx[_np.argpartition(-scores[idx], limit - 1)[:limit]]
+            idx = idx[_np.argsort(-scores[idx], kind="stable")]
+            return [(part["ids"][i], float(scores[i])) for i in idx]
+
+        scored = []
+        for emb_id, conv, vec in zip(part["ids"], part["convs"], part["vectors"]):
+            if conversation_id and conv not in (conversation_id, "global"):
+                continue
+            sim = sum(a * b for a, b in zip(query, vec)) / qnorm
+            if sim >= min_similarity:
+                scored.append((emb_id, sim))
+        scored.sort(key=lambda x: x[1], reverse=True)
+        return scored[:limit]
+
+
+_TASK_INDEXES: Dict[tuple, _TaskVectorIndex] = {}
+_TASK_INDEX_LOCK = threading.Lock()
+
+
+def _search_task_vectors(
+    conn: sqlite3.Connection,
+    version: str,
+    query: List[float],
+    conversation_id: Optional[str],
+    limit: int,
+    min_similarity: float,
+) -> List[tuple]:
+    key = (_resolve_db_path(), version)
+    with _TASK_INDEX_LOCK:
+        index = _TASK_INDEXES.get(key)
+        if index is None:
+            index = _TaskVectorIndex(version)
+            _TASK_INDEXES[key] = index
+        index.refresh(conn)
+        return index.top_k(query, conversation_id, limit, min_similarity)
+
+
 # ═══════════════════════════════════════════════════════════
 # ARCHIVE MANAGER
 # ═══════════════════════════════════════════════════════════
@@ -361,14 +681,25 @@ class TaskArchiveManager:
                     f"(active_version={active_version})"
                 )
 
+                # Build searchable summaries first, then embed them in batches.
+                prepared = []
                 for task in pending:
                     try:
-                        # Build searchable summary from task content
                         content_data = json.loads(task["content"])
-                        summary = _build_search_summary(content_data)
+                        prepared.append((task, _build_search_summary(content_data)))
+                    except json.JSONDecodeError:
+                        log_error(
+                            f"[ArchiveManager] Corrupted content in {task['task_id']}"
+                        )
+                    except Exception as e:
+                        log_error(
+                            f"[ArchiveManager] Failed to process {task['task_id']}: {e}"
+                        )
+
+                embeddings = _get_embeddings_batch([summary for _, summary in prepared])
 
-                        # Generate embedding
-                        embedding = _get_embedding(summary)
+                for (task, summary), embedding in zip(prepared, embeddings):
+                    try:
                         if not embedding:
                             log_warning(
                                 f"[ArchiveManager] Skipping {task['task_id']} "
@@ -403,10 +734,6 @@ class TaskArchiveManager:
                                 f"→ embedding_id={embedding_id}"
                             )
 
-                    except json.JSONDecodeError:
-                        log_error(
-                            f"[ArchiveManager] Corrupted content in {task['task_id']}"
-                        )
                     except Exception as e:
                         log_error(
                             f"[ArchiveManager] Failed to process {task['task_id']}: {e}"
@@ -459,8 +786,8 @@ class TaskArchiveManager:
 
         Flow:
           1. Generate embedding for query
-          2. Search embeddings table (content_type='task')
-          3. Join with task_archive for full JSON content
+          2. Score the cached task vector matrix (content_type='task')
+          3. Load task_archive JSON content for the top-k only
           4. Return ranked results
 
         Fallback: If embedding fails, uses FTS text search.
@@ -488,55 +815,53 @@ class TaskArchiveManager:
         limit: int,
         min_similarity: float,
     ) -> List[Dict[str, Any]]:
-        """Search using cosine similarity over active embedding_version."""
+        """
+        Search using cosine similarity over active embedding_version.
+
+        Scoring runs on the cached task vector matrix; summaries and the
+        heavy archive_content JSON are loaded only for the final top-k.
+        """
         try:
             active_version = _get_active_embedding_context()["embedding_version"]
             conn = _get_db()
             try:
-                # Fetch task embeddings
-                sql = """
-                    SELECT e.id, e.content, e.embedding, e.metadata,
-                           e.embedding_version,
+                # Etwas Reserve für Zeilen mit kaputtem archive_content
+                ranked = _search_task_vectors(
+                    conn, active_version, query_embedding, conversation_id, limit + 5, min_similarity
+                )
+                if not ranked:
+                    return []
+
+                placeholders = ",".join("?" for _ in ranked)
+                rows = conn.execute(
+                    f"""
+                    SELECT e.id, e.content, e.embedding_version,
                            a.task_id, a.content as archive_content, a.archived_at
                     FROM embeddings e
                     JOIN task_archive a ON a.embedding_id = e.id
-                    WHERE e.content_type = 'task'
-                      AND e.embedding_version = ?
-                """
-                params = [active_version]
-
-                if conversation_id:
-                    sql += " AND (e.conversation_id = ? OR e.conversation_id = 'global')"
-                    params.append(conversation_id)
-
-                rows = conn.execute(sql, params).fetchall()
-
-                results = []
+                    WHERE e.id IN ({placeholders})
+                    """,
+                    [emb_id for emb_id, _ in ranked],
+                ).fetchall()
+                by_id: Dict[int, List[Any]] = {}
                 for row in rows:
-                    if not row["embedding"]:
-                        continue
-
-                    try:
-                        stored_embedding = json.loads(row["embedding"])
-                        similarity = _cosine_similarity(query_embedding, stored_embedding)
+                    by_id.setdefault(int(row["id"]), []).append(row)
 
-                        if similarity >= min_similarity:
-                            # Parse full archive content
+                results = []
+                for emb_id, similarity in ranked:
+                    for row in by_id.get(emb_id, []):
+                        try:
                             archive_data = json.loads(row["archive_content"])
-
-                            results.append({
-                                "task_id": row["task_id"],
-                                "summary": row["content"],
-                                "content": archive_data,
-                                "similarity": round(similarity, 4),
-                                "archived_at": row["archived_at"],
-                                "embedding_version": row["embedding_version"],
-                            })
-                    except (json.JSONDecodeError, TypeError):
-                        continue
-
-                # Sort by similarity descending
-                results.sort(key=lambda x: x["similarity"], reverse=True)
+                        except (json.JSONDecodeError, TypeError):
+                            continue
+                        results.append({
+                            "task_id": row["task_id"],
+                            "summary": row["content"],
+                            "content": archive_data,
+                            "similarity": round(similarity, 4),
+                            "archived_at": row["archived_at"],
+                            "embedding_version": row["embedding_version"],
+                        })
                 return results[:limit]
 
             finally:
@@ -631,6 +956,11 @@ class TaskArchiveManager:
                     "coverage_pct": round(
                         (active_version_count / total * 100) if total > 0 else 0, 1
                     ),
+                    "embedding_cache": (
+                        {"enabled": True, **get_embedding_cache(DB_PATH).get_stats()}
+                        if cache_enabled()
+                        else {"enabled": False}
+                    ),
                 }
             finally:
                 conn.close()
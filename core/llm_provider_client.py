@@ -9,18 +9,27 @@ Supported providers:
 """
 from __future__ import annotations
 
+import asyncio
+import importlib.util
 import json
 import os
 import re
 import threading
 import time
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
-from typing import Any, AsyncGenerator, Dict, Iterable, List, Tuple
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Iterable, List, Tuple
+from urllib.parse import urlsplit
 
 import httpx
 
 from config import (
     get_control_provider,
+    get_llm_http2_enable,
+    get_llm_http_pool_enable,
+    get_llm_http_pool_keepalive_expiry_s,
+    get_llm_http_pool_max_connections,
+    get_llm_http_pool_max_keepalive,
     get_output_model,
     get_output_provider,
     get_secret_resolve_miss_ttl_s,
@@ -189,6 +198,160 @@ def get_rate_limit_snapshot() -> Dict[str, Dict[str, Any]]:
         }
 
 
+# ─── Pooled keep-alive clients ────────────────────────────────────────────────
+# Ein httpx.AsyncClient pro (Event-Loop, Provider, Endpoint) statt pro Call:
+# TCP/TLS-Handshakes entfallen, Verbindungen pro Provider sind begrenzt.
+# httpx-Clients sind an den Loop gebunden, in dem sie benutzt wurden — daher
+# gehört der Loop zum Key; Clients toter Loops werden beim nächsten Acquire verworfen.
+
+_HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+def _pool_endpoint_key(endpoint: str) -> str:
+    parts = urlsplit(str(endpoint or "").strip())
+    if parts.scheme and parts.netloc:
+        return f"{parts.scheme}://{parts.netloc}".lower()
+    return str(endpoint or "").strip().rstrip("/").lower()
+
+
+class _TimeoutBoundClient:
+    """Per-call view on a pooled client: applies the caller's timeout to each request."""
+
+    def __init__(self, client: httpx.AsyncClient, timeout_s: float):
+        self._client = client
+        self._timeout = timeout_s
+
+    async def post(self, url: str, **kwargs: Any) -> httpx.Response:
+        kwargs.setdefault("timeout", self._timeout)
+        return await self._client.post(url, **kwargs)
+
+    async def get(self, url: str, **kwargs: Any) -> httpx.Response:
+        kwargs.setdefault("timeout", self._timeout)
+        return await self._client.get(url, **kwargs)
+
+    def stream(self, method: str, url: str, **kwargs: Any) -> Any:
+        kwargs.setdefault("timeout", self._timeout)
+        return self._client.stream(method, url, **kwargs)
+
+
+class _LLMHttpPool:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # (id(loop), provider, endpoint_key) -> (loop, client)
+        self._clients: Dict[Tuple[int, str, str], Tuple[Any, httpx.AsyncClient]] = {}
+        self._stats: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    def _stat(self, provider: str, endpoint_key: str) -> Dict[str, Any]:
+        key = (provider, endpoint_key)
+        row = self._stats.get(key)
+        if row is None:
+            row = {"created": 0, "requests": 0, "in_flight": 0, "closed": 0, "http2": False}
+            self._stats[key] = row
+        return row
+
+    def acquire(self, provider: str, endpoint: str) -> Tuple[httpx.AsyncClient, Dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        endpoint_key = _pool_endpoint_key(endpoint)
+        key = (id(loop), provider, endpoint_key)
+        with self._lock:
+            self._drop_dead_loops_locked()
+            entry = self._clients.get(key)
+            stat = self._stat(provider, endpoint_key)
+            if entry is None or entry[0] is not loop or entry[1].is_closed:
+                http2 = bool(
+                    _HTTP2_AVAILABLE
+                    and get_llm_http2_enable()
+                    and endpoint_key.startswith("https://")
+                )
+                client = httpx.AsyncClient(
+                    http2=http2,
+                    limits=httpx.Limits(
+                        max_connections=int(get_llm_http_pool_max_connections()),
+                        max_keepalive_connections=int(get_llm_http_pool_max_keepalive()),
+                        keepalive_expiry=float(get_llm_http_pool_keepalive_expiry_s()),
+                    ),
+                )
+                self._clients[key] = (loop, client)
+                stat["created"] += 1
+                stat["http2"] = http2
+                entry = self._clients[key]
+            stat["requests"] += 1
+            return entry[1], stat
+
+    def _drop_dead_loops_locked(self) -> None:
+        for key, (loop, _client) in list(self._clients.items()):
+            if loop.is_closed():
+                # Client kann im toten Loop nicht mehr sauber geschlossen werden.
+                self._clients.pop(key, None)
+                self._stat(key[1], key[2])["closed"] += 1
+
+    async def aclose(self) -> int:
+        """Closes all clients owned by the running loop. Returns the number closed."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            owned = [(k, c) for k, (l, c) in self._clients.items() if l is loop]
+            for key, _ in owned:
+                self._clients.pop(key, None)
+            self._drop_dead_loops_locked()
+        for key, client in owned:
+            try:
+                await client.aclose()
+            except Exception:
+                pass
+            with self._lock:
+                self._stat(key[1], key[2])["closed"] += 1
+        return len(owned)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            open_clients: Dict[Tuple[str, str], int] = {}
+            for (_, provider, endpoint_key), _entry in self._clients.items():
+                open_clients[(provider, endpoint_key)] = open_clients.get((provider, endpoint_key), 0) + 1
+            rows = {}
+            for (provider, endpoint_key), row in self._stats.items():
+                created = int(row["created"])
+                requests = int(row["requests"])
+                rows[f"{provider}@{endpoint_key}"] = {
+                    "provider": provider,
+                    "endpoint": endpoint_key,
+                    **row,
+                    "open_clients": open_clients.get((provider, endpoint_key), 0),
+                    "reused": max(0, requests - created),
+                }
+        return rows
+
+
+_HTTP_POOL = _LLMHttpPool()
+
+
+@asynccontextmanager
+async def _provider_client(provider: str, endpoint: str, timeout_s: float) -> AsyncIterator[Any]:
+    """
+    HTTP client for one provider call. Pooled keep-alive client when
+    LLM_HTTP_POOL_ENABLE=true, otherwise a short-lived client (legacy path).
+    """
+    if not get_llm_http_pool_enable():
+        async with httpx.AsyncClient(timeout=timeout_s) as client:
+            yield client
+        return
+    client, stat = _HTTP_POOL.acquire(provider, endpoint)
+    stat["in_flight"] += 1
+    try:
+        yield _TimeoutBoundClient(client, timeout_s)
+    finally:
+        stat["in_flight"] -= 1
+
+
+def get_http_pool_snapshot() -> Dict[str, Dict[str, Any]]:
+    """Pool stats per provider endpoint (created/reused clients, in-flight, HTTP/2)."""
+    return _HTTP_POOL.snapshot()
+
+
+async def aclose_http_pool() -> int:
+    """Shutdown hook: closes the pooled clients of the running loop."""
+    return await _HTTP_POOL.aclose()
+
+
 def _flatten_content(content: Any) -> str:
     if isinstance(content, str):
         return content
@@ -397,7 +560,7 @@ async def complete_prompt(
                 }
                 parts: List[str] = []
                 try:
-                    async with httpx.AsyncClient(timeout=timeout_s) as client:
+                    async with _provider_client(provider_norm, endpoint, timeout_s) as client:
                         async with client.stream(
                             "POST",
                             f"{endpoint}/api/chat",
@@ -438,7 +601,7 @@ async def complete_prompt(
         }
         if json_mode:
             payload["format"] = "json"
-        async with httpx.AsyncClient(timeout=timeout_s) as client:
+        async with _provider_client(provider_norm, endpoint, timeout_s) as client:
             r = await client.post(f"{endpoint}/api/generate", json=payload, headers=headers or None)
             _capture_rate_limit_headers(provider_norm, r.headers, r.status_code)
             r.raise_for_status()
@@ -459,7 +622,7 @@ async def complete_prompt(
         if json_mode:
             body["response_format"] = {"type": "json_object"}
         headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
-        async with httpx.AsyncClient(timeout=timeout_s) as client:
+        async with _provider_client(provider_norm, _openai_base(), timeout_s) as client:
             r = await client.post(f"{_openai_base()}/chat/completions", json=body, headers=headers)
             _capture_rate_limit_headers(provider_norm, r.headers, r.status_code)
             r.raise_for_status()
@@ -478,7 +641,7 @@ async def complete_prompt(
         "anthropic-version": "2023-06-01",
         "content-type": "application/json",
     }
-    async with httpx.AsyncClient(timeout=timeout_s) as client:
+    async with _provider_client(provider_norm, _anthropic_base(), timeout_s) as client:
         r = await client.post(f"{_anthropic_base()}/messages", json=body, headers=headers)
         _capture_rate_limit_headers(provider_norm, r.headers, r.status_code)
         r.raise_for_status()
@@ -526,7 +689,7 @@ async def stream_prompt(
             for candidate_model in _ollama_cloud_model_candidates(model_name):
                 payload["model"] = candidate_model
                 try:
-                    async with httpx.AsyncClient(timeout=timeout_s) as client:
+                    async with _provider_client(provider_norm, endpoint, timeout_s) as client:
                         async with client.stream(
                             "POST",
                             f"{endpoint}/api/chat",
@@ -566,7 +729,7 @@ async def stream_prompt(
             "stream": True,
             "keep_alive": "2m",
         }
-        async with httpx.AsyncClient(timeout=timeout_s) as client:
+        async with _provider_client(provider_norm, endpoint, timeout_s) as client:
             async with client.stream(
                 "POST",
                 f"{endpoint}/api/generate",
@@ -601,7 +764,7 @@ async def stream_prompt(
             "temperature": 0,
             "stream": True,
         }
-        async with httpx.AsyncClient(timeout=timeout_s) as client:
+        async with _provider_client(provider_norm, _openai_base(), timeout_s) as client:
             async with client.stream(
                 "POST",
                 f"{_openai_base()}/chat/completions",
@@ -638,7 +801,7 @@ async def stream_prompt(
         "messages": [{"role": "user", "content": prompt}],
         "stream": True,
     }
-    async with httpx.AsyncClient(timeout=timeout_s) as client:
+    async with _provider_client(provider_norm, _anthropic_base(), timeout_s) as client:
         async with client.stream(
             "POST",
             f"{_anthropic_base()}/messages",
@@ -706,7 +869,7 @@ async def complete_chat(
             if tools:
                 payload["tools"] = tools
             try:
-                async with httpx.AsyncClient(timeout=timeout_s) as client:
+                async with _provider_client(provider_norm, endpoint, timeout_s) as client:
                     response = await client.post(
                         f"{endpoint}/api/chat",
                         json=payload,
@@ -744,7 +907,7 @@ async def complete_chat(
             "temperature": 0,
             "stream": False,
         }
-        async with httpx.AsyncClient(timeout=timeout_s) as client:
+        async with _provider_client(provider_norm, _openai_base(), timeout_s) as client:
             response = await client.post(
                 f"{_openai_base()}/chat/completions",
                 json=body,
@@ -771,7 +934,7 @@ async def complete_chat(
         "anthropic-version": "2023-06-01",
         "content-type": "application/json",
     }
-    async with httpx.AsyncClient(timeout=timeout_s) as client:
+    async with _provider_client(provider_norm, _anthropic_base(), timeout_s) as client:
         response = await client.post(f"{_anthropic_base()}/messages", json=body, headers=headers)
         _capture_rate_limit_headers(provider_norm, response.headers, response.status_code)
         response.raise_for_status()
@@ -823,7 +986,7 @@ async def stream_chat_events(
                 "keep_alive": "5m",
             }
             try:
-                async with httpx.AsyncClient(timeout=timeout_s) as client:
+                async with _provider_client(provider_norm, endpoint, timeout_s) as client:
                     async with client.stream(
                         "POST",
                         f"{endpoint}/api/chat",
@@ -871,7 +1034,7 @@ async def stream_chat_events(
             "temperature": 0,
             "stream": True,
         }
-        async with httpx.AsyncClient(timeout=timeout_s) as client:
+        async with _provider_client(provider_norm, _openai_base(), timeout_s) as client:
             async with client.stream(
                 "POST",
                 f"{_openai_base()}/chat/completions",
@@ -911,7 +1074,7 @@ async def stream_chat_events(
         "anthropic-version": "2023-06-01",
         "content-type": "application/json",
     }
-    async with httpx.AsyncClient(timeout=timeout_s) as client:
+    async with _provider_client(provider_norm, _anthropic_base(), timeout_s) as client:
         async with client.stream(
             "POST",
             f"{_anthropic_base()}/messages",
@@ -0,0 +1,171 @@
+"""
+Process-wide retrieval cache for the ContextManager memory fan-out.
+
+Goal:
+- reuse fact/graph/semantic/fallback lookups across requests and turns
+- keyed by (conversation_id, backend, key), bounded by TTL + LRU
+- invalidated by memory writes through a global version counter:
+  every entry remembers the version it was read under; a write bumps the
+  version, so older entries miss without scanning the cache
+- only non-empty results are stored: backend wrappers map hub errors and
+  timeouts to None/""/[], which must not be cached as "no memory"
+
+Limits:
+- the version counter lives in this process. Writes made by other uvicorn
+  workers or other services (sql-memory maintenance, archive) do not bump
+  it; such entries only expire via TTL (MEMORY_RETRIEVAL_CACHE_TTL_S).
+  Multi-worker deployments that need read-your-writes across workers can
+  turn it off with MEMORY_RETRIEVAL_CACHE_ENABLE=false.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from config import (
+    get_memory_retrieval_cache_enable,
+    get_memory_retrieval_cache_max_entries,
+    get_memory_retrieval_cache_ttl_s,
+)
+
+# MCP tools whose success can change what the retrieval backends return.
+MEMORY_WRITE_TOOLS = frozenset({
+    "memory_save",
+    "memory_fact_save",
+    "memory_semantic_save",
+    "memory_autosave_hook",
+    "memory_delete",
+    "memory_delete_bulk",
+    "memory_reset",
+    "memory_embedding_backfill",
+    "memory_graph_save",
+    "memory_graph_content_hash_backfill",
+    "maintenance_run",
+    "graph_add_node",
+    "graph_merge_nodes",
+    "graph_relink_semantic_edges",
+    "graph_delete_orphan_nodes",
+    "graph_prune_weak_edges",
+})
+
+CacheKey = Tuple[str, str, str]
+
+_version_lock = threading.Lock()
+_memory_version = 0
+_invalidations = 0
+
+
+def get_memory_version() -> int:
+    with _version_lock:
+        return _memory_version
+
+
+def bump_memory_version() -> int:
+    """Invalidates all cached retrievals. Returns the new version."""
+    global _memory_version, _invalidations
+    with _version_lock:
+        _memory_version += 1
+        _invalidations += 1
+        return _memory_version
+
+
+def note_tool_call(tool_name: str) -> None:
+    """Hook for MCP call paths: bump the version after memory writes."""
+    if str(tool_name or "").strip() in MEMORY_WRITE_TOOLS:
+        bump_memory_version()
+
+
+class MemoryRetrievalCache:
+    def __init__(self, *, ttl_s: float, max_entries: int):
+        self.ttl_s = max(1.0, float(ttl_s or 1.0))
+        self.max_entries = max(16, int(max_entries or 16))
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[CacheKey, Tuple[float, int, Any]]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "stores": 0, "evictions": 0}
+
+    @staticmethod
+    def make_key(conversation_id: str, backend: str, key: str) -> CacheKey:
+        return (str(conversation_id or ""), str(backend or ""), str(key or ""))
+
+    def get(self, cache_key: CacheKey) -> Tuple[bool, Any]:
+        """Returns (hit, value). Expired or outdated entries count as stale misses."""
+        now = time.monotonic()
+        version = get_memory_version()
+        with self._lock:
+            entry = self._entries.get(cache_key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return False, None
+            ts, entry_version, value = entry
+            if entry_version != version or (now - ts) > self.ttl_s:
+                self._entries.pop(cache_key, None)
+                self._stats["misses"] += 1
+                self._stats["stale"] += 1
+                return False, None
+            self._entries.move_to_end(cache_key, last=True)
+            self._stats["hits"] += 1
+            return True, value
+
+    def put(self, cache_key: CacheKey, value: Any, *, version: int) -> bool:
+        """
+        Stores a result read under `version` (captured before the backend call).
+        A write that landed meanwhile makes the entry unusable, so it is dropped.
+        """
+        if version != get_memory_version():
+            return False
+        with self._lock:
+            self._entries[cache_key] = (time.monotonic(), int(version), value)
+            self._entries.move_to_end(cache_key, last=True)
+            self._stats["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+        return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            size = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        with _version_lock:
+            version, invalidations = _memory_version, _invalidations
+        return {
+            **stats,
+            "size": size,
+            "max_entries": self.max_entries,
+            "ttl_s": self.ttl_s,
+            "hit_rate": round(stats["hits"] / lookups, 4) if lookups else 0.0,
+            "version": version,
+            "invalidations": invalidations,
+        }
+
+
+_cache_lock = threading.Lock()
+_cache: MemoryRetrievalCache | None = None
+_cache_cfg: Tuple[float, int] | None = None
+
+
+def get_memory_retrieval_cache() -> MemoryRetrievalCache | None:
+    if not get_memory_retrieval_cache_enable():
+        return None
+    cfg = (float(get_memory_retrieval_cache_ttl_s()), int(get_memory_retrieval_cache_max_entries()))
+
+    global _cache, _cache_cfg
+    with _cache_lock:
+        if _cache is None or _cache_cfg != cfg:
+            _cache = MemoryRetrievalCache(ttl_s=cfg[0], max_entries=cfg[1])
+            _cache_cfg = cfg
+        return _cache
+
+
+def get_memory_retrieval_cache_stats() -> Optional[Dict[str, Any]]:
+    """Hit-rate metrics for diagnostics; None when the cache is disabled."""
+    cache = get_memory_retrieval_cache()
+    return cache.get_stats() if cache is not None else None
@@ -881,11 +881,14 @@ class PipelineOrchestrator:
         self,
         user_text: str,
         messages: Optional[List[Any]] = None,
+        *,
+        embedding_ctx: Any = None,
     ) -> Dict[str, Any]:
         return await util_classify_tone_signal(
             tone_hybrid=self.tone_hybrid,
             user_text=user_text,
             messages=messages,
+            embedding_ctx=embedding_ctx,
             sanitize_tone_signal_fn=self._sanitize_tone_signal,
             log_warn_fn=log_warn,
         )
@@ -896,6 +899,7 @@ class PipelineOrchestrator:
         *,
         selected_tools: Optional[List[Any]] = None,
         tone_signal: Optional[Dict[str, Any]] = None,
+        embedding_ctx: Any = None,
     ) -> Dict[str, Any]:
         from config import get_query_budget_enable
 
@@ -904,6 +908,7 @@ class PipelineOrchestrator:
             user_text=user_text,
             selected_tools=selected_tools,
             tone_signal=tone_signal,
+            embedding_ctx=embedding_ctx,
             query_budget_enabled=bool(get_query_budget_enable()),
             log_info_fn=log_info,
             log_warn_fn=log_warn,
@@ -914,6 +919,7 @@ class PipelineOrchestrator:
         user_text: str,
         *,
         selected_tools: Optional[List[Any]] = None,
+        embedding_ctx: Any = None,
     ) -> Dict[str, Any]:
         from config import get_domain_router_enable
 
@@ -921,6 +927,7 @@ class PipelineOrchestrator:
             domain_router=self.domain_router,
             user_text=user_text,
             selected_tools=selected_tools,
+            embedding_ctx=embedding_ctx,
             domain_router_enabled=bool(get_domain_router_enable()),
             maybe_downgrade_cron_create_signal_fn=self._maybe_downgrade_cron_create_signal,
             log_info_fn=log_info,
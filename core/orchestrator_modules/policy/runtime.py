@@ -21,11 +21,15 @@ async def classify_tone_signal(
     tone_hybrid: Any,
     user_text: str,
     messages: Optional[List[Any]] = None,
+    embedding_ctx: Any = None,
     sanitize_tone_signal_fn: Callable[[Optional[Dict[str, Any]]], Dict[str, Any]],
     log_warn_fn: Callable[[str], None],
 ) -> Dict[str, Any]:
     try:
-        signal = await tone_hybrid.classify(user_text, messages=messages)
+        kwargs: Dict[str, Any] = {"messages": messages}
+        if embedding_ctx is not None:
+            kwargs["embedding_ctx"] = embedding_ctx
+        signal = await tone_hybrid.classify(user_text, **kwargs)
         return sanitize_tone_signal_fn(signal)
     except Exception as exc:
         log_warn_fn(f"[Orchestrator] ToneHybrid fallback: {exc}")
@@ -38,6 +42,7 @@ async def classify_query_budget_signal(
     user_text: str,
     selected_tools: Optional[List[Any]] = None,
     tone_signal: Optional[Dict[str, Any]] = None,
+    embedding_ctx: Any = None,
     query_budget_enabled: bool,
     log_info_fn: Callable[[str], None],
     log_warn_fn: Callable[[str], None],
@@ -45,11 +50,10 @@ async def classify_query_budget_signal(
     if not query_budget_enabled:
         return {}
     try:
-        signal = await query_budget.classify(
-            user_text,
-            selected_tools=selected_tools,
-            tone_signal=tone_signal,
-        )
+        kwargs: Dict[str, Any] = {"selected_tools": selected_tools, "tone_signal": tone_signal}
+        if embedding_ctx is not None:
+            kwargs["embedding_ctx"] = embedding_ctx
+        signal = await query_budget.classify(user_text, **kwargs)
         if isinstance(signal, dict) and signal:
             log_info_fn(
                 "[Orchestrator] query_budget "
@@ -72,6 +76,7 @@ async def classify_domain_signal(
     domain_router: Any,
     user_text: str,
     selected_tools: Optional[List[Any]] = None,
+    embedding_ctx: Any = None,
     domain_router_enabled: bool,
     maybe_downgrade_cron_create_signal_fn: Callable[[str, Optional[Dict[str, Any]]], Dict[str, Any]],
     log_info_fn: Callable[[str], None],
@@ -80,10 +85,10 @@ async def classify_domain_signal(
     if not domain_router_enabled:
         return {}
     try:
-        signal = await domain_router.classify(
-            user_text,
-            selected_tools=selected_tools,
-        )
+        kwargs: Dict[str, Any] = {"selected_tools": selected_tools}
+        if embedding_ctx is not None:
+            kwargs["embedding_ctx"] = embedding_ctx
+        signal = await domain_router.classify(user_text, **kwargs)
         if isinstance(signal, dict) and signal:
             signal = maybe_downgrade_cron_create_signal_fn(user_text, signal)
             log_info_fn(
@@ -3,7 +3,10 @@ from __future__ import annotations
 from dataclasses import replace
 from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
 
+from intelligence_modules.prompt_manager import load_prompt
+
 from core.task_loop.chat_runtime import (
+    VERSION_CONFLICT_DONE_REASON,
     create_task_loop_snapshot,
     is_task_loop_candidate,
     is_task_loop_cancel,
@@ -34,7 +37,7 @@ from core.task_loop.events import (
 )
 from core.task_loop.pipeline_adapter import build_task_loop_planning_context
 from core.task_loop.runner import run_chat_auto_loop_async, stream_chat_auto_loop
-from core.task_loop.store import get_task_loop_store
+from core.task_loop.store import commit_task_loop_snapshot, get_task_loop_store
 from core.task_loop.unresolved_context import (
     build_seeded_followup_user_text,
     build_unresolved_task_response,
@@ -49,6 +52,17 @@ from core.work_context.selectors import (
 from core.work_context.service import load_work_context
 
 
+def _version_conflict_stream_events(stored: Optional[Any]) -> List[Tuple[str, bool, Dict[str, Any]]]:
+    # Ein anderer Worker hat den Loop weitergefuehrt: dessen Stand melden, Stream beenden.
+    done: Dict[str, Any] = {"type": "done", "done_reason": VERSION_CONFLICT_DONE_REASON}
+    if stored is not None:
+        done["task_loop"] = stored.to_dict()
+    return [
+        (load_prompt("task_loop", "version_conflict"), False, {"type": "content"}),
+        ("", True, done),
+    ]
+
+
 def get_active_task_loop_snapshot(conversation_id: str) -> Optional[Any]:
     store = get_task_loop_store()
     return store.get_active(str(conversation_id or "").strip())
@@ -240,17 +254,21 @@ async def maybe_handle_task_loop_sync(
                 save_workspace_entry_fn=getattr(orch, "_save_workspace_entry", None),
             )
             final_snapshot = replace(run.snapshot, workspace_event_ids=list(active.workspace_event_ids) + event_ids)
-            store.put(final_snapshot)
+            _stored, written = commit_task_loop_snapshot(store, final_snapshot)
+            content, done_reason = run.content, run.done_reason
+            if not written:
+                content = load_prompt("task_loop", "version_conflict")
+                done_reason = VERSION_CONFLICT_DONE_REASON
             log_info_fn(
                 "[TaskLoop] handled sync continue via async runner "
-                f"state={final_snapshot.state.value} done_reason={run.done_reason}"
+                f"state={final_snapshot.state.value} done_reason={done_reason}"
             )
             return core_chat_response_cls(
                 model=request.model,
-                content=run.content,
+                content=content,
                 conversation_id=conversation_id,
                 done=True,
-                done_reason=run.done_reason,
+                done_reason=done_reason,
                 memory_used=False,
                 validation_passed=True,
             )
@@ -470,9 +488,14 @@ async def stream_task_loop_events(
                             "step_runtime": dict(chunk.step_runtime or {}),
                         },
                     )
-                store.put(chunk_snapshot)
+                stored, written = commit_task_loop_snapshot(store, chunk_snapshot)
                 for workspace_update in workspace_updates:
                     yield ("", False, workspace_update)
+                if not written:
+                    log_info_fn("[TaskLoop] active-loop continue superseded by another worker")
+                    for item in _version_conflict_stream_events(stored):
+                        yield item
+                    return
                 if chunk.thinking_delta:
                     yield (
                         "",
@@ -565,6 +588,7 @@ async def stream_task_loop_events(
         make_task_loop_event(TaskLoopEventType.PLAN_UPDATED, snapshot),
     ]
     known_event_ids: List[str] = []
+    started = False
     output_layer = getattr(orch, "output", None)
     control_layer = getattr(orch, "control", None)
 
@@ -604,9 +628,20 @@ async def stream_task_loop_events(
                     "step_runtime": dict(chunk.step_runtime or {}),
                 },
             )
-        store.put(chunk_snapshot)
+        # Der erste Write ersetzt einen evtl. gespeicherten alten Loop (expliziter Start).
+        stored, written = commit_task_loop_snapshot(
+            store,
+            chunk_snapshot,
+            rebase=None if started else (lambda _current, snap=chunk_snapshot: snap),
+        )
+        started = True
         for workspace_update in workspace_updates:
             yield ("", False, workspace_update)
+        if not written:
+            log_info_fn("[TaskLoop] streaming auto loop superseded by another worker")
+            for item in _version_conflict_stream_events(stored):
+                yield item
+            return
         if chunk.thinking_delta:
             yield (
                 "",
@@ -11,6 +11,8 @@ Stages:
   prepare_output_invocation() — Model resolution, memory guard flag, time budget (pre-output)
 """
 
+import asyncio
+import time
 from typing import Any, Dict, List, Optional, Tuple
 
 
@@ -219,6 +221,40 @@ def run_plan_finalization(
     return thinking_plan, response_mode
 
 
+async def _timed_signal(coro: Any, timings: Dict[str, Any], name: str) -> Any:
+    started = time.monotonic()
+    try:
+        return await coro
+    finally:
+        timings[f"{name}_ms"] = round((time.monotonic() - started) * 1000.0, 1)
+
+
+async def _await_until(
+    tasks: Dict[str, "asyncio.Task"],
+    deadline: float,
+    defaults: Dict[str, Any],
+    timed_out: List[str],
+    log_info_fn: Any,
+) -> Dict[str, Any]:
+    """Waits for all tasks until the shared deadline; late/failed signals get their default."""
+    remaining = max(0.0, deadline - time.monotonic())
+    done, pending = await asyncio.wait(set(tasks.values()), timeout=remaining)
+    out: Dict[str, Any] = {}
+    for name, task in tasks.items():
+        if task in pending:
+            task.cancel()
+            timed_out.append(name)
+            out[name] = defaults[name]
+            log_info_fn(f"[Pipeline] Layer-0 signal '{name}' missed deadline; using default")
+            continue
+        try:
+            out[name] = task.result()
+        except Exception as exc:
+            out[name] = defaults[name]
+            log_info_fn(f"[Pipeline] Layer-0 signal '{name}' failed: {exc}")
+    return out
+
+
 async def run_tool_selection_stage(
     orch: Any,
     user_text: str,
@@ -226,16 +262,28 @@ async def run_tool_selection_stage(
     forced_response_mode: Optional[str],
     tone_signal: Any,
     log_info_fn: Any,
+    embedding_ctx: Any = None,
+    signal_timings: Optional[Dict[str, Any]] = None,
 ) -> Tuple[List[str], Dict, Dict, str]:
     """
     Layer 0: Tool selection, short-input bypass, budget and domain signals.
 
+    Tool selection, query budget and domain routing run concurrently under one
+    shared deadline (get_layer0_signal_deadline_s). Budget and domain start
+    without selected_tools; once selection finished, the query budget is
+    re-run with the final tool list if the deadline leaves time (cheap: the
+    query embedding is shared via embedding_ctx). Per-signal timings are
+    written into signal_timings when given.
+
     Returns:
         selected_tools        — list of tool names
         query_budget_signal   — dict
         domain_route_signal   — dict
         last_assistant_msg    — str (used downstream for context enrichment)
     """
+    from config import get_layer0_signal_deadline_s
+    from core.query_embedding_context import QueryEmbeddingContext
+
     # Extract last assistant message for context-aware selection
     last_assistant_msg = ""
     for _msg in reversed(list(getattr(request, "messages", None) or [])):
@@ -243,11 +291,43 @@ async def run_tool_selection_stage(
             last_assistant_msg = str(_msg.get("content", ""))
             break
 
-    selected_tools = await orch.tool_selector.select_tools(
-        user_text, context_summary=last_assistant_msg
+    caller_ctx = embedding_ctx is not None
+    if embedding_ctx is None:
+        embedding_ctx = QueryEmbeddingContext()
+    timings: Dict[str, Any] = signal_timings if isinstance(signal_timings, dict) else {}
+    timed_out: List[str] = []
+    stage_started = time.monotonic()
+    deadline = stage_started + float(get_layer0_signal_deadline_s())
+
+    provisional = await _await_until(
+        {
+            "tool_selector": asyncio.ensure_future(_timed_signal(
+                orch.tool_selector.select_tools(
+                    user_text, context_summary=last_assistant_msg, embedding_ctx=embedding_ctx
+                ),
+                timings, "tool_selector",
+            )),
+            "query_budget": asyncio.ensure_future(_timed_signal(
+                orch._classify_query_budget_signal(
+                    user_text, selected_tools=None, tone_signal=tone_signal, embedding_ctx=embedding_ctx
+                ),
+                timings, "query_budget",
+            )),
+            "domain_router": asyncio.ensure_future(_timed_signal(
+                orch._classify_domain_signal(
+                    user_text, selected_tools=None, embedding_ctx=embedding_ctx
+                ),
+                timings, "domain_router",
+            )),
+        },
+        deadline,
+        {"tool_selector": None, "query_budget": {}, "domain_router": {}},
+        timed_out,
+        log_info_fn,
     )
+
     selected_tools = orch._filter_tool_selector_candidates(
-        selected_tools, user_text, forced_mode=forced_response_mode
+        provisional["tool_selector"], user_text, forced_mode=forced_response_mode
     )
 
     # Short-Input Bypass: inject follow-up tools when semantic search returns empty
@@ -258,15 +338,48 @@ async def run_tool_selection_stage(
             selected_tools = ["request_container", "run_skill", "home_write"]
         log_info_fn("[Pipeline] Short-Input Bypass: core follow-up tools injected")
 
-    query_budget_signal = await orch._classify_query_budget_signal(
-        user_text,
-        selected_tools=selected_tools,
-        tone_signal=tone_signal,
-    )
-    domain_route_signal = await orch._classify_domain_signal(
-        user_text,
-        selected_tools=selected_tools,
+    query_budget_signal = provisional["query_budget"]
+    domain_route_signal = provisional["domain_router"]
+    reconciled = False
+    if selected_tools and time.monotonic() < deadline:
+        # Provisorisches Budget kannte die Tool-Kandidaten noch nicht -> mit finaler Auswahl abgleichen.
+        # Domain-Routing bleibt provisorisch; der Abgleich zählt gegen dieselbe Deadline.
+        reconcile_started = time.monotonic()
+        final = await _await_until(
+            {
+                "query_budget": asyncio.ensure_future(orch._classify_query_budget_signal(
+                    user_text,
+                    selected_tools=selected_tools,
+                    tone_signal=tone_signal,
+                    embedding_ctx=embedding_ctx,
+                )),
+            },
+            deadline,
+            {"query_budget": query_budget_signal},
+            timed_out,
+            log_info_fn,
+        )
+        # verpasst/fehlgeschlagen -> _await_until liefert das provisorische Signal zurück
+        reconciled = final["query_budget"] is not query_budget_signal
+        query_budget_signal = final["query_budget"]
+        timings["reconcile_ms"] = round((time.monotonic() - reconcile_started) * 1000.0, 1)
+    elif selected_tools:
+        log_info_fn("[Pipeline] Layer-0 deadline exhausted; keeping provisional query budget")
+
+    timings["total_ms"] = round((time.monotonic() - stage_started) * 1000.0, 1)
+    timings["reconciled"] = reconciled
+    timings["timed_out"] = timed_out
+    log_info_fn(
+        "[Pipeline] layer0_signals "
+        + " ".join(f"{k}={v}" for k, v in timings.items() if k.endswith("_ms"))
+        + (f" timed_out={timed_out}" if timed_out else "")
     )
+    if caller_ctx:
+        stats = embedding_ctx.get_stats()
+        log_info_fn(
+            "[Pipeline] query_embeddings "
+            f"requests={stats['requests']} computed={stats['computed']} saved={stats['saved']}"
+        )
 
     return selected_tools, query_budget_signal, domain_route_signal, last_assistant_msg
 
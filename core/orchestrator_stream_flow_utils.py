@@ -62,6 +62,7 @@ from core.host_runtime_policy import (
     extract_blueprint_id_from_create_result,
 )
 from core.tool_hub_runtime import get_initialized_hub_safe
+from core.query_embedding_context import QueryEmbeddingContext
 
 
 def _build_thinking_ui_payload(plan: Optional[Dict[str, Any]], **overrides: Any) -> Dict[str, Any]:
@@ -214,7 +215,10 @@ async def process_stream_with_events(
     conversation_id = request.conversation_id
     forced_response_mode = orch._requested_response_mode(request)
     request_retrieval_cache: Dict[str, Any] = {}
-    tone_signal = await orch._classify_tone_signal(user_text, request.messages)
+    query_embeddings = QueryEmbeddingContext()
+    tone_signal = await orch._classify_tone_signal(
+        user_text, request.messages, embedding_ctx=query_embeddings
+    )
     _emit_loop_trace = is_internal_loop_analysis_prompt(user_text)
     _loop_trace_started_emitted = False
     
@@ -334,13 +338,18 @@ async def process_stream_with_events(
         
         # Layer 0: Tool Selection
         from core.orchestrator_pipeline_stages import run_tool_selection_stage
+        layer0_timings: Dict[str, Any] = {}
         selected_tools, query_budget_signal, domain_route_signal, _last_assistant_msg = (
             await run_tool_selection_stage(
-                orch, user_text, request, forced_response_mode, tone_signal, log_info_fn
+                orch, user_text, request, forced_response_mode, tone_signal, log_info_fn,
+                embedding_ctx=query_embeddings,
+                signal_timings=layer0_timings,
             )
         )
         if selected_tools:
             yield ("", False, {"type": "tool_selection", "tools": selected_tools})
+        if layer0_timings:
+            yield ("", False, {"type": "layer0_signals", "timings": layer0_timings})
 
         # Check if we should skip ThinkingLayer
         skip_thinking = False
@@ -2433,22 +2442,30 @@ async def process_stream_with_events(
             done_reason=_final_done_reason,
             save_workspace_entry_fn=getattr(orch, "_save_workspace_entry", None),
         )
+        from core.task_loop.context_writeback import commit_context_only_turn
         from core.task_loop.store import get_task_loop_store
-        get_task_loop_store().put(updated_snapshot)
-        yield (
-            "",
-            False,
-            {
-                "type": "task_loop_update",
-                "state": updated_snapshot.state.value,
-                "done_reason": "task_loop_context_updated",
-                "task_loop": updated_snapshot.to_dict(),
-                "event_types": ["task_loop_context_updated"],
-                "is_final": False,
-                "context_only": True,
-                **build_background_loop_state(updated_snapshot),
-            },
+        stored_snapshot = commit_context_only_turn(
+            get_task_loop_store(),
+            updated_snapshot,
+            full_response,
+            done_reason=_final_done_reason,
+            event_ids=_event_ids,
         )
+        if stored_snapshot is not None:
+            yield (
+                "",
+                False,
+                {
+                    "type": "task_loop_update",
+                    "state": stored_snapshot.state.value,
+                    "done_reason": "task_loop_context_updated",
+                    "task_loop": stored_snapshot.to_dict(),
+                    "event_types": ["task_loop_context_updated"],
+                    "is_final": False,
+                    "context_only": True,
+                    **build_background_loop_state(stored_snapshot),
+                },
+            )
         for workspace_update in workspace_updates:
             yield ("", False, workspace_update)
         log_info_fn("[TaskLoop] context-only stream turn written back to active loop")
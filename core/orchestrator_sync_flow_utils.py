@@ -46,6 +46,7 @@ from core.plan_runtime_bridge import (
     set_runtime_tool_failure,
     set_runtime_tool_results,
 )
+from core.query_embedding_context import QueryEmbeddingContext
 
 async def process_request(
     orch: Any,
@@ -85,7 +86,10 @@ async def process_request(
     conversation_id = request.conversation_id
     forced_response_mode = orch._requested_response_mode(request)
     request_retrieval_cache: Dict[str, Any] = {}
-    tone_signal = await orch._classify_tone_signal(user_text, request.messages)
+    query_embeddings = QueryEmbeddingContext()
+    tone_signal = await orch._classify_tone_signal(
+        user_text, request.messages, embedding_ctx=query_embeddings
+    )
     
     # ===============================================================
     # STEP 1: Intent Confirmation Check
@@ -136,11 +140,21 @@ async def process_request(
     # STEP 1.5: Tool Selector (Layer 0)
     # ===============================================================
     from core.orchestrator_pipeline_stages import run_tool_selection_stage
+    layer0_timings: Dict[str, Any] = {}
     selected_tools, query_budget_signal, domain_route_signal, _last_assistant_msg = (
         await run_tool_selection_stage(
-            orch, user_text, request, forced_response_mode, tone_signal, log_info_fn
+            orch, user_text, request, forced_response_mode, tone_signal, log_info_fn,
+            embedding_ctx=query_embeddings,
+            signal_timings=layer0_timings,
         )
     )
+    if layer0_timings:
+        # Kein SSE im Sync-Pfad: dasselbe layer0_signals-Event wie der Stream per WebSocket
+        from core.workspace_event_emitter import get_workspace_emitter
+        get_workspace_emitter().broadcast(
+            {"type": "layer0_signals", "timings": layer0_timings},
+            conversation_id=conversation_id,
+        )
     
     # ===============================================================
     # STEP 2: Thinking Layer
@@ -793,8 +807,15 @@ async def process_request(
             done_reason=_done_reason_sync,
             save_workspace_entry_fn=getattr(orch, "_save_workspace_entry", None),
         )
+        from core.task_loop.context_writeback import commit_context_only_turn
         from core.task_loop.store import get_task_loop_store
-        get_task_loop_store().put(updated_snapshot)
+        commit_context_only_turn(
+            get_task_loop_store(),
+            updated_snapshot,
+            answer,
+            done_reason=_done_reason_sync,
+            event_ids=_event_ids,
+        )
         log_info_fn("[TaskLoop] context-only sync turn written back to active loop")
 
     return core_chat_response_cls(
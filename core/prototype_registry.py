@@ -0,0 +1,306 @@
+"""
+Shared prototype-embedding registry for the Layer-0 hybrid classifiers.
+
+Design:
+- ToneHybrid / QueryBudget / DomainRouter register their prototype texts
+  under a namespace ("tone", "act", "query_budget", "domain")
+- the first classifier that needs vectors embeds ALL missing prototypes of all
+  namespaces in one batched /api/embed request (per-text fallback when the
+  endpoint has no batch API)
+- vectors are kept as one L2-normalized matrix per namespace; a query is
+  scored with a single matrix-vector product (pure-Python fallback without NumPy)
+- persisted as JSON keyed by embedding model + version, so a cold start skips
+  re-embedding; an edited prototype text is re-embedded alone
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import math
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+
+from config import (
+    OLLAMA_BASE,
+    get_embedding_model,
+    get_embedding_prototype_cache_path,
+    get_embedding_runtime_policy,
+)
+from utils.logger import log_debug, log_info
+from utils.role_endpoint_resolver import resolve_role_endpoint
+
+try:
+    import numpy as _np
+except ImportError:  # pragma: no cover - numpy is part of the runtime image
+    _np = None
+
+EmbedFn = Callable[[str], Awaitable[Optional[List[float]]]]
+
+# Nach einem komplett fehlgeschlagenen Embedding-Lauf nicht bei jedem Turn neu versuchen.
+_FAILURE_BACKOFF_S = 30.0
+_CACHE_FORMAT = 1
+
+
+def _text_key(text: str) -> str:
+    return hashlib.sha256(str(text or "").encode("utf-8")).hexdigest()[:24]
+
+
+def _embedding_version(model: str, runtime_policy: str) -> str:
+    digest = hashlib.sha256(
+        f"{(model or '').strip()}|{(runtime_policy or 'auto').strip().lower()}".encode("utf-8")
+    ).hexdigest()[:16]
+    return f"embv1_{digest}"
+
+
+def _unit(vec: Sequence[float]) -> Optional[List[float]]:
+    norm = math.sqrt(sum(float(v) * float(v) for v in vec))
+    if norm <= 0.0:
+        return None
+    return [float(v) / norm for v in vec]
+
+
+async def fetch_embeddings_batch(texts: List[str], timeout_s: float = 10.0) -> Optional[List[List[float]]]:
+    """
+    One Ollama /api/embed call for many texts.
+    Returns None on error or when the endpoint has no batch API.
+    """
+    if not texts:
+        return []
+    route = resolve_role_endpoint("embedding", default_endpoint=OLLAMA_BASE)
+    if route.get("hard_error"):
+        return None
+    endpoint = route.get("endpoint") or OLLAMA_BASE
+    payload = {"model": get_embedding_model(), "input": list(texts)}
+    try:
+        async with httpx.AsyncClient(timeout=timeout_s) as client:
+            resp = await client.post(f"{endpoint}/api/embed", json=payload)
+            if resp.status_code in (404, 405):
+                log_debug(f"[Prototypes] /api/embed not supported @ {endpoint}")
+                return None
+            resp.raise_for_status()
+            data = resp.json()
+        vectors = data.get("embeddings") or []
+        if len(vectors) != len(texts) or not all(isinstance(v, list) and v for v in vectors):
+            log_debug(f"[Prototypes] batch size mismatch: sent={len(texts)} got={len(vectors)}")
+            return None
+        return [[float(x) for x in v] for v in vectors]
+    except Exception as e:
+        log_debug(f"[Prototypes] batch embedding unavailable: {type(e).__name__}: {e}")
+    return None
+
+
+class PrototypeMatrix:
+    """Normalized prototype vectors of one namespace, scored in one product."""
+
+    def __init__(self, labels: Sequence[str], unit_vectors: Sequence[Sequence[float]]):
+        self.labels: Tuple[str, ...] = tuple(labels)
+        self.dim = len(unit_vectors[0]) if unit_vectors else 0
+        if _np is not None:
+            self._matrix: Any = _np.asarray(unit_vectors, dtype=_np.float64)
+        else:
+            self._matrix = [list(v) for v in unit_vectors]
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def scores(self, query_vec: Sequence[float]) -> Dict[str, float]:
+        """Cosine similarity of the query against every prototype; {} on dim mismatch."""
+        if not self.labels or not query_vec or len(query_vec) != self.dim:
+            return {}
+        if _np is not None:
+            q = _np.asarray(query_vec, dtype=_np.float64)
+            norm = float(_np.linalg.norm(q))
+            if norm <= 0.0:
+                return {}
+            sims = self._matrix @ (q / norm)
+            return {label: float(sim) for label, sim in zip(self.labels, sims.tolist())}
+        q = _unit(query_vec)
+        if q is None:
+            return {}
+        return {
+            label: sum(a * b for a, b in zip(row, q))
+            for label, row in zip(self.labels, self._matrix)
+        }
+
+
+class PrototypeRegistry:
+    def __init__(self, cache_path: str = ""):
+        self.cache_path = str(cache_path or "")
+        self._namespaces: Dict[str, Dict[str, str]] = {}
+        self._vectors: Dict[str, List[float]] = {}  # text_key -> raw vector (active version)
+        self._matrices: Dict[str, PrototypeMatrix] = {}
+        self._version = ""
+        self._model = ""
+        self._failed_at = 0.0
+        self._lock_state: Tuple[Any, Optional[asyncio.Lock]] = (None, None)
+        self._stats = {"batch_calls": 0, "single_calls": 0, "embedded": 0, "disk_loaded": 0, "builds": 0}
+
+    def register(self, namespace: str, prototypes: Dict[str, str]) -> None:
+        """Idempotent; a changed prototype set drops that namespace's matrix."""
+        if self._namespaces.get(namespace) == prototypes:
+            return
+        self._namespaces[namespace] = dict(prototypes)
+        self._matrices.pop(namespace, None)
+
+    def _lock(self) -> asyncio.Lock:
+        # asyncio.Lock ist an den Event-Loop gebunden; pro Loop neu anlegen.
+        loop = asyncio.get_running_loop()
+        owner, lock = self._lock_state
+        if owner is not loop or lock is None:
+            lock = asyncio.Lock()
+            self._lock_state = (loop, lock)
+        return lock
+
+    def _missing_texts(self) -> List[str]:
+        seen: Dict[str, str] = {}
+        for prototypes in self._namespaces.values():
+            for text in prototypes.values():
+                key = _text_key(text)
+                if key not in self._vectors and key not in seen:
+                    seen[key] = text
+        return list(seen.values())
+
+    def _build_matrices(self) -> None:
+        self._matrices = {}
+        for namespace, prototypes in self._namespaces.items():
+            labels: List[str] = []
+            rows: List[List[float]] = []
+            for label, text in prototypes.items():
+                vec = self._vectors.get(_text_key(text))
+                unit = _unit(vec) if vec else None
+                if unit is None or (rows and len(unit) != len(rows[0])):
+                    continue
+                labels.append(label)
+                rows.append(unit)
+            if rows:
+                self._matrices[namespace] = PrototypeMatrix(labels, rows)
+        self._stats["builds"] += 1
+
+    def _load_disk(self, version: str) -> Dict[str, List[float]]:
+        if not self.cache_path or not os.path.exists(self.cache_path):
+            return {}
+        try:
+            with open(self.cache_path, "r", encoding="utf-8") as fh:
+                data = json.load(fh)
+            entry = (data.get("versions") or {}).get(version) or {}
+            vectors = entry.get("vectors") or {}
+            return {
+                str(k): [float(x) for x in v]
+                for k, v in vectors.items()
+                if isinstance(v, list) and v
+            }
+        except Exception as e:
+            log_debug(f"[Prototypes] cache load failed ({self.cache_path}): {type(e).__name__}: {e}")
+            return {}
+
+    def _save_disk(self) -> None:
+        if not self.cache_path:
+            return
+        try:
+            data: Dict[str, Any] = {}
+            if os.path.exists(self.cache_path):
+                with open(self.cache_path, "r", encoding="utf-8") as fh:
+                    data = json.load(fh) or {}
+            versions = data.get("versions") if isinstance(data.get("versions"), dict) else {}
+            wanted = {_text_key(t) for p in self._namespaces.values() for t in p.values()}
+            versions[self._version] = {
+                "embedding_model": self._model,
+                "vectors": {k: v for k, v in self._vectors.items() if k in wanted},
+            }
+            parent = os.path.dirname(self.cache_path)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            tmp = f"{self.cache_path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as fh:
+                json.dump({"format": _CACHE_FORMAT, "versions": versions}, fh)
+            os.replace(tmp, self.cache_path)
+        except Exception as e:
+            log_debug(f"[Prototypes] cache save failed ({self.cache_path}): {type(e).__name__}: {e}")
+
+    async def _embed_missing(self, texts: List[str], embed_fn: EmbedFn) -> int:
+        vectors = await fetch_embeddings_batch(texts)
+        if vectors is not None:
+            self._stats["batch_calls"] += 1
+        else:
+            self._stats["single_calls"] += len(texts)
+            vectors = await asyncio.gather(*(embed_fn(t) for t in texts), return_exceptions=True)
+        added = 0
+        for text, vec in zip(texts, vectors):
+            if isinstance(vec, list) and vec:
+                self._vectors[_text_key(text)] = [float(x) for x in vec]
+                added += 1
+        self._stats["embedded"] += added
+        return added
+
+    def _activate_version(self) -> None:
+        model = get_embedding_model()
+        version = _embedding_version(model, get_embedding_runtime_policy())
+        if version == self._version:
+            return
+        self._version = version
+        self._model = model
+        self._vectors = self._load_disk(version)
+        self._stats["disk_loaded"] += len(self._vectors)
+        self._matrices = {}
+        self._failed_at = 0.0
+
+    def get(self, namespace: str) -> Optional[PrototypeMatrix]:
+        return self._matrices.get(namespace)
+
+    async def ensure(self, namespace: str, embed_fn: EmbedFn) -> Optional[PrototypeMatrix]:
+        """
+        Returns the prototype matrix of `namespace` for the active embedding
+        model, embedding whatever is missing (batched, across namespaces).
+        """
+        async with self._lock():
+            self._activate_version()
+            matrix = self._matrices.get(namespace)
+            missing = self._missing_texts()
+            if matrix is not None and not missing:
+                return matrix
+            rebuild = matrix is None
+            if missing and (time.monotonic() - self._failed_at) >= _FAILURE_BACKOFF_S:
+                added = await self._embed_missing(missing, embed_fn)
+                if added:
+                    rebuild = True
+                    self._failed_at = 0.0
+                    self._save_disk()
+                    log_info(
+                        f"[Prototypes] embedded {added}/{len(missing)} prototypes "
+                        f"(model={self._model}, namespaces={len(self._namespaces)})"
+                    )
+                else:
+                    self._failed_at = time.monotonic()
+            if rebuild:
+                self._build_matrices()
+            return self._matrices.get(namespace)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self._stats,
+            "embedding_version": self._version,
+            "embedding_model": self._model,
+            "namespaces": {ns: len(m) for ns, m in self._matrices.items()},
+            "vectors": len(self._vectors),
+            "numpy": _np is not None,
+        }
+
+
+_registry_lock = threading.Lock()
+_registry: Optional[PrototypeRegistry] = None
+
+
+def get_prototype_registry() -> PrototypeRegistry:
+    """Process-wide registry; rebuilt when the cache path changes."""
+    global _registry
+    path = get_embedding_prototype_cache_path()
+    with _registry_lock:
+        if _registry is None or _registry.cache_path != str(path or ""):
+            _registry = PrototypeRegistry(path)
+        return _registry
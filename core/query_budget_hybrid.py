@@ -9,10 +9,7 @@ Purpose:
 
 from __future__ import annotations
 
-import asyncio
-import math
 import re
-import time
 from typing import Any, Dict, List, Optional
 
 import httpx
@@ -22,6 +19,7 @@ from config import (
     get_embedding_model,
     get_query_budget_embedding_enable,
 )
+from core.prototype_registry import get_prototype_registry
 from utils.logger import log_debug
 from utils.role_endpoint_resolver import resolve_role_endpoint
 
@@ -118,10 +116,6 @@ class QueryBudgetHybridClassifier:
     )
 
     def __init__(self):
-        self._prototype_cache: Dict[str, List[float]] = {}
-        self._prototype_cache_ts = 0.0
-        self._prototype_lock = asyncio.Lock()
-        self._prototype_cache_ttl_s = 6 * 60 * 60
         self._embed_timeout_s = 1.8
 
     @staticmethod
@@ -403,21 +397,6 @@ class QueryBudgetHybridClassifier:
             }
         return {}
 
-    @staticmethod
-    def _cosine_similarity(a: List[float], b: List[float]) -> float:
-        if not a or not b or len(a) != len(b):
-            return 0.0
-        dot = 0.0
-        norm_a = 0.0
-        norm_b = 0.0
-        for x, y in zip(a, b):
-            dot += x * y
-            norm_a += x * x
-            norm_b += y * y
-        if norm_a <= 0.0 or norm_b <= 0.0:
-            return 0.0
-        return dot / (math.sqrt(norm_a) * math.sqrt(norm_b))
-
     async def _embed_text(self, text: str) -> Optional[List[float]]:
         route = resolve_role_endpoint("embedding", default_endpoint=OLLAMA_BASE)
         if route.get("hard_error"):
@@ -439,24 +418,15 @@ class QueryBudgetHybridClassifier:
             log_debug(f"[QueryBudget] Embedding unavailable: {type(e).__name__}: {e}")
         return None
 
+    async def _embed_query(self, text: str, embedding_ctx: Any = None) -> Optional[List[float]]:
+        if embedding_ctx is None:
+            return await self._embed_text(text)
+        return await embedding_ctx.embed(text, self._embed_text)
+
     async def _ensure_prototype_vectors(self) -> bool:
-        now = time.time()
-        if self._prototype_cache and (now - self._prototype_cache_ts) < self._prototype_cache_ttl_s:
-            return True
-        async with self._prototype_lock:
-            now = time.time()
-            if self._prototype_cache and (now - self._prototype_cache_ts) < self._prototype_cache_ttl_s:
-                return True
-            cache: Dict[str, List[float]] = {}
-            for key, text in self._QUERY_PROTOTYPES.items():
-                vec = await self._embed_text(text)
-                if vec:
-                    cache[key] = vec
-            if not cache:
-                return False
-            self._prototype_cache = cache
-            self._prototype_cache_ts = now
-            return True
+        registry = get_prototype_registry()
+        registry.register("query_budget", self._QUERY_PROTOTYPES)
+        return await registry.ensure("query_budget", self._embed_text) is not None
 
     def _lexical_classify(
         self,
@@ -611,22 +581,18 @@ class QueryBudgetHybridClassifier:
             "source": "lexical",
         }
 
-    async def _embedding_refine(self, text: str) -> Optional[Dict[str, Any]]:
+    async def _embedding_refine(self, text: str, embedding_ctx: Any = None) -> Optional[Dict[str, Any]]:
         if not get_query_budget_embedding_enable():
             return None
         ok = await self._ensure_prototype_vectors()
         if not ok:
             return None
-        text_vec = await self._embed_text(text)
+        text_vec = await self._embed_query(text, embedding_ctx)
         if not text_vec:
             return None
 
-        sims: Dict[str, float] = {}
-        for key in self._QUERY_TYPES:
-            proto = self._prototype_cache.get(key)
-            if not proto:
-                continue
-            sims[key] = self._cosine_similarity(text_vec, proto)
+        matrix = get_prototype_registry().get("query_budget")
+        sims: Dict[str, float] = matrix.scores(text_vec) if matrix is not None else {}
         if not sims:
             return None
         best = sorted(sims.items(), key=lambda kv: kv[1], reverse=True)[0]
@@ -728,6 +694,7 @@ class QueryBudgetHybridClassifier:
         *,
         selected_tools: Optional[List[Any]] = None,
         tone_signal: Optional[Dict[str, Any]] = None,
+        embedding_ctx: Any = None,
     ) -> Dict[str, Any]:
         text = str(user_text or "").strip()
         if not text:
@@ -759,7 +726,7 @@ class QueryBudgetHybridClassifier:
         embedding_sim = 0.0
 
         if confidence < 0.78:
-            refined = await self._embedding_refine(text)
+            refined = await self._embedding_refine(text, embedding_ctx)
             if refined:
                 refined_type = str(refined.get("query_type") or final_query_type)
                 embedding_sim = float(refined.get("similarity", 0.0) or 0.0)
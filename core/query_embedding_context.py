@@ -0,0 +1,89 @@
+"""
+Per-turn query embedding context for Layer-0 signals.
+
+Design:
+- created once per chat turn by the orchestrator flow
+- passed to ToneHybrid / QueryBudget / DomainRouter classifiers and ToolSelector
+- each distinct text is embedded at most once; concurrent callers await the
+  same in-flight request, failures are shared too (no retry storm on a slow host)
+- reports how many embedding calls the turn saved
+"""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import httpx
+
+from config import OLLAMA_BASE, get_embedding_model
+from utils.logger import log_debug
+from utils.role_endpoint_resolver import resolve_role_endpoint
+
+EmbedFn = Callable[[str], Awaitable[Optional[List[float]]]]
+
+
+async def fetch_query_embedding(text: str, timeout_s: float = 2.0) -> Optional[List[float]]:
+    """Single embedding request against the embedding role endpoint."""
+    route = resolve_role_endpoint("embedding", default_endpoint=OLLAMA_BASE)
+    if route.get("hard_error"):
+        return None
+    endpoint = route.get("endpoint") or OLLAMA_BASE
+    payload = {"model": get_embedding_model(), "prompt": text}
+    try:
+        async with httpx.AsyncClient(timeout=timeout_s) as client:
+            resp = await client.post(f"{endpoint}/api/embeddings", json=payload)
+            resp.raise_for_status()
+            data = resp.json()
+        vec = data.get("embedding")
+        if isinstance(vec, list) and vec:
+            return [float(v) for v in vec]
+    except Exception as e:
+        log_debug(f"[QueryEmbeddings] Embedding unavailable: {type(e).__name__}: {e}")
+    return None
+
+
+class QueryEmbeddingContext:
+    def __init__(self) -> None:
+        self._tasks: Dict[str, "asyncio.Future[Optional[List[float]]]"] = {}
+        self.requests = 0
+        self.computed = 0
+
+    @staticmethod
+    def _key(text: str) -> str:
+        return str(text or "").strip()
+
+    async def embed(self, text: str, fetch: EmbedFn) -> Optional[List[float]]:
+        """
+        Returns the embedding for `text`, calling `fetch` only for the first
+        request of that text in this turn.
+        """
+        key = self._key(text)
+        if not key:
+            return None
+        self.requests += 1
+        task = self._tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fetch(text))
+            self._tasks[key] = task
+            self.computed += 1
+        try:
+            # shield: a caller that gives up must not cancel the shared request
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log_debug(f"[QueryEmbeddings] shared embedding failed: {type(e).__name__}: {e}")
+            return None
+
+    @property
+    def saved(self) -> int:
+        return max(0, self.requests - self.computed)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "computed": self.computed,
+            "saved": self.saved,
+            "texts": len(self._tasks),
+        }
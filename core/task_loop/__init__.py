@@ -42,13 +42,21 @@ from core.task_loop.runner import (
     stream_chat_auto_loop,
 )
 from core.task_loop.progress_policy import TaskLoopProgressAssessment, assess_task_loop_progress
-from core.task_loop.store import TaskLoopStore, get_task_loop_store
+from core.task_loop.store import (
+    SqliteTaskLoopStore,
+    TaskLoopStore,
+    TaskLoopVersionConflict,
+    commit_task_loop_snapshot,
+    get_task_loop_store,
+    make_task_loop_store,
+)
 
 __all__ = [
     "RiskLevel",
     "ReflectionAction",
     "ReflectionDecision",
     "StopDecision",
+    "SqliteTaskLoopStore",
     "StopReason",
     "TASK_LOOP_EVENT_TYPES",
     "TaskLoopEventType",
@@ -60,12 +68,14 @@ __all__ = [
     "TaskLoopStep",
     "TaskLoopStore",
     "TaskLoopTransitionError",
+    "TaskLoopVersionConflict",
     "TaskLoopRunResult",
     "TaskLoopStreamChunk",
     "build_completion_message",
     "build_task_loop_workspace_summary",
     "build_task_loop_steps",
     "clean_task_loop_objective",
+    "commit_task_loop_snapshot",
     "completion_detail",
     "create_task_loop_snapshot_from_plan",
     "detect_loop",
@@ -77,6 +87,7 @@ __all__ = [
     "get_task_loop_store",
     "is_task_loop_complete",
     "make_task_loop_event",
+    "make_task_loop_store",
     "persist_task_loop_workspace_event",
     "reflect_after_chat_step",
     "run_chat_auto_loop",
@@ -25,7 +25,10 @@ from core.task_loop.planner import (
     build_task_loop_steps,
     create_task_loop_snapshot_from_plan,
 )
-from core.task_loop.store import TaskLoopStore, get_task_loop_store
+from core.task_loop.store import TaskLoopStore, commit_task_loop_snapshot, get_task_loop_store
+
+
+VERSION_CONFLICT_DONE_REASON = "task_loop_version_conflict"
 
 
 @dataclass(frozen=True)
@@ -247,6 +250,30 @@ def _needs_concrete_input(snapshot: TaskLoopSnapshot) -> bool:
 
 
 
+def _commit_turn(
+    store: TaskLoopStore,
+    turn: TaskLoopChatTurn,
+    *,
+    restart: bool = False,
+) -> TaskLoopChatTurn:
+    """
+    Speichert den Snapshot des Turns. Hat ein anderer Worker den Loop inzwischen
+    weitergefuehrt, gilt dessen Stand und der User bekommt einen Hinweis.
+    Ein expliziter (Neu-)Start ersetzt den gespeicherten Loop immer.
+    """
+    rebase = (lambda _current: turn.snapshot) if restart else None
+    stored, written = commit_task_loop_snapshot(store, turn.snapshot, rebase=rebase)
+    if written:
+        return turn
+    return TaskLoopChatTurn(
+        content=load_prompt("task_loop", "version_conflict"),
+        done_reason=VERSION_CONFLICT_DONE_REASON,
+        snapshot=stored or turn.snapshot,
+        events=turn.events,
+        workspace_updates=turn.workspace_updates,
+    )
+
+
 def start_chat_task_loop(
     user_text: str,
     conversation_id: str,
@@ -257,7 +284,7 @@ def start_chat_task_loop(
     auto_continue: bool = True,
     thinking_plan: Optional[Dict[str, Any]] = None,
 ) -> TaskLoopChatTurn:
-    store = store or get_task_loop_store()
+    store = store if store is not None else get_task_loop_store()
     snapshot = create_task_loop_snapshot(
         user_text,
         conversation_id,
@@ -277,13 +304,16 @@ def start_chat_task_loop(
             save_workspace_entry_fn=save_workspace_entry_fn,
         )
         final_snapshot = replace(run.snapshot, workspace_event_ids=event_ids)
-        store.put(final_snapshot)
-        return TaskLoopChatTurn(
-            content=run.content,
-            done_reason=run.done_reason,
-            snapshot=final_snapshot,
-            events=run.events,
-            workspace_updates=workspace_updates,
+        return _commit_turn(
+            store,
+            TaskLoopChatTurn(
+                content=run.content,
+                done_reason=run.done_reason,
+                snapshot=final_snapshot,
+                events=run.events,
+                workspace_updates=workspace_updates,
+            ),
+            restart=True,
         )
 
     executing = transition_task_loop(snapshot, TaskLoopState.EXECUTING)
@@ -328,13 +358,16 @@ def start_chat_task_loop(
         save_workspace_entry_fn=save_workspace_entry_fn,
     )
     final_snapshot = replace(final_snapshot, workspace_event_ids=event_ids)
-    store.put(final_snapshot)
-    return TaskLoopChatTurn(
-        content=answer,
-        done_reason=done_reason,
-        snapshot=final_snapshot,
-        events=events,
-        workspace_updates=workspace_updates,
+    return _commit_turn(
+        store,
+        TaskLoopChatTurn(
+            content=answer,
+            done_reason=done_reason,
+            snapshot=final_snapshot,
+            events=events,
+            workspace_updates=workspace_updates,
+        ),
+        restart=True,
     )
 
 
@@ -345,7 +378,7 @@ def continue_chat_task_loop(
     store: Optional[TaskLoopStore] = None,
     save_workspace_entry_fn: Optional[Callable[..., Optional[Dict[str, Any]]]] = None,
 ) -> TaskLoopChatTurn:
-    store = store or get_task_loop_store()
+    store = store if store is not None else get_task_loop_store()
     conversation_id = snapshot.conversation_id
 
     # Terminal-Guard: bereits abgeschlossene oder abgebrochene Loops unveraendert zurueckgeben
@@ -375,13 +408,15 @@ def continue_chat_task_loop(
             save_workspace_entry_fn=save_workspace_entry_fn,
         )
         cancelled = replace(cancelled, workspace_event_ids=snapshot.workspace_event_ids + event_ids)
-        store.put(cancelled)
-        return TaskLoopChatTurn(
-            content="Task-Loop gestoppt. Es wurden keine weiteren Schritte ausgefuehrt.",
-            done_reason="task_loop_cancelled",
-            snapshot=cancelled,
-            events=events,
-            workspace_updates=workspace_updates,
+        return _commit_turn(
+            store,
+            TaskLoopChatTurn(
+                content="Task-Loop gestoppt. Es wurden keine weiteren Schritte ausgefuehrt.",
+                done_reason="task_loop_cancelled",
+                snapshot=cancelled,
+                events=events,
+                workspace_updates=workspace_updates,
+            ),
         )
 
     # Wenn der aktuelle Step auf konkrete Parameter wartet (z.B. Blueprintauswahl,
@@ -400,13 +435,15 @@ def continue_chat_task_loop(
             conversation_id=conversation_id,
             save_workspace_entry_fn=save_workspace_entry_fn,
         )
-        store.put(waiting)
-        return TaskLoopChatTurn(
-            content=waiting.last_user_visible_answer,
-            done_reason="task_loop_waiting_for_user",
-            snapshot=waiting,
-            events=events,
-            workspace_updates=workspace_updates,
+        return _commit_turn(
+            store,
+            TaskLoopChatTurn(
+                content=waiting.last_user_visible_answer,
+                done_reason="task_loop_waiting_for_user",
+                snapshot=waiting,
+                events=events,
+                workspace_updates=workspace_updates,
+            ),
         )
 
     # Alles andere: Loop mit User-Text als Kontext fortsetzen.
@@ -426,13 +463,15 @@ def continue_chat_task_loop(
         run.snapshot,
         workspace_event_ids=list(snapshot.workspace_event_ids) + event_ids,
     )
-    store.put(final_snapshot)
-    return TaskLoopChatTurn(
-        content=run.content,
-        done_reason=run.done_reason,
-        snapshot=final_snapshot,
-        events=run.events,
-        workspace_updates=workspace_updates,
+    return _commit_turn(
+        store,
+        TaskLoopChatTurn(
+            content=run.content,
+            done_reason=run.done_reason,
+            snapshot=final_snapshot,
+            events=run.events,
+            workspace_updates=workspace_updates,
+        ),
     )
 
 
@@ -446,7 +485,7 @@ def maybe_handle_chat_task_loop_turn(
     thinking_plan: Optional[Dict[str, Any]] = None,
     force_start: bool = False,
 ) -> Optional[TaskLoopChatTurn]:
-    store = store or get_task_loop_store()
+    store = store if store is not None else get_task_loop_store()
     active = store.get_active(conversation_id)
     if active is not None:
         if force_start or should_restart_task_loop(user_text, raw_request):
@@ -1,14 +1,15 @@
 from __future__ import annotations
 
 from dataclasses import replace
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from core.task_loop.contracts import TaskLoopSnapshot
+from core.task_loop.contracts import TERMINAL_STATES, TaskLoopSnapshot
 from core.task_loop.events import (
     TaskLoopEventType,
     make_task_loop_event,
     persist_task_loop_workspace_event,
 )
+from core.task_loop.store import TaskLoopStore, commit_task_loop_snapshot
 
 
 def _clip(text: Any, limit: int = 400) -> str:
@@ -101,3 +102,30 @@ def persist_context_only_turn(
     if event_ids:
         updated = replace(updated, workspace_event_ids=list(updated.workspace_event_ids) + event_ids)
     return updated, event, workspace_updates, event_ids
+
+
+def commit_context_only_turn(
+    store: TaskLoopStore,
+    updated: TaskLoopSnapshot,
+    assistant_text: str,
+    *,
+    done_reason: str = "",
+    event_ids: Sequence[str] = (),
+) -> Optional[TaskLoopSnapshot]:
+    """
+    Schreibt einen Context-only-Turn in den Store. Hat ein anderer Worker den
+    Loop inzwischen weitergefuehrt, wird der Turn auf dessen Stand neu
+    angewendet; ist der Loop dort beendet oder ersetzt, bleibt er unveraendert.
+    Returns den gespeicherten Snapshot (None, wenn der Loop entfernt wurde).
+    """
+
+    def _rebase(current: Optional[TaskLoopSnapshot]) -> Optional[TaskLoopSnapshot]:
+        if current is None or current.objective_id != updated.objective_id or current.state in TERMINAL_STATES:
+            return None
+        rebased = apply_context_only_turn_to_snapshot(current, assistant_text, done_reason=done_reason)
+        if event_ids:
+            rebased = replace(rebased, workspace_event_ids=list(rebased.workspace_event_ids) + list(event_ids))
+        return rebased
+
+    stored, _written = commit_task_loop_snapshot(store, updated, rebase=_rebase)
+    return stored
@@ -311,6 +311,42 @@ class TaskLoopSnapshot:
             "objective_summary": self.objective_summary,
         }
 
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TaskLoopSnapshot":
+        """Inverse of ``to_dict`` (used by persistent task-loop stores)."""
+        stop_reason = data.get("stop_reason")
+        return cls(
+            objective_id=str(data.get("objective_id") or ""),
+            conversation_id=str(data.get("conversation_id") or ""),
+            plan_id=str(data.get("plan_id") or ""),
+            state=TaskLoopState(data.get("state") or TaskLoopState.PLANNING.value),
+            step_index=int(data.get("step_index") or 0),
+            current_step_id=str(data.get("current_step_id") or ""),
+            current_step_type=TaskLoopStepType(
+                data.get("current_step_type") or TaskLoopStepType.ANALYSIS.value
+            ),
+            current_step_status=TaskLoopStepStatus(
+                data.get("current_step_status") or TaskLoopStepStatus.PENDING.value
+            ),
+            step_execution_source=TaskLoopStepExecutionSource(
+                data.get("step_execution_source") or TaskLoopStepExecutionSource.LOOP.value
+            ),
+            current_plan=list(data.get("current_plan") or []),
+            plan_steps=list(data.get("plan_steps") or []),
+            completed_steps=list(data.get("completed_steps") or []),
+            pending_step=str(data.get("pending_step") or ""),
+            last_user_visible_answer=str(data.get("last_user_visible_answer") or ""),
+            stop_reason=StopReason(stop_reason) if stop_reason else None,
+            risk_level=RiskLevel(data.get("risk_level") or RiskLevel.SAFE.value),
+            tool_trace=list(data.get("tool_trace") or []),
+            verified_artifacts=list(data.get("verified_artifacts") or []),
+            last_step_result=dict(data.get("last_step_result") or {}),
+            workspace_event_ids=list(data.get("workspace_event_ids") or []),
+            error_count=int(data.get("error_count") or 0),
+            no_progress_count=int(data.get("no_progress_count") or 0),
+            objective_summary=str(data.get("objective_summary") or ""),
+        )
+
 
 def transition_task_loop(
     snapshot: TaskLoopSnapshot,
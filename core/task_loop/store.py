@@ -1,48 +1,423 @@
+"""
+Task-loop snapshot stores.
+
+- TaskLoopStore: in-process store (LRU-bounded, terminal loops expire after a TTL)
+- SqliteTaskLoopStore: shared SQLite/WAL store for multi-worker setups with a
+  small in-process hot tier and optimistic versioning per conversation
+
+``get_task_loop_store()`` returns the process-wide store selected by
+``make_task_loop_store()`` (TRION_TASK_LOOP_STORE_BACKEND, default sqlite).
+Callers write through ``commit_task_loop_snapshot()``, which resolves version
+conflicts between workers instead of failing the turn.
+"""
+
 from __future__ import annotations
 
+import json
+import os
+import sqlite3
 import threading
-from typing import Dict, Optional
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from core.task_loop.contracts import TERMINAL_STATES, TaskLoopSnapshot
+from utils.logger import log_info, log_warn
+
+_TERMINAL_VALUES = tuple(sorted(state.value for state in TERMINAL_STATES))
+
+
+class TaskLoopVersionConflict(RuntimeError):
+    """Raised when another worker advanced a task loop since this store last saw it."""
+
+    def __init__(self, conversation_id: str, expected: int, actual: int) -> None:
+        super().__init__(
+            f"task loop version conflict for {conversation_id}: expected={expected} actual={actual}"
+        )
+        self.conversation_id = conversation_id
+        self.expected = expected
+        self.actual = actual
 
-from core.task_loop.contracts import TaskLoopSnapshot, TaskLoopState
+
+def _key(conversation_id: str) -> str:
+    return str(conversation_id or "").strip()
+
+
+def encode_task_loop_snapshot(snapshot: TaskLoopSnapshot) -> str:
+    return json.dumps(snapshot.to_dict(), separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def decode_task_loop_snapshot(payload: str) -> TaskLoopSnapshot:
+    return TaskLoopSnapshot.from_dict(json.loads(payload))
 
 
 class TaskLoopStore:
     """Small in-process store for active chat task-loop snapshots."""
 
-    def __init__(self) -> None:
+    def __init__(self, *, max_entries: int = 1000, terminal_ttl_s: float = 3600.0) -> None:
         self._lock = threading.Lock()
-        self._by_conversation: Dict[str, TaskLoopSnapshot] = {}
+        self._by_conversation: "OrderedDict[str, TaskLoopSnapshot]" = OrderedDict()
+        self._terminal_since: Dict[str, float] = {}
+        self._max_entries = max(1, int(max_entries))
+        self._terminal_ttl_s = float(terminal_ttl_s)
 
     def get(self, conversation_id: str) -> Optional[TaskLoopSnapshot]:
-        key = str(conversation_id or "").strip()
+        key = _key(conversation_id)
         if not key:
             return None
         with self._lock:
-            return self._by_conversation.get(key)
+            self._prune_unlocked(time.time())
+            snapshot = self._by_conversation.get(key)
+            if snapshot is not None:
+                self._by_conversation.move_to_end(key)
+            return snapshot
 
     def put(self, snapshot: TaskLoopSnapshot) -> TaskLoopSnapshot:
+        key = snapshot.conversation_id
+        now = time.time()
         with self._lock:
-            self._by_conversation[snapshot.conversation_id] = snapshot
+            self._by_conversation[key] = snapshot
+            self._by_conversation.move_to_end(key)
+            if snapshot.state in TERMINAL_STATES:
+                self._terminal_since.setdefault(key, now)
+            else:
+                self._terminal_since.pop(key, None)
+            self._prune_unlocked(now)
         return snapshot
 
     def clear(self, conversation_id: str) -> None:
-        key = str(conversation_id or "").strip()
+        key = _key(conversation_id)
         if not key:
             return
         with self._lock:
             self._by_conversation.pop(key, None)
+            self._terminal_since.pop(key, None)
 
     def get_active(self, conversation_id: str) -> Optional[TaskLoopSnapshot]:
         snapshot = self.get(conversation_id)
         if snapshot is None:
             return None
-        if snapshot.state in {TaskLoopState.COMPLETED, TaskLoopState.CANCELLED}:
+        if snapshot.state in TERMINAL_STATES:
             return None
         return snapshot
 
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._by_conversation)
+
+    def _prune_unlocked(self, now: float) -> None:
+        # Abgeschlossene Loops nach TTL verwerfen, danach LRU-Grenze durchsetzen.
+        if self._terminal_since:
+            cutoff = now - self._terminal_ttl_s
+            for key in [k for k, ts in self._terminal_since.items() if ts <= cutoff]:
+                self._by_conversation.pop(key, None)
+                self._terminal_since.pop(key, None)
+        while len(self._by_conversation) > self._max_entries:
+            key, _ = self._by_conversation.popitem(last=False)
+            self._terminal_since.pop(key, None)
+
+
+class SqliteTaskLoopStore(TaskLoopStore):
+    """
+    SQLite-backed snapshot store shared by all workers on one host.
+
+    Every conversation row carries a version. A worker remembers the version of
+    every conversation it read or wrote and writes with compare-and-set, so a
+    stale worker gets TaskLoopVersionConflict instead of clobbering the newer
+    loop state. The versions outlive the LRU-bounded hot tier of decoded
+    snapshots; they are dropped together with the row (clear/prune). Reads
+    return the hot copy while the row version is unchanged and only decode the
+    payload when another worker wrote it.
+    """
+
+    def __init__(
+        self,
+        *,
+        db_path: str = "/tmp/trion_task_loop_store.sqlite",
+        hot_max_entries: int = 256,
+        terminal_ttl_s: float = 3600.0,
+        prune_interval_s: float = 60.0,
+    ) -> None:
+        self._lock = threading.Lock()
+        self._db_path = db_path
+        self._hot: "OrderedDict[str, Tuple[int, TaskLoopSnapshot]]" = OrderedDict()
+        self._versions: Dict[str, int] = {}  # zuletzt gesehene Version, unabhängig vom Hot-Tier
+        self._max_entries = max(1, int(hot_max_entries))
+        self._terminal_ttl_s = float(terminal_ttl_s)
+        self._prune_interval_s = float(prune_interval_s)
+        self._last_prune = 0.0
+        self._stats = {"hot_hits": 0, "decodes": 0, "writes": 0, "conflicts": 0, "pruned": 0}
+        self._init_db()
+
+    def _conn(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._db_path, timeout=5.0, isolation_level=None)
+
+    def _init_db(self) -> None:
+        parent = os.path.dirname(self._db_path)
+        if parent:
+            os.makedirs(parent, exist_ok=True)
+        with self._conn() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS task_loop_snapshots (
+                    conversation_id TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL,
+                    state TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    payload TEXT NOT NULL
+                )
+                """
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_task_loop_state_updated "
+                "ON task_loop_snapshots(state, updated_at)"
+            )
+
+    # ── hot tier ────────────────────────────────────────────────
+
+    def _hot_get_unlocked(self, key: str) -> Optional[Tuple[int, TaskLoopSnapshot]]:
+        entry = self._hot.get(key)
+        if entry is not None:
+            self._hot.move_to_end(key)
+        return entry
+
+    def _hot_put_unlocked(self, key: str, version: int, snapshot: TaskLoopSnapshot) -> None:
+        self._versions[key] = version
+        self._hot[key] = (version, snapshot)
+        self._hot.move_to_end(key)
+        while len(self._hot) > self._max_entries:
+            self._hot.popitem(last=False)
+
+    # ── public API ──────────────────────────────────────────────
+
+    def get_versioned(self, conversation_id: str) -> Optional[Tuple[int, TaskLoopSnapshot]]:
+        key = _key(conversation_id)
+        if not key:
+            return None
+        with self._lock:
+            hot = self._hot_get_unlocked(key)
+        known_version = hot[0] if hot else -1
+        try:
+            with self._conn() as conn:
+                row = conn.execute(
+                    "SELECT version, CASE WHEN version = ? THEN NULL ELSE payload END "
+                    "FROM task_loop_snapshots WHERE conversation_id = ?",
+                    (known_version, key),
+                ).fetchone()
+        except Exception as e:
+            log_warn(f"[TaskLoopStore] sqlite get failed for {key}: {e}")
+            return hot
+        with self._lock:
+            if row is None:
+                self._hot.pop(key, None)
+                self._versions.pop(key, None)
+                return None
+            version, payload = int(row[0]), row[1]
+            if payload is None and hot is not None:
+                self._stats["hot_hits"] += 1
+                self._versions[key] = version
+                return hot
+            snapshot = decode_task_loop_snapshot(payload)
+            self._stats["decodes"] += 1
+            self._hot_put_unlocked(key, version, snapshot)
+            return version, snapshot
+
+    def get(self, conversation_id: str) -> Optional[TaskLoopSnapshot]:
+        entry = self.get_versioned(conversation_id)
+        return entry[1] if entry else None
+
+    def put(
+        self,
+        snapshot: TaskLoopSnapshot,
+        *,
+        expected_version: Optional[int] = None,
+    ) -> TaskLoopSnapshot:
+        """
+        Persist `snapshot`. Without `expected_version` the version this worker
+        last saw is used, even after its snapshot left the hot tier; only a
+        conversation this worker never read or wrote is upserted.
+        """
+        key = snapshot.conversation_id
+        if expected_version is None:
+            with self._lock:
+                expected = self._versions.get(key)
+        else:
+            expected = int(expected_version)
+        payload = encode_task_loop_snapshot(snapshot)
+        now = time.time()
+
+        conn = self._conn()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT version FROM task_loop_snapshots WHERE conversation_id = ?", (key,)
+            ).fetchone()
+            current = int(row[0]) if row else 0
+            if expected is not None and current != expected:
+                conn.execute("ROLLBACK")
+                with self._lock:
+                    # Version bleibt stehen: weitere Writes scheitern, bis neu gelesen wurde.
+                    self._hot.pop(key, None)
+                    self._stats["conflicts"] += 1
+                raise TaskLoopVersionConflict(key, expected, current)
+            version = current + 1
+            conn.execute(
+                "INSERT OR REPLACE INTO task_loop_snapshots "
+                "(conversation_id, version, state, updated_at, payload) VALUES (?, ?, ?, ?, ?)",
+                (key, version, snapshot.state.value, now, payload),
+            )
+            conn.execute("COMMIT")
+        except TaskLoopVersionConflict:
+            raise
+        except Exception:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+
+        with self._lock:
+            self._hot_put_unlocked(key, version, snapshot)
+            self._stats["writes"] += 1
+            prune_due = now - self._last_prune >= self._prune_interval_s
+            if prune_due:
+                self._last_prune = now
+        if prune_due:
+            self.prune_terminal(now=now)
+        return snapshot
+
+    def clear(self, conversation_id: str) -> None:
+        key = _key(conversation_id)
+        if not key:
+            return
+        with self._lock:
+            self._hot.pop(key, None)
+            self._versions.pop(key, None)
+        try:
+            with self._conn() as conn:
+                conn.execute("DELETE FROM task_loop_snapshots WHERE conversation_id = ?", (key,))
+        except Exception as e:
+            log_warn(f"[TaskLoopStore] sqlite clear failed for {key}: {e}")
+
+    def prune_terminal(self, *, now: Optional[float] = None) -> int:
+        """Delete COMPLETED/CANCELLED loops older than the terminal TTL."""
+        cutoff = (time.time() if now is None else now) - self._terminal_ttl_s
+        placeholders = ",".join("?" for _ in _TERMINAL_VALUES)
+        where = f"state IN ({placeholders}) AND updated_at <= ?"
+        conn = self._conn()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            keys = [
+                row[0]
+                for row in conn.execute(
+                    f"SELECT conversation_id FROM task_loop_snapshots WHERE {where}",
+                    (*_TERMINAL_VALUES, cutoff),
+                )
+            ]
+            if keys:
+                conn.execute(f"DELETE FROM task_loop_snapshots WHERE {where}", (*_TERMINAL_VALUES, cutoff))
+            conn.execute("COMMIT")
+        except Exception as e:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            log_warn(f"[TaskLoopStore] sqlite prune failed: {e}")
+            return 0
+        finally:
+            conn.close()
+        with self._lock:
+            for key in keys:
+                self._hot.pop(key, None)
+                self._versions.pop(key, None)
+            self._stats["pruned"] += len(keys)
+        return len(keys)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {**self._stats, "hot_entries": len(self._hot), "db_path": self._db_path}
+
+    def __len__(self) -> int:
+        try:
+            with self._conn() as conn:
+                return int(conn.execute("SELECT COUNT(*) FROM task_loop_snapshots").fetchone()[0])
+        except Exception:
+            return 0
+
+
+def _supersedes(ours: TaskLoopSnapshot, current: Optional[TaskLoopSnapshot]) -> bool:
+    # Gleicher Loop: der weiter fortgeschrittene Stand gewinnt, Abbruch/Abschluss immer.
+    # Fremder oder geloeschter Loop: der andere Worker hat neu gestartet/aufgeraeumt.
+    if current is None or current.objective_id != ours.objective_id:
+        return False
+    if current.state in TERMINAL_STATES:
+        return False
+    return ours.state in TERMINAL_STATES or ours.step_index > current.step_index
+
+
+def commit_task_loop_snapshot(
+    store: TaskLoopStore,
+    snapshot: TaskLoopSnapshot,
+    *,
+    rebase: Optional[Callable[[Optional[TaskLoopSnapshot]], Optional[TaskLoopSnapshot]]] = None,
+    max_attempts: int = 3,
+) -> Tuple[Optional[TaskLoopSnapshot], bool]:
+    """
+    store.put() with conflict resolution for shared stores.
+
+    On TaskLoopVersionConflict the current row is re-read. `rebase(current)`
+    re-applies the caller's change on top of it (None keeps the stored state);
+    without `rebase` our snapshot is retried only when it supersedes the stored
+    one (same objective and further along, or terminal). Otherwise the other
+    worker's state stands.
+
+    Returns (stored snapshot, written): written=False means another worker's
+    snapshot (or None, if it cleared the loop) was kept and ours was dropped.
+    """
+    candidate = snapshot
+    for _ in range(max(1, int(max_attempts))):
+        try:
+            return store.put(candidate), True
+        except TaskLoopVersionConflict as conflict:
+            log_warn(f"[TaskLoopStore] {conflict}; re-reading current snapshot")
+        current_entry = store.get_versioned(snapshot.conversation_id)
+        current = current_entry[1] if current_entry else None
+        if rebase is not None:
+            candidate = rebase(current)
+        elif not _supersedes(snapshot, current):
+            candidate = None
+        if candidate is None:
+            return current, False
+    current_entry = store.get_versioned(snapshot.conversation_id)
+    return (current_entry[1] if current_entry else None), False
+
+
+def make_task_loop_store() -> TaskLoopStore:
+    backend = os.getenv("TRION_TASK_LOOP_STORE_BACKEND", "sqlite").strip().lower()
+    max_entries = int(os.getenv("TRION_TASK_LOOP_STORE_MAX_ENTRIES", "512"))
+    terminal_ttl_s = float(os.getenv("TRION_TASK_LOOP_TERMINAL_TTL_S", "3600"))
+    if backend in {"sqlite", "shared", "sqlite_shared"}:
+        db_path = os.getenv("TRION_TASK_LOOP_STORE_DB", "/tmp/trion_task_loop_store.sqlite")
+        try:
+            log_info(f"[TaskLoopStore] backend=sqlite db={db_path}")
+            return SqliteTaskLoopStore(
+                db_path=db_path,
+                hot_max_entries=max_entries,
+                terminal_ttl_s=terminal_ttl_s,
+            )
+        except Exception as e:
+            log_warn(f"[TaskLoopStore] sqlite backend init failed, fallback=memory: {e}")
+    return TaskLoopStore(max_entries=max_entries, terminal_ttl_s=terminal_ttl_s)
+
 
-_TASK_LOOP_STORE = TaskLoopStore()
+_TASK_LOOP_STORE: Optional[TaskLoopStore] = None
+_TASK_LOOP_STORE_LOCK = threading.Lock()
 
 
 def get_task_loop_store() -> TaskLoopStore:
+    global _TASK_LOOP_STORE
+    if _TASK_LOOP_STORE is None:
+        with _TASK_LOOP_STORE_LOCK:
+            if _TASK_LOOP_STORE is None:
+                _TASK_LOOP_STORE = make_task_loop_store()
     return _TASK_LOOP_STORE
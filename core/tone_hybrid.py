@@ -9,15 +9,13 @@ Design:
 
 from __future__ import annotations
 
-import asyncio
-import math
 import re
-import time
 from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
 
 from config import OLLAMA_BASE, get_embedding_model
+from core.prototype_registry import get_prototype_registry
 from utils.logger import log_debug, log_warning
 from utils.role_endpoint_resolver import resolve_role_endpoint
 
@@ -115,10 +113,6 @@ class ToneHybridClassifier:
     }
 
     def __init__(self):
-        self._prototype_cache: Dict[str, List[float]] = {}
-        self._prototype_cache_ts = 0.0
-        self._prototype_lock = asyncio.Lock()
-        self._prototype_cache_ttl_s = 6 * 60 * 60
         self._embed_timeout_s = 2.8
 
     @staticmethod
@@ -146,21 +140,6 @@ class ToneHybridClassifier:
             return {k: 0.0 for k in scores}
         return {k: max(0.0, float(v) / max_v) for k, v in scores.items()}
 
-    @staticmethod
-    def _cosine_similarity(a: List[float], b: List[float]) -> float:
-        if not a or not b or len(a) != len(b):
-            return 0.0
-        dot = 0.0
-        norm_a = 0.0
-        norm_b = 0.0
-        for x, y in zip(a, b):
-            dot += x * y
-            norm_a += x * x
-            norm_b += y * y
-        if norm_a <= 0.0 or norm_b <= 0.0:
-            return 0.0
-        return dot / (math.sqrt(norm_a) * math.sqrt(norm_b))
-
     async def _embed_text(self, text: str) -> Optional[List[float]]:
         route = resolve_role_endpoint("embedding", default_endpoint=OLLAMA_BASE)
         if route.get("hard_error"):
@@ -182,29 +161,18 @@ class ToneHybridClassifier:
             log_debug(f"[ToneHybrid] Embedding unavailable: {type(e).__name__}: {e}")
         return None
 
+    async def _embed_query(self, text: str, embedding_ctx: Any = None) -> Optional[List[float]]:
+        if embedding_ctx is None:
+            return await self._embed_text(text)
+        return await embedding_ctx.embed(text, self._embed_text)
+
     async def _ensure_prototype_vectors(self) -> bool:
-        now = time.time()
-        if self._prototype_cache and (now - self._prototype_cache_ts) < self._prototype_cache_ttl_s:
-            return True
-        async with self._prototype_lock:
-            now = time.time()
-            if self._prototype_cache and (now - self._prototype_cache_ts) < self._prototype_cache_ttl_s:
-                return True
-            cache: Dict[str, List[float]] = {}
-            all_prototypes = {}
-            for key, text in self._TONE_PROTOTYPES.items():
-                all_prototypes[f"tone::{key}"] = text
-            for key, text in self._ACT_PROTOTYPES.items():
-                all_prototypes[f"act::{key}"] = text
-            for key, text in all_prototypes.items():
-                vec = await self._embed_text(text)
-                if vec:
-                    cache[key] = vec
-            if not cache:
-                return False
-            self._prototype_cache = cache
-            self._prototype_cache_ts = now
-            return True
+        registry = get_prototype_registry()
+        registry.register("tone", self._TONE_PROTOTYPES)
+        registry.register("act", self._ACT_PROTOTYPES)
+        tone = await registry.ensure("tone", self._embed_text)
+        act = await registry.ensure("act", self._embed_text)
+        return tone is not None or act is not None
 
     def _lexical_classify(self, user_text: str) -> Dict[str, Any]:
         text = (user_text or "").strip()
@@ -265,26 +233,26 @@ class ToneHybridClassifier:
             "is_question": is_question,
         }
 
-    async def _embedding_classify(self, user_text: str) -> Optional[Dict[str, Dict[str, float]]]:
+    async def _embedding_classify(
+        self,
+        user_text: str,
+        embedding_ctx: Any = None,
+    ) -> Optional[Dict[str, Dict[str, float]]]:
         if not await self._ensure_prototype_vectors():
             return None
-        query_vec = await self._embed_text(user_text)
+        query_vec = await self._embed_query(user_text, embedding_ctx)
         if not query_vec:
             return None
 
+        registry = get_prototype_registry()
         tone_scores: Dict[str, float] = {}
-        for label in self._TONE_LABELS:
-            vec = self._prototype_cache.get(f"tone::{label}")
-            if not vec:
-                continue
-            tone_scores[label] = (self._cosine_similarity(query_vec, vec) + 1.0) / 2.0
-
         act_scores: Dict[str, float] = {}
-        for label in self._ACT_LABELS:
-            vec = self._prototype_cache.get(f"act::{label}")
-            if not vec:
+        for namespace, out in (("tone", tone_scores), ("act", act_scores)):
+            matrix = registry.get(namespace)
+            if matrix is None:
                 continue
-            act_scores[label] = (self._cosine_similarity(query_vec, vec) + 1.0) / 2.0
+            for label, sim in matrix.scores(query_vec).items():
+                out[label] = (sim + 1.0) / 2.0
 
         return {
             "tone_scores": self._normalize_scores(tone_scores),
@@ -320,7 +288,13 @@ class ToneHybridClassifier:
             return "medium"
         return "medium"
 
-    async def classify(self, user_text: str, messages: Optional[List[Any]] = None) -> Dict[str, Any]:
+    async def classify(
+        self,
+        user_text: str,
+        messages: Optional[List[Any]] = None,
+        *,
+        embedding_ctx: Any = None,
+    ) -> Dict[str, Any]:
         _ = messages  # reserved for future history-aware scoring
 
         text = (user_text or "").strip()
@@ -342,7 +316,7 @@ class ToneHybridClassifier:
         lexical_margin = min(self._margin(lex_tone_scores), self._margin(lex_act_scores))
 
         use_embedding = lexical_margin < 0.28 or len(text) > 140
-        emb = await self._embedding_classify(text) if use_embedding else None
+        emb = await self._embedding_classify(text, embedding_ctx) if use_embedding else None
 
         if emb:
             tone_scores = {}
@@ -11,9 +11,11 @@ from typing import List, Dict, Optional, Any
 
 from config import (
     ENABLE_TOOL_SELECTOR,
+    get_embedding_model,
     get_tool_selector_candidate_limit,
     get_tool_selector_min_similarity,
 )
+from core.query_embedding_context import fetch_query_embedding
 from mcp.hub import get_hub
 
 logger = logging.getLogger(__name__)
@@ -24,10 +26,17 @@ class ToolSelector:
         self.hub = get_hub()
         self._semantic_unavailable_logged = False
 
-    async def select_tools(self, user_text: str, context_summary: str = "") -> Optional[List[str]]:
+    async def select_tools(
+        self,
+        user_text: str,
+        context_summary: str = "",
+        embedding_ctx: Any = None,
+    ) -> Optional[List[str]]:
         """
         Gibt Tool-Kandidaten zurück (Semantic Search, kein LLM).
         ControlLayer entscheidet final welche davon genutzt werden.
+        Mit embedding_ctx (QueryEmbeddingContext) wird das Query-Embedding
+        mit den Hybrid-Klassifikatoren des Turns geteilt.
 
         Returns:
             List[str]: Kandidaten-Namen.
@@ -43,7 +52,10 @@ class ToolSelector:
             if context_summary and len(user_text.split()) < 5:
                 search_query = f"{user_text}. Context: {context_summary[-200:]}"
                 logger.info("[ToolSelector] Short-input enriched with context_summary")
-            candidates = await self._get_candidates(search_query)
+            if embedding_ctx is None:
+                candidates = await self._get_candidates(search_query)
+            else:
+                candidates = await self._get_candidates(search_query, embedding_ctx=embedding_ctx)
             if not candidates:
                 return None
             names = [c["name"] for c in candidates]
@@ -53,7 +65,7 @@ class ToolSelector:
             logger.error(f"[ToolSelector] Error: {e}")
             return None
 
-    async def _get_candidates(self, query: str) -> List[Dict[str, Any]]:
+    async def _get_candidates(self, query: str, embedding_ctx: Any = None) -> List[Dict[str, Any]]:
         """Semantic Search → Tool-Kandidaten. Kein LLM-Call."""
         if not self.hub.get_mcp_for_tool("memory_semantic_search"):
             # Startup race recovery: refresh once if sql-memory came up late.
@@ -72,18 +84,21 @@ class ToolSelector:
         try:
             limit = get_tool_selector_candidate_limit()
             min_similarity = get_tool_selector_min_similarity()
+            args: Dict[str, Any] = {
+                "query": query,
+                "limit": limit,
+                "min_similarity": min_similarity,
+            }
+            if embedding_ctx is not None:
+                # sql-memory übernimmt den Vektor nur bei gleichem Modell, sonst embeddet es selbst.
+                query_embedding = await embedding_ctx.embed(query, fetch_query_embedding)
+                if query_embedding:
+                    args["query_embedding"] = query_embedding
+                    args["query_embedding_model"] = get_embedding_model()
             if hasattr(self.hub, "call_tool_async"):
-                result = await self.hub.call_tool_async("memory_semantic_search", {
-                    "query": query,
-                    "limit": limit,
-                    "min_similarity": min_similarity,
-                })
+                result = await self.hub.call_tool_async("memory_semantic_search", args)
             else:
-                result = await asyncio.to_thread(self.hub.call_tool, "memory_semantic_search", {
-                    "query": query,
-                    "limit": limit,
-                    "min_similarity": min_similarity,
-                })
+                result = await asyncio.to_thread(self.hub.call_tool, "memory_semantic_search", args)
             if isinstance(result, dict) and result.get("error"):
                 logger.warning(f"[ToolSelector] Semantic search error: {result.get('error')}")
                 return []
@@ -360,6 +360,7 @@ class WorkspaceEventListTool(BaseNativeTool):
     conversation_id: Optional[str] = Field(None, description="Filter by conversation")
     event_type: Optional[str] = Field(None, description="Filter by event type")
     limit: int = Field(10, description="Max events")
+    min_id: Optional[int] = Field(None, description="Only events with id >= min_id (cursor reads)")
 
     def execute(self) -> List[dict]:
         try:
@@ -382,6 +383,10 @@ class WorkspaceEventListTool(BaseNativeTool):
                     query += " AND event_type = ?"
                     params.append(self.event_type)
 
+                if self.min_id is not None:
+                    query += " AND id >= ?"
+                    params.append(self.min_id)
+
                 query += " ORDER BY created_at DESC LIMIT ?"
                 params.append(self.limit)
 
@@ -553,6 +558,7 @@ def get_fast_lane_tools_summary() -> List[Dict[str, Any]]:
                     "conversation_id": {"type": "string", "description": "Filter by conversation ID."},
                     "event_type": {"type": "string", "description": "Filter by event type."},
                     "limit": {"type": "integer", "description": "Max results.", "default": 20},
+                    "min_id": {"type": "integer", "description": "Only events with id >= min_id (incremental reads)."},
                 },
                 "required": [],
             },
@@ -18,6 +18,8 @@ Transportentscheidung bleibt beim Aufrufer:
 
   Sync:    result = emitter.persist(...)
            # kein yield — Entry landet in DB
+           emitter.broadcast(event)
+           # transiente Stream-Events (z.B. layer0_signals) per WebSocket spiegeln
 
   Shell:   emitter.persist_and_broadcast(...)
            # WebSocket-Broadcast intern im Emitter
@@ -248,6 +250,22 @@ class WorkspaceEventEmitter:
             logger.error("[WorkspaceEventEmitter] persist_and_broadcast failed: %s", exc)
         return WorkspaceEventResult(entry_id=None, sse_dict=None)
 
+    def broadcast(self, event: Dict[str, Any], conversation_id: str = "") -> bool:
+        """
+        Spiegelt ein transientes Stream-Event via WebSocket, ohne es zu persistieren.
+
+        Verwendung: Sync-Pfad, der kein SSE hat, aber dieselben Events wie der
+        Stream-Pfad liefern soll (z.B. layer0_signals).
+        """
+        try:
+            from container_commander.ws_stream import emit_activity
+            data = {k: v for k, v in event.items() if k != "type"}
+            emit_activity(str(event.get("type") or "event"), conversation_id=conversation_id, **data)
+            return True
+        except Exception as exc:
+            logger.debug("[WorkspaceEventEmitter] broadcast failed (non-fatal): %s", exc)
+            return False
+
 
 # ---------------------------------------------------------------------------
 # Singleton
@@ -415,21 +415,17 @@ class MaintenanceWorker:
             
             # BONUS: Graph duplicate merging
             try:
-                graph_dups = unwrap_mcp_result(call_tool("graph_find_duplicate_nodes", {}, timeout=10))
+                graph_dups = unwrap_mcp_result(call_tool("graph_find_duplicate_nodes", {}, timeout=60))
                 
                 if isinstance(graph_dups, dict):
                     dup_groups = graph_dups.get("duplicate_groups", [])
+                    clusters = [g.get("node_ids", []) for g in dup_groups if len(g.get("node_ids", [])) >= 2]
                     
-                    for group in dup_groups:
-                        if self._cancel_requested:
-                            return
-                        
-                        node_ids = group.get("node_ids", [])
-                        if len(node_ids) >= 2:
-                            # Merge graph nodes
-                            unwrap_mcp_result(call_tool("graph_merge_nodes", {
-                                "node_ids": node_ids
-                            }, timeout=10))
+                    if clusters and not self._cancel_requested:
+                        # Merge graph nodes (bulk)
+                        unwrap_mcp_result(call_tool("graph_merge_nodes", {
+                            "clusters": clusters
+                        }, timeout=60))
             except Exception as e:
                 log_error(f"Graph duplicate merge failed: {e}")
             
@@ -724,7 +720,7 @@ Zusammenfassung (max 500 Zeichen):"""
             
             # 1. Find and merge duplicate nodes
             try:
-                duplicates = unwrap_mcp_result(call_tool("graph_find_duplicate_nodes", {}, timeout=10))
+                duplicates = unwrap_mcp_result(call_tool("graph_find_duplicate_nodes", {}, timeout=60))
                 
                 if isinstance(duplicates, dict):
                     dup_groups = duplicates.get("duplicate_groups", [])
@@ -735,16 +731,15 @@ Zusammenfassung (max 500 Zeichen):"""
                         "sub_progress": 40
                     }
                     
-                    for group in dup_groups:
-                        if self._cancel_requested:
-                            return
-                        
-                        node_ids = group.get("node_ids", [])
-                        if len(node_ids) >= 2:
-                            # Merge nodes
-                            unwrap_mcp_result(call_tool("graph_merge_nodes", {
-                                "node_ids": node_ids
-                            }, timeout=10))
+                    if self._cancel_requested:
+                        return
+                    
+                    clusters = [g.get("node_ids", []) for g in dup_groups if len(g.get("node_ids", [])) >= 2]
+                    if clusters:
+                        # Merge nodes (bulk)
+                        unwrap_mcp_result(call_tool("graph_merge_nodes", {
+                            "clusters": clusters
+                        }, timeout=60))
             
             except Exception as e:
                 log_error(f"Graph duplicate merge failed: {e}")
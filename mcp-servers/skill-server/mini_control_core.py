@@ -21,13 +21,17 @@ Decision Points:
 """
 
 import asyncio
+import bisect
+import heapq
 import json
+import math
 import re
 import os
+import time
 import httpx
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, List, Optional, Any, Set, Tuple
 from pathlib import Path
 from datetime import datetime
 
@@ -105,6 +109,10 @@ AUTO_CREATE_ESCALATE_TO_DEEP = os.getenv("AUTO_CREATE_ESCALATE_TO_DEEP", "true")
 AUTO_REPAIR_ON_VALIDATION_FAIL = os.getenv("AUTO_REPAIR_ON_VALIDATION_FAIL", "true").lower() == "true"
 AUTO_REPAIR_MAX_ATTEMPTS = int(os.getenv("AUTO_REPAIR_MAX_ATTEMPTS", "1"))
 
+# Skill-Index: Draft-Manifeste werden höchstens alle N Sekunden neu ge-stat-et
+# (neue/gelöschte Draft-Ordner werden sofort über die mtime von _drafts erkannt)
+SKILL_INDEX_POLL_S = float(os.getenv("SKILL_INDEX_POLL_S", "2"))
+
 
 class ControlAction(Enum):
     """Possible actions from Mini-Control."""
@@ -207,12 +215,200 @@ class ControlDecision:
         }
 
 
+# === SKILL MATCH INDEX ===
+
+_INDEX_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def _index_tokens(text: str) -> List[str]:
+    return [t for t in _INDEX_TOKEN_RE.findall(str(text or "").lower()) if len(t) > 2]
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class SkillMatchIndex:
+    """
+    In-memory inverted index over skill names, descriptions and triggers.
+
+    Scoring is BM25 over a field-weighted bag of words (name > triggers >
+    description); query terms of 4+ chars also match token prefixes at half
+    weight, which keeps the old substring behaviour for "calc" → "calculate".
+    A character-trigram index over the same texts (as `_calculate_match_score`
+    sees them) yields every skill in which a term occurs as a substring, so
+    infix/suffix hits like "mail" → "send_email" stay candidates.
+    `sync()` diffs the installed/draft maps and only re-indexes changed skills;
+    unchanged source dicts (same objects) are a no-op.
+    """
+
+    FIELD_WEIGHTS = {"name": 3.0, "triggers": 2.0, "description": 1.0}
+    K1 = 1.2
+    B = 0.75
+    PREFIX_WEIGHT = 0.5
+
+    def __init__(self):
+        self.skills: Dict[str, Dict] = {}
+        self._sources: Tuple[Any, Any] = (None, None)
+        self._fingerprints: Dict[str, tuple] = {}
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._doc_terms: Dict[str, Dict[str, float]] = {}
+        self._doc_len: Dict[str, float] = {}
+        self._total_len = 0.0
+        self._vocab: List[str] = []
+        self._grams: Dict[str, Set[str]] = {}
+        self._doc_grams: Dict[str, Set[str]] = {}
+        self.stats = {"syncs": 0, "reindexed": 0, "removed": 0}
+
+    @staticmethod
+    def _fingerprint(info: Dict) -> tuple:
+        triggers = info.get("triggers") or []
+        if isinstance(triggers, str):
+            triggers = [triggers]
+        return (str(info.get("description") or ""), tuple(str(t) for t in triggers))
+
+    def _remove_doc(self, name: str) -> None:
+        terms = self._doc_terms.pop(name, None)
+        if terms is None:
+            return
+        self._total_len -= self._doc_len.pop(name, 0.0)
+        for term in terms:
+            posting = self._postings.get(term)
+            if posting is None:
+                continue
+            posting.pop(name, None)
+            if not posting:
+                del self._postings[term]
+                pos = bisect.bisect_left(self._vocab, term)
+                if pos < len(self._vocab) and self._vocab[pos] == term:
+                    self._vocab.pop(pos)
+        for gram in self._doc_grams.pop(name, ()):
+            holders = self._grams.get(gram)
+            if holders is None:
+                continue
+            holders.discard(name)
+            if not holders:
+                del self._grams[gram]
+
+    def _add_doc(self, name: str, fingerprint: tuple) -> None:
+        description, triggers = fingerprint
+        fields = {
+            "name": _index_tokens(name),
+            "triggers": [tok for trig in triggers for tok in _index_tokens(trig)],
+            "description": _index_tokens(description),
+        }
+        terms: Dict[str, float] = {}
+        for field_name, tokens in fields.items():
+            weight = self.FIELD_WEIGHTS[field_name]
+            for tok in tokens:
+                terms[tok] = terms.get(tok, 0.0) + weight
+        doc_len = sum(terms.values())
+        self._doc_terms[name] = terms
+        self._doc_len[name] = doc_len
+        self._total_len += doc_len
+        for term, tf in terms.items():
+            posting = self._postings.get(term)
+            if posting is None:
+                posting = self._postings[term] = {}
+                bisect.insort(self._vocab, term)
+            posting[name] = tf
+        # gleiche Normalisierung wie _calculate_match_score; pro Text, damit
+        # keine Trigramme über Trigger-Grenzen hinweg entstehen
+        grams: Set[str] = set()
+        for text in (name.lower().replace("_", " "), description.lower(), *(t.lower() for t in triggers)):
+            grams |= _trigrams(text)
+        self._doc_grams[name] = grams
+        for gram in grams:
+            holders = self._grams.get(gram)
+            if holders is None:
+                holders = self._grams[gram] = set()
+            holders.add(name)
+
+    def sync(self, installed: Dict[str, Dict], drafts: Dict[str, Dict]) -> bool:
+        """Bring the index in line with the current skill maps. Returns True if anything changed."""
+        if self._sources[0] is installed and self._sources[1] is drafts:
+            return False
+        merged = {**installed, **drafts}
+        changed = False
+        for name in [n for n in self._fingerprints if n not in merged]:
+            self._remove_doc(name)
+            del self._fingerprints[name]
+            self.stats["removed"] += 1
+            changed = True
+        for name, info in merged.items():
+            fingerprint = self._fingerprint(info if isinstance(info, dict) else {})
+            if self._fingerprints.get(name) == fingerprint:
+                continue
+            self._remove_doc(name)
+            self._add_doc(name, fingerprint)
+            self._fingerprints[name] = fingerprint
+            self.stats["reindexed"] += 1
+            changed = True
+        self.skills = merged
+        self._sources = (installed, drafts)
+        self.stats["syncs"] += 1
+        return changed
+
+    def _expand(self, term: str) -> List[Tuple[str, float]]:
+        expanded = [(term, 1.0)] if term in self._postings else []
+        if len(term) >= 4:
+            pos = bisect.bisect_right(self._vocab, term)
+            while pos < len(self._vocab) and self._vocab[pos].startswith(term):
+                expanded.append((self._vocab[pos], self.PREFIX_WEIGHT))
+                pos += 1
+        return expanded
+
+    def substring_candidates(self, terms: List[str]) -> Set[str]:
+        """Skills in which at least one term may occur as a substring (superset, never misses)."""
+        found: Set[str] = set()
+        for term in terms:
+            term = str(term).lower()
+            if len(term) < 3:
+                return set(self._doc_grams)
+            holders = sorted((self._grams.get(g, set()) for g in _trigrams(term)), key=len)
+            if not holders[0]:
+                continue
+            rest = holders[1:]
+            found.update(name for name in holders[0] if all(name in h for h in rest))
+        return found
+
+    def scores(self, terms: List[str]) -> Dict[str, float]:
+        """BM25 score for every skill that shares a (prefix) token with the query."""
+        n_docs = len(self._doc_terms)
+        if not n_docs:
+            return {}
+        avg_len = (self._total_len / n_docs) or 1.0
+        scores: Dict[str, float] = {}
+        query = {tok for term in terms for tok in _index_tokens(term)}
+        for term in query:
+            for token, boost in self._expand(term):
+                posting = self._postings[token]
+                idf = math.log(1.0 + (n_docs - len(posting) + 0.5) / (len(posting) + 0.5))
+                for name, tf in posting.items():
+                    norm = self.K1 * (1.0 - self.B + self.B * self._doc_len[name] / avg_len)
+                    scores[name] = scores.get(name, 0.0) + boost * idf * tf * (self.K1 + 1.0) / (tf + norm)
+        return scores
+
+    def search(self, terms: List[str], limit: int = 10) -> List[Tuple[str, float]]:
+        """Top `limit` (skill name, BM25 score) pairs for the query terms."""
+        return heapq.nlargest(limit, self.scores(terms).items(), key=lambda item: item[1])
+
+
 class SkillMiniControl:
     """
     Mini-Control-Layer for fast skill decision-making.
     
     Now with autonomous skill discovery and creation capabilities.
     """
+
+    # mtime-gecachte Skill-Quellen (installed.json, _drafts/*); werden nur
+    # ersetzt, nie in-place verändert
+    _installed_cache: Tuple[Optional[tuple], Dict[str, Dict]] = (None, {})
+    _draft_cache: Dict[str, Tuple[tuple, Dict]] = {}
+    _drafts_view: Dict[str, Dict] = {}
+    _drafts_dir_sig: Optional[tuple] = None
+    _drafts_polled_at = float("-inf")
+    _skill_index: Optional[SkillMatchIndex] = None
     
     def __init__(self, cim: Optional[SkillCIMLight] = None, skills_dir: str = SKILLS_DIR):
         """Initialize with CIM instance."""
@@ -228,6 +424,7 @@ class SkillMiniControl:
         self.auto_repair_on_validation_fail = AUTO_REPAIR_ON_VALIDATION_FAIL
         self.auto_repair_max_attempts = max(0, AUTO_REPAIR_MAX_ATTEMPTS)
 
+
     @staticmethod
     def _is_run_result_success(run_result: Dict[str, Any]) -> bool:
         """
@@ -661,7 +858,9 @@ class SkillMiniControl:
         """
         Find an existing skill that matches the user's intent.
         
-        Uses keyword matching and description similarity.
+        Candidates are all skills containing a search term as substring
+        (trigram index) — exactly the ones the keyword match score can accept.
+        The winner is the highest match score (>= 0.3), ties broken by BM25.
         
         Args:
             intent: Extracted intent from ThinkingLayer
@@ -676,7 +875,9 @@ class SkillMiniControl:
         # Also check drafts (promoted ones)
         drafts = self._load_draft_skills()
         
-        all_skills = {**installed, **drafts}
+        index = self._get_skill_index()
+        index.sync(installed, drafts)
+        all_skills = index.skills
         
         if not all_skills:
             return None
@@ -697,13 +898,16 @@ class SkillMiniControl:
         search_terms = list(set([t.lower() for t in search_terms]))
         
         best_match = None
-        best_score = 0
+        best_key = (0.0, 0.0)
         
-        for name, info in all_skills.items():
+        bm25_scores = index.scores(search_terms)
+        for name in index.substring_candidates(search_terms):
+            info = all_skills[name]
             score = self._calculate_match_score(name, info, search_terms)
-            if score > best_score and score >= 0.3:  # Minimum threshold
-                best_score = score
-                best_match = {"name": name, **info, "match_score": score}
+            bm25 = bm25_scores.get(name, 0.0)
+            if score >= 0.3 and (score, bm25) > best_key:  # Minimum threshold
+                best_key = (score, bm25)
+                best_match = {"name": name, **info, "match_score": score, "bm25_score": round(bm25, 4)}
         
         return best_match
 
@@ -846,56 +1050,111 @@ class SkillMiniControl:
             return content.split()[0].strip()
         return ""
     
+    def _get_skill_index(self) -> SkillMatchIndex:
+        if self._skill_index is None:
+            self._skill_index = SkillMatchIndex()
+        return self._skill_index
+
+    @staticmethod
+    def _file_sig(path: Path) -> Optional[tuple]:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
     def _load_installed_skills(self) -> Dict[str, Dict]:
         """
         Load installed skills from registry.
         Handles both legacy flat dict and V2 envelope transparently.
         Returns flat {skill_name: {...}} — backward compat for all call sites.
+        Cached until installed.json changes (inode/mtime/size); treat the
+        returned dict as read-only.
         """
         registry_file = self.skills_dir / "_registry" / "installed.json"
-        if registry_file.exists():
+        sig = self._file_sig(registry_file)
+        if sig is not None and sig == self._installed_cache[0]:
+            return self._installed_cache[1]
+        skills: Dict[str, Dict] = {}
+        if sig is not None:
             try:
                 with open(registry_file, "r", encoding="utf-8") as f:
                     raw = json.load(f)
                 if isinstance(raw, dict) and raw.get("schema_version") == 2:
-                    return raw.get("skills", {}) if isinstance(raw.get("skills"), dict) else {}
-                if isinstance(raw, dict):
-                    return raw
+                    skills = raw.get("skills", {}) if isinstance(raw.get("skills"), dict) else {}
+                elif isinstance(raw, dict):
+                    skills = raw
             except:
                 pass
-        return {}
+        self._installed_cache = (sig, skills)
+        return skills
+
+    @staticmethod
+    def _draft_manifest(skill_dir: Path) -> Tuple[Optional[Path], Optional[tuple]]:
+        """manifest.yaml (preferred) or legacy manifest.json plus its stat signature."""
+        for filename in ("manifest.yaml", "manifest.json"):
+            path = skill_dir / filename
+            sig = SkillMiniControl._file_sig(path)
+            if sig is not None:
+                return path, (filename, *sig)
+        return None, None
+
+    @staticmethod
+    def _read_draft_manifest(path: Path) -> Dict[str, Any]:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                if path.suffix == ".json":
+                    return json.load(f) or {}
+                import yaml
+                return yaml.safe_load(f) or {}
+        except Exception:
+            return {}
 
     def _load_draft_skills(self) -> Dict[str, Dict]:
-        """Load draft skills (for matching). Supports manifest.yaml and legacy manifest.json."""
+        """
+        Load draft skills (for matching). Supports manifest.yaml and legacy manifest.json.
+        Added/removed draft folders are picked up immediately via the mtime of
+        _drafts; edits inside existing folders within SKILL_INDEX_POLL_S. Only
+        changed manifests are re-parsed; treat the returned dict as read-only.
+        """
         drafts_dir = self.skills_dir / "_drafts"
-        drafts = {}
-        
-        if drafts_dir.exists():
+        dir_sig = self._file_sig(drafts_dir)
+        now = time.monotonic()
+        if dir_sig == self._drafts_dir_sig and now - self._drafts_polled_at < SKILL_INDEX_POLL_S:
+            return self._drafts_view
+        self._drafts_dir_sig = dir_sig
+        self._drafts_polled_at = now
+
+        drafts: Dict[str, Dict] = {}
+        cache: Dict[str, Tuple[tuple, Dict]] = {}
+        changed = False
+        if dir_sig is not None:
             for skill_dir in drafts_dir.iterdir():
-                if skill_dir.is_dir():
-                    data: Dict[str, Any] = {}
-                    manifest_yaml = skill_dir / "manifest.yaml"
-                    manifest_json = skill_dir / "manifest.json"
-                    if manifest_yaml.exists():
-                        try:
-                            import yaml
-                            with open(manifest_yaml, "r", encoding="utf-8") as f:
-                                data = yaml.safe_load(f) or {}
-                        except Exception:
-                            data = {}
-                    elif manifest_json.exists():
-                        try:
-                            with open(manifest_json, "r", encoding="utf-8") as f:
-                                data = json.load(f) or {}
-                        except Exception:
-                            data = {}
-                    if data:
-                        drafts[skill_dir.name] = {
-                            "description": data.get("description", ""),
-                            "triggers": data.get("triggers", []),
-                            "is_draft": True
-                        }
-        return drafts
+                if not skill_dir.is_dir():
+                    continue
+                manifest_path, sig = self._draft_manifest(skill_dir)
+                if manifest_path is None:
+                    continue
+                cached = self._draft_cache.get(skill_dir.name)
+                if cached is not None and cached[0] == sig:
+                    info = cached[1]
+                else:
+                    changed = True
+                    data = self._read_draft_manifest(manifest_path)
+                    if not data:
+                        continue
+                    info = {
+                        "description": data.get("description", ""),
+                        "triggers": data.get("triggers", []),
+                        "is_draft": True
+                    }
+                drafts[skill_dir.name] = info
+                cache[skill_dir.name] = (sig, info)
+        # Neues Dict-Objekt nur bei Änderung → SkillMatchIndex.sync bleibt ein No-op
+        if changed or drafts.keys() != self._drafts_view.keys():
+            self._drafts_view = drafts
+        self._draft_cache = cache
+        return self._drafts_view
     
     def _extract_keywords(self, text: str) -> List[str]:
         """Extract meaningful keywords from text."""
@@ -112,7 +112,14 @@ def call_tool(name: str, arguments: Dict[str, Any], timeout: float = 5.0) -> Opt
             "arguments": arguments,
         },
     }
-    return _call_mcp_raw(payload, timeout=timeout)
+    try:
+        return _call_mcp_raw(payload, timeout=timeout)
+    finally:
+        try:
+            from core.memory_retrieval_cache import note_tool_call
+            note_tool_call(name)
+        except Exception as e:
+            log_debug(f"[MCP] retrieval cache invalidation skipped: {e}")
 
 
 # ------------------------------------------------------
@@ -13,14 +13,27 @@ from typing import Dict, Any, List, Optional
 from mcp_registry import MCPS, get_enabled_mcps, get_mcp_config
 from mcp.transports import HTTPTransport, SSETransport, STDIOTransport
 from mcp.tool_prompt_hints import TOOL_KEYWORDS, iter_base_detection_rules
+from mcp.latency import LatencyHistogram
 
 from utils.logger import log_info, log_error, log_debug, log_warning
 import json
 import os
 import threading
 import asyncio
+import inspect
+import time
 from pathlib import Path
 
+
+def _note_memory_write(tool_name: str) -> None:
+    """Memory-Writes invalidieren den prozessweiten Retrieval-Cache (lazy: core importiert mcp)."""
+    try:
+        from core.memory_retrieval_cache import note_tool_call
+        note_tool_call(tool_name)
+    except Exception as e:
+        log_debug(f"[MCPHub] retrieval cache invalidation skipped: {e}")
+
+
 class MCPHub:
     """Zentraler Hub für alle MCPs."""
 
@@ -34,6 +47,7 @@ class MCPHub:
         self._initialized = False
         self._tools_registered = False
         self._lock = threading.RLock()
+        self._latency: Dict[str, LatencyHistogram] = {}  # mcp_name → Histogramm
 
 
     def _register_fast_lane_tools(self):
@@ -462,6 +476,8 @@ Examples: {"; ".join(examples[:2])}
             log_debug(f"[MCPHub] Saved system fact: {key}")
         except Exception as e:
             log_error(f"[MCPHub] Failed to save fact {key}: {e}")
+        finally:
+            _note_memory_write("memory_fact_save")
     
     # ═══════════════════════════════════════════════════════════════
     # SYSTEM KNOWLEDGE: Abrufen von System-Wissen
@@ -566,11 +582,7 @@ Examples: {"; ".join(examples[:2])}
             trace_id = str(arguments.get("_trace_id") or "").strip()
         trace_suffix = f" trace={trace_id}" if trace_id else ""
 
-        # Snapshot routing data under lock so refresh() cannot expose transient empty caches.
-        with self._lock:
-            tool_def = self._tool_definitions.get(tool_name)
-            mcp_name = self._tools_cache.get(tool_name)
-            transport = self._transports.get(mcp_name) if mcp_name else None
+        tool_def, mcp_name, transport = self._route(tool_name)
 
         # Check if it's a Fast Lane tool (direct execution)
         if tool_def and tool_def.get("execution") == "direct":
@@ -583,6 +595,9 @@ Examples: {"; ".join(examples[:2])}
             except Exception as e:
                 log_error(f"[MCPHub] Fast Lane execution failed{trace_suffix}: {e}")
                 return {"error": f"Fast Lane execution failed: {e}"}
+            finally:
+                # Fast-Lane memory_save schreibt direkt in die DB -> Cache trotzdem invalidieren
+                _note_memory_write(tool_name)
         
         # Regular MCP tool execution
         if not mcp_name:
@@ -595,20 +610,73 @@ Examples: {"; ".join(examples[:2])}
         
         log_info(f"[MCPHub] Calling {tool_name} via {mcp_name}{trace_suffix}")
         
+        started = time.monotonic()
+        result: Any = None
         try:
             result = transport.call_tool(tool_name, arguments)
             return result
         except Exception as e:
             log_error(f"[MCPHub] Tool call failed{trace_suffix}: {e}")
-            return {"error": str(e)}
+            result = {"error": str(e)}
+            return result
+        finally:
+            self._observe_latency(mcp_name, started, result)
+            _note_memory_write(tool_name)
 
     async def call_tool_async(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
         """
-        Async-safe MCP tool call wrapper.
-        Keeps existing sync routing logic, but offloads blocking transport I/O
-        from the event loop. Useful for async request paths (/api/chat stream/deep).
+        Async MCP tool call.
+        HTTP/SSE-Transports werden nativ async (gepoolter httpx-Client) aufgerufen;
+        Fast-Lane-, STDIO- und Bridge-Tools laufen weiter über den sync-Pfad im Worker-Thread.
         """
-        return await asyncio.to_thread(self.call_tool, tool_name, arguments)
+        if not self._initialized:
+            await asyncio.to_thread(self.initialize)
+        tool_def, mcp_name, transport = self._route(tool_name)
+        native = getattr(transport, "call_tool_async", None) if transport is not None else None
+        direct = bool(tool_def and tool_def.get("execution") == "direct")
+        if direct or not inspect.iscoroutinefunction(native):
+            return await asyncio.to_thread(self.call_tool, tool_name, arguments)
+
+        trace_id = ""
+        if isinstance(arguments, dict):
+            trace_id = str(arguments.get("_trace_id") or "").strip()
+        trace_suffix = f" trace={trace_id}" if trace_id else ""
+        log_info(f"[MCPHub] Calling {tool_name} via {mcp_name} (async){trace_suffix}")
+
+        started = time.monotonic()
+        result: Any = None
+        try:
+            result = await native(tool_name, arguments)
+            return result
+        except Exception as e:
+            log_error(f"[MCPHub] Tool call failed{trace_suffix}: {e}")
+            result = {"error": str(e)}
+            return result
+        finally:
+            self._observe_latency(mcp_name, started, result)
+            _note_memory_write(tool_name)
+
+    def _route(self, tool_name: str):
+        """(tool_def, mcp_name, transport) — Snapshot unter Lock, damit refresh() keine leeren Caches zeigt."""
+        with self._lock:
+            tool_def = self._tool_definitions.get(tool_name)
+            mcp_name = self._tools_cache.get(tool_name)
+            transport = self._transports.get(mcp_name) if mcp_name else None
+        return tool_def, mcp_name, transport
+
+    def _observe_latency(self, mcp_name: str, started: float, result: Any) -> None:
+        failed = isinstance(result, dict) and result.get("error") is not None
+        with self._lock:
+            hist = self._latency.get(mcp_name)
+            if hist is None:
+                hist = self._latency[mcp_name] = LatencyHistogram()
+        hist.observe((time.monotonic() - started) * 1000.0, error=failed)
+
+    def get_latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Latenz-Histogramme pro MCP (auch für Bridge-MCPs ohne Registry-Eintrag)."""
+        with self._lock:
+            hists = dict(self._latency)
+        return {name: hist.snapshot() for name, hist in hists.items()}
     
     def get_mcp_for_tool(self, tool_name: str) -> Optional[str]:
         """Gibt den MCP-Namen für ein Tool zurück."""
@@ -623,6 +691,7 @@ Examples: {"; ".join(examples[:2])}
         with self._lock:
             transports = dict(self._transports)
             tools_cache = dict(self._tools_cache)
+        latency = self.get_latency_stats()
 
         result = []
         for mcp_name, config in MCPS.items():
@@ -645,6 +714,7 @@ Examples: {"; ".join(examples[:2])}
                 "description": config.get("description", ""),
                 "online": transport.health_check() if transport else False,
                 "tools_count": tools_count,
+                "latency": latency.get(mcp_name, LatencyHistogram().snapshot()),
             })
         
         return result
@@ -672,10 +742,12 @@ Examples: {"; ".join(examples[:2])}
         log_info(f"[MCPHub] Refresh complete: {tools_count} tools")
     
     def shutdown(self):
-        """Beendet alle STDIO-Transports."""
+        """Beendet alle STDIO-Transports und schließt gepoolte HTTP-Verbindungen."""
         for mcp_name, transport in self._transports.items():
             if isinstance(transport, STDIOTransport):
                 transport.shutdown()
+            elif isinstance(transport, (HTTPTransport, SSETransport)):
+                transport.close()
         log_info("[MCPHub] Shutdown complete")
 
 
@@ -0,0 +1,64 @@
+# mcp/latency.py
+"""
+Latenz-Histogramme pro MCP für MCPHub.list_mcps().
+
+Feste Bucket-Grenzen (ms), damit Snapshots über Prozesse/Zeit vergleichbar
+bleiben; Perzentile werden aus den Buckets geschätzt (obere Bucket-Grenze).
+"""
+
+import threading
+from typing import Any, Dict, List, Optional
+
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+
+
+class LatencyHistogram:
+    def __init__(self, buckets_ms=LATENCY_BUCKETS_MS):
+        self.buckets_ms = tuple(buckets_ms)
+        self._counts: List[int] = [0] * (len(self.buckets_ms) + 1)  # letzter = +Inf
+        self._lock = threading.Lock()
+        self.count = 0
+        self.errors = 0
+        self.sum_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, duration_ms: float, error: bool = False) -> None:
+        value = max(0.0, float(duration_ms))
+        idx = len(self.buckets_ms)
+        for i, bound in enumerate(self.buckets_ms):
+            if value <= bound:
+                idx = i
+                break
+        with self._lock:
+            self._counts[idx] += 1
+            self.count += 1
+            self.sum_ms += value
+            self.max_ms = max(self.max_ms, value)
+            if error:
+                self.errors += 1
+
+    def _percentile_locked(self, q: float) -> Optional[float]:
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self._counts):
+            seen += n
+            if seen >= rank and n:
+                return float(self.buckets_ms[i]) if i < len(self.buckets_ms) else round(self.max_ms, 1)
+        return round(self.max_ms, 1)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            buckets = {f"le_{b}": n for b, n in zip(self.buckets_ms, self._counts)}
+            buckets["le_inf"] = self._counts[-1]
+            return {
+                "count": self.count,
+                "errors": self.errors,
+                "avg_ms": round(self.sum_ms / self.count, 1) if self.count else None,
+                "max_ms": round(self.max_ms, 1) if self.count else None,
+                "p50_ms": self._percentile_locked(0.50),
+                "p95_ms": self._percentile_locked(0.95),
+                "p99_ms": self._percentile_locked(0.99),
+                "buckets": buckets,
+            }
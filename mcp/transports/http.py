@@ -8,14 +8,20 @@ Erkennt automatisch:
 - Streamable HTTP (stateless)
 
 Handhabt Sessions automatisch wenn nötig.
+
+Verbindungen werden pro MCP-Endpoint gepoolt (requests.Session für den
+sync-Pfad, httpx.AsyncClient pro Event-Loop für call_tool_async).
 """
 
+import httpx
 import requests
 import json
 import uuid
 from typing import Dict, Any, List, Optional
 from utils.logger import log_info, log_error, log_debug, log_warning
 
+from .pool import AsyncClientPool, build_session
+
 
 class HTTPTransport:
     """
@@ -32,6 +38,28 @@ class HTTPTransport:
     FORMAT_JSON = "json"
     FORMAT_STREAMABLE = "streamable"
     FORMAT_STREAMABLE_STATELESS = "streamable-stateless"
+
+    # Probe- und Handshake-Payloads (sync und async identisch)
+    _TOOLS_LIST_PAYLOAD = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "tools/list",
+        "params": {}
+    }
+
+    _INITIALIZE_PAYLOAD = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "initialize",
+        "params": {
+            "protocolVersion": "2024-11-05",
+            "capabilities": {},
+            "clientInfo": {
+                "name": "mcp-hub",
+                "version": "1.0.0"
+            }
+        }
+    }
     
     def __init__(self, url: str, api_key: str = None, timeout: int = 30):
         self.url = url
@@ -42,6 +70,10 @@ class HTTPTransport:
         self._format: Optional[str] = None
         self._session_id: Optional[str] = None
         self._format_detected = False
+
+        # Gepoolte Verbindungen (Keep-Alive)
+        self._http = build_session()
+        self._async_pool = AsyncClientPool(timeout)
     
     # ═══════════════════════════════════════════════════════════════
     # HEADER BUILDERS
@@ -82,67 +114,67 @@ class HTTPTransport:
         
         log_debug(f"[HTTP] Auto-detecting format for {self.url}")
         
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "tools/list",
-            "params": {}
-        }
-        
         try:
-            resp = requests.post(
+            # stream=True: Probe-Response schließen, sonst bleibt die Pool-Verbindung belegt
+            with self._http.post(
                 self.url,
-                json=payload,
+                json=self._TOOLS_LIST_PAYLOAD,
                 headers=self._get_base_headers(),
                 timeout=self.timeout,
                 stream=True
-            )
-            
-            content_type = resp.headers.get("Content-Type", "")
-            
-            # Check für Session-Fehler
-            if resp.status_code == 400:
-                try:
-                    error_data = resp.json()
-                    error_msg = error_data.get("error", {}).get("message", "")
-                    
-                    if "session" in error_msg.lower() or "Missing session ID" in error_msg:
-                        log_info(f"[HTTP] Detected: Streamable HTTP (needs session)")
-                        self._format = self.FORMAT_STREAMABLE
-                        self._format_detected = True
-                        return self._format
-                except:
-                    pass
-            
-            # Erfolgreiche Response analysieren
-            if resp.status_code == 200:
-                if "text/event-stream" in content_type:
-                    log_info(f"[HTTP] Detected: Streamable HTTP (stateless)")
-                    self._format = self.FORMAT_STREAMABLE_STATELESS
-                else:
-                    log_info(f"[HTTP] Detected: Simple JSON-RPC")
-                    self._format = self.FORMAT_JSON
-                
+            ) as resp:
+                return self._apply_detected_format(resp)
+        except Exception as e:
+            log_error(f"[HTTP] Format detection failed: {e}")
+            self._format = self.FORMAT_UNKNOWN
+            self._format_detected = True
+            return self._format
+
+    @staticmethod
+    def _session_error_message(resp: Any) -> str:
+        """Fehlermeldung einer 400-Response (requests oder httpx), sonst ''."""
+        try:
+            error_data = resp.json()
+            return str(error_data.get("error", {}).get("message", "") or "")
+        except Exception:
+            return ""
+
+    def _apply_detected_format(self, resp: Any) -> str:
+        """Wertet die tools/list-Probe aus (gemeinsam für sync und async)."""
+        content_type = resp.headers.get("Content-Type", "")
+        
+        # Check für Session-Fehler
+        if resp.status_code == 400:
+            error_msg = self._session_error_message(resp)
+            if "session" in error_msg.lower() or "Missing session ID" in error_msg:
+                log_info(f"[HTTP] Detected: Streamable HTTP (needs session)")
+                self._format = self.FORMAT_STREAMABLE
                 self._format_detected = True
                 return self._format
-            
-            # 406 Not Acceptable = braucht SSE Headers (schon gesendet, also stateless)
-            if resp.status_code == 406:
-                log_info(f"[HTTP] Detected: Streamable HTTP (stateless, needs Accept header)")
+        
+        # Erfolgreiche Response analysieren
+        if resp.status_code == 200:
+            if "text/event-stream" in content_type:
+                log_info(f"[HTTP] Detected: Streamable HTTP (stateless)")
                 self._format = self.FORMAT_STREAMABLE_STATELESS
-                self._format_detected = True
-                return self._format
+            else:
+                log_info(f"[HTTP] Detected: Simple JSON-RPC")
+                self._format = self.FORMAT_JSON
             
-            log_warning(f"[HTTP] Could not detect format, status={resp.status_code}")
-            self._format = self.FORMAT_UNKNOWN
             self._format_detected = True
             return self._format
-            
-        except Exception as e:
-            log_error(f"[HTTP] Format detection failed: {e}")
-            self._format = self.FORMAT_UNKNOWN
+        
+        # 406 Not Acceptable = braucht SSE Headers (schon gesendet, also stateless)
+        if resp.status_code == 406:
+            log_info(f"[HTTP] Detected: Streamable HTTP (stateless, needs Accept header)")
+            self._format = self.FORMAT_STREAMABLE_STATELESS
             self._format_detected = True
             return self._format
+        
+        log_warning(f"[HTTP] Could not detect format, status={resp.status_code}")
+        self._format = self.FORMAT_UNKNOWN
+        self._format_detected = True
+        return self._format
     
     # ═══════════════════════════════════════════════════════════════
     # SESSION MANAGEMENT
@@ -159,52 +191,40 @@ class HTTPTransport:
         
         log_debug(f"[HTTP] Initializing session for {self.url}")
         
-        payload = {
-            "jsonrpc": "2.0",
-            "id": 1,
-            "method": "initialize",
-            "params": {
-                "protocolVersion": "2024-11-05",
-                "capabilities": {},
-                "clientInfo": {
-                    "name": "mcp-hub",
-                    "version": "1.0.0"
-                }
-            }
-        }
-        
         try:
-            resp = requests.post(
+            resp = self._http.post(
                 self.url,
-                json=payload,
+                json=self._INITIALIZE_PAYLOAD,
                 headers=self._get_base_headers(),
                 timeout=self.timeout,
                 stream=True
             )
-            
-            # Session-ID aus Response-Header
-            session_id = resp.headers.get("Mcp-Session-Id")
-            if session_id:
-                self._session_id = session_id
-                log_info(f"[HTTP] Session initialized: {session_id[:8]}...")
-                return True
-            
-            # Manche MCPs geben Session-ID im Body zurück
-            content_type = resp.headers.get("Content-Type", "")
-            if "text/event-stream" in content_type:
-                result = self._parse_sse_response(resp)
-                if isinstance(result, dict):
-                    # Generiere eigene Session-ID wenn Server keine gibt
-                    self._session_id = str(uuid.uuid4())
-                    log_info(f"[HTTP] Session initialized (client-generated): {self._session_id[:8]}...")
-                    return True
-            
-            log_warning(f"[HTTP] No session ID received")
-            return False
-            
+            return self._apply_session_response(resp)
         except Exception as e:
             log_error(f"[HTTP] Session initialization failed: {e}")
             return False
+
+    def _apply_session_response(self, resp: Any) -> bool:
+        """Übernimmt die Session-ID aus der initialize-Response (sync und async)."""
+        # Session-ID aus Response-Header
+        session_id = resp.headers.get("Mcp-Session-Id")
+        if session_id:
+            self._session_id = session_id
+            log_info(f"[HTTP] Session initialized: {session_id[:8]}...")
+            return True
+        
+        # Manche MCPs geben Session-ID im Body zurück
+        content_type = resp.headers.get("Content-Type", "")
+        if "text/event-stream" in content_type:
+            result = self._parse_sse_response(resp)
+            if isinstance(result, dict):
+                # Generiere eigene Session-ID wenn Server keine gibt
+                self._session_id = str(uuid.uuid4())
+                log_info(f"[HTTP] Session initialized (client-generated): {self._session_id[:8]}...")
+                return True
+        
+        log_warning(f"[HTTP] No session ID received")
+        return False
     
     def _ensure_session(self) -> bool:
         """Stellt sicher dass eine Session existiert (wenn nötig)."""
@@ -251,13 +271,13 @@ class HTTPTransport:
         return result
 
     
-    def _parse_sse_response(self, response: requests.Response) -> Any:
-        """Parst SSE-Response und extrahiert das Result."""
+    def _parse_sse_response(self, response: Any) -> Any:
+        """Parst SSE-Response (requests: bytes-Zeilen, httpx: str-Zeilen) und extrahiert das Result."""
         result = None
         
         for line in response.iter_lines():
             if line:
-                decoded = line.decode("utf-8")
+                decoded = line.decode("utf-8") if isinstance(line, bytes) else line
                 
                 # SSE Format: "data: {...}"
                 if decoded.startswith("data: "):
@@ -284,7 +304,7 @@ class HTTPTransport:
         
         return result
     
-    def _parse_response(self, response: requests.Response) -> Any:
+    def _parse_response(self, response: Any) -> Any:
         """Parst Response basierend auf Content-Type."""
         content_type = response.headers.get("Content-Type", "")
         
@@ -325,7 +345,7 @@ class HTTPTransport:
         
         # Request senden
         try:
-            resp = requests.post(
+            resp = self._http.post(
                 self.url,
                 json=payload,
                 headers=self._get_headers_with_session(),
@@ -334,18 +354,8 @@ class HTTPTransport:
             )
             
             # Session-Fehler → Retry mit neuer Session
-            if resp.status_code == 400 and retry_count < 2:
-                try:
-                    error_data = resp.json()
-                    error_msg = error_data.get("error", {}).get("message", "")
-                    
-                    if "session" in error_msg.lower():
-                        log_warning(f"[HTTP] Session error, reinitializing...")
-                        self._session_id = None
-                        self._format = self.FORMAT_STREAMABLE
-                        return self._smart_request(payload, retry_count + 1)
-                except:
-                    pass
+            if resp.status_code == 400 and retry_count < 2 and self._reset_on_session_error(resp):
+                return self._smart_request(payload, retry_count + 1)
             
             resp.raise_for_status()
             return self._parse_response(resp)
@@ -357,6 +367,75 @@ class HTTPTransport:
             log_error(f"[HTTP] Request failed: {e}")
             return {"error": str(e)}
     
+    def _reset_on_session_error(self, resp: Any) -> bool:
+        """True wenn die 400-Response ein Session-Fehler war (Session wird verworfen)."""
+        if "session" not in self._session_error_message(resp).lower():
+            return False
+        log_warning(f"[HTTP] Session error, reinitializing...")
+        self._session_id = None
+        self._format = self.FORMAT_STREAMABLE
+        return True
+
+    # ═══════════════════════════════════════════════════════════════
+    # ASYNC PATH (httpx, ohne Thread-Offload)
+    # ═══════════════════════════════════════════════════════════════
+
+    async def _detect_format_async(self) -> str:
+        if self._format_detected:
+            return self._format
+        log_debug(f"[HTTP] Auto-detecting format for {self.url} (async)")
+        try:
+            resp = await self._async_pool.get().post(
+                self.url,
+                json=self._TOOLS_LIST_PAYLOAD,
+                headers=self._get_base_headers(),
+            )
+            return self._apply_detected_format(resp)
+        except Exception as e:
+            log_error(f"[HTTP] Format detection failed: {e}")
+            self._format = self.FORMAT_UNKNOWN
+            self._format_detected = True
+            return self._format
+
+    async def _ensure_session_async(self) -> bool:
+        if self._format != self.FORMAT_STREAMABLE or self._session_id:
+            return True
+        log_debug(f"[HTTP] Initializing session for {self.url} (async)")
+        try:
+            resp = await self._async_pool.get().post(
+                self.url,
+                json=self._INITIALIZE_PAYLOAD,
+                headers=self._get_base_headers(),
+            )
+            return self._apply_session_response(resp)
+        except Exception as e:
+            log_error(f"[HTTP] Session initialization failed: {e}")
+            return False
+
+    async def _smart_request_async(self, payload: Dict[str, Any], retry_count: int = 0) -> Any:
+        """Async-Variante von _smart_request auf dem gepoolten httpx-Client."""
+        if not self._format_detected:
+            await self._detect_format_async()
+        if not await self._ensure_session_async():
+            log_error(f"[HTTP] Could not establish session")
+            return {"error": "Session initialization failed"}
+        try:
+            resp = await self._async_pool.get().post(
+                self.url,
+                json=payload,
+                headers=self._get_headers_with_session(),
+            )
+            if resp.status_code == 400 and retry_count < 2 and self._reset_on_session_error(resp):
+                return await self._smart_request_async(payload, retry_count + 1)
+            resp.raise_for_status()
+            return self._parse_response(resp)
+        except httpx.HTTPStatusError as e:
+            log_error(f"[HTTP] HTTP error: {e}")
+            return {"error": str(e)}
+        except Exception as e:
+            log_error(f"[HTTP] Request failed: {e}")
+            return {"error": str(e)}
+
     # ═══════════════════════════════════════════════════════════════
     # PUBLIC API
     # ═══════════════════════════════════════════════════════════════
@@ -407,6 +486,27 @@ class HTTPTransport:
         
         return result
     
+    async def call_tool_async(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
+        """Ruft ein Tool nativ async auf (gepoolter httpx-Client, kein Worker-Thread)."""
+        payload = {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "tools/call",
+            "params": {
+                "name": tool_name,
+                "arguments": arguments
+            }
+        }
+        
+        log_debug(f"[HTTP] tools/call (async) {tool_name} → {self.url}")
+        
+        result = await self._smart_request_async(payload)
+        
+        if isinstance(result, dict) and result.get("error") is not None:
+            log_error(f"[HTTP] Tool error: {result['error']}")
+        
+        return result
+    
     def health_check(self) -> bool:
         """Prüft ob MCP erreichbar ist."""
         try:
@@ -426,3 +526,8 @@ class HTTPTransport:
         self._format = None
         self._session_id = None
         self._format_detected = False
+
+    def close(self):
+        """Schließt die gepoolten Verbindungen."""
+        self._http.close()
+        self._async_pool.drop()
@@ -0,0 +1,81 @@
+# mcp/transports/pool.py
+"""
+Connection-Pooling für HTTP/SSE-MCP-Transports.
+
+- sync:  eine requests.Session pro Transport (= pro MCP-Endpoint) mit
+         HTTPAdapter-Pool, Keep-Alive statt neuer TCP-Verbindung pro Call
+- async: ein httpx.AsyncClient pro Transport und Event-Loop
+         (httpx-Clients sind an den Loop gebunden, in dem sie laufen)
+
+Poolgröße: MCP_HTTP_POOL_MAXSIZE (Default 16).
+"""
+
+import asyncio
+import os
+import threading
+from typing import Any, Dict, Tuple
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+
+def _pool_maxsize() -> int:
+    try:
+        return max(1, min(256, int(os.getenv("MCP_HTTP_POOL_MAXSIZE", "16"))))
+    except ValueError:
+        return 16
+
+
+def build_session() -> requests.Session:
+    """requests.Session mit Keep-Alive-Pool für genau einen MCP-Endpoint."""
+    maxsize = _pool_maxsize()
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=maxsize)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+class AsyncClientPool:
+    """Ein httpx.AsyncClient pro Event-Loop; Clients toter Loops werden verworfen."""
+
+    def __init__(self, timeout: float):
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._clients: Dict[int, Tuple[Any, httpx.AsyncClient]] = {}
+        self.created = 0
+
+    def get(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            for key, (owner, _client) in list(self._clients.items()):
+                if owner.is_closed():
+                    self._clients.pop(key, None)
+            entry = self._clients.get(id(loop))
+            if entry is None or entry[0] is not loop or entry[1].is_closed:
+                maxsize = _pool_maxsize()
+                client = httpx.AsyncClient(
+                    timeout=self.timeout,
+                    limits=httpx.Limits(
+                        max_connections=maxsize,
+                        max_keepalive_connections=maxsize,
+                    ),
+                )
+                entry = (loop, client)
+                self._clients[id(loop)] = entry
+                self.created += 1
+            return entry[1]
+
+    async def aclose(self) -> None:
+        """Schließt den Client des laufenden Loops."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._clients.pop(id(loop), None)
+        if entry is not None:
+            await entry[1].aclose()
+
+    def drop(self) -> None:
+        """Vergisst alle Clients (sync Shutdown; offene Verbindungen räumt der GC ab)."""
+        with self._lock:
+            self._clients.clear()
@@ -2,13 +2,17 @@
 """
 SSE (Server-Sent Events) Transport für MCPs.
 Für Streaming/Realtime MCPs.
+
+Verbindungen werden pro MCP-Endpoint gepoolt (requests.Session bzw.
+httpx.AsyncClient pro Event-Loop für call_tool_async).
 """
 
-import requests
 import json
-from typing import Dict, Any, List, Generator
+from typing import Dict, Any, Iterable, List, Generator
 from utils.logger import log_info, log_error, log_debug
 
+from .pool import AsyncClientPool, build_session
+
 
 class SSETransport:
     """SSE Transport für Streaming MCPs."""
@@ -17,6 +21,8 @@ class SSETransport:
         self.url = url
         self.api_key = api_key
         self.timeout = timeout
+        self._http = build_session()
+        self._async_pool = AsyncClientPool(timeout)
     
     def _get_headers(self) -> Dict[str, str]:
         """Baut HTTP Headers."""
@@ -71,7 +77,7 @@ class SSETransport:
             log_debug(f"[SSE] tools/list → {self.url}")
             
             # Für list_tools nutzen wir normales HTTP
-            resp = requests.post(
+            resp = self._http.post(
                 self.url,
                 json=payload,
                 headers={"Content-Type": "application/json"},
@@ -94,55 +100,76 @@ class SSETransport:
             log_error(f"[SSE] tools/list failed: {e}")
             return []
     
+    @staticmethod
+    def _tool_call_payload(tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "tools/call",
+            "params": {
+                "name": tool_name,
+                "arguments": arguments
+            }
+        }
+
+    def _collect_result(self, lines: Iterable[Any]) -> Any:
+        """Sammelt SSE-Events; liefert das letzte result bzw. den ersten error."""
+        result_data = None
+        for line in lines:
+            if not line:
+                continue
+            if isinstance(line, bytes):
+                line = line.decode("utf-8")
+            if not line.startswith("data: "):
+                continue
+            try:
+                data = json.loads(line[6:])  # Remove "data: " prefix
+            except json.JSONDecodeError:
+                continue
+            # Letztes Event mit result speichern
+            if "result" in data:
+                result_data = data["result"]
+            elif "error" in data:
+                return {"error": data["error"]}
+        return self._extract_mcp_content(result_data or {})
+
     def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
         """Ruft ein Tool auf (sammelt alle SSE Events)."""
         try:
-            payload = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "tools/call",
-                "params": {
-                    "name": tool_name,
-                    "arguments": arguments
-                }
-            }
-            
             log_debug(f"[SSE] tools/call {tool_name} → {self.url}")
             
-            result_data = None
-            
-            with requests.post(
+            with self._http.post(
                 self.url,
-                json=payload,
+                json=self._tool_call_payload(tool_name, arguments),
                 headers=self._get_headers(),
                 stream=True,
                 timeout=self.timeout
             ) as resp:
                 resp.raise_for_status()
-                
-                for line in resp.iter_lines():
-                    if line:
-                        line = line.decode("utf-8")
-                        
-                        if line.startswith("data: "):
-                            data_str = line[6:]  # Remove "data: " prefix
-                            try:
-                                data = json.loads(data_str)
-                                
-                                # Letztes Event mit result speichern
-                                if "result" in data:
-                                    result_data = data["result"]
-                                elif "error" in data:
-                                    return {"error": data["error"]}
-                                    
-                            except json.JSONDecodeError:
-                                continue
-            
-            return self._extract_mcp_content(result_data or {})
+                return self._collect_result(resp.iter_lines())
             
         except Exception as e:
             log_error(f"[SSE] call_tool failed: {e}")
             return {"error": str(e)}
+
+    async def call_tool_async(self, tool_name: str, arguments: Dict[str, Any]) -> Any:
+        """Ruft ein Tool nativ async auf (gepoolter httpx-Client, kein Worker-Thread)."""
+        try:
+            log_debug(f"[SSE] tools/call (async) {tool_name} → {self.url}")
+            lines: List[str] = []
+            async with self._async_pool.get().stream(
+                "POST",
+                self.url,
+                json=self._tool_call_payload(tool_name, arguments),
+                headers=self._get_headers(),
+            ) as resp:
+                resp.raise_for_status()
+                async for line in resp.aiter_lines():
+                    lines.append(line)
+            return self._collect_result(lines)
+        except Exception as e:
+            log_error(f"[SSE] call_tool failed: {e}")
+            return {"error": str(e)}
     
     def call_tool_stream(self, tool_name: str, arguments: Dict[str, Any]) -> Generator[Dict, None, None]:
         """Ruft ein Tool auf und streamt Events."""
@@ -159,7 +186,7 @@ class SSETransport:
             
             log_debug(f"[SSE] tools/call (stream) {tool_name} → {self.url}")
             
-            with requests.post(
+            with self._http.post(
                 self.url,
                 json=payload,
                 headers=self._get_headers(),
@@ -191,3 +218,8 @@ class SSETransport:
             return True
         except:
             return False
+
+    def close(self):
+        """Schließt die gepoolten Verbindungen."""
+        self._http.close()
+        self._async_pool.drop()
@@ -0,0 +1,626 @@
+# sql-memory/ann_index.py
+"""
+ANN Index - In-Process IVF-Flat Index ueber die embeddings-Tabelle.
+
+Design:
+  - Eine Partition pro embedding_version (kein Mischen von Vektorraeumen).
+  - IVF-Flat: spherisches k-means (nlist ~ sqrt(n)) auf normalisierten
+    Vektoren; Suche prueft nur die nprobe naechsten Listen.
+  - Kleine Partitionen (< ANN_MIN_PARTITION) werden exakt gescannt.
+  - Filter (conversation_id/content_type) laufen vektorisiert ueber
+    NumPy-Codearrays; pro Conversation/Content-Type gibt es invertierte
+    Zeilenlisten, damit der exakte Nachzug nur die gefilterte Teilmenge scored.
+  - Inkrementell: VectorStore.add/backfill rufen upsert()/remove().
+  - Persistenz: eine .npz-Datei pro Partition neben der DB. Beim Laden und
+    periodisch (ANN_CHECKSUM_TTL_S) wird eine Checksumme
+    (COUNT, MAX(id), SUM(id)) gegen SQLite geprueft. Bei Abweichung werden
+    nur die Deltas per rowid nachgezogen (neue Zeilen laden, fehlende
+    tombstonen) - kein Rebuild/Retrain. Damit werden auch Schreiber
+    ausserhalb des Prozesses (z.B. Archive) eingeholt.
+
+Benoetigt NumPy; ohne NumPy nutzt VectorStore weiterhin den SQL-Scan.
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from vector_math import _np, unpack_embedding
+
+logger = logging.getLogger(__name__)
+
+ANN_MIN_PARTITION = int(os.getenv("ANN_MIN_PARTITION", "4096"))
+ANN_NPROBE = int(os.getenv("ANN_NPROBE", "8"))
+ANN_KMEANS_ITERS = int(os.getenv("ANN_KMEANS_ITERS", "8"))
+ANN_KMEANS_SAMPLE = int(os.getenv("ANN_KMEANS_SAMPLE", "20000"))
+ANN_CHECKSUM_TTL_S = float(os.getenv("ANN_CHECKSUM_TTL_S", "10"))
+ANN_PERSIST_EVERY = int(os.getenv("ANN_PERSIST_EVERY", "1024"))
+
+# SQLite-Default SQLITE_MAX_VARIABLE_NUMBER ist 999.
+SQL_IN_CHUNK = 900
+_FORMAT = 2
+
+Checksum = Tuple[int, int, int]
+RowFetcher = Callable[[List[int]], Iterable[Tuple[int, Any, Optional[str], Optional[str]]]]
+
+
+def _partition_checksum(conn: sqlite3.Connection, version: str) -> Checksum:
+    row = conn.execute(
+        "SELECT COUNT(*), COALESCE(MAX(id), 0), COALESCE(SUM(id), 0) "
+        "FROM embeddings WHERE embedding_version = ? AND embedding IS NOT NULL",
+        (version,),
+    ).fetchone()
+    return (int(row[0]), int(row[1]), int(row[2]))
+
+
+def fetch_chunked(conn: sqlite3.Connection, sql: str, ids: Sequence[int], params: Sequence[Any] = ()) -> List[tuple]:
+    """Fuehrt `sql` (mit einem `{ids}`-Platzhalter) in IN-Chunks unter dem SQLite-Variablenlimit aus."""
+    out: List[tuple] = []
+    for start in range(0, len(ids), SQL_IN_CHUNK):
+        chunk = list(ids[start:start + SQL_IN_CHUNK])
+        marks = ",".join("?" * len(chunk))
+        out.extend(conn.execute(sql.format(ids=marks), (*params, *chunk)).fetchall())
+    return out
+
+
+def _rows_array(rows: array) -> Any:
+    return _np.array(rows, dtype=_np.int64)
+
+
+class Partition:
+    """IVF-Flat Partition fuer genau eine embedding_version."""
+
+    def __init__(self, version: str, dim: int):
+        self.version = version
+        self.dim = dim
+        self.size = 0  # belegte Zeilen (inkl. Tombstones)
+        self.vectors = _np.zeros((0, dim), dtype=_np.float32)
+        self.ids = _np.zeros(0, dtype=_np.int64)
+        self.alive = _np.zeros(0, dtype=bool)
+        self.conv_codes = _np.zeros(0, dtype=_np.int32)
+        self.ctype_codes = _np.zeros(0, dtype=_np.int32)
+        self.conv_names: List[str] = []
+        self.ctype_names: List[str] = []
+        self._conv_code: Dict[str, int] = {}
+        self._ctype_code: Dict[str, int] = {}
+        # invertierte Zeilenlisten (enthalten Tombstones, gefiltert via alive)
+        self.conv_rows: Dict[int, array] = {}
+        self.ctype_rows: Dict[int, array] = {}
+        self.row_of: Dict[int, int] = {}
+        self.skipped: Set[int] = set()  # SQLite-Zeilen ohne verwertbaren Vektor
+        self.centroids: Optional[Any] = None
+        self.lists: List[array] = []
+        self.trained_size = 0
+        self.checksum: Checksum = (0, 0, 0)
+        self.dirty = 0
+        self.verified_at = 0.0
+
+    # ── Mutationen ──────────────────────────────────────────────────────
+
+    def _ensure_capacity(self, extra: int) -> None:
+        need = self.size + extra
+        cap = self.vectors.shape[0]
+        if need <= cap:
+            return
+        cap = max(need, cap * 2, 64)
+        n = self.size
+
+        def grow(arr: Any, shape: Tuple[int, ...]) -> Any:
+            grown = _np.zeros(shape, dtype=arr.dtype)
+            grown[:n] = arr[:n]
+            return grown
+
+        self.vectors = grow(self.vectors, (cap, self.dim))
+        self.ids = grow(self.ids, (cap,))
+        self.alive = grow(self.alive, (cap,))
+        self.conv_codes = grow(self.conv_codes, (cap,))
+        self.ctype_codes = grow(self.ctype_codes, (cap,))
+
+    @staticmethod
+    def _intern(value: str, codes: Dict[str, int], names: List[str]) -> int:
+        code = codes.get(value)
+        if code is None:
+            code = codes[value] = len(names)
+            names.append(value)
+        return code
+
+    def add(self, entry_id: int, unit_vec: Any, conv: str, ctype: str) -> None:
+        self._ensure_capacity(1)
+        row = self.size
+        conv_code = self._intern(conv or "", self._conv_code, self.conv_names)
+        ctype_code = self._intern(ctype or "", self._ctype_code, self.ctype_names)
+        self.vectors[row] = unit_vec
+        self.ids[row] = entry_id
+        self.alive[row] = True
+        self.conv_codes[row] = conv_code
+        self.ctype_codes[row] = ctype_code
+        self.size += 1
+        self.conv_rows.setdefault(conv_code, array("q")).append(row)
+        self.ctype_rows.setdefault(ctype_code, array("q")).append(row)
+        self.row_of[entry_id] = row
+        if self.centroids is not None:
+            self.lists[int(_np.argmax(self.centroids @ unit_vec))].append(row)
+        count, max_id, id_sum = self.checksum
+        self.checksum = (count + 1, max(max_id, entry_id), id_sum + entry_id)
+        self.dirty += 1
+
+    def remove(self, entry_id: int) -> bool:
+        row = self.row_of.pop(entry_id, None)
+        if row is None:
+            return False
+        self.alive[row] = False
+        count, max_id, id_sum = self.checksum
+        # MAX(id) bleibt stehen; weicht SQLite ab, zieht die naechste Verifikation Deltas nach.
+        self.checksum = (count - 1, max_id, id_sum - entry_id)
+        self.dirty += 1
+        return True
+
+    def apply_delta(self, current_ids: Iterable[int], fetch: RowFetcher) -> Tuple[int, int]:
+        """
+        Gleicht die Partition per rowid mit der Quelle ab.
+        `current_ids` sind alle ids der Quelle, `fetch(ids)` liefert
+        (id, embedding_raw, conversation_id, content_type) fuer neue ids.
+        Returns (added, removed).
+        """
+        current = set(current_ids)
+        removed = [eid for eid in self.row_of if eid not in current]
+        for eid in removed:
+            self.remove(eid)
+        self.skipped &= current
+        missing = sorted(eid for eid in current if eid not in self.row_of and eid not in self.skipped)
+        added = 0
+        for entry_id, raw, conv, ctype in fetch(missing) if missing else ():
+            vec = unpack_embedding(raw)
+            unit = unit_vector(vec) if vec and len(vec) == self.dim else None
+            if unit is None:
+                self.skipped.add(int(entry_id))
+                continue
+            self.add(int(entry_id), unit, conv, ctype)
+            added += 1
+        return added, len(removed)
+
+    @property
+    def live_count(self) -> int:
+        return len(self.row_of)
+
+    def needs_retrain(self) -> bool:
+        n = self.live_count
+        if n < ANN_MIN_PARTITION:
+            # Unter der Schwelle exakt; Tombstones trotzdem irgendwann kompaktieren.
+            return self.centroids is not None or self.size > 2 * max(n, 64)
+        if self.centroids is None:
+            return True
+        # Zu viele Tombstones oder Partition stark gewachsen -> neu clustern.
+        return self.size > 2 * max(n, 1) or n > 4 * max(self.trained_size, 1)
+
+    def _reindex_rows(self) -> None:
+        """Baut die invertierten Conversation/Content-Type-Listen aus den Codearrays neu."""
+        self.conv_rows = {}
+        self.ctype_rows = {}
+        for target, codes in ((self.conv_rows, self.conv_codes), (self.ctype_rows, self.ctype_codes)):
+            codes = codes[: self.size]
+            order = _np.argsort(codes, kind="stable")
+            uniq, starts = _np.unique(codes[order], return_index=True)
+            bounds = list(starts.tolist()) + [order.shape[0]]
+            for i, code in enumerate(uniq.tolist()):
+                target[int(code)] = array("q", order[bounds[i]:bounds[i + 1]].tolist())
+
+    def train(self) -> None:
+        """Kompaktiert Tombstones und trainiert IVF-Zentroide neu."""
+        live = _np.flatnonzero(self.alive[: self.size])
+        self.vectors = _np.ascontiguousarray(self.vectors[live])
+        self.ids = self.ids[live].copy()
+        self.conv_codes = self.conv_codes[live].copy()
+        self.ctype_codes = self.ctype_codes[live].copy()
+        self.size = int(live.shape[0])
+        self.alive = _np.ones(self.size, dtype=bool)
+        self.row_of = {int(eid): i for i, eid in enumerate(self.ids.tolist())}
+        self._reindex_rows()
+        self.trained_size = self.size
+
+        if self.size < ANN_MIN_PARTITION:
+            self.centroids = None
+            self.lists = []
+            return
+
+        data = self.vectors[: self.size]
+        nlist = max(1, int(self.size ** 0.5))
+        rng = _np.random.default_rng(0)
+        sample = data
+        if self.size > ANN_KMEANS_SAMPLE:
+            sample = data[rng.choice(self.size, ANN_KMEANS_SAMPLE, replace=False)]
+        centroids = sample[rng.choice(sample.shape[0], nlist, replace=False)].copy()
+        for _ in range(ANN_KMEANS_ITERS):
+            assign = _np.argmax(sample @ centroids.T, axis=1)
+            for c in range(nlist):
+                members = sample[assign == c]
+                if members.shape[0]:
+                    centroids[c] = members.sum(axis=0)
+            norms = _np.linalg.norm(centroids, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            centroids /= norms
+
+        self.centroids = centroids.astype(_np.float32)
+        self._assign_lists(_np.argmax(data @ centroids.T, axis=1), nlist)
+
+    def _assign_lists(self, list_of_row: Any, nlist: int) -> None:
+        rows = _np.flatnonzero(list_of_row >= 0)
+        codes = list_of_row[rows]
+        order = _np.argsort(codes, kind="stable")
+        counts = _np.bincount(codes, minlength=nlist)
+        bounds = _np.concatenate(([0], _np.cumsum(counts)))
+        ordered = rows[order]
+        self.lists = [array("q", ordered[bounds[c]:bounds[c + 1]].tolist()) for c in range(nlist)]
+
+    # ── Suche ───────────────────────────────────────────────────────────
+
+    def _candidate_rows(self, q: Any) -> Any:
+        if self.centroids is None:
+            return _np.arange(self.size)
+        nprobe = min(max(1, ANN_NPROBE), len(self.lists))
+        probe = _np.argpartition(-(self.centroids @ q), nprobe - 1)[:nprobe]
+        parts = [_rows_array(self.lists[c]) for c in probe.tolist()]
+        return _np.concatenate(parts) if parts else _np.zeros(0, dtype=_np.int64)
+
+    def _filtered_rows(self, conversation_id: Optional[str], content_type: Optional[str]) -> Any:
+        """Kandidaten aus den invertierten Listen (nur gefilterte Teilmenge)."""
+        if conversation_id:
+            codes = {self._conv_code.get(conversation_id), self._conv_code.get("global")}
+            parts = [_rows_array(self.conv_rows[code]) for code in codes if code in self.conv_rows]
+            return _np.concatenate(parts) if parts else _np.zeros(0, dtype=_np.int64)
+        if content_type:
+            code = self._ctype_code.get(content_type)
+            if code is None or code not in self.ctype_rows:
+                return _np.zeros(0, dtype=_np.int64)
+            return _rows_array(self.ctype_rows[code])
+        return _np.arange(self.size)
+
+    def _filter_rows(
+        self,
+        rows: Any,
+        conversation_id: Optional[str],
+        content_type: Optional[str],
+    ) -> Any:
+        mask = self.alive[rows]
+        if conversation_id:
+            codes = self.conv_codes[rows]
+            conv_mask = _np.zeros(rows.shape[0], dtype=bool)
+            for name in (conversation_id, "global"):
+                code = self._conv_code.get(name)
+                if code is not None:
+                    conv_mask |= codes == code
+            mask &= conv_mask
+        if content_type:
+            code = self._ctype_code.get(content_type)
+            if code is None:
+                return rows[:0]
+            mask &= self.ctype_codes[rows] == code
+        return rows[mask]
+
+    def search(
+        self,
+        q: Any,
+        limit: int,
+        min_similarity: float,
+        conversation_id: Optional[str],
+        content_type: Optional[str],
+    ) -> List[Tuple[int, float]]:
+        if self.centroids is None:
+            rows = self._filtered_rows(conversation_id, content_type)
+        else:
+            rows = self._candidate_rows(q)
+        rows = self._filter_rows(rows, conversation_id, content_type)
+        if rows.shape[0] < limit and self.centroids is not None:
+            # Selektive Filter koennen die geprobten Listen leeren -> exakt
+            # ueber die gefilterte Teilmenge nachziehen.
+            rows = self._filter_rows(self._filtered_rows(conversation_id, content_type), conversation_id, content_type)
+        return self._score(q, rows, limit, min_similarity)
+
+    def _score(self, q: Any, rows: Any, limit: int, min_similarity: float) -> List[Tuple[int, float]]:
+        if rows.shape[0] == 0:
+            return []
+        scores = self.vectors[rows] @ q
+        if rows.shape[0] > limit:
+            top = _np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            top = _np.arange(rows.shape[0])
+        top = top[_np.argsort(-scores[top], kind="stable")]
+        return [
+            (int(self.ids[rows[i]]), float(scores[i]))
+            for i in top
+            if scores[i] >= min_similarity
+        ]
+
+    # ── Persistenz ──────────────────────────────────────────────────────
+
+    def save(self, path: str) -> None:
+        meta = {
+            "format": _FORMAT,
+            "version": self.version,
+            "dim": self.dim,
+            "checksum": list(self.checksum),
+            "trained_size": self.trained_size,
+        }
+        n = self.size
+        list_of_row = _np.full(n, -1, dtype=_np.int32)
+        for c, rows in enumerate(self.lists):
+            list_of_row[_rows_array(rows)] = c
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as fh:
+            _np.savez(
+                fh,
+                meta=_np.asarray(json.dumps(meta)),
+                vectors=self.vectors[:n],
+                ids=self.ids[:n],
+                alive=self.alive[:n],
+                conv_codes=self.conv_codes[:n],
+                ctype_codes=self.ctype_codes[:n],
+                conv_names=_np.asarray(self.conv_names, dtype=str),
+                ctype_names=_np.asarray(self.ctype_names, dtype=str),
+                centroids=(
+                    self.centroids
+                    if self.centroids is not None
+                    else _np.zeros((0, self.dim), dtype=_np.float32)
+                ),
+                list_of_row=list_of_row,
+            )
+        os.replace(tmp, path)
+        self.dirty = 0
+
+    @classmethod
+    def load(cls, path: str) -> "Partition":
+        with _np.load(path, allow_pickle=False) as data:
+            meta = json.loads(str(data["meta"]))
+            if meta.get("format") != _FORMAT:
+                raise ValueError(f"unsupported index format {meta.get('format')!r}")
+            part = cls(meta["version"], int(meta["dim"]))
+            part.vectors = _np.array(data["vectors"], dtype=_np.float32)
+            part.size = part.vectors.shape[0]
+            part.ids = _np.array(data["ids"], dtype=_np.int64)
+            part.alive = _np.array(data["alive"], dtype=bool)
+            part.conv_codes = _np.array(data["conv_codes"], dtype=_np.int32)
+            part.ctype_codes = _np.array(data["ctype_codes"], dtype=_np.int32)
+            part.conv_names = [str(c) for c in data["conv_names"].tolist()]
+            part.ctype_names = [str(c) for c in data["ctype_names"].tolist()]
+            centroids = data["centroids"]
+            list_of_row = _np.array(data["list_of_row"], dtype=_np.int64)
+        part._conv_code = {name: i for i, name in enumerate(part.conv_names)}
+        part._ctype_code = {name: i for i, name in enumerate(part.ctype_names)}
+        part.row_of = {int(part.ids[r]): int(r) for r in _np.flatnonzero(part.alive).tolist()}
+        part._reindex_rows()
+        part.trained_size = int(meta.get("trained_size", 0))
+        part.checksum = tuple(int(v) for v in meta["checksum"])  # type: ignore[assignment]
+        if centroids.shape[0]:
+            part.centroids = _np.array(centroids, dtype=_np.float32)
+            part._assign_lists(list_of_row, centroids.shape[0])
+        return part
+
+
+class AnnIndex:
+    """Verwaltet IVF-Partitionen (eine pro embedding_version) fuer eine DB."""
+
+    def __init__(self, db_path: str, index_dir: Optional[str] = None):
+        self.db_path = db_path
+        self.index_dir = index_dir or os.getenv("ANN_INDEX_DIR") or os.path.join(
+            os.path.dirname(os.path.abspath(db_path)), "ann_index"
+        )
+        self._parts: Dict[str, Partition] = {}
+        self._lock = threading.RLock()
+        self.stats = {
+            "builds": 0,
+            "loads": 0,
+            "delta_syncs": 0,
+            "delta_added": 0,
+            "delta_removed": 0,
+            "ann_searches": 0,
+            "exact_searches": 0,
+        }
+
+    def _path(self, version: str) -> str:
+        safe = re.sub(r"[^A-Za-z0-9_.-]", "_", version)
+        return os.path.join(self.index_dir, f"{safe}.npz")
+
+    def _persist(self, part: Partition) -> None:
+        try:
+            os.makedirs(self.index_dir, exist_ok=True)
+            part.save(self._path(part.version))
+        except Exception as e:
+            logger.warning(f"[AnnIndex] persist failed for {part.version}: {e}")
+
+    def _build(self, conn: sqlite3.Connection, version: str) -> Optional[Partition]:
+        rows = conn.execute(
+            "SELECT id, embedding, conversation_id, content_type FROM embeddings "
+            "WHERE embedding_version = ? AND embedding IS NOT NULL ORDER BY id",
+            (version,),
+        ).fetchall()
+        part: Optional[Partition] = None
+        skipped: Set[int] = set()
+        for entry_id, raw, conv, ctype in rows:
+            vec = unpack_embedding(raw)
+            if not vec:
+                skipped.add(int(entry_id))
+                continue
+            if part is None:
+                part = Partition(version, len(vec))
+            unit = unit_vector(vec) if len(vec) == part.dim else None
+            if unit is None:
+                skipped.add(int(entry_id))
+                continue
+            part.add(int(entry_id), unit, conv, ctype)
+        if part is None:
+            return None
+        part.skipped = skipped
+        part.train()
+        # Checksumme aus SQLite (inkl. uebersprungener Zeilen), sonst Dauer-Abgleich.
+        part.checksum = _partition_checksum(conn, version)
+        part.verified_at = time.monotonic()
+        self.stats["builds"] += 1
+        self._persist(part)
+        logger.info(
+            "[AnnIndex] built partition %s rows=%s lists=%s",
+            version,
+            part.live_count,
+            len(part.lists),
+        )
+        return part
+
+    def _sync_delta(self, conn: sqlite3.Connection, part: Partition, expected: Checksum) -> bool:
+        """Zieht Schreibzugriffe anderer Prozesse per rowid nach (ohne Retrain)."""
+        version = part.version
+        ids = [
+            int(r[0])
+            for r in conn.execute(
+                "SELECT id FROM embeddings WHERE embedding_version = ? AND embedding IS NOT NULL",
+                (version,),
+            )
+        ]
+        added, removed = part.apply_delta(
+            ids,
+            lambda missing: fetch_chunked(
+                conn,
+                "SELECT id, embedding, conversation_id, content_type FROM embeddings "
+                "WHERE embedding_version = ? AND id IN ({ids}) ORDER BY id",
+                missing,
+                (version,),
+            ),
+        )
+        part.checksum = expected
+        self.stats["delta_syncs"] += 1
+        self.stats["delta_added"] += added
+        self.stats["delta_removed"] += removed
+        logger.info(f"[AnnIndex] delta sync {version}: +{added} -{removed}")
+        return bool(added or removed)
+
+    def _partition(self, version: str) -> Optional[Partition]:
+        """Liefert eine verifizierte Partition (laden/Delta-Abgleich/Build bei Bedarf)."""
+        part = self._parts.get(version)
+        now = time.monotonic()
+        if part is not None and (now - part.verified_at) < ANN_CHECKSUM_TTL_S:
+            return part
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            expected = _partition_checksum(conn, version)
+            if part is None:
+                path = self._path(version)
+                if os.path.exists(path):
+                    try:
+                        part = Partition.load(path)
+                        self.stats["loads"] += 1
+                    except Exception as e:
+                        logger.warning(f"[AnnIndex] load failed for {version}: {e}")
+                        part = None
+            if not expected[0]:
+                part = None
+            elif part is None:
+                part = self._build(conn, version)
+            else:
+                changed = tuple(part.checksum) != expected and self._sync_delta(conn, part, expected)
+                if part.needs_retrain():
+                    part.train()
+                    changed = True
+                if changed:
+                    self._persist(part)
+        finally:
+            conn.close()
+
+        if part is None:
+            self._parts.pop(version, None)
+            return None
+        part.verified_at = now
+        self._parts[version] = part
+        return part
+
+    # ── Public API ──────────────────────────────────────────────────────
+
+    def search(
+        self,
+        version: str,
+        query: Sequence[float],
+        limit: int,
+        min_similarity: float,
+        conversation_id: Optional[str] = None,
+        content_type: Optional[str] = None,
+    ) -> Optional[List[Tuple[int, float]]]:
+        """
+        Top-k (id, similarity) innerhalb einer Partition.
+        Returns None, wenn der Index die Anfrage nicht bedienen kann
+        (Caller faellt dann auf den SQL-Scan zurueck).
+        """
+        if limit <= 0:
+            return []
+        q = unit_vector(query)
+        if q is None:
+            return []
+        with self._lock:
+            part = self._partition(version)
+            if part is None:
+                return []
+            if part.dim != q.shape[0]:
+                return None
+            if part.centroids is None:
+                self.stats["exact_searches"] += 1
+            else:
+                self.stats["ann_searches"] += 1
+            return part.search(q, limit, min_similarity, conversation_id, content_type)
+
+    def upsert(
+        self,
+        entry_id: int,
+        version: str,
+        vector: Sequence[float],
+        conversation_id: str,
+        content_type: str,
+    ) -> None:
+        """Inkrementelles Update fuer bereits geladene Partitionen."""
+        unit = unit_vector(vector)
+        with self._lock:
+            self._remove_locked(entry_id)
+            part = self._parts.get(version)
+            if part is None or unit is None or part.dim != unit.shape[0]:
+                return
+            part.add(int(entry_id), unit, conversation_id, content_type)
+            self._maybe_persist(part)
+
+    def remove(self, entry_id: int) -> None:
+        with self._lock:
+            self._remove_locked(entry_id)
+
+    def _remove_locked(self, entry_id: int) -> None:
+        for part in self._parts.values():
+            if part.remove(int(entry_id)):
+                # MAX(id) kann nicht zurueckgerechnet werden -> beim naechsten Zugriff pruefen.
+                part.verified_at = 0.0
+                self._maybe_persist(part)
+
+    def _maybe_persist(self, part: Partition) -> None:
+        if part.dirty >= ANN_PERSIST_EVERY:
+            self._persist(part)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "partitions": {
+                    v: {
+                        "rows": p.live_count,
+                        "lists": len(p.lists),
+                        "mode": "ivf" if p.centroids is not None else "exact",
+                    }
+                    for v, p in self._parts.items()
+                },
+            }
+
+
+def unit_vector(vec: Sequence[float]) -> Optional[Any]:
+    arr = _np.asarray(vec, dtype=_np.float32)
+    norm = float(_np.linalg.norm(arr))
+    if norm == 0:
+        return None
+    return arr / norm
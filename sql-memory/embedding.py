@@ -10,6 +10,10 @@ Model resolution precedence (per call, with short TTL cache):
 Execution mode (GPU vs CPU) is resolved per-call via the inline
 _inline_resolve_target() function, which mirrors utils/embedding_resolver.py
 (inlined because sql-memory runs in a separate container).
+
+Batching: get_embeddings_batch() nutzt Ollamas /api/embed (input=[...]) in
+Chunks von EMBEDDING_BATCH_SIZE und faellt bei aelteren Servern ohne
+/api/embed auf Einzel-Calls gegen /api/embeddings zurueck.
 """
 
 import os
@@ -20,6 +24,8 @@ import requests
 from typing import List, Optional, Dict, Any
 import logging
 
+from embedding_cache import cache_enabled, get_embedding_cache
+
 logger = logging.getLogger(__name__)
 _ROUTING_LOG_LEVEL = str(
     os.getenv("EMBEDDING_ROUTING_LOG_LEVEL", "warning")
@@ -52,6 +58,10 @@ _ROUTE_FETCH_TIMEOUT_S = max(
     float(os.getenv("SETTINGS_ROUTE_FETCH_TIMEOUT_S", "1.0")),
 )
 _REFRESH_WARN_THROTTLE_S = 60.0
+EMBEDDING_BATCH_SIZE = max(1, int(os.getenv("EMBEDDING_BATCH_SIZE", "32")))
+_EMBED_CACHE_DB_PATH = os.getenv(
+    "EMBEDDING_CACHE_DB_PATH", os.getenv("DB_PATH", "/app/data/memory.db")
+)
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Runtime model resolver (Settings API → env → default)
@@ -206,6 +216,11 @@ def get_active_embedding_version() -> str:
     return compute_embedding_version_id(model, policy)
 
 
+def get_active_embedding_model() -> str:
+    """Effektives Embedding-Modell (für Clients, die Query-Vektoren mitschicken)."""
+    return _resolve_embedding_model()
+
+
 def _resolve_embedding_model() -> str:
     """
     Resolve embedding model at runtime.
@@ -440,6 +455,42 @@ def _request_embedding(url: str, model: str, text: str, options: dict) -> Option
         return None
 
 
+# endpoint -> False, sobald der Server /api/embed nicht kennt (404/405)
+_batch_support: Dict[str, bool] = {}
+
+
+def _request_embeddings_batch(
+    url: str, model: str, texts: List[str], options: dict
+) -> Optional[List[List[float]]]:
+    """
+    Ollama /api/embed Batch-Call.
+    Returns None bei Fehler oder wenn der Server kein /api/embed anbietet.
+    """
+    if _batch_support.get(url) is False:
+        return None
+    try:
+        payload: dict = {"model": model, "input": [t.strip() for t in texts]}
+        if options:
+            payload["options"] = options
+        response = requests.post(f"{url}/api/embed", json=payload, timeout=60)
+        if response.status_code in (404, 405):
+            _batch_support[url] = False
+            logger.warning(f"[Embedding] /api/embed not supported @ {url}, using per-text calls")
+            return None
+        response.raise_for_status()
+        embeddings = response.json().get("embeddings") or []
+        if len(embeddings) != len(texts) or not all(embeddings):
+            logger.error(
+                f"[Embedding] Batch size mismatch @ {url}: sent={len(texts)} got={len(embeddings)}"
+            )
+            return None
+        _batch_support[url] = True
+        return embeddings
+    except Exception as e:
+        logger.error(f"[Embedding] Batch error @ {url}: {e}")
+        return None
+
+
 def _log_routing_decision(message: str, hard_error: bool = False) -> None:
     """
     Emit routing decision with a visibility-safe default level.
@@ -458,25 +509,13 @@ def _log_routing_decision(message: str, hard_error: bool = False) -> None:
     logger.warning(message)
 
 
-def get_embedding(text: str) -> Optional[List[float]]:
+def _resolve_embedding_target() -> Optional[dict]:
     """
-    Holt Embedding-Vektor für einen Text von Ollama.
+    Resolve routing target (endpoint/options/fallback) for the next embedding call.
 
-    Routes to GPU or CPU endpoint based on embedding_runtime_policy
-    (read via EMBEDDING_EXECUTION_MODE env var / Settings API).
     Emits structured log per Scope 3.1 observability spec.
-    Falls back to fallback_endpoint on failure when policy=best_effort.
-
-    Args:
-        text: Der Text der embedded werden soll
-
-    Returns:
-        Liste von Floats (der Embedding-Vektor) oder None bei Fehler
+    Returns None on hard routing errors.
     """
-    if not text or not text.strip():
-        return None
-
-    model = _resolve_embedding_model()
     rt = _resolve_runtime_config()
     role_route = _resolve_embedding_role_route()
 
@@ -534,6 +573,52 @@ def get_embedding(text: str) -> Optional[List[float]]:
         _log_routing_decision(_log_msg, hard_error=True)
         return None
     _log_routing_decision(_log_msg, hard_error=False)
+    return target
+
+
+def _embedding_cache():
+    """Shared content-addressed cache, or None when EMBEDDING_CACHE_ENABLED=false."""
+    if not cache_enabled():
+        return None
+    return get_embedding_cache(_EMBED_CACHE_DB_PATH)
+
+
+def get_embedding_cache_stats() -> dict:
+    """Hit/miss counters of the embedding cache (for status tools)."""
+    if not cache_enabled():
+        return {"enabled": False}
+    return {"enabled": True, **get_embedding_cache(_EMBED_CACHE_DB_PATH).get_stats()}
+
+
+def get_embedding(text: str) -> Optional[List[float]]:
+    """
+    Holt Embedding-Vektor für einen Text von Ollama.
+
+    Routes to GPU or CPU endpoint based on embedding_runtime_policy
+    (read via EMBEDDING_EXECUTION_MODE env var / Settings API).
+    Emits structured log per Scope 3.1 observability spec.
+    Falls back to fallback_endpoint on failure when policy=best_effort.
+
+    Args:
+        text: Der Text der embedded werden soll
+
+    Returns:
+        Liste von Floats (der Embedding-Vektor) oder None bei Fehler
+    """
+    if not text or not text.strip():
+        return None
+
+    cache = _embedding_cache()
+    version = get_active_embedding_version() if cache else ""
+    if cache:
+        cached = cache.get(text, version)
+        if cached:
+            return cached
+
+    model = _resolve_embedding_model()
+    target = _resolve_embedding_target()
+    if target is None:
+        return None
 
     embedding = _request_embedding(target["endpoint"], model, text, target["options"])
 
@@ -551,11 +636,83 @@ def get_embedding(text: str) -> Optional[List[float]]:
             f"[Embedding] Generated vector with {len(embedding)} dimensions "
             f"target={target['effective_target']}"
         )
+        if cache:
+            cache.put(text, version, embedding)
         return embedding
     logger.error("[Embedding] No embedding in response")
     return None
 
 
+def get_embeddings_batch(
+    texts: List[str],
+    batch_size: Optional[int] = None,
+) -> List[Optional[List[float]]]:
+    """
+    Holt Embeddings fuer viele Texte mit moeglichst wenigen Requests.
+
+    - Chunks von batch_size (Default EMBEDDING_BATCH_SIZE) gegen /api/embed.
+    - Aeltere Ollama-Server ohne /api/embed: Einzel-Calls gegen /api/embeddings.
+    - Fallback-Endpoint wie bei get_embedding (policy=best_effort).
+
+    Returns:
+        Liste gleicher Laenge und Reihenfolge wie `texts`; None fuer leere
+        oder fehlgeschlagene Eintraege.
+    """
+    results: List[Optional[List[float]]] = [None] * len(texts)
+    pending = [i for i, t in enumerate(texts) if t and t.strip()]
+    if not pending:
+        return results
+
+    cache = _embedding_cache()
+    version = get_active_embedding_version() if cache else ""
+    if cache:
+        for i in pending:
+            results[i] = cache.get(texts[i], version)
+        pending = [i for i in pending if results[i] is None]
+        if not pending:
+            return results
+    requested = list(pending)
+
+    model = _resolve_embedding_model()
+    target = _resolve_embedding_target()
+    if target is None:
+        return results
+
+    size = max(1, int(batch_size or EMBEDDING_BATCH_SIZE))
+    endpoints = [target["endpoint"]]
+    if target.get("fallback_endpoint"):
+        endpoints.append(target["fallback_endpoint"])
+
+    for start in range(0, len(pending), size):
+        chunk = pending[start:start + size]
+        chunk_texts = [texts[i] for i in chunk]
+        for url in endpoints:
+            vectors = _request_embeddings_batch(url, model, chunk_texts, target["options"])
+            if vectors is None and _batch_support.get(url) is False:
+                vectors = [
+                    _request_embedding(url, model, t, target["options"]) for t in chunk_texts
+                ]
+            if vectors is None:
+                continue
+            for i, vec in zip(chunk, vectors):
+                if vec and results[i] is None:
+                    results[i] = vec
+            if all(results[i] is not None for i in chunk):
+                break
+            chunk = [i for i in chunk if results[i] is None]
+            chunk_texts = [texts[i] for i in chunk]
+
+    generated = [i for i in requested if results[i]]
+    if cache:
+        for i in generated:
+            cache.put(texts[i], version, results[i])
+    logger.info(
+        f"[Embedding] Batch generated {len(generated)}/{len(requested)} vectors "
+        f"target={target['effective_target']}"
+    )
+    return results
+
+
 def get_embedding_with_metadata(text: str) -> Optional[dict]:
     """
     Generate embedding plus version metadata for Scope 3.2.
@@ -586,6 +743,35 @@ def get_embedding_with_metadata(text: str) -> Optional[dict]:
     }
 
 
+def get_embeddings_batch_with_metadata(
+    texts: List[str],
+    batch_size: Optional[int] = None,
+) -> List[Optional[dict]]:
+    """
+    Batch-Variante von get_embedding_with_metadata (gleiche Reihenfolge,
+    None fuer fehlgeschlagene Eintraege).
+    """
+    vectors = get_embeddings_batch(texts, batch_size=batch_size)
+    if not any(vectors):
+        return [None] * len(texts)
+
+    model = _resolve_embedding_model()
+    policy = _canonical_policy()
+    version_id = compute_embedding_version_id(model, policy)
+    return [
+        {
+            "embedding": vec,
+            "embedding_model": model,
+            "embedding_dim": len(vec),
+            "embedding_version": version_id,
+            "runtime_policy": policy,
+        }
+        if vec
+        else None
+        for vec in vectors
+    ]
+
+
 def cosine_similarity(vec1: List[float], vec2: List[float]) -> float:
     """
     Berechnet Cosine Similarity zwischen zwei Vektoren.
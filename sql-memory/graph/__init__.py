@@ -1,3 +1,3 @@
 # sql-memory/graph/__init__.py
 from .graph_store import GraphStore, get_graph_store
-from .graph_builder import build_node_with_edges
\ No newline at end of file
+from .graph_builder import build_node_with_edges, relink_semantic_edges
\ No newline at end of file
@@ -0,0 +1,209 @@
+# sql-memory/graph/dedup.py
+"""
+Graph Dedup - Near-Duplicate-Erkennung über alle Node-Typen.
+
+Streaming über graph_nodes (id-Batches), sub-quadratisch:
+  - Lexikalisch: MinHash-Signaturen (Char-Shingles) + LSH-Banding.
+    Jeder Node wird nur mit wenigen Bucket-Nachbarn verglichen.
+  - Semantisch: k-NN über GraphNodeIndex (IVF/exakt) statt All-Pairs.
+  - Paare -> Union-Find -> Cluster mit Score (schwächste Verbindung).
+
+Standardmäßig nur innerhalb desselben source_type (ein "skill" wird nicht
+mit einem "fact" gleichen Inhalts verschmolzen).
+"""
+
+import logging
+import random
+import re
+import sqlite3
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from vector_math import _np, unpack_embedding
+from .node_index import get_node_index
+
+logger = logging.getLogger(__name__)
+
+MINHASH_PERM = 64
+LSH_BANDS = 16
+SHINGLE_SIZE = 4
+# Vergleiche pro Bucket begrenzen (große exakte Gruppen bleiben linear)
+BUCKET_COMPARE = 8
+_MERSENNE = (1 << 31) - 1
+
+
+def _shingles(text: str) -> List[int]:
+    norm = re.sub(r"\s+", " ", (text or "").lower()).strip()
+    if not norm:
+        return []
+    if len(norm) <= SHINGLE_SIZE:
+        return [zlib.crc32(norm.encode("utf-8")) % _MERSENNE]
+    return list({
+        zlib.crc32(norm[i:i + SHINGLE_SIZE].encode("utf-8")) % _MERSENNE
+        for i in range(len(norm) - SHINGLE_SIZE + 1)
+    })
+
+
+class MinHasher:
+    """MinHash mit Hashfamilie h(x) = (a*x + b) mod (2^31 - 1)."""
+
+    def __init__(self, num_perm: int = MINHASH_PERM, seed: int = 1):
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self.a = [rng.randrange(1, _MERSENNE) for _ in range(num_perm)]
+        self.b = [rng.randrange(0, _MERSENNE) for _ in range(num_perm)]
+        if _np is not None:
+            self._a = _np.asarray(self.a, dtype=_np.int64)
+            self._b = _np.asarray(self.b, dtype=_np.int64)
+
+    def signature(self, shingles: List[int]) -> Tuple[int, ...]:
+        if _np is not None:
+            x = _np.asarray(shingles, dtype=_np.int64)
+            hashed = (_np.outer(self._a, x) + self._b[:, None]) % _MERSENNE
+            return tuple(int(v) for v in hashed.min(axis=1))
+        return tuple(
+            min((a * x + b) % _MERSENNE for x in shingles)
+            for a, b in zip(self.a, self.b)
+        )
+
+
+def estimate_jaccard(sig_a: Tuple[int, ...], sig_b: Tuple[int, ...]) -> float:
+    if not sig_a or len(sig_a) != len(sig_b):
+        return 0.0
+    return sum(1 for x, y in zip(sig_a, sig_b) if x == y) / len(sig_a)
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent: Dict[int, int] = {}
+
+    def find(self, x: int) -> int:
+        self.parent.setdefault(x, x)
+        while self.parent[x] != x:
+            self.parent[x] = self.parent[self.parent[x]]
+            x = self.parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> None:
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+
+def find_duplicate_clusters(
+    db_path: str,
+    lexical_threshold: float = 0.85,
+    semantic_threshold: float = 0.97,
+    include_semantic: bool = True,
+    cross_type: bool = False,
+    batch_size: int = 500,
+    semantic_k: int = 5,
+    max_clusters: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Findet Cluster von Near-Duplicates im Graph.
+
+    Returns:
+        {
+          "clusters": [{node_ids, count, score, kinds, source_types, content_preview}],
+          "stats": {nodes, lexical_pairs, semantic_pairs, comparisons}
+        }
+        node_ids[0] ist der vorgeschlagene Primary (höchste Confidence, dann ältester).
+    """
+    hasher = MinHasher()
+    rows_per_band = max(1, MINHASH_PERM // LSH_BANDS)
+    buckets: Dict[Tuple, List[int]] = {}
+    signatures: Dict[int, Tuple[int, ...]] = {}
+    meta: Dict[int, Tuple[str, float, str]] = {}
+    pairs: Dict[Tuple[int, int], Tuple[float, str]] = {}
+    index = get_node_index(db_path) if include_semantic else None
+    stats = {"nodes": 0, "lexical_pairs": 0, "semantic_pairs": 0, "comparisons": 0}
+
+    def _add_pair(a: int, b: int, score: float, kind: str) -> None:
+        key = (min(a, b), max(a, b))
+        prev = pairs.get(key)
+        if prev is None:
+            pairs[key] = (score, kind)
+        else:
+            pairs[key] = (max(prev[0], score), prev[1] if prev[1] == kind else "both")
+
+    conn = sqlite3.connect(db_path)
+    try:
+        cursor = conn.execute(
+            "SELECT id, source_type, content, confidence, embedding FROM graph_nodes ORDER BY id"
+        )
+        while True:
+            batch = cursor.fetchmany(batch_size)
+            if not batch:
+                break
+            for node_id, source_type, content, confidence, raw_emb in batch:
+                stats["nodes"] += 1
+                meta[node_id] = (source_type, confidence if confidence is not None else 0.5, (content or "")[:100])
+
+                shingles = _shingles(content)
+                if shingles:
+                    sig = hasher.signature(shingles)
+                    signatures[node_id] = sig
+                    scope = "*" if cross_type else source_type
+                    seen = set()
+                    for band in range(LSH_BANDS):
+                        key = (scope, band, sig[band * rows_per_band:(band + 1) * rows_per_band])
+                        members = buckets.setdefault(key, [])
+                        for other in members[-BUCKET_COMPARE:]:
+                            if other in seen:
+                                continue
+                            seen.add(other)
+                            stats["comparisons"] += 1
+                            score = estimate_jaccard(sig, signatures[other])
+                            if score >= lexical_threshold:
+                                _add_pair(node_id, other, score, "lexical")
+                        members.append(node_id)
+
+                if index is not None and raw_emb:
+                    vec = unpack_embedding(raw_emb)
+                    if vec:
+                        for other, sim in index.search(vec, semantic_k + 1, semantic_threshold):
+                            if other != node_id:
+                                _add_pair(node_id, other, sim, "semantic")
+    finally:
+        conn.close()
+
+    uf = _UnionFind()
+    links: List[Tuple[int, int, float, str]] = []
+    for (a, b), (score, kind) in pairs.items():
+        if a not in meta or b not in meta:
+            continue  # Index kann gelöschte Nodes liefern
+        if not cross_type and meta[a][0] != meta[b][0]:
+            continue
+        links.append((a, b, score, kind))
+        uf.union(a, b)
+        if kind in ("lexical", "both"):
+            stats["lexical_pairs"] += 1
+        if kind in ("semantic", "both"):
+            stats["semantic_pairs"] += 1
+
+    groups: Dict[int, Dict[str, Any]] = {}
+    for a, b, score, kind in links:
+        g = groups.setdefault(uf.find(a), {"ids": set(), "score": 1.0, "kinds": set()})
+        g["ids"].update((a, b))
+        g["score"] = min(g["score"], score)
+        g["kinds"].add(kind)
+
+    clusters = []
+    for g in groups.values():
+        ids = sorted(g["ids"], key=lambda n: (-meta[n][1], n))
+        kinds = {"lexical", "semantic"} if "both" in g["kinds"] else g["kinds"]
+        clusters.append({
+            "node_ids": ids,
+            "count": len(ids),
+            "score": round(g["score"], 4),
+            "kinds": sorted(kinds),
+            "source_types": sorted({meta[n][0] for n in ids}),
+            "content_preview": meta[ids[0]][2],
+        })
+    clusters.sort(key=lambda c: (-c["score"], -c["count"]))
+    if max_clusters is not None:
+        clusters = clusters[:max_clusters]
+
+    logger.info(f"[GraphDedup] {len(clusters)} clusters {stats}")
+    return {"clusters": clusters, "stats": stats}
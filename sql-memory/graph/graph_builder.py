@@ -4,13 +4,18 @@ Graph Builder - Erstellt automatisch Kanten beim Speichern.
 """
 
 import logging
-from typing import List, Optional
+import os
+import sqlite3
+from typing import Dict, List, Optional
 from .graph_store import get_graph_store
+from .node_index import get_node_index
 
 logger = logging.getLogger(__name__)
 
 # Similarity Thresholds
-SEMANTIC_THRESHOLD = 0.70
+SEMANTIC_THRESHOLD = float(os.getenv("GRAPH_SEMANTIC_THRESHOLD", "0.70"))
+# Max. Semantic Edges pro Node (k-NN über alle Nodes)
+SEMANTIC_K = int(os.getenv("GRAPH_SEMANTIC_K", "10"))
 COOCCUR_WEIGHT = 0.2
 
 
@@ -78,50 +83,117 @@ def build_node_with_edges(
 def _create_semantic_edges(
     node_id: int,
     embedding: List[float],
-    conversation_id: str = None
+    conversation_id: str = None,
+    k: int = None,
+    threshold: float = None,
 ):
-    """Erstellt Semantic Edges zu ähnlichen Nodes."""
-    from embedding import cosine_similarity
-    import json
-    
+    """Erstellt Semantic Edges zu den k ähnlichsten Nodes (k-NN über alle Nodes)."""
     gs = get_graph_store()
-    
-    # Alle Nodes mit Embeddings holen (außer der aktuelle)
-    import sqlite3
-    from memory_mcp.config import DB_PATH
-    
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT id, embedding FROM graph_nodes
-        WHERE embedding IS NOT NULL AND id != ?
-        ORDER BY id DESC
-        LIMIT 100
-    """, (node_id,))
-    
-    rows = cursor.fetchall()
-    conn.close()
-    
-    for row in rows:
-        other_id, other_emb_json = row
-        if not other_emb_json:
-            continue
-        
-        try:
-            other_embedding = json.loads(other_emb_json)
-            similarity = cosine_similarity(embedding, other_embedding)
-            
-            if similarity >= SEMANTIC_THRESHOLD:
-                gs.add_edge(
-                    src_node_id=node_id,
-                    dst_node_id=other_id,
-                    edge_type="semantic",
-                    weight=similarity
-                )
-                logger.info(f"[GraphBuilder] Semantic edge: {node_id} → {other_id} (sim={similarity:.3f})")
-        except:
+    k = SEMANTIC_K if k is None else k
+    threshold = SEMANTIC_THRESHOLD if threshold is None else threshold
+
+    index = get_node_index(gs.db_path)
+    index.upsert(node_id, embedding)
+    # k+1: der Node selbst ist sein bester Treffer
+    hits = [(other, sim) for other, sim in index.search(embedding, k + 1, threshold) if other != node_id]
+
+    conn = sqlite3.connect(gs.db_path)
+    try:
+        live = _existing_node_ids(conn, [other for other, _ in hits])
+    finally:
+        conn.close()
+
+    for other_id, similarity in hits[:k]:
+        if other_id not in live:
             continue
+        gs.add_edge(
+            src_node_id=node_id,
+            dst_node_id=other_id,
+            edge_type="semantic",
+            weight=similarity
+        )
+        logger.info(f"[GraphBuilder] Semantic edge: {node_id} → {other_id} (sim={similarity:.3f})")
+
+
+def _existing_node_ids(conn: sqlite3.Connection, node_ids: List[int]) -> set:
+    """Index kann bis zur nächsten Checksum-Prüfung gelöschte Nodes liefern."""
+    live = set()
+    for i in range(0, len(node_ids), 500):
+        chunk = node_ids[i:i + 500]
+        rows = conn.execute(
+            f"SELECT id FROM graph_nodes WHERE id IN ({','.join('?' * len(chunk))})", chunk
+        ).fetchall()
+        live.update(row[0] for row in rows)
+    return live
+
+
+def relink_semantic_edges(
+    batch_size: int = 200,
+    k: int = None,
+    threshold: float = None,
+) -> Dict[str, int]:
+    """
+    Maintenance: berechnet alle Semantic Edges des Graphen neu.
+
+    Läuft in id-Batches; pro Batch werden die alten Semantic Edges der
+    Batch-Nodes ersetzt (eine Transaktion pro Batch).
+    """
+    from vector_math import unpack_embedding
+
+    gs = get_graph_store()
+    k = SEMANTIC_K if k is None else k
+    threshold = SEMANTIC_THRESHOLD if threshold is None else threshold
+    index = get_node_index(gs.db_path)
+
+    stats = {"nodes": 0, "batches": 0, "edges_removed": 0, "edges_created": 0}
+    last_id = 0
+    conn = sqlite3.connect(gs.db_path)
+    try:
+        while True:
+            rows = conn.execute(
+                """
+                SELECT id, embedding FROM graph_nodes
+                WHERE embedding IS NOT NULL AND id > ?
+                ORDER BY id
+                LIMIT ?
+                """,
+                (last_id, batch_size),
+            ).fetchall()
+            if not rows:
+                break
+            last_id = rows[-1][0]
+
+            edges = []
+            for node_id, raw in rows:
+                vec = unpack_embedding(raw)
+                if not vec:
+                    continue
+                hits = [h for h in index.search(vec, k + 1, threshold) if h[0] != node_id]
+                edges.extend((node_id, other, sim) for other, sim in hits[:k])
+            live = _existing_node_ids(conn, list({dst for _, dst, _ in edges}))
+            edges = [e for e in edges if e[1] in live]
+
+            batch_ids = [r[0] for r in rows]
+            cur = conn.execute(
+                f"DELETE FROM graph_edges WHERE edge_type = 'semantic' "
+                f"AND src_node_id IN ({','.join('?' * len(batch_ids))})",
+                batch_ids,
+            )
+            stats["edges_removed"] += cur.rowcount
+            conn.executemany(
+                "INSERT INTO graph_edges (src_node_id, dst_node_id, edge_type, weight) "
+                "VALUES (?, ?, 'semantic', ?)",
+                edges,
+            )
+            conn.commit()
+            stats["nodes"] += len(rows)
+            stats["batches"] += 1
+            stats["edges_created"] += len(edges)
+    finally:
+        conn.close()
+
+    logger.info(f"[GraphBuilder] Semantic relink: {stats}")
+    return stats
 
 
 def _create_cooccur_edges(
@@ -9,12 +9,23 @@ Graph Store - Speichert Nodes und Edges in SQLite.
 
 import sqlite3
 import json
+import hashlib
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Node-Budget pro graph_walk (besuchte Nodes über alle Ebenen)
+DEFAULT_WALK_NODE_BUDGET = 500
+# SQLite erlaubt max. 999 Parameter pro Statement
+_SQL_IN_CHUNK = 500
+
+
+def content_hash(content: str) -> str:
+    """Hash für die direkte Zuordnung Embedding-Eintrag → Graph-Node."""
+    return hashlib.sha256((content or "").strip().encode("utf-8")).hexdigest()
+
 
 class GraphStore:
     """SQLite-basierter Graph Store."""
@@ -47,6 +58,9 @@ class GraphStore:
         columns = [row[1] for row in cursor.fetchall()]
         if "confidence" not in columns:
             cursor.execute("ALTER TABLE graph_nodes ADD COLUMN confidence REAL DEFAULT 0.5")
+        # Migration: content_hash (Seed-Auflösung in memory_graph_search)
+        if "content_hash" not in columns:
+            cursor.execute("ALTER TABLE graph_nodes ADD COLUMN content_hash TEXT")
         
         # Edges Tabelle
         cursor.execute("""
@@ -71,6 +85,10 @@ class GraphStore:
             CREATE INDEX IF NOT EXISTS idx_nodes_conv 
             ON graph_nodes(conversation_id)
         """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_nodes_content_hash
+            ON graph_nodes(content_hash)
+        """)
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_edges_src 
             ON graph_edges(src_node_id)
@@ -113,15 +131,16 @@ class GraphStore:
         if has_confidence:
             cursor.execute("""
                 INSERT INTO graph_nodes
-                (source_type, source_id, content, embedding, conversation_id, confidence)
-                VALUES (?, ?, ?, ?, ?, ?)
+                (source_type, source_id, content, embedding, conversation_id, confidence, content_hash)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
             """, (
                 source_type,
                 source_id,
                 content,
                 json.dumps(embedding) if embedding else None,
                 conversation_id,
-                confidence
+                confidence,
+                content_hash(content),
             ))
         else:
             cursor.execute("""
@@ -223,6 +242,66 @@ class GraphStore:
             "created_at": row[6]
         } for row in rows]
     
+    def find_nodes_by_contents(self, contents: List[str]) -> Dict[str, int]:
+        """
+        Ordnet Inhalte (z.B. Seed-Ergebnisse aus vs.search) direkt Graph-Nodes zu.
+
+        Eine indizierte Query über content_hash; bei mehreren Nodes mit
+        gleichem Inhalt gewinnt der neueste.
+
+        Returns:
+            {content: node_id} für alle aufgelösten Inhalte
+        """
+        hashes: Dict[str, List[str]] = {}
+        for text in contents:
+            hashes.setdefault(content_hash(text), []).append(text)
+        if not hashes:
+            return {}
+
+        resolved: Dict[str, int] = {}
+        keys = list(hashes)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            for i in range(0, len(keys), _SQL_IN_CHUNK):
+                chunk = keys[i:i + _SQL_IN_CHUNK]
+                rows = conn.execute(f"""
+                    SELECT content_hash, MAX(id) FROM graph_nodes
+                    WHERE content_hash IN ({",".join("?" * len(chunk))})
+                    GROUP BY content_hash
+                """, chunk).fetchall()
+                for h, node_id in rows:
+                    for text in hashes[h]:
+                        resolved[text] = node_id
+        finally:
+            conn.close()
+        return resolved
+
+    def backfill_content_hashes(self, batch_size: int = 500) -> Dict[str, int]:
+        """Setzt content_hash für Nodes, die vor der Migration angelegt wurden."""
+        updated = 0
+        conn = sqlite3.connect(self.db_path)
+        try:
+            while True:
+                rows = conn.execute(
+                    "SELECT id, content FROM graph_nodes WHERE content_hash IS NULL LIMIT ?",
+                    (batch_size,),
+                ).fetchall()
+                if not rows:
+                    break
+                conn.executemany(
+                    "UPDATE graph_nodes SET content_hash = ? WHERE id = ?",
+                    [(content_hash(content), node_id) for node_id, content in rows],
+                )
+                conn.commit()
+                updated += len(rows)
+            remaining = conn.execute(
+                "SELECT COUNT(*) FROM graph_nodes WHERE content_hash IS NULL"
+            ).fetchone()[0]
+        finally:
+            conn.close()
+        logger.info(f"[GraphStore] content_hash backfill: {updated} nodes")
+        return {"updated": updated, "remaining": remaining}
+
     # ══════════════════════════════════════════════════════════
     # EDGE OPERATIONS
     # ══════════════════════════════════════════════════════════
@@ -335,41 +414,59 @@ class GraphStore:
         self,
         start_node_ids: List[int],
         depth: int = 2,
-        limit: int = 10
+        limit: int = 10,
+        min_weight: Optional[float] = None,
+        edge_types: Optional[List[str]] = None,
+        max_nodes: int = DEFAULT_WALK_NODE_BUDGET,
     ) -> List[Dict]:
         """
         Graph-Walk von Start-Nodes aus.
         Sammelt Nodes bis zur gegebenen Tiefe.
         Sorts results by confidence (higher = more relevant).
-        """
-        visited = set()
-        results = []
 
-        current_level = start_node_ids
+        Set-basiert: pro Ebene ein Node-Query und ein Edge-Query
+        (`WHERE id IN (...)`) über eine einzige Connection.
 
-        for d in range(depth):
-            next_level = []
+        Args:
+            min_weight: nur Edges mit weight >= min_weight folgen
+            edge_types: nur diese Edge-Typen folgen (str oder Liste)
+            max_nodes: Node-Budget pro Walk (besuchte Nodes)
+        """
+        if isinstance(edge_types, str):
+            edge_types = [edge_types]
+        budget = max(1, int(max_nodes))
 
-            for node_id in current_level:
-                if node_id in visited:
-                    continue
-                visited.add(node_id)
+        visited = set()
+        results = []
+        current_level = list(dict.fromkeys(start_node_ids or []))
 
-                node = self.get_node(node_id)
-                if node:
-                    node["depth"] = d
-                    results.append(node)
+        conn = sqlite3.connect(self.db_path)
+        try:
+            for d in range(depth):
+                frontier = [n for n in current_level if n not in visited]
+                frontier = frontier[: budget - len(visited)]
+                if not frontier:
+                    break
+                visited.update(frontier)
 
-                # Nachbarn holen
-                neighbors = self.get_neighbors(node_id)
-                for neighbor in neighbors:
-                    if neighbor["node_id"] not in visited:
-                        next_level.append(neighbor["node_id"])
+                nodes = self._fetch_nodes(conn, frontier)
+                for node_id in frontier:
+                    node = nodes.get(node_id)
+                    if node:
+                        node["depth"] = d
+                        results.append(node)
 
-            current_level = next_level
+                if len(results) >= limit or len(visited) >= budget or d == depth - 1:
+                    break
 
-            if len(results) >= limit:
-                break
+                # Nachbarn der ganzen Ebene holen
+                next_level = []
+                for dst in self._fetch_neighbor_ids(conn, frontier, min_weight, edge_types):
+                    if dst not in visited:
+                        next_level.append(dst)
+                current_level = list(dict.fromkeys(next_level))
+        finally:
+            conn.close()
 
         # Sort by confidence (desc) then depth (asc) so workspace-promoted
         # nodes (confidence=0.9) rank above auto-extracted (confidence=0.5)
@@ -377,6 +474,57 @@ class GraphStore:
 
         return results[:limit]
 
+    @staticmethod
+    def _fetch_nodes(conn: sqlite3.Connection, node_ids: List[int]) -> Dict[int, Dict]:
+        """Batch-Variante von get_node (eine Query pro Chunk)."""
+        nodes: Dict[int, Dict] = {}
+        for i in range(0, len(node_ids), _SQL_IN_CHUNK):
+            chunk = node_ids[i:i + _SQL_IN_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(f"""
+                SELECT id, source_type, source_id, content, embedding, conversation_id, created_at, confidence
+                FROM graph_nodes WHERE id IN ({placeholders})
+            """, chunk).fetchall()
+            for row in rows:
+                nodes[row[0]] = {
+                    "id": row[0],
+                    "source_type": row[1],
+                    "source_id": row[2],
+                    "content": row[3],
+                    "embedding": json.loads(row[4]) if row[4] else None,
+                    "conversation_id": row[5],
+                    "created_at": row[6],
+                    "confidence": row[7] if row[7] is not None else 0.5,
+                }
+        return nodes
+
+    @staticmethod
+    def _fetch_neighbor_ids(
+        conn: sqlite3.Connection,
+        node_ids: List[int],
+        min_weight: Optional[float],
+        edge_types: Optional[List[str]],
+    ) -> List[int]:
+        """Outgoing-Nachbarn einer ganzen Frontier, nach Gewicht sortiert."""
+        out: List[int] = []
+        for i in range(0, len(node_ids), _SQL_IN_CHUNK):
+            chunk = node_ids[i:i + _SQL_IN_CHUNK]
+            sql = (
+                "SELECT e.dst_node_id FROM graph_edges e "
+                "JOIN graph_nodes n ON e.dst_node_id = n.id "
+                f"WHERE e.src_node_id IN ({','.join('?' * len(chunk))})"
+            )
+            params: List[Any] = list(chunk)
+            if min_weight is not None:
+                sql += " AND e.weight >= ?"
+                params.append(min_weight)
+            if edge_types:
+                sql += f" AND e.edge_type IN ({','.join('?' * len(edge_types))})"
+                params.extend(edge_types)
+            sql += " ORDER BY e.weight DESC"
+            out.extend(row[0] for row in conn.execute(sql, params).fetchall())
+        return out
+
 
 
     def get_edges(self, node_id: int):
@@ -404,6 +552,64 @@ class GraphStore:
         finally:
             conn.close()
     
+    def merge_nodes(self, node_ids: List[int]) -> Dict[str, Any]:
+        """
+        Verschmilzt Nodes in node_ids[0] (eine Connection, eine Transaktion).
+
+        Edges der übrigen Nodes werden auf den Primary umgebogen; Gewichte
+        akkumulieren wie in add_edge (max. 1.0). Self-Loops entfallen.
+        """
+        ids = list(dict.fromkeys(node_ids))
+        if len(ids) < 2:
+            return {"merged": 0, "primary_node": ids[0] if ids else None, "deleted_nodes": []}
+        primary_id, others = ids[0], ids[1:]
+        # Temp-Tabelle statt IN (?, ...): große Dedup-Cluster würden sonst
+        # SQLites Variablenlimit (Default 999) sprengen.
+        merged = "SELECT id FROM temp.merge_ids"
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS merge_ids (id INTEGER PRIMARY KEY)")
+            conn.execute("DELETE FROM temp.merge_ids")
+            conn.executemany("INSERT OR IGNORE INTO temp.merge_ids (id) VALUES (?)", [(i,) for i in others])
+            edges = conn.execute(f"""
+                SELECT id, src_node_id, dst_node_id, edge_type, weight FROM graph_edges
+                WHERE src_node_id IN ({merged}) OR dst_node_id IN ({merged})
+            """).fetchall()
+            other_set = set(others)
+            for _, src, dst, edge_type, weight in edges:
+                src = primary_id if src in other_set else src
+                dst = primary_id if dst in other_set else dst
+                if src == dst:
+                    continue
+                existing = conn.execute("""
+                    SELECT id, weight FROM graph_edges
+                    WHERE src_node_id = ? AND dst_node_id = ? AND edge_type = ?
+                """, (src, dst, edge_type)).fetchone()
+                if existing:
+                    conn.execute(
+                        "UPDATE graph_edges SET weight = ? WHERE id = ?",
+                        (min(existing[1] + (weight or 0.0), 1.0), existing[0]),
+                    )
+                else:
+                    conn.execute("""
+                        INSERT INTO graph_edges (src_node_id, dst_node_id, edge_type, weight)
+                        VALUES (?, ?, ?, ?)
+                    """, (src, dst, edge_type, weight))
+            conn.execute(
+                f"DELETE FROM graph_edges WHERE src_node_id IN ({merged}) OR dst_node_id IN ({merged})"
+            )
+            conn.execute(f"DELETE FROM graph_nodes WHERE id IN ({merged})")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+        logger.info(f"[GraphStore] Merged {others} into {primary_id}")
+        return {"merged": len(others), "primary_node": primary_id, "deleted_nodes": others}
+
     def delete_node(self, node_id: int):
         """Delete a node and all its edges."""
         conn = sqlite3.connect(self.db_path)
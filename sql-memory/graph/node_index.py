@@ -0,0 +1,170 @@
+# sql-memory/graph/node_index.py
+"""
+Graph Node Index - k-NN über alle Node-Embeddings (graph_nodes.embedding).
+
+Nutzt die IVF-Flat Partition aus ann_index (eine Partition pro Dimension):
+  - Aufbau einmal aus SQLite, danach inkrementell via upsert() beim Anlegen.
+  - Checksumme (COUNT, MAX(id), SUM(id)) wird alle ANN_CHECKSUM_TTL_S
+    gegen SQLite geprüft; Mismatch (z.B. delete_node / graph_merge_nodes)
+    -> nur Deltas per id nachziehen (Partition.apply_delta), kein Rebuild.
+  - Ohne NumPy: exakter Scan über vector_math.top_k_cosine.
+"""
+
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+import ann_index
+from vector_math import _np, top_k_cosine, unpack_embedding
+
+logger = logging.getLogger(__name__)
+
+
+def _nodes_checksum(conn: sqlite3.Connection) -> Tuple[int, int, int]:
+    row = conn.execute(
+        "SELECT COUNT(*), COALESCE(MAX(id), 0), COALESCE(SUM(id), 0) "
+        "FROM graph_nodes WHERE embedding IS NOT NULL"
+    ).fetchone()
+    return (int(row[0]), int(row[1]), int(row[2]))
+
+
+class GraphNodeIndex:
+    """k-NN Index über graph_nodes für semantische Edges."""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._parts: Dict[int, Any] = {}
+        self._lock = threading.RLock()
+        self.stats = {
+            "builds": 0,
+            "delta_syncs": 0,
+            "ann_searches": 0,
+            "exact_searches": 0,
+            "scan_searches": 0,
+        }
+
+    def _build(self, conn: sqlite3.Connection, dim: int):
+        part = ann_index.Partition(f"graph_nodes:{dim}", dim)
+        rows = conn.execute(
+            "SELECT id, embedding FROM graph_nodes WHERE embedding IS NOT NULL ORDER BY id"
+        )
+        for node_id, raw in rows:
+            vec = unpack_embedding(raw)
+            unit = ann_index.unit_vector(vec) if vec and len(vec) == dim else None
+            if unit is None:
+                # andere Dimension / kaputt: beim Delta-Abgleich nicht erneut laden
+                part.skipped.add(int(node_id))
+            else:
+                part.add(int(node_id), unit, "", "")
+        part.train()
+        part.checksum = _nodes_checksum(conn)
+        self.stats["builds"] += 1
+        logger.info(f"[GraphNodeIndex] built dim={dim} rows={part.live_count} lists={len(part.lists)}")
+        return part
+
+    def _sync_delta(self, conn: sqlite3.Connection, part, expected: Tuple[int, int, int]) -> None:
+        ids = [int(r[0]) for r in conn.execute("SELECT id FROM graph_nodes WHERE embedding IS NOT NULL")]
+        added, removed = part.apply_delta(
+            ids,
+            lambda missing: ann_index.fetch_chunked(
+                conn,
+                "SELECT id, embedding, '', '' FROM graph_nodes WHERE id IN ({ids}) ORDER BY id",
+                missing,
+            ),
+        )
+        part.checksum = expected
+        self.stats["delta_syncs"] += 1
+        logger.debug(f"[GraphNodeIndex] delta sync dim={part.dim}: +{added} -{removed}")
+
+    def _partition(self, dim: int):
+        part = self._parts.get(dim)
+        now = time.monotonic()
+        if part is not None and (now - part.verified_at) < ann_index.ANN_CHECKSUM_TTL_S:
+            return part
+        conn = sqlite3.connect(self.db_path)
+        try:
+            expected = _nodes_checksum(conn)
+            if part is None:
+                part = self._build(conn, dim)
+            else:
+                if tuple(part.checksum) != expected:
+                    self._sync_delta(conn, part, expected)
+                if part.needs_retrain():
+                    part.train()
+        finally:
+            conn.close()
+        part.verified_at = now
+        self._parts[dim] = part
+        return part
+
+    def _scan(self, query: Sequence[float], limit: int, min_similarity: float) -> List[Tuple[int, float]]:
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.execute(
+                "SELECT id, embedding FROM graph_nodes WHERE embedding IS NOT NULL"
+            ).fetchall()
+        finally:
+            conn.close()
+        self.stats["scan_searches"] += 1
+        return top_k_cosine(query, [(r[0], r[1], None) for r in rows], limit, min_similarity)
+
+    def search(self, query: Sequence[float], limit: int, min_similarity: float) -> List[Tuple[int, float]]:
+        """Top-k (node_id, similarity) über alle Nodes gleicher Dimension."""
+        if limit <= 0 or not query:
+            return []
+        if _np is None:
+            return self._scan(query, limit, min_similarity)
+        q = ann_index.unit_vector(query)
+        if q is None:
+            return []
+        with self._lock:
+            part = self._partition(int(q.shape[0]))
+            if part.centroids is None:
+                self.stats["exact_searches"] += 1
+            else:
+                self.stats["ann_searches"] += 1
+            return part.search(q, limit, min_similarity, None, None)
+
+    def upsert(self, node_id: int, vector: Sequence[float]) -> None:
+        """Neuen Node in bereits geladene Partition übernehmen."""
+        if _np is None or not vector:
+            return
+        unit = ann_index.unit_vector(vector)
+        with self._lock:
+            part = self._parts.get(len(vector))
+            if part is None or unit is None or part.dim != unit.shape[0]:
+                return
+            part.remove(int(node_id))
+            part.add(int(node_id), unit, "", "")
+            for other in self._parts.values():
+                if other is not part:
+                    # Tabellen-Checksumme geändert -> andere Dimensionen neu prüfen.
+                    other.verified_at = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                **self.stats,
+                "partitions": {
+                    str(dim): {
+                        "rows": p.live_count,
+                        "mode": "ivf" if p.centroids is not None else "exact",
+                    }
+                    for dim, p in self._parts.items()
+                },
+            }
+
+
+_indexes: Dict[str, GraphNodeIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_node_index(db_path: str) -> GraphNodeIndex:
+    with _indexes_lock:
+        idx = _indexes.get(db_path)
+        if idx is None:
+            idx = GraphNodeIndex(db_path)
+            _indexes[db_path] = idx
+        return idx
@@ -30,6 +30,27 @@ def main():
     migrate_db()
     print("✓ DB: migration abgeschlossen\n")
 
+    print("→ Konvertiere Legacy-JSON-Embeddings…")
+    try:
+        from vector_store import get_vector_store
+        emb_migration = get_vector_store().migrate_legacy_embeddings()
+        print(
+            f"✓ Embeddings: {emb_migration['converted']} konvertiert, "
+            f"{emb_migration['remaining_legacy']} verbleibend\n"
+        )
+    except Exception as e:
+        # Legacy-Zeilen bleiben lesbar; Migration kann per Tool nachgeholt werden.
+        print(f"⚠ Embedding-Migration übersprungen: {e}\n")
+
+    print("→ Backfill Graph content_hash…")
+    try:
+        from graph import get_graph_store
+        hash_backfill = get_graph_store().backfill_content_hashes()
+        print(f"✓ Graph: {hash_backfill['updated']} Nodes gehasht\n")
+    except Exception as e:
+        # Ohne Hash fallen betroffene Seeds auf semantic_only zurück.
+        print(f"⚠ content_hash-Backfill übersprungen: {e}\n")
+
     # -------------------------------------------
     # 2. MCP Server erzeugen
     # -------------------------------------------
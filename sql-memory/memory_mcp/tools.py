@@ -3,6 +3,7 @@ import sys
 sys.path.insert(0, '/app')  # Damit embedding.py gefunden wird
 from graph import get_graph_store, build_node_with_edges
 from vector_store import get_vector_store
+from embedding import get_active_embedding_model, get_embedding_cache_stats
 from typing import Optional, List, Dict
 
 from .config import DB_PATH
@@ -391,10 +392,22 @@ def register_tools(mcp):
         content_type: Optional[str] = None,
         allow_mixed_versions: bool = False,
         embedding_version: Optional[str] = None,
+        query_embedding: Optional[List[float]] = None,
+        query_embedding_model: Optional[str] = None,
     ) -> Dict:
-        """Semantische Suche - findet ähnliche Einträge nach Bedeutung."""
+        """
+        Semantische Suche - findet ähnliche Einträge nach Bedeutung.
+
+        query_embedding/query_embedding_model: vom Client bereits berechneter
+        Query-Vektor; wird nur bei identischem aktiven Modell übernommen.
+        """
         vs = get_vector_store()
 
+        reuse_vector = bool(
+            query_embedding
+            and query_embedding_model
+            and str(query_embedding_model).strip() == get_active_embedding_model()
+        )
         results = vs.search(
             query=query,
             conversation_id=conversation_id,
@@ -403,6 +416,7 @@ def register_tools(mcp):
             content_type=content_type,
             allow_mixed_versions=allow_mixed_versions,
             embedding_version=embedding_version,
+            query_embedding=[float(v) for v in query_embedding] if reuse_vector else None,
         )
 
         return {
@@ -420,10 +434,15 @@ def register_tools(mcp):
     ) -> Dict:
         """Zeigt aktive/stale Embedding-Versionen fuer Monitoring und Migration."""
         vs = get_vector_store()
-        return vs.get_version_status(
+        status = vs.get_version_status(
             conversation_id=conversation_id,
             content_type=content_type,
         )
+        ann_stats = vs.get_ann_stats()
+        if ann_stats is not None:
+            status["ann_index"] = ann_stats
+        status["embedding_cache"] = get_embedding_cache_stats()
+        return status
 
     # --------------------------------------------------
     # memory_embedding_backfill
@@ -447,6 +466,23 @@ def register_tools(mcp):
             dry_run=bool(dry_run),
         )
     # --------------------------------------------------
+    # memory_embedding_storage_migrate
+    # --------------------------------------------------
+    @mcp.tool
+    def memory_embedding_storage_migrate(
+        batch_size: int = 500,
+        max_batches: Optional[int] = None,
+    ) -> Dict:
+        """
+        Konvertiert Legacy-JSON-Embeddings in float32-BLOBs (+ Norm).
+        Resume-faehig: wiederholte Aufrufe arbeiten die Restmenge ab.
+        """
+        vs = get_vector_store()
+        return vs.migrate_legacy_embeddings(
+            batch_size=max(1, min(int(batch_size), 5000)),
+            max_batches=max_batches,
+        )
+    # --------------------------------------------------
     # memory_graph_search (NEU)
     # --------------------------------------------------
     @mcp.tool
@@ -454,7 +490,9 @@ def register_tools(mcp):
         query: str,
         conversation_id: str = None,
         depth: int = 2,
-        limit: int = 10
+        limit: int = 10,
+        min_weight: Optional[float] = None,
+        edge_type: Optional[str] = None,
     ) -> Dict:
         """Graph-basierte Suche - findet verbundene Infomrationen."""
         from vector_store import get_vector_store
@@ -474,35 +512,32 @@ def register_tools(mcp):
             return {"results": [], "count": 0}
         
         # 2. Finde Graph Nodes die zu den Seeds gehören
-        # Suche über ALLE source_types (nicht nur "fact" - würde z.B. "skill" Nodes verpassen)
-        seed_node_ids = []
-        all_known_types = ["fact", "skill", "event", "note", "observation", "task"]
-        for seed in seed_results:
-            seed_text = seed["content"][:80]
-            found = False
-            for t in all_known_types:
-                candidates = gs.get_nodes_by_type(t, limit=50)
-                for node in candidates:
-                    if seed_text in node["content"] or node["content"][:80] in seed_text:
-                        seed_node_ids.append(node["id"])
-                        found = True
-                        break
-                if found:
-                    break
+        # Direkt über content_hash (eine indizierte Query, alle source_types)
+        resolved = gs.find_nodes_by_contents([seed["content"] for seed in seed_results])
+        seed_node_ids = list(dict.fromkeys(
+            resolved[seed["content"]] for seed in seed_results if seed["content"] in resolved
+        ))
+        seed_stats = {
+            "seeds": len(seed_results),
+            "resolved": sum(1 for seed in seed_results if seed["content"] in resolved),
+        }
 
         if not seed_node_ids:
             # Fallback: direkt semantische Ergebnisse zurückgeben
             return {
                 "results": seed_results,
                 "count": len(seed_results),
-                "source": "semantic_only"
+                "source": "semantic_only",
+                "seed_resolution": seed_stats,
             }
         
         # 3 Graph Walk
         graph_results = gs.graph_walk(
             start_node_ids=seed_node_ids,
             depth=depth,
-            limit=limit
+            limit=limit,
+            min_weight=min_weight,
+            edge_types=[edge_type] if edge_type else None,
         )
 
         # 4. Tombstone-Filter: Nodes die als Tombstone/Ghost markiert wurden entfernen
@@ -542,9 +577,18 @@ def register_tools(mcp):
         return {
             "results": combined,
             "count": len(combined),
-            "source": "graph_walk"
+            "source": "graph_walk",
+            "seed_resolution": seed_stats,
         }
     
+    # --------------------------------------------------
+    # memory_graph_content_hash_backfill
+    # --------------------------------------------------
+    @mcp.tool
+    def memory_graph_content_hash_backfill(batch_size: int = 500) -> Dict:
+        """Setzt content_hash für Alt-Nodes (Seed-Auflösung in memory_graph_search)."""
+        return get_graph_store().backfill_content_hashes(batch_size=batch_size)
+
     # --------------------------------------------------
     # memory_graph_neighbors (NEU)
     # --------------------------------------------------
@@ -738,85 +782,87 @@ def register_tools(mcp):
         except Exception as e:
             return {"error": str(e), "deleted": 0}
     
+    # graph_relink_semantic_edges (MAINTENANCE)
+    @mcp.tool
+    def graph_relink_semantic_edges(
+        batch_size: int = 200,
+        k: Optional[int] = None,
+        threshold: Optional[float] = None,
+    ) -> Dict:
+        """
+        Recompute all semantic edges via k-NN over every node embedding (batched).
+        Defaults: GRAPH_SEMANTIC_K / GRAPH_SEMANTIC_THRESHOLD.
+        """
+        try:
+            from graph import relink_semantic_edges
+            return {"structuredContent": relink_semantic_edges(batch_size=batch_size, k=k, threshold=threshold)}
+        except Exception as e:
+            return {"error": str(e)}
+
     # graph_find_duplicate_nodes (NEW - FOR MAINTENANCE)
     @mcp.tool
-    def graph_find_duplicate_nodes() -> Dict:
+    def graph_find_duplicate_nodes(
+        lexical_threshold: float = 0.85,
+        semantic_threshold: float = 0.97,
+        include_semantic: bool = True,
+        max_clusters: int = 500,
+    ) -> Dict:
         """
-        Find duplicate nodes in the graph (same content).
-        Returns groups of node IDs that are duplicates.
+        Find near-duplicate nodes across all node types (MinHash/LSH + embedding k-NN).
+        Returns clusters of node IDs with scores; node_ids[0] is the suggested primary.
         """
         try:
+            from graph.dedup import find_duplicate_clusters
+
             gs = get_graph_store()
-            all_nodes = gs.get_nodes_by_type("fact", limit=1000)
-            
-            # Group by content
-            from collections import defaultdict
-            content_map = defaultdict(list)
-            
-            for node in all_nodes:
-                content = node.get("content", "").strip().lower()
-                if content:
-                    content_map[content].append(node["id"])
-            
-            # Find duplicates (groups with more than 1 node)
-            duplicates = []
-            for content, node_ids in content_map.items():
-                if len(node_ids) > 1:
-                    duplicates.append({
-                        "content_preview": content[:100],
-                        "node_ids": node_ids,
-                        "count": len(node_ids)
-                    })
-            
-            return {"structuredContent": {"duplicate_groups": duplicates, "total_duplicates": sum(d["count"] - 1 for d in duplicates)}}
+            found = find_duplicate_clusters(
+                gs.db_path,
+                lexical_threshold=lexical_threshold,
+                semantic_threshold=semantic_threshold,
+                include_semantic=include_semantic,
+                max_clusters=max_clusters,
+            )
+            duplicates = found["clusters"]
+            return {"structuredContent": {
+                "duplicate_groups": duplicates,
+                "total_duplicates": sum(d["count"] - 1 for d in duplicates),
+                "stats": found["stats"],
+            }}
             
         except Exception as e:
             return {"error": str(e), "duplicate_groups": []}
     
     # graph_merge_nodes (NEW - FOR MAINTENANCE)
     @mcp.tool
-    def graph_merge_nodes(node_ids: List[int]) -> Dict:
+    def graph_merge_nodes(
+        node_ids: Optional[List[int]] = None,
+        clusters: Optional[List[List[int]]] = None,
+    ) -> Dict:
         """
-        Merge multiple duplicate nodes into one.
-        Keeps the first node, redirects all edges to it, deletes others.
+        Merge duplicate nodes. Keeps the first node of each group, redirects all
+        edges to it, deletes the others.
+        node_ids: a single group; clusters: many groups in one call
+        (e.g. the node_ids lists from graph_find_duplicate_nodes).
         """
         try:
-            if len(node_ids) < 2:
+            groups = [list(g) for g in (clusters or []) if len(g) >= 2]
+            if node_ids:
+                if len(node_ids) < 2:
+                    return {"error": "Need at least 2 nodes to merge"}
+                groups.insert(0, list(node_ids))
+            if not groups:
                 return {"error": "Need at least 2 nodes to merge"}
-            
+
             gs = get_graph_store()
-            
-            # Keep first node
-            primary_id = node_ids[0]
-            to_delete = node_ids[1:]
-            
-            # For each node to delete
-            for node_id in to_delete:
-                # Get its edges
-                edges = gs.get_edges(node_id)
-                
-                # Redirect edges to primary node
-                for edge in edges:
-                    # Update edge to point to primary
-                    if edge["source"] == node_id:
-                        gs.add_edge(
-                            src_node_id=primary_id,
-                            dst_node_id=edge["target"],
-                            edge_type=edge["type"],
-                            weight=edge.get("weight", 1.0)
-                        )
-                    elif edge["target"] == node_id:
-                        gs.add_edge(
-                            src_node_id=edge["source"],
-                            dst_node_id=primary_id,
-                            edge_type=edge["type"],
-                            weight=edge.get("weight", 1.0)
-                        )
-                
-                # Delete the node
-                gs.delete_node(node_id)
-            
-            return {"structuredContent": {"merged": len(to_delete), "primary_node": primary_id, "deleted_nodes": to_delete}}
+            results = [gs.merge_nodes(g) for g in groups]
+
+            if len(results) == 1:
+                return {"structuredContent": results[0]}
+            return {"structuredContent": {
+                "merged": sum(r["merged"] for r in results),
+                "clusters": len(results),
+                "results": results,
+            }}
             
         except Exception as e:
             return {"error": str(e)}
@@ -0,0 +1,176 @@
+# sql-memory/vector_math.py
+"""
+Vector Math - Binaere Embedding-Speicherung und vektorisierte Top-k Suche.
+
+Storage-Format:
+  - Neue Vektoren werden als float32 little-endian BLOB gespeichert,
+    zusaetzlich mit vorberechneter L2-Norm (Spalte embedding_norm).
+  - Legacy-Zeilen (JSON-Text) bleiben lesbar, bis sie migriert sind.
+
+Scoring:
+  - Mit NumPy: eine Matrix-Vektor-Multiplikation + argpartition fuer Top-k.
+  - Ohne NumPy: Pure-Python-Fallback mit identischer Semantik.
+"""
+
+import heapq
+import json
+import math
+import struct
+from typing import Any, Iterable, List, Optional, Sequence, Tuple
+
+try:  # optional: sql-memory image installs numpy, tests may not
+    import numpy as _np
+except ImportError:  # pragma: no cover - exercised via monkeypatch in tests
+    _np = None
+
+
+def has_numpy() -> bool:
+    return _np is not None
+
+
+def vector_norm(vec: Sequence[float]) -> float:
+    """L2-Norm eines Vektors."""
+    return math.sqrt(sum(float(v) * float(v) for v in vec))
+
+
+def pack_embedding(vec: Sequence[float]) -> bytes:
+    """Serialisiert einen Vektor als float32 little-endian BLOB."""
+    return struct.pack(f"<{len(vec)}f", *vec)
+
+
+def unpack_embedding(raw: Any) -> Optional[List[float]]:
+    """
+    Liest ein gespeichertes Embedding.
+
+    Akzeptiert float32-BLOBs (bytes/memoryview) und Legacy-JSON (str).
+    Returns None bei leerem oder kaputtem Inhalt.
+    """
+    if raw is None:
+        return None
+    if isinstance(raw, memoryview):
+        raw = raw.tobytes()
+    if isinstance(raw, (bytes, bytearray)):
+        if not raw or len(raw) % 4 != 0:
+            return None
+        return list(struct.unpack(f"<{len(raw) // 4}f", raw))
+    if isinstance(raw, str):
+        try:
+            data = json.loads(raw)
+        except (json.JSONDecodeError, TypeError):
+            return None
+        if not isinstance(data, list) or not data:
+            return None
+        try:
+            return [float(v) for v in data]
+        except (TypeError, ValueError):
+            return None
+    return None
+
+
+def is_legacy_embedding(raw: Any) -> bool:
+    """True fuer JSON-Text-Embeddings, die noch migriert werden muessen."""
+    return isinstance(raw, str)
+
+
+def top_k_cosine(
+    query: Sequence[float],
+    candidates: Iterable[Tuple[Any, Any, Optional[float]]],
+    limit: int,
+    min_similarity: float,
+) -> List[Tuple[Any, float]]:
+    """
+    Cosine-Top-k ueber (key, raw_embedding, norm)-Kandidaten.
+
+    raw_embedding darf BLOB oder Legacy-JSON sein; fehlende Normen werden
+    berechnet. Kandidaten mit abweichender Dimension bekommen Score 0.0
+    (gleiches Verhalten wie embedding.cosine_similarity).
+
+    Returns:
+        [(key, similarity)] absteigend sortiert, hoechstens `limit` Eintraege,
+        nur similarity >= min_similarity.
+    """
+    if not query or limit <= 0:
+        return []
+    dim = len(query)
+    q_norm = vector_norm(query)
+    if q_norm == 0:
+        return []
+
+    keys: List[Any] = []
+    blobs: List[bytes] = []
+    norms: List[float] = []
+    mismatched: List[Any] = []
+
+    for key, raw, norm in candidates:
+        if isinstance(raw, memoryview):
+            raw = raw.tobytes()
+        if isinstance(raw, (bytes, bytearray)) and len(raw) == dim * 4:
+            blob = bytes(raw)
+        else:
+            vec = unpack_embedding(raw)
+            if vec is None:
+                continue
+            if len(vec) != dim:
+                mismatched.append(key)
+                continue
+            blob = pack_embedding(vec)
+            norm = None
+        if norm is None:
+            norm = vector_norm(struct.unpack(f"<{dim}f", blob))
+        keys.append(key)
+        blobs.append(blob)
+        norms.append(float(norm))
+
+    scored = _score_matrix(query, q_norm, blobs, norms)
+
+    hits: List[Tuple[Any, float]] = [
+        (keys[i], s) for i, s in _select_top(scored, limit, min_similarity)
+    ]
+    if len(hits) < limit and min_similarity <= 0.0:
+        hits.extend((key, 0.0) for key in mismatched[: limit - len(hits)])
+    return hits
+
+
+def _score_matrix(
+    query: Sequence[float],
+    q_norm: float,
+    blobs: List[bytes],
+    norms: List[float],
+) -> Any:
+    if not blobs:
+        return []
+    dim = len(query)
+    if _np is not None:
+        matrix = _np.frombuffer(b"".join(blobs), dtype="<f4").reshape(len(blobs), dim)
+        q = _np.asarray(query, dtype=_np.float32)
+        denom = _np.asarray(norms, dtype=_np.float32) * _np.float32(q_norm)
+        dots = matrix @ q
+        with _np.errstate(divide="ignore", invalid="ignore"):
+            scores = _np.where(denom > 0, dots / denom, 0.0)
+        return scores.astype(_np.float64)
+
+    scores = []
+    for blob, norm in zip(blobs, norms):
+        if norm == 0:
+            scores.append(0.0)
+            continue
+        vec = struct.unpack(f"<{dim}f", blob)
+        dot = sum(a * b for a, b in zip(query, vec))
+        scores.append(dot / (q_norm * norm))
+    return scores
+
+
+def _select_top(scores: Any, limit: int, min_similarity: float) -> List[Tuple[int, float]]:
+    if _np is not None and not isinstance(scores, list):
+        n = scores.shape[0]
+        if n == 0:
+            return []
+        if n > limit:
+            idx = _np.argpartition(-scores, limit - 1)[:limit]
+        else:
+            idx = _np.arange(n)
+        idx = idx[_np.argsort(-scores[idx], kind="stable")]
+        return [(int(i), float(scores[i])) for i in idx if scores[i] >= min_similarity]
+
+    top = heapq.nlargest(limit, enumerate(scores), key=lambda item: item[1])
+    return [(i, float(s)) for i, s in top if s >= min_similarity]
@@ -7,23 +7,42 @@ Scope 3.2:
   - Suchanfragen filtern standardmaessig auf aktive embedding_version
     (kein stilles Mischen alter/neuer Vektoren).
   - Re-Embedding/Backfill in Batches fuer veraltete Versionen.
+
+Storage:
+  - Vektoren als float32-BLOB + vorberechnete Norm (embedding_norm).
+  - Legacy-JSON-Zeilen bleiben lesbar bis migrate_legacy_embeddings()
+    sie konvertiert hat.
+  - Suche: kompakter Scan (id, embedding, norm) -> Top-k via vector_math,
+    Content/Metadata werden nur fuer die Treffer geladen.
+  - Mit NumPy: In-Process ANN-Index (ann_index.AnnIndex) pro
+    embedding_version; SQL-Scan bleibt Fallback (z.B. allow_mixed_versions).
 """
 
 import json
 import logging
+import os
 import sqlite3
 from typing import Any, Dict, List, Optional
 
 from embedding import (
-    cosine_similarity,
     get_active_embedding_version,
     get_embedding,
     get_embedding_with_metadata,
+    get_embeddings_batch_with_metadata,
 )
 from memory_mcp.config import DB_PATH
+from vector_math import (
+    has_numpy,
+    pack_embedding,
+    top_k_cosine,
+    unpack_embedding,
+    vector_norm,
+)
 
 logger = logging.getLogger(__name__)
 
+ANN_ENABLED = os.getenv("MEMORY_ANN_ENABLED", "true").strip().lower() not in {"0", "false", "no", "off"}
+
 
 class VectorStore:
     """SQLite-basierter Vector Store."""
@@ -31,6 +50,11 @@ class VectorStore:
     def __init__(self, db_path: str):
         self.db_path = db_path
         self._init_table()
+        self._ann = None
+        if ANN_ENABLED and has_numpy():
+            from ann_index import AnnIndex
+
+            self._ann = AnnIndex(db_path)
 
     def _init_table(self):
         """Erstellt/Migriert die Embedding-Tabelle."""
@@ -49,6 +73,7 @@ class VectorStore:
                     embedding_model TEXT,
                     embedding_dim INTEGER,
                     embedding_version TEXT,
+                    embedding_norm REAL,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
                 """
@@ -71,6 +96,8 @@ class VectorStore:
             cursor.execute("ALTER TABLE embeddings ADD COLUMN embedding_dim INTEGER")
         if "embedding_version" not in cols:
             cursor.execute("ALTER TABLE embeddings ADD COLUMN embedding_version TEXT")
+        if "embedding_norm" not in cols:
+            cursor.execute("ALTER TABLE embeddings ADD COLUMN embedding_norm REAL")
 
         cursor.execute(
             "CREATE INDEX IF NOT EXISTS idx_embeddings_conv ON embeddings(conversation_id)"
@@ -105,22 +132,31 @@ class VectorStore:
                 """
                 INSERT INTO embeddings
                 (conversation_id, content, content_type, metadata, embedding,
-                 embedding_model, embedding_dim, embedding_version)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                 embedding_model, embedding_dim, embedding_version, embedding_norm)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """,
                 (
                     conversation_id,
                     content,
                     content_type,
                     json.dumps(metadata) if metadata else None,
-                    json.dumps(emb["embedding"]),
+                    pack_embedding(emb["embedding"]),
                     emb["embedding_model"],
                     emb["embedding_dim"],
                     emb["embedding_version"],
+                    vector_norm(emb["embedding"]),
                 ),
             )
             conn.commit()
             entry_id = cursor.lastrowid
+            if self._ann is not None:
+                self._ann.upsert(
+                    entry_id,
+                    emb["embedding_version"],
+                    emb["embedding"],
+                    conversation_id,
+                    content_type,
+                )
             logger.info(
                 "[VectorStore] Added entry %s version=%s",
                 entry_id,
@@ -142,13 +178,16 @@ class VectorStore:
         content_type: Optional[str] = None,
         allow_mixed_versions: bool = False,
         embedding_version: Optional[str] = None,
+        query_embedding: Optional[List[float]] = None,
     ) -> List[Dict[str, Any]]:
         """
         Semantische Suche nach aehnlichen Eintraegen.
 
         Default: kein Mixing. Es wird nur die aktive embedding_version gelesen.
+        query_embedding: bereits berechneter Query-Vektor (aktives Modell) — spart den Embed-Call.
         """
-        query_embedding = get_embedding(query)
+        if not query_embedding:
+            query_embedding = get_embedding(query)
         if not query_embedding:
             return []
 
@@ -156,69 +195,85 @@ class VectorStore:
         if version_filter is None and not allow_mixed_versions:
             version_filter = get_active_embedding_version()
 
-        conn = sqlite3.connect(self.db_path)
-        try:
-            cursor = conn.cursor()
+        where: List[str] = ["embedding IS NOT NULL"]
+        params: List[Any] = []
 
-            sql = (
-                "SELECT id, content, content_type, metadata, embedding, "
-                "embedding_model, embedding_dim, embedding_version "
-                "FROM embeddings WHERE 1=1"
-            )
-            params: List[Any] = []
+        if conversation_id:
+            where.append("(conversation_id = ? OR conversation_id = 'global')")
+            params.append(conversation_id)
 
-            if conversation_id:
-                sql += " AND (conversation_id = ? OR conversation_id = 'global')"
-                params.append(conversation_id)
+        if content_type:
+            where.append("content_type = ?")
+            params.append(content_type)
 
-            if content_type:
-                sql += " AND content_type = ?"
-                params.append(content_type)
+        if version_filter:
+            where.append("embedding_version = ?")
+            params.append(version_filter)
 
-            if version_filter:
-                sql += " AND embedding_version = ?"
-                params.append(version_filter)
+        hits = None
+        if self._ann is not None and version_filter:
+            try:
+                hits = self._ann.search(
+                    version_filter,
+                    query_embedding,
+                    limit,
+                    min_similarity,
+                    conversation_id=conversation_id,
+                    content_type=content_type,
+                )
+            except Exception as e:
+                logger.warning(f"[VectorStore] ANN search failed, using scan: {e}")
+                hits = None
 
-            cursor.execute(sql, params)
-            rows = cursor.fetchall()
+        conn = sqlite3.connect(self.db_path)
+        try:
+            if hits is None:
+                # Phase 1: kompakter Scan, nur Vektor + Norm.
+                cursor = conn.execute(
+                    "SELECT id, embedding, embedding_norm FROM embeddings WHERE "
+                    + " AND ".join(where),
+                    params,
+                )
+                hits = top_k_cosine(query_embedding, cursor, limit, min_similarity)
+            if not hits:
+                return []
+
+            # Phase 2: Content/Metadata nur fuer die Top-k Treffer.
+            hit_ids = [entry_id for entry_id, _ in hits]
+            placeholders = ",".join("?" for _ in hit_ids)
+            rows = conn.execute(
+                "SELECT id, content, content_type, metadata, "
+                "embedding_model, embedding_dim, embedding_version "
+                f"FROM embeddings WHERE id IN ({placeholders})",
+                hit_ids,
+            ).fetchall()
         finally:
             conn.close()
 
+        by_id = {row[0]: row for row in rows}
         results = []
-        for row in rows:
-            (
-                entry_id,
-                content_val,
-                ctype,
-                metadata_json,
-                embedding_json,
-                emb_model,
-                emb_dim,
-                emb_version,
-            ) = row
-            if not embedding_json:
+        for entry_id, similarity in hits:
+            row = by_id.get(entry_id)
+            if row is None:
                 continue
+            _, content_val, ctype, metadata_json, emb_model, emb_dim, emb_version = row
             try:
-                stored_embedding = json.loads(embedding_json)
-                similarity = cosine_similarity(query_embedding, stored_embedding)
-                if similarity >= min_similarity:
-                    results.append(
-                        {
-                            "id": entry_id,
-                            "content": content_val,
-                            "type": ctype,
-                            "metadata": json.loads(metadata_json) if metadata_json else {},
-                            "similarity": round(similarity, 4),
-                            "embedding_model": emb_model,
-                            "embedding_dim": emb_dim,
-                            "embedding_version": emb_version,
-                        }
-                    )
-            except Exception:
+                metadata_val = json.loads(metadata_json) if metadata_json else {}
+            except (json.JSONDecodeError, TypeError):
                 continue
-
-        results.sort(key=lambda x: x["similarity"], reverse=True)
-        return results[:limit]
+            results.append(
+                {
+                    "id": entry_id,
+                    "content": content_val,
+                    "type": ctype,
+                    "metadata": metadata_val,
+                    "similarity": round(similarity, 4),
+                    "embedding_model": emb_model,
+                    "embedding_dim": emb_dim,
+                    "embedding_version": emb_version,
+                }
+            )
+        return results
 
     def get_version_status(
         self,
@@ -258,6 +313,10 @@ class VectorStore:
             "by_version": by_version,
         }
 
+    def get_ann_stats(self) -> Optional[Dict[str, Any]]:
+        """Diagnose des ANN-Index; None, wenn der Index deaktiviert ist (kein NumPy/Env)."""
+        return self._ann.get_stats() if self._ann is not None else None
+
     def backfill_embeddings(
         self,
         batch_size: int = 100,
@@ -287,7 +346,7 @@ class VectorStore:
                 params.append(content_type)
 
             sql = (
-                "SELECT id, content FROM embeddings WHERE "
+                "SELECT id, content, conversation_id, content_type FROM embeddings WHERE "
                 + " AND ".join(where)
                 + " ORDER BY id ASC LIMIT ?"
             )
@@ -307,31 +366,45 @@ class VectorStore:
 
             processed = 0
             failed = 0
-            for row in rows:
-                emb = get_embedding_with_metadata(row["content"])
+            reembedded = []
+            batch = get_embeddings_batch_with_metadata([row["content"] for row in rows])
+            for row, emb in zip(rows, batch):
                 if not emb:
                     failed += 1
                     continue
                 conn.execute(
                     """
                     UPDATE embeddings
-                    SET embedding = ?, embedding_model = ?, embedding_dim = ?, embedding_version = ?
+                    SET embedding = ?, embedding_model = ?, embedding_dim = ?,
+                        embedding_version = ?, embedding_norm = ?
                     WHERE id = ?
                     """,
                     (
-                        json.dumps(emb["embedding"]),
+                        pack_embedding(emb["embedding"]),
                         emb["embedding_model"],
                         emb["embedding_dim"],
                         emb["embedding_version"],
+                        vector_norm(emb["embedding"]),
                         row["id"],
                     ),
                 )
+                reembedded.append((row, emb))
                 processed += 1
 
             conn.commit()
         finally:
             conn.close()
 
+        if self._ann is not None:
+            for row, emb in reembedded:
+                self._ann.upsert(
+                    row["id"],
+                    emb["embedding_version"],
+                    emb["embedding"],
+                    row["conversation_id"],
+                    row["content_type"],
+                )
+
         status_after = self.get_version_status(conversation_id, content_type)
         return {
             "success": True,
@@ -342,6 +415,80 @@ class VectorStore:
             "remaining_stale": status_after["stale_count"],
         }
 
+    def migrate_legacy_embeddings(
+        self,
+        batch_size: int = 500,
+        max_batches: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Konvertiert Legacy-JSON-Embeddings in float32-BLOBs + Norm.
+
+        Arbeitet in Batches (je ein Commit) und ist resume-faehig; bis zur
+        Konvertierung bleiben JSON-Zeilen fuer search() lesbar.
+        Zeilen mit BLOB aber ohne Norm werden dabei ebenfalls nachgezogen.
+        """
+        batch_size = max(1, int(batch_size))
+        converted = 0
+        failed = 0
+        batches = 0
+        last_id = 0
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            while max_batches is None or batches < max_batches:
+                rows = conn.execute(
+                    """
+                    SELECT id, embedding FROM embeddings
+                    WHERE id > ?
+                      AND embedding IS NOT NULL
+                      AND (typeof(embedding) = 'text' OR embedding_norm IS NULL)
+                    ORDER BY id ASC LIMIT ?
+                    """,
+                    (last_id, batch_size),
+                ).fetchall()
+                if not rows:
+                    break
+                batches += 1
+                updates = []
+                for entry_id, raw in rows:
+                    last_id = entry_id
+                    vec = unpack_embedding(raw)
+                    if not vec:
+                        failed += 1
+                        continue
+                    updates.append((pack_embedding(vec), len(vec), vector_norm(vec), entry_id))
+                conn.executemany(
+                    """
+                    UPDATE embeddings
+                    SET embedding = ?, embedding_dim = COALESCE(embedding_dim, ?),
+                        embedding_norm = ?
+                    WHERE id = ?
+                    """,
+                    updates,
+                )
+                conn.commit()
+                converted += len(updates)
+
+            remaining = conn.execute(
+                "SELECT COUNT(*) FROM embeddings WHERE typeof(embedding) = 'text'"
+            ).fetchone()[0]
+        finally:
+            conn.close()
+
+        if converted:
+            logger.info(
+                "[VectorStore] Migrated %s legacy embeddings to float32 (failed=%s)",
+                converted,
+                failed,
+            )
+        return {
+            "success": True,
+            "converted": converted,
+            "failed": failed,
+            "batches": batches,
+            "remaining_legacy": int(remaining),
+        }
+
 
 # Singleton
 _vector_store: Optional[VectorStore] = None
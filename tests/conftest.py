@@ -18,6 +18,7 @@ _SQL_MEMORY = _ROOT / "sql-memory"
 if _SQL_MEMORY.exists():
     sys.path.insert(0, str(_SQL_MEMORY))
 
+
 # Standalone runner scripts that are not proper pytest files (use exit() at module level).
 # These cause INTERNALERROR during pytest collection because sys.exit() fires on import.
 collect_ignore = [
@@ -28,6 +29,27 @@ collect_ignore_glob = [
 ]
 
 
+@pytest.fixture(scope="session", autouse=True)
+def _isolated_task_loop_store(tmp_path_factory):
+    """Task-loop snapshots in eine Session-eigene DB statt in die geteilte /tmp-DB schreiben."""
+    import core.task_loop.store as task_loop_store
+
+    mp = pytest.MonkeyPatch()
+    mp.setenv("TRION_TASK_LOOP_STORE_DB", str(tmp_path_factory.mktemp("task_loop_store") / "task_loops.sqlite"))
+    mp.setattr(task_loop_store, "_TASK_LOOP_STORE", None)
+    yield
+    mp.undo()
+
+
+@pytest.fixture
+def no_embedding_cache(monkeypatch):
+    """
+    Embedding-Cache (prozessweiter LRU) aus: Routing-/Batch-Tests zählen
+    HTTP-Calls und sollen nie einen Vektor aus einem früheren Test bekommen.
+    """
+    monkeypatch.setenv("EMBEDDING_CACHE_ENABLED", "false")
+
+
 # ═══════════════════════════════════════════════════════════
 # SAMPLE DATA FIXTURES
 # ═══════════════════════════════════════════════════════════
@@ -0,0 +1,161 @@
+"""
+Unit Tests: vectorized archive semantic search (core/lifecycle/archive.py)
+
+Tests:
+- ranking / conversation filter / min_similarity on the cached task matrix
+- archive_content is decoded only for the top-k results
+- new archive rows are appended incrementally; deletes trigger a rebuild
+- pure-Python fallback without NumPy gives the same ranking
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import math
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+
+
+class TestArchiveVectorSearch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "archive.db")
+        self.archive_mod = importlib.import_module("core.lifecycle.archive")
+        self.prev_db_path = self.archive_mod.DB_PATH
+        self.prev_schema_ready = self.archive_mod._EMBED_SCHEMA_READY
+        self.archive_mod.DB_PATH = self.db_path
+        self.archive_mod._EMBED_SCHEMA_READY = False
+        self.archive_mod._TASK_INDEXES.clear()
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute(
+                """
+                CREATE TABLE task_archive (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    conversation_id TEXT NOT NULL,
+                    task_id TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    archived_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    embedding_id INTEGER,
+                    UNIQUE(task_id)
+                )
+                """
+            )
+            conn.commit()
+        finally:
+            conn.close()
+        self.archive_mod._get_db().close()  # ensure embeddings schema
+
+        self.version_patches = [
+            patch.object(self.archive_mod, "get_embedding_model", return_value="m"),
+            patch.object(self.archive_mod, "get_embedding_runtime_policy", return_value="auto"),
+        ]
+        for p in self.version_patches:
+            p.start()
+        self.version = self.archive_mod._compute_embedding_version_id("m", "auto")
+
+    def tearDown(self):
+        for p in self.version_patches:
+            p.stop()
+        self.archive_mod._TASK_INDEXES.clear()
+        self.archive_mod.DB_PATH = self.prev_db_path
+        self.archive_mod._EMBED_SCHEMA_READY = self.prev_schema_ready
+        self.tmp.cleanup()
+
+    def _add_task(self, task_id, vec, conversation_id="c1"):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            cur = conn.execute(
+                """
+                INSERT INTO embeddings
+                (conversation_id, content, content_type, metadata, embedding,
+                 embedding_model, embedding_dim, embedding_version)
+                VALUES (?, ?, 'task', '{}', ?, 'm', ?, ?)
+                """,
+                (conversation_id, f"summary {task_id}", json.dumps(vec), len(vec), self.version),
+            )
+            conn.execute(
+                "INSERT INTO task_archive (conversation_id, task_id, content, embedding_id) VALUES (?, ?, ?, ?)",
+                (conversation_id, task_id, json.dumps({"task": task_id}), cur.lastrowid),
+            )
+            conn.commit()
+            return cur.lastrowid
+        finally:
+            conn.close()
+
+    def _search(self, query, conversation_id="c1", limit=3, min_similarity=0.0):
+        mgr = self.archive_mod.TaskArchiveManager()
+        return mgr._semantic_search(query, conversation_id, limit, min_similarity)
+
+    def test_ranking_filter_and_threshold(self):
+        self._add_task("exact", [1.0, 0.0])
+        self._add_task("close", [0.9, 0.1])
+        self._add_task("far", [0.0, 1.0])
+        self._add_task("global", [0.95, 0.05], conversation_id="global")
+        self._add_task("other_conv", [1.0, 0.0], conversation_id="c2")
+
+        results = self._search([1.0, 0.0], limit=10, min_similarity=0.5)
+
+        self.assertEqual([r["task_id"] for r in results], ["exact", "global", "close"])
+        self.assertEqual(results[0]["content"], {"task": "exact"})
+        self.assertEqual(results[0]["summary"], "summary exact")
+        self.assertEqual(results[0]["embedding_version"], self.version)
+        self.assertAlmostEqual(results[2]["similarity"], round(0.9 / math.sqrt(0.82), 4))
+
+    def test_archive_content_decoded_only_for_top_k(self):
+        for i in range(50):
+            self._add_task(f"t{i}", [1.0, i / 50.0])
+
+        real_loads = json.loads
+        decoded = []
+
+        def _tracking_loads(raw, *args, **kwargs):
+            value = real_loads(raw, *args, **kwargs)
+            if isinstance(value, dict) and "task" in value:
+                decoded.append(value["task"])
+            return value
+
+        self._search([1.0, 0.0], limit=1)  # warm the matrix
+        with patch.object(self.archive_mod.json, "loads", side_effect=_tracking_loads):
+            results = self._search([1.0, 0.0], limit=3)
+
+        self.assertEqual([r["task_id"] for r in results], ["t0", "t1", "t2"])
+        self.assertLessEqual(len(decoded), 3 + 5)
+
+    def test_incremental_append_and_rebuild_on_delete(self):
+        self._add_task("a", [1.0, 0.0])
+        self.assertEqual([r["task_id"] for r in self._search([1.0, 0.0])], ["a"])
+
+        self._add_task("b", [1.0, 0.01])
+        self.assertEqual([r["task_id"] for r in self._search([1.0, 0.0])], ["a", "b"])
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.execute("DELETE FROM task_archive WHERE task_id = 'a'")
+            conn.commit()
+        finally:
+            conn.close()
+        self.assertEqual([r["task_id"] for r in self._search([1.0, 0.0])], ["b"])
+
+    def test_python_fallback_matches_numpy(self):
+        for i, vec in enumerate(([1.0, 0.0], [0.6, 0.8], [0.8, 0.6], [-1.0, 0.0])):
+            self._add_task(f"t{i}", vec)
+
+        with_np = self._search([1.0, 0.2], limit=4)
+        self.archive_mod._TASK_INDEXES.clear()
+        with patch.object(self.archive_mod, "_np", None):
+            without_np = self._search([1.0, 0.2], limit=4)
+
+        self.assertEqual(
+            [(r["task_id"], r["similarity"]) for r in with_np],
+            [(r["task_id"], r["similarity"]) for r in without_np],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
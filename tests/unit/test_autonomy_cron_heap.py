@@ -0,0 +1,205 @@
+"""
+Unit Tests: event-driven cron core (core/autonomy/cron_scheduler.py)
+
+Tests:
+- field-jumping next_fire_utc equals a minute-by-minute scan
+- DST: nonexistent wall times are skipped, repeated ones fire once
+- long gaps (leap day) resolve instead of running into the 35-day scan limit
+- _tick_once only pops due heap entries and advances them
+- the tick loop sleeps until the earliest deadline, not the tick interval
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import patch
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from core.autonomy.cron_scheduler import (
+    AutonomyCronScheduler,
+    cron_matches,
+    estimate_min_interval_seconds,
+    next_fire_utc,
+    next_matching_utc,
+    parse_cron_expression,
+)
+
+
+def _scan(parsed, tz, from_utc, days=40):
+    base = from_utc.replace(second=0, microsecond=0)
+    for i in range(1, days * 1440 + 1):
+        cand = base + timedelta(minutes=i)
+        local = cand.astimezone(tz)
+        if local.fold == 0 and cron_matches(parsed, local):
+            return cand
+    return None
+
+
+@pytest.mark.parametrize("expr", [
+    "*/15 * * * *",
+    "30 2 * * *",
+    "0 9 * * 1-5",
+    "5 0 13 * 5",
+    "*/7 */3 * 6 *",
+    "10 2 25-31 3,10 *",
+])
+@pytest.mark.parametrize("tz_name", ["UTC", "Europe/Berlin", "America/New_York"])
+def test_next_fire_matches_minute_scan(expr, tz_name):
+    parsed = parse_cron_expression(expr)
+    tz = ZoneInfo(tz_name)
+    starts = [
+        datetime(2026, 1, 17, 13, 7, 42, tzinfo=timezone.utc),
+        datetime(2026, 3, 29, 0, 45, tzinfo=timezone.utc),
+        datetime(2026, 10, 25, 0, 20, tzinfo=timezone.utc),
+        datetime(2026, 11, 1, 5, 50, tzinfo=timezone.utc),
+    ]
+    for start in starts:
+        assert next_fire_utc(parsed, tz, start, max_days=40) == _scan(parsed, tz, start)
+
+
+def test_dst_gap_is_skipped_and_overlap_fires_once():
+    parsed = parse_cron_expression("30 2 * * *")
+    berlin = ZoneInfo("Europe/Berlin")
+
+    # 2026-03-29: 02:00-03:00 gibt es in Berlin nicht
+    spring = next_fire_utc(parsed, berlin, datetime(2026, 3, 28, 12, 0, tzinfo=timezone.utc))
+    assert spring == datetime(2026, 3, 30, 0, 30, tzinfo=timezone.utc)
+
+    # 2026-10-25: 02:30 kommt zweimal vor, gefeuert wird beim ersten (CEST)
+    first = next_fire_utc(parsed, berlin, datetime(2026, 10, 24, 12, 0, tzinfo=timezone.utc))
+    assert first == datetime(2026, 10, 25, 0, 30, tzinfo=timezone.utc)
+    assert next_fire_utc(parsed, berlin, first) == datetime(2026, 10, 26, 1, 30, tzinfo=timezone.utc)
+
+
+def test_long_gaps_resolve_within_horizon():
+    leap = parse_cron_expression("0 0 29 2 *")
+    assert next_matching_utc(leap, "UTC", from_utc=datetime(2026, 3, 1, tzinfo=timezone.utc)).startswith(
+        "2028-02-29T00:00"
+    )
+    assert next_matching_utc(parse_cron_expression("0 0 30 2 *"), "UTC") == ""
+    assert estimate_min_interval_seconds(parse_cron_expression("*/10 * * * *")) == 600
+    assert estimate_min_interval_seconds(parse_cron_expression("0 4 * * *")) == 86400
+
+
+def _scheduler(tmp_path, submit=None, tick_s=10):
+    async def _dummy_submit(payload, meta):
+        return {"job_id": "autonomy_dummy", "status": "queued"}
+
+    return AutonomyCronScheduler(
+        state_path=str(tmp_path / "autonomy_cron_state.json"),
+        tick_s=tick_s,
+        max_concurrency=1,
+        submit_cb=submit or _dummy_submit,
+        max_pending_runs_per_job=50,
+    )
+
+
+def _add_job(scheduler, job_id, cron, now_utc):
+    scheduler._jobs[job_id] = {
+        "id": job_id,
+        "cron": cron,
+        "timezone": "UTC",
+        "enabled": True,
+        "conversation_id": "conv",
+        "objective": "x",
+        "last_trigger_key": "",
+    }
+    scheduler._schedule_job_locked(job_id, now_utc)
+
+
+@pytest.mark.asyncio
+async def test_tick_pops_only_due_jobs(tmp_path):
+    scheduler = _scheduler(tmp_path)
+    t0 = datetime(2026, 5, 4, 3, 58, 30, tzinfo=timezone.utc)
+    _add_job(scheduler, "every5", "*/5 * * * *", t0)
+    _add_job(scheduler, "daily", "0 4 * * *", t0)
+    for i in range(500):
+        _add_job(scheduler, f"idle{i}", "0 0 1 1 *", t0)
+
+    with patch("core.autonomy.cron_scheduler._utcnow", return_value=t0 + timedelta(seconds=45)):
+        await scheduler._tick_once()
+    assert (await scheduler.get_queue_snapshot())["pending"] == []
+
+    at_four = datetime(2026, 5, 4, 4, 0, 2, tzinfo=timezone.utc)
+    with patch("core.autonomy.cron_scheduler._utcnow", return_value=at_four):
+        await scheduler._tick_once()
+        await scheduler._tick_once()
+    pending = (await scheduler.get_queue_snapshot())["pending"]
+    assert sorted(x["cron_job_id"] for x in pending) == ["daily", "every5"]
+    assert scheduler._jobs["daily"]["last_trigger_key"] == "2026-05-04T04:00"
+
+    nxt = {jid: datetime.fromtimestamp(ts, timezone.utc) for jid, ts in scheduler._next_fire.items()}
+    assert nxt["every5"] == datetime(2026, 5, 4, 4, 5, tzinfo=timezone.utc)
+    assert nxt["daily"] == datetime(2026, 5, 5, 4, 0, tzinfo=timezone.utc)
+
+
+@pytest.mark.asyncio
+async def test_missed_fire_is_skipped_not_replayed(tmp_path):
+    scheduler = _scheduler(tmp_path)
+    t0 = datetime(2026, 5, 4, 3, 58, tzinfo=timezone.utc)
+    _add_job(scheduler, "daily", "0 4 * * *", t0)
+
+    late = datetime(2026, 5, 4, 6, 0, tzinfo=timezone.utc)
+    with patch("core.autonomy.cron_scheduler._utcnow", return_value=late):
+        await scheduler._tick_once()
+    assert (await scheduler.get_queue_snapshot())["pending"] == []
+    assert scheduler._next_fire["daily"] == datetime(2026, 5, 5, 4, 0, tzinfo=timezone.utc).timestamp()
+
+
+@pytest.mark.asyncio
+async def test_delete_and_pause_drop_heap_entry(tmp_path):
+    scheduler = _scheduler(tmp_path)
+    created = await scheduler.create_job(
+        {
+            "name": "n",
+            "objective": "build nightly summary",
+            "conversation_id": "conv-heap",
+            "cron": "0 4 * * *",
+            "timezone": "UTC",
+            "created_by": "user",
+        }
+    )
+    cron_id = created["id"]
+    assert cron_id in scheduler._next_fire
+    assert (await scheduler.get_status())["scheduler"]["next_fire_at"] == created["next_run_at"]
+
+    await scheduler.pause_job(cron_id)
+    assert cron_id not in scheduler._next_fire
+    await scheduler.resume_job(cron_id)
+    assert cron_id in scheduler._next_fire
+    await scheduler.delete_job(cron_id)
+    assert scheduler._next_fire == {}
+    assert (await scheduler.get_status())["scheduler"]["next_fire_at"] == ""
+
+
+@pytest.mark.asyncio
+async def test_tick_loop_wakes_at_deadline(tmp_path):
+    submitted = []
+
+    async def _submit(payload, meta):
+        submitted.append(meta["cron_job_id"])
+        return {"job_id": "autonomy_dummy", "status": "queued"}
+
+    scheduler = _scheduler(tmp_path, submit=_submit, tick_s=60)
+    await scheduler.start()
+    try:
+        # Job entsteht nach dem Start: der schlafende Loop muss neu planen
+        await asyncio.sleep(0.05)
+        created = await scheduler.create_job(
+            {
+                "name": "soon",
+                "objective": "send reminder",
+                "conversation_id": "conv-soon",
+                "schedule_mode": "one_shot",
+                "run_at": (datetime.now(timezone.utc) + timedelta(seconds=0.5)).isoformat(),
+                "timezone": "UTC",
+                "created_by": "user",
+            }
+        )
+        deadline = asyncio.get_running_loop().time() + 3.0
+        while not submitted and asyncio.get_running_loop().time() < deadline:
+            await asyncio.sleep(0.05)
+    finally:
+        await scheduler.stop()
+    assert submitted == [created["id"]]
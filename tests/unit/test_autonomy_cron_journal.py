@@ -0,0 +1,166 @@
+"""
+Unit Tests: append-only state journal of the autonomy cron scheduler
+
+Tests:
+- mutations append one record each and replay into a fresh scheduler
+- background compaction folds the journal into the JSON snapshot
+- a truncated last record is dropped, everything before it survives
+- replay after an interrupted compaction does not apply records twice
+- legacy snapshots (no journal_seq) still load
+"""
+
+import json
+import os
+import shutil
+
+import pytest
+
+from core.autonomy.cron_journal import CronStateJournal
+from core.autonomy.cron_scheduler import AutonomyCronScheduler
+
+
+async def _dummy_submit(payload, meta):
+    return {"job_id": "autonomy_dummy", "status": "queued"}
+
+
+def _scheduler(path, **kwargs):
+    return AutonomyCronScheduler(
+        state_path=str(path),
+        tick_s=10,
+        max_concurrency=1,
+        submit_cb=_dummy_submit,
+        journal_fsync=False,
+        **kwargs,
+    )
+
+
+def _payload(name, conv="conv-journal"):
+    return {
+        "name": name,
+        "objective": "build nightly summary",
+        "conversation_id": conv,
+        "cron": "0 4 * * *",
+        "timezone": "UTC",
+        "created_by": "user",
+    }
+
+
+def _journal_lines(path):
+    with open(f"{path}.journal", "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+@pytest.mark.asyncio
+async def test_mutations_append_single_records_and_replay(tmp_path):
+    path = tmp_path / "cron_state.json"
+    sched = _scheduler(path)
+    ids = [(await sched.create_job(_payload(f"job-{i}")))["id"] for i in range(5)]
+    assert len(_journal_lines(path)) == 5
+
+    await sched.update_job(ids[0], {"name": "renamed"})
+    await sched.delete_job(ids[1])
+    await sched.run_now(ids[2], reason="manual")
+    records = _journal_lines(path)
+    assert [r["op"] for r in records[5:]] == ["job", "delete", "job"]
+    assert [r["seq"] for r in records] == list(range(1, 9))
+    assert not os.path.exists(path)  # noch kein Snapshot nötig
+
+    fresh = _scheduler(path)
+    async with fresh._lock:
+        fresh._load_state_locked()
+    jobs = {j["id"]: j for j in await fresh.list_jobs()}
+    assert set(jobs) == set(ids) - {ids[1]}
+    assert jobs[ids[0]]["name"] == "renamed"
+    assert jobs[ids[2]]["last_manual_trigger_at"]
+    await fresh.stop()
+
+
+@pytest.mark.asyncio
+async def test_background_compaction_writes_snapshot(tmp_path):
+    path = tmp_path / "cron_state.json"
+    sched = _scheduler(path, journal_compact_records=4)
+    job_id = (await sched.create_job(_payload("compact-me")))["id"]
+    for i in range(5):
+        await sched.update_job(job_id, {"name": f"v{i}"})
+    await sched.stop()  # wartet auf laufende Kompaktierung
+
+    with open(path, "r", encoding="utf-8") as f:
+        snap = json.load(f)
+    assert snap["journal_seq"] >= 4
+    assert snap["jobs"][0]["id"] == job_id
+    assert sched._journal.stats()["compactions"] >= 1
+    assert sched._journal.stats()["segments"] == 0
+
+    fresh = _scheduler(path)
+    async with fresh._lock:
+        fresh._load_state_locked()
+    assert (await fresh.get_job(job_id))["name"] == "v4"
+    await fresh.stop()
+
+
+@pytest.mark.asyncio
+async def test_truncated_last_record_is_dropped(tmp_path):
+    path = tmp_path / "cron_state.json"
+    sched = _scheduler(path)
+    keep = (await sched.create_job(_payload("keep")))["id"]
+    lost = (await sched.create_job(_payload("lost")))["id"]
+    sched._journal.close()
+
+    journal_path = f"{path}.journal"
+    with open(journal_path, "rb") as f:
+        data = f.read()
+    with open(journal_path, "wb") as f:
+        f.write(data[:-20])  # Crash mitten im letzten Record
+
+    fresh = _scheduler(path)
+    async with fresh._lock:
+        fresh._load_state_locked()
+    assert await fresh.get_job(keep) is not None
+    assert await fresh.get_job(lost) is None
+
+    again = (await fresh.create_job(_payload("after-crash")))["id"]
+    await fresh.stop()
+    assert _journal_lines(path)[-1]["job"]["id"] == again
+
+    third = _scheduler(path)
+    async with third._lock:
+        third._load_state_locked()
+    assert await third.get_job(keep) is not None
+    assert await third.get_job(again) is not None
+    await third.stop()
+
+
+def test_replay_skips_records_already_in_snapshot(tmp_path):
+    path = str(tmp_path / "cron_state.json")
+    journal = CronStateJournal(path, fsync=False)
+    journal.append("job", job={"id": "a", "name": "A"})
+    journal.append("run", entry={"run_id": "r1", "cron_job_id": "a"})
+    journal.rotate()
+    segment = journal._segment_paths()[0]
+    shutil.copy(segment, f"{segment}.bak")
+    assert journal.compact() == 2
+
+    # Crash nach Snapshot-Write, bevor das Segment gelöscht wurde
+    shutil.move(f"{segment}.bak", segment)
+    jobs, history = CronStateJournal(path, fsync=False).load()
+    assert list(jobs) == ["a"]
+    assert [h["run_id"] for h in history] == ["r1"]
+
+
+@pytest.mark.asyncio
+async def test_legacy_snapshot_without_journal_seq_loads(tmp_path):
+    path = tmp_path / "cron_state.json"
+    legacy = {
+        "version": 1,
+        "jobs": [{"id": "legacy1", "name": "old", "cron": "0 4 * * *", "timezone": "UTC", "enabled": True}],
+        "history": [{"run_id": "h1", "cron_job_id": "legacy1"}],
+    }
+    path.write_text(json.dumps(legacy), encoding="utf-8")
+
+    sched = _scheduler(path)
+    async with sched._lock:
+        sched._load_state_locked()
+    assert (await sched.get_job("legacy1"))["name"] == "old"
+    assert "legacy1" in sched._next_fire
+    assert len((await sched.get_queue_snapshot())["recent"]) == 1
+    await sched.stop()
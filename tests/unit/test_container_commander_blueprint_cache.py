@@ -0,0 +1,95 @@
+"""
+Unit Tests: versioned blueprint cache (container_commander/blueprint_store.py)
+
+Tests:
+  1. repeated reads are served from the cache (no reload per call)
+  2. updating a parent invalidates every resolved child
+  3. delete removes the blueprint from list/resolve
+  4. callers get copies, mutating them does not poison the cache
+  5. extends cycles raise BlueprintCycleError instead of recursing
+"""
+
+import pytest
+
+from container_commander import blueprint_store
+from container_commander.models import Blueprint, MountDef
+
+
+@pytest.fixture
+def store(monkeypatch, tmp_path):
+    monkeypatch.setattr(blueprint_store, "DB_PATH", str(tmp_path / "commander.db"))
+    monkeypatch.setattr(blueprint_store, "_INIT_DONE", False)
+    blueprint_store.ensure_store_initialized(seed_defaults=False)
+    return blueprint_store
+
+
+def _loads(store):
+    return store.get_blueprint_cache_stats()["loads"]
+
+
+def test_reads_hit_cache_until_write(store):
+    store.create_blueprint(Blueprint(id="base", name="Base", image="python:3.12-slim", tags=["python"]))
+    store.create_blueprint(Blueprint(id="child", name="Child", extends="base", tags=["ml"]))
+
+    first = store.resolve_blueprint("child")
+    loads = _loads(store)
+    for _ in range(5):
+        assert store.resolve_blueprint("child").image == "python:3.12-slim"
+        store.list_blueprints()
+        store.get_blueprint("base")
+    assert _loads(store) == loads
+    assert sorted(first.tags) == ["ml", "python"]
+
+    store.create_blueprint(Blueprint(id="other", name="Other", image="alpine"))
+    assert [b.id for b in store.list_blueprints()] == ["base", "child", "other"]
+    assert _loads(store) == loads + 1
+
+
+def test_parent_update_invalidates_children(store):
+    store.create_blueprint(Blueprint(id="base", name="Base", image="python:3.11"))
+    store.create_blueprint(Blueprint(id="mid", name="Mid", extends="base"))
+    store.create_blueprint(Blueprint(id="leaf", name="Leaf", extends="mid"))
+    assert store.resolve_blueprint("leaf").image == "python:3.11"
+
+    store.update_blueprint("base", {"image": "python:3.12"})
+    assert store.resolve_blueprint("leaf").image == "python:3.12"
+    assert store.resolve_blueprint("mid").image == "python:3.12"
+
+
+def test_delete_drops_from_list_and_resolve(store):
+    store.create_blueprint(Blueprint(id="gone", name="Gone", image="alpine"))
+    assert store.get_active_blueprint_ids() == {"gone"}
+    assert store.delete_blueprint("gone") is True
+    assert store.resolve_blueprint("gone") is None
+    assert store.list_blueprints() == []
+    assert store.get_active_blueprint_ids() == set()
+
+
+def test_returned_blueprints_are_copies(store):
+    store.create_blueprint(Blueprint(id="base", name="Base", image="alpine",
+                                     mounts=[MountDef(host="/data", container="/data")]))
+    store.create_blueprint(Blueprint(id="child", name="Child", extends="base",
+                                     mounts=[MountDef(host="/cache", container="/cache")]))
+    resolved = store.resolve_blueprint("child")
+    resolved.mounts.append(MountDef(host="/evil", container="/evil"))
+    resolved.tags.append("mutated")
+    store.list_blueprints()[0].mounts.clear()
+
+    again = store.resolve_blueprint("child")
+    assert [m.container for m in again.mounts] == ["/data", "/cache"]
+    assert "mutated" not in again.tags
+    assert [m.container for m in store.get_blueprint("base").mounts] == ["/data"]
+
+
+def test_inheritance_cycle_is_detected(store):
+    store.create_blueprint(Blueprint(id="a", name="A", image="alpine"))
+    store.create_blueprint(Blueprint(id="b", name="B", extends="a"))
+    store.update_blueprint("a", {"extends": "b"})
+
+    with pytest.raises(store.BlueprintCycleError, match="a -> b -> a"):
+        store.resolve_blueprint("a")
+    with pytest.raises(ValueError):
+        store.resolve_blueprint("b")
+
+    store.update_blueprint("a", {"extends": None})
+    assert store.resolve_blueprint("b").image == "alpine"
@@ -0,0 +1,286 @@
+"""
+Unit Tests: Docker event-stream driven runtime state (container_commander)
+
+Tests:
+  1. start event adds the container to _active and quota
+  2. die removes it again, oom is flagged, destroy drops it from the listing
+  3. list_containers is a registry read while the watcher is live
+  4. a broken stream reconnects and triggers a full resync
+  5. events for non-TRION containers are ignored
+  6. stop/start through the engine update the registry without waiting for events
+
+Docker is mocked at sys.modules level (same as the other engine tests);
+the event source is a fake iterator fed from a queue.
+"""
+
+import os
+import queue
+import sys
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def _install_docker_mock():
+    if "docker" in sys.modules:
+        return
+    m = MagicMock()
+    m.errors = MagicMock()
+    m.errors.NotFound = type("NotFound", (Exception,), {})
+    m.errors.APIError = type("APIError", (Exception,), {})
+    m.errors.BuildError = type("BuildError", (Exception,), {})
+    m.errors.ImageNotFound = type("ImageNotFound", (Exception,), {})
+    m.errors.DockerException = type("DockerException", (Exception,), {})
+    sys.modules["docker"] = m
+    sys.modules["docker.errors"] = m.errors
+
+
+def _install_store_mocks():
+    if "container_commander.blueprint_store" not in sys.modules:
+        bs = MagicMock()
+        bs.resolve_blueprint = MagicMock(return_value=None)
+        bs.log_action = MagicMock(return_value=None)
+        sys.modules["container_commander.blueprint_store"] = bs
+    if "container_commander.secret_store" not in sys.modules:
+        ss = MagicMock()
+        ss.get_secrets_for_blueprint = MagicMock(return_value={})
+        ss.log_secret_access = MagicMock(return_value=None)
+        sys.modules["container_commander.secret_store"] = ss
+
+
+_install_docker_mock()
+_install_store_mocks()
+
+from container_commander.runtime_events import DockerEventWatcher  # noqa: E402
+
+try:
+    import container_commander.engine as _ENGINE
+except Exception as _ENG_ERR:  # pragma: no cover - depends on optional imports
+    _ENGINE = None
+    _ENG_IMPORT_ERR = _ENG_ERR
+
+_CLOSED = object()
+
+
+class _FakeContainer:
+    def __init__(self, cid, name, status="running", mem_mb=256):
+        self.id = cid
+        self.name = name
+        self.status = status
+        self.labels = {"trion.managed": "true", "trion.blueprint": f"bp-{name}"}
+        self.attrs = {"HostConfig": {"Memory": mem_mb * 1024 * 1024, "NanoCpus": 500_000_000}}
+
+
+class _FakeStream:
+    """Blocking event iterator; `fail()` breaks the stream like a daemon restart."""
+
+    def __init__(self):
+        self.q = queue.Queue()
+
+    def __iter__(self):
+        while True:
+            item = self.q.get()
+            if item is _CLOSED:
+                return
+            if isinstance(item, Exception):
+                raise item
+            yield item
+
+    def push(self, event):
+        self.q.put(event)
+
+    def fail(self):
+        self.q.put(ConnectionError("stream reset"))
+
+    def close(self):
+        self.q.put(_CLOSED)
+
+
+class _FakeDocker:
+    def __init__(self):
+        self.containers_by_id = {}
+        self.streams = []
+        self.list_calls = 0
+        self.containers = MagicMock()
+        self.containers.get.side_effect = lambda cid: self.containers_by_id[cid]
+        self.containers.list.side_effect = self._list
+
+    def _list(self, all=False, filters=None):
+        self.list_calls += 1
+        wanted = (filters or {}).get("status")
+        return [c for c in self.containers_by_id.values() if not wanted or c.status == wanted]
+
+    def events_factory(self):
+        stream = _FakeStream()
+        self.streams.append(stream)
+        return stream
+
+
+def _event(action, container, **extra):
+    attrs = {"name": container.name, **container.labels, **extra}
+    return {"Type": "container", "Action": action, "Actor": {"ID": container.id, "Attributes": attrs}}
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    if _ENGINE is None:
+        pytest.skip(f"Cannot import container_commander.engine: {_ENG_IMPORT_ERR}")
+    fake = _FakeDocker()
+    monkeypatch.setattr(_ENGINE, "get_client", lambda: fake)
+    monkeypatch.setattr(_ENGINE, "COMMANDER_DOCKER_EVENTS", True)
+    monkeypatch.setattr(_ENGINE, "COMMANDER_STATS_COLLECTOR", False)
+    monkeypatch.setattr(_ENGINE, "_emit_ws_activity", MagicMock())
+    monkeypatch.setattr(_ENGINE, "_event_watcher", None)
+    with _ENGINE._state_lock:
+        saved_active = dict(_ENGINE._active)
+        _ENGINE._active.clear()
+        _ENGINE._known_containers.clear()
+        _ENGINE._update_quota_used_unlocked()
+    yield _ENGINE, fake
+    _ENGINE.stop_runtime_event_watcher()
+    with _ENGINE._state_lock:
+        _ENGINE._active.clear()
+        _ENGINE._active.update(saved_active)
+        _ENGINE._known_containers.clear()
+        _ENGINE._update_quota_used_unlocked()
+
+
+def _start_watcher(eng, fake):
+    assert eng.start_runtime_event_watcher(events_factory=fake.events_factory) is True
+    assert eng._event_watcher.wait_live(2.0)
+
+
+def test_start_and_die_events_update_active_and_quota(engine):
+    eng, fake = engine
+    _start_watcher(eng, fake)
+    c = _FakeContainer("c" * 64, "trion_worker", mem_mb=256)
+    fake.containers_by_id[c.id] = c
+
+    fake.streams[-1].push(_event("start", c))
+    assert _wait_for(lambda: c.id in eng._active)
+    assert eng._active[c.id].blueprint_id == "bp-trion_worker"
+    assert eng._quota.containers_used == 1
+    assert eng._quota.memory_used_mb == 256.0
+
+    c.status = "exited"
+    fake.streams[-1].push(_event("die", c, exitCode="137"))
+    assert _wait_for(lambda: c.id not in eng._active)
+    assert eng._quota.containers_used == 0
+    assert eng._known_containers[c.id]["status"] == "exited"
+
+
+def test_oom_is_flagged_and_destroy_drops_listing(engine):
+    eng, fake = engine
+    c = _FakeContainer("d" * 64, "trion_hungry")
+    fake.containers_by_id[c.id] = c
+    _start_watcher(eng, fake)
+    assert c.id in eng._active  # via Resync
+
+    fake.streams[-1].push(_event("oom", c))
+    assert _wait_for(lambda: eng._known_containers[c.id]["oom_killed"])
+    eng._emit_ws_activity.assert_called_once()
+    assert eng._emit_ws_activity.call_args.args[0] == "container_oom"
+
+    fake.streams[-1].push(_event("destroy", c))
+    assert _wait_for(lambda: c.id not in eng._known_containers)
+    assert c.id not in eng._active
+
+
+def test_list_containers_reads_registry_while_live(engine):
+    eng, fake = engine
+    running = _FakeContainer("e" * 64, "trion_up")
+    stopped = _FakeContainer("f" * 64, "trion_down", status="exited")
+    fake.containers_by_id.update({running.id: running, stopped.id: stopped})
+    _start_watcher(eng, fake)
+
+    calls = fake.list_calls
+    listing = {i.container_id: i for i in eng.list_containers()}
+    assert fake.list_calls == calls
+    assert listing[running.id].status == eng.ContainerStatus.RUNNING
+    assert listing[stopped.id].status == eng.ContainerStatus.STOPPED
+
+    eng._sync_runtime_state_from_docker()  # Quota-Pfad: kein Docker-Poll
+    assert fake.list_calls == calls
+
+
+def test_stream_loss_reconnects_and_resyncs():
+    resyncs, events = [], []
+    streams = []
+
+    def factory():
+        stream = _FakeStream()
+        streams.append(stream)
+        return stream
+
+    watcher = DockerEventWatcher(
+        events_factory=factory,
+        on_event=events.append,
+        on_resync=lambda: resyncs.append(len(streams)),
+        reconnect_backoff_s=0.01,
+    )
+    watcher.start()
+    try:
+        assert watcher.wait_live(2.0)
+        streams[-1].push({"Action": "start"})
+        assert _wait_for(lambda: len(events) == 1)
+        streams[-1].fail()
+        assert _wait_for(lambda: len(streams) == 2 and watcher.is_live())
+        assert resyncs == [1, 2]
+        snap = watcher.snapshot()
+        assert snap["reconnects"] == 1
+        assert "stream reset" in snap["last_error"]
+    finally:
+        watcher.stop()
+    assert not watcher.is_live()
+
+
+def test_foreign_containers_are_ignored(engine):
+    eng, fake = engine
+    _start_watcher(eng, fake)
+    foreign = _FakeContainer("a" * 64, "postgres")
+    foreign.labels = {}
+    fake.containers_by_id[foreign.id] = foreign
+    fake.streams[-1].push(_event("start", foreign))
+    marker = _FakeContainer("b" * 64, "trion_marker", status="created")
+    fake.streams[-1].push(_event("create", marker))
+    assert _wait_for(lambda: marker.id in eng._known_containers)
+    assert foreign.id not in eng._known_containers
+    assert foreign.id not in eng._active
+
+
+def test_engine_stop_and_start_update_registry_before_events(engine, monkeypatch):
+    eng, fake = engine
+    monkeypatch.setattr(eng, "log_action", MagicMock())
+    keep = _FakeContainer("g" * 64, "trion_keep")
+    gone = _FakeContainer("h" * 64, "trion_gone")
+    for c in (keep, gone):
+        c.stop = MagicMock()
+        c.remove = MagicMock()
+        fake.containers_by_id[c.id] = c
+    _start_watcher(eng, fake)
+
+    # Watcher liefert keine Events: Listing muss trotzdem sofort stimmen
+    assert eng.stop_container(keep.id, remove=False) is True
+    assert eng.stop_container(gone.id, remove=True) is True
+    listing = {i.container_id: i for i in eng.list_containers()}
+    assert listing[keep.id].status == eng.ContainerStatus.STOPPED
+    assert gone.id not in listing
+
+    keep.status = "exited"
+    keep.start = MagicMock()
+    keep.reload = MagicMock()
+    assert eng.start_stopped_container(keep.id) is True
+    listing = {i.container_id: i for i in eng.list_containers()}
+    assert listing[keep.id].status == eng.ContainerStatus.RUNNING
@@ -0,0 +1,206 @@
+"""
+Unit Tests: background stats collector (container_commander/stats_collector.py)
+
+Tests:
+  1. parse_stats_sample computes CPU %, memory and network rates
+  2. first stream sample (empty precpu_stats) uses the previous sample for CPU
+  3. streaming subscription fills the ring buffer (bounded), history queries
+  4. short ids are aliased to the full id reported by Docker
+  5. get_container_stats: cold read seeds the collector, warm read skips Docker
+
+Docker is mocked at sys.modules level (same as the other engine tests).
+"""
+
+import os
+import sys
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+
+def _install_docker_mock():
+    if "docker" in sys.modules:
+        return
+    m = MagicMock()
+    m.errors = MagicMock()
+    m.errors.NotFound = type("NotFound", (Exception,), {})
+    m.errors.APIError = type("APIError", (Exception,), {})
+    m.errors.BuildError = type("BuildError", (Exception,), {})
+    m.errors.ImageNotFound = type("ImageNotFound", (Exception,), {})
+    m.errors.DockerException = type("DockerException", (Exception,), {})
+    sys.modules["docker"] = m
+    sys.modules["docker.errors"] = m.errors
+
+
+def _install_store_mocks():
+    if "container_commander.blueprint_store" not in sys.modules:
+        bs = MagicMock()
+        bs.resolve_blueprint = MagicMock(return_value=None)
+        bs.log_action = MagicMock(return_value=None)
+        sys.modules["container_commander.blueprint_store"] = bs
+    if "container_commander.secret_store" not in sys.modules:
+        ss = MagicMock()
+        ss.get_secrets_for_blueprint = MagicMock(return_value={})
+        ss.log_secret_access = MagicMock(return_value=None)
+        sys.modules["container_commander.secret_store"] = ss
+
+
+_install_docker_mock()
+_install_store_mocks()
+
+from container_commander.stats_collector import (  # noqa: E402
+    ContainerStatsCollector,
+    parse_stats_sample,
+)
+
+FULL_ID = "abc123def456" + "0" * 52
+
+
+def _raw(total, system, pre_total=0, pre_system=0, mem_mb=256, rx=0, tx=0):
+    return {
+        "cpu_stats": {"cpu_usage": {"total_usage": total}, "system_cpu_usage": system, "online_cpus": 2},
+        "precpu_stats": {"cpu_usage": {"total_usage": pre_total}, "system_cpu_usage": pre_system},
+        "memory_stats": {"usage": mem_mb * 1024 * 1024, "limit": 1024 * 1024 * 1024},
+        "networks": {"eth0": {"rx_bytes": rx, "tx_bytes": tx}},
+    }
+
+
+def _attrs():
+    return {
+        "Id": FULL_ID,
+        "Config": {"Labels": {"trion.blueprint": "bp-stats"}},
+        "NetworkSettings": {"Networks": {"trion-sandbox": {"IPAddress": "172.20.0.5"}}},
+    }
+
+
+class _FakeContainer:
+    def __init__(self, samples, gate=None):
+        self.id = FULL_ID
+        self.attrs = _attrs()
+        self._samples = samples
+        self._gate = gate
+        self.blocking_reads = 0
+
+    def stats(self, stream=False, decode=False):
+        if not stream:
+            self.blocking_reads += 1
+            return _raw(2_000, 20_000, 1_000, 10_000)
+        return self._stream()
+
+    def _stream(self):
+        for raw in self._samples:
+            yield raw
+        if self._gate is not None:
+            self._gate.wait(2.0)
+
+
+def _client_for(container):
+    client = MagicMock()
+    client.containers.get.return_value = container
+    client.containers.list.return_value = [container]
+    return client
+
+
+def _wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_parse_sample_cpu_memory_and_network_rates():
+    prev = parse_stats_sample(_raw(1_000, 10_000, rx=1_000, tx=500), ts=100.0)
+    cur = parse_stats_sample(_raw(2_000, 20_000, 1_000, 10_000, mem_mb=300, rx=3_000, tx=1_500), prev, ts=102.0)
+    assert cur.cpu_percent == 20.0  # 1000/10000 * 2 cpus
+    assert cur.memory_mb == 300.0
+    assert cur.memory_limit_mb == 1024.0
+    assert (cur.network_rx_bps, cur.network_tx_bps) == (1000.0, 500.0)
+    assert "cpu_total_usage" not in cur.to_dict()
+
+
+def test_first_stream_sample_uses_previous_counters():
+    prev = parse_stats_sample(_raw(1_000, 10_000), ts=1.0)
+    cur = parse_stats_sample(_raw(1_500, 15_000), prev, ts=2.0)  # leere precpu_stats
+    assert cur.cpu_percent == 20.0
+    assert parse_stats_sample(_raw(1_500, 15_000)).cpu_percent == 0.0
+
+
+def test_stream_fills_bounded_ring_buffer():
+    gate = threading.Event()
+    samples = [_raw(1_000 * i, 10_000 * i, rx=100 * i) for i in range(1, 8)]
+    container = _FakeContainer(samples, gate=gate)
+    collector = ContainerStatsCollector(lambda: _client_for(container), label="trion.managed", history=5)
+    try:
+        collector.ensure(FULL_ID)
+        assert _wait_for(lambda: collector.snapshot()["samples_total"] == 7)
+        history = collector.history(FULL_ID)
+        assert len(history) == 5
+        assert [h["network_rx_bytes"] for h in history] == [300, 400, 500, 600, 700]
+        assert len(collector.history(FULL_ID, limit=2)) == 2
+        assert collector.history(FULL_ID, seconds=0.0) == []
+        sample, attrs = collector.latest(FULL_ID)
+        assert sample.network_rx_bytes == 700
+        assert attrs["Id"] == FULL_ID
+    finally:
+        gate.set()
+        collector.shutdown()
+
+
+def test_short_id_alias_and_forget():
+    gate = threading.Event()
+    container = _FakeContainer([], gate=gate)
+    collector = ContainerStatsCollector(lambda: _client_for(container), label="trion.managed")
+    try:
+        collector.seed("abc123def456", parse_stats_sample(_raw(1, 1)), _attrs())
+        assert collector.latest("abc123def456") is not None
+        assert collector.latest(FULL_ID) is not None
+        collector.sync([FULL_ID])  # Resync mit voller ID -> keine zweite Subscription
+        assert collector.snapshot()["subscriptions"] == 1
+        collector.forget("abc123def456")
+        assert collector.latest(FULL_ID) is None
+    finally:
+        gate.set()
+        collector.shutdown()
+
+
+try:
+    import container_commander.engine as _ENGINE
+except Exception as _ENG_ERR:  # pragma: no cover - depends on optional imports
+    _ENGINE = None
+    _ENG_IMPORT_ERR = _ENG_ERR
+
+
+def test_get_container_stats_reads_from_collector(monkeypatch):
+    if _ENGINE is None:
+        pytest.skip(f"Cannot import container_commander.engine: {_ENG_IMPORT_ERR}")
+    gate = threading.Event()
+    container = _FakeContainer([], gate=gate)
+    client = _client_for(container)
+    collector = ContainerStatsCollector(lambda: client, label="trion.managed")
+    monkeypatch.setattr(_ENGINE, "_stats_collector", collector)
+    monkeypatch.setattr(_ENGINE, "COMMANDER_STATS_COLLECTOR", True)
+    monkeypatch.setattr(_ENGINE, "get_client", lambda: client)
+    try:
+        cold = _ENGINE.get_container_stats("abc123def456")
+        assert cold["cpu_percent"] == 20.0
+        assert container.blocking_reads == 1
+
+        client.containers.get.reset_mock()
+        warm = _ENGINE.get_container_stats("abc123def456")
+        assert container.blocking_reads == 1
+        assert warm["cpu_percent"] == 20.0
+        assert warm["connection"] is not None
+        # Docker wird nur noch vom Stream-Thread angefasst, nicht vom Read
+        assert all(call.args == (FULL_ID,) for call in client.containers.get.call_args_list)
+
+        history = _ENGINE.get_container_stats_history("abc123def456", seconds=60)
+        assert len(history["samples"]) == 1
+    finally:
+        gate.set()
+        collector.shutdown()
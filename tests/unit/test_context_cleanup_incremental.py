@@ -0,0 +1,240 @@
+"""
+Unit Tests: incremental TypedState projection (core/context_cleanup.py)
+
+Tests:
+- growing event streams: delta projection == full rebuild (state + output)
+- only new events are applied on the delta path
+- evicted, out-of-order and in-window duplicate events force a full replay
+- changed content under a known id is treated as a new event
+- mapping_rules.yaml is parsed once and reloaded on mtime change
+- cursor reads (id >= cursor) advance the checkpoint without a window replay
+- synthetic extra events never enter the checkpoint
+"""
+
+import json
+import os
+import random
+import sys
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+import core.context_cleanup as cc  # noqa: E402
+
+CONV = "conv-incremental"
+_T0 = datetime(2026, 3, 1, 12, 0, 0, tzinfo=timezone.utc)
+
+
+def _ev(i: int, event_type: str, data: dict, secs: float = None) -> dict:
+    ts = _T0 + timedelta(seconds=secs if secs is not None else i * 5)
+    return {
+        "id": f"ev-{i:04d}",
+        "conversation_id": CONV,
+        "event_type": event_type,
+        "event_data": data,
+        "created_at": ts.strftime("%Y-%m-%dT%H:%M:%S.%f") + "Z",
+    }
+
+
+def _random_stream(n: int, seed: int) -> list:
+    rnd = random.Random(seed)
+    events = []
+    for i in range(n):
+        cid = f"c{rnd.randint(1, 4)}"
+        kind = rnd.choice([
+            ("container_started", {"container_id": cid, "blueprint_id": "python-sandbox"}),
+            ("container_stopped", {"container_id": cid}),
+            ("container_exec", {"container_id": cid, "exit_code": rnd.choice([0, 0, 1]), "stderr": f"boom {i}"}),
+            ("tool_result", {"ref_id": f"ref-{i}", "tool_name": "exec", "status": rnd.choice(["success", "error"])}),
+            ("trust_blocked", {"reason": f"unsigned image {i % 3}"}),
+            ("approval_requested", {"skill_id": f"skill-{i % 5}"}),
+            ("note", {"content": f"step {i} failed" if i % 4 == 0 else f"step {i}"}),
+        ])
+        events.append(_ev(i, kind[0], dict(kind[1])))
+    return events
+
+
+def _state_dump(state) -> str:
+    data = {k: v for k, v in vars(state).items() if k != "updated_at"}
+    return json.dumps(data, sort_keys=True, default=vars)
+
+
+def _full_state(events: list):
+    evs = cc._sort_events_asc(cc._dedupe_events(cc._normalize_events(list(events))))
+    state = cc.TypedState()
+    cc._apply_events_to_state(state, evs, cc._correlate_events(evs), cc._load_confidence_config())
+    return state
+
+
+def _output(ctx) -> tuple:
+    meta = {k: v for k, v in ctx.meta.items() if k not in ("generated_at", "projection")}
+    return ctx.now, ctx.rules, ctx.next, meta
+
+
+@pytest.fixture(autouse=True)
+def _fresh_projection(monkeypatch):
+    monkeypatch.setattr(cc, "_dedupe_scope_by_conv", lambda: True)
+    cc.reset_typedstate_projection()
+    yield
+    cc.reset_typedstate_projection()
+
+
+@pytest.mark.parametrize("seed", [1, 7, 42])
+def test_growing_stream_matches_full_rebuild(seed):
+    stream = _random_stream(60, seed)
+    modes = []
+    for n in range(1, len(stream) + 1, 3):
+        window = list(reversed(stream[:n]))  # Store liefert newest-first
+        inc = cc.build_compact_context(window, conversation_id=CONV)
+        full = cc.build_compact_context(window)
+        modes.append(inc.meta["projection"])
+        assert _output(inc) == _output(full)
+        with cc._PROJECTOR.lock:
+            cp_state = cc._PROJECTOR._checkpoints[CONV].state
+            assert _state_dump(cp_state) == _state_dump(_full_state(window))
+    assert modes[0] == "full"
+    assert set(modes[1:]) == {"delta"}
+
+
+def test_delta_applies_only_new_events():
+    stream = _random_stream(40, 3)
+    cc.build_compact_context(stream[:30], conversation_id=CONV)
+    applied = cc.get_projection_stats()["events_applied"]
+    ctx = cc.build_compact_context(stream, conversation_id=CONV)
+    assert ctx.meta["projection"] == "delta"
+    assert cc.get_projection_stats()["events_applied"] - applied == 10
+    assert ctx.meta["events_processed"] == 40
+
+    again = cc.build_compact_context(list(reversed(stream)), conversation_id=CONV)
+    assert again.meta["projection"] == "noop"
+    assert _output(again) == _output(ctx)
+
+
+def test_eviction_out_of_order_and_collisions_replay():
+    stream = _random_stream(30, 11)
+    cc.build_compact_context(stream[:20], conversation_id=CONV)
+
+    # Fenster rutscht weiter: ältestes Event fehlt
+    slid = stream[1:21]
+    ctx = cc.build_compact_context(slid, conversation_id=CONV)
+    assert ctx.meta["projection"] == "full"
+    assert _output(ctx) == _output(cc.build_compact_context(slid))
+
+    # Nachzügler mit altem Zeitstempel
+    late = _ev(900, "trust_blocked", {"reason": "late gate"}, secs=12)
+    events = slid + [late]
+    ctx = cc.build_compact_context(events, conversation_id=CONV)
+    assert ctx.meta["projection"] == "full"
+    assert _output(ctx) == _output(cc.build_compact_context(events))
+
+    # gleicher Dedupe-Key wie ein bekanntes Event, weit außerhalb des Fensters → Delta
+    repeat = dict(slid[-1], id="ev-repeat", created_at=_ev(0, "x", {}, secs=1000)["created_at"])
+    events = events + [repeat]
+    ctx = cc.build_compact_context(events, conversation_id=CONV)
+    assert ctx.meta["projection"] == "delta"
+    assert _output(ctx) == _output(cc.build_compact_context(events))
+
+    # ... innerhalb des Dedupe-Fensters → Replay
+    dup = dict(repeat, id="ev-dup", created_at=_ev(0, "x", {}, secs=1001)["created_at"])
+    events = events + [dup]
+    ctx = cc.build_compact_context(events, conversation_id=CONV)
+    assert ctx.meta["projection"] == "full"
+    assert _output(ctx) == _output(cc.build_compact_context(events))
+
+
+def test_changed_content_under_known_id_is_not_skipped():
+    base = [_ev(0, "container_started", {"container_id": "c1"})]
+    work = _ev(1, "task_loop_context_updated", {"background_loop_topic": "Build A", "pending_step": "step 1"})
+    cc.build_compact_context(base + [work], conversation_id=CONV)
+
+    changed = dict(work, event_data={"background_loop_topic": "Build B", "pending_step": "step 2"})
+    events = base + [changed]
+    ctx = cc.build_compact_context(events, conversation_id=CONV)
+    assert ctx.meta["projection"] == "full"
+    assert _output(ctx) == _output(cc.build_compact_context(events))
+
+
+def test_mapping_rules_parsed_once_and_reloaded_on_mtime(monkeypatch, tmp_path):
+    if not cc._YAML_AVAILABLE:
+        pytest.skip("PyYAML not installed")
+    rules = tmp_path / "mapping_rules.yaml"
+    rules.write_text("limits:\n  now_max: 4\n", encoding="utf-8")
+    monkeypatch.setattr(cc, "_RULES_PATH", str(rules))
+    for slot in ("key", "data", "error"):
+        monkeypatch.setitem(cc._rules_cache, slot, None)
+
+    loads = []
+    real_safe_load = cc.yaml.safe_load
+    monkeypatch.setattr(cc.yaml, "safe_load", lambda f: loads.append(1) or real_safe_load(f))
+
+    for _ in range(3):
+        cc.build_compact_context([_ev(0, "note", {"content": "hi"})], conversation_id=CONV)
+    assert cc._load_limits()["now_max"] == 4
+    assert len(loads) == 1
+
+    rules.write_text("limits:\n  now_max: 2\n  next_max: 1\n", encoding="utf-8")
+    st = os.stat(rules)
+    os.utime(rules, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    ctx = cc.build_compact_context([_ev(0, "note", {"content": "hi"})], conversation_id=CONV)
+    assert cc._load_limits()["now_max"] == 2
+    assert len(loads) == 2
+    assert ctx.meta["projection"] == "full"  # Config geändert → Replay
+
+
+def _numbered(events: list) -> list:
+    # Workspace-Store vergibt fortlaufende Integer-IDs
+    return [dict(ev, id=i + 1) for i, ev in enumerate(events)]
+
+
+def test_cursor_reads_match_full_rebuild():
+    stream = _numbered(_random_stream(60, 5))
+    cc.build_compact_context(list(reversed(stream[:10])), conversation_id=CONV)
+    modes = []
+    for n in range(12, len(stream) + 1, 3):
+        cursor = cc.get_projection_cursor(CONV)
+        since = [ev for ev in reversed(stream[:n]) if ev["id"] >= cursor]
+        inc = cc.build_compact_context_since(since, CONV)
+        modes.append(inc.meta["projection"])
+        assert _output(inc) == _output(cc.build_compact_context(stream[:n]))
+    assert set(modes) == {"delta"}
+    assert cc.get_projection_cursor(CONV) == stream[-1]["id"]
+    assert [ev["id"] for ev in cc.get_projection_window(CONV, 3)] == [60, 59, 58]
+
+
+def test_cursor_read_without_anchor_falls_back():
+    stream = _numbered(_random_stream(20, 9))
+    cc.build_compact_context(stream[:10], conversation_id=CONV)
+    cursor = cc.get_projection_cursor(CONV)
+
+    # Store zurückgesetzt / Cursor-Event abgelaufen
+    assert cc.build_compact_context_since(stream[cursor:], CONV) is None
+    changed = dict(stream[cursor - 1], event_data={"content": "rewritten"})
+    assert cc.build_compact_context_since([changed] + stream[cursor:], CONV) is None
+    # anderer Quell-Filter → kein Checkpoint
+    assert cc.get_projection_cursor(CONV, source_key=("tool_result",)) is None
+
+
+def test_extra_events_are_not_checkpointed():
+    stream = _numbered(_random_stream(20, 13))
+    extra = {
+        "id": "work-context-" + CONV,
+        "event_type": "task_loop_context_updated",
+        "created_at": _ev(0, "x", {}, secs=10_000)["created_at"],
+        "event_data": {"background_loop_topic": "Build A", "background_loop_pending_step": "step 1"},
+    }
+    ctx = cc.build_compact_context(stream[:10], conversation_id=CONV, extra_events=[extra])
+    assert _output(ctx) == _output(cc.build_compact_context(stream[:10], extra_events=[extra]))
+
+    with cc._PROJECTOR.lock:
+        cp = cc._PROJECTOR._checkpoints[CONV]
+        assert _state_dump(cp.state) == _state_dump(_full_state(stream[:10]))
+        assert all(ev["id"] != extra["id"] for ev in cp.raw_events)
+
+    # Extra ändert sich pro Turn, neue Events bleiben trotzdem auf dem Delta-Pfad
+    moved = dict(extra, created_at=_ev(0, "x", {}, secs=10_005)["created_at"])
+    since = [ev for ev in stream if ev["id"] >= cc.get_projection_cursor(CONV)]
+    ctx = cc.build_compact_context_since(since, CONV, extra_events=[moved])
+    assert ctx.meta["projection"] == "delta"
+    assert _output(ctx) == _output(cc.build_compact_context(stream, extra_events=[moved]))
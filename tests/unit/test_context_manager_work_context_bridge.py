@@ -81,3 +81,60 @@ def test_build_small_model_context_does_not_duplicate_when_task_loop_events_exis
         result = cm.build_small_model_context(conversation_id="conv-ctx")
 
     assert result.count("TASK_CONTEXT Container-Auswahl abschliessen") == 1
+
+
+def test_build_small_model_context_reads_new_events_by_cursor():
+    from core.context_cleanup import get_projection_stats, reset_typedstate_projection
+    from core.context_manager import ContextManager
+    from core.task_loop.contracts import TaskLoopSnapshot, TaskLoopState
+
+    cm = ContextManager.__new__(ContextManager)
+    cm._protocol_cache = {}
+
+    snapshot = TaskLoopSnapshot(
+        objective_id="obj-1",
+        conversation_id="conv-cursor",
+        plan_id="plan-1",
+        state=TaskLoopState.WAITING_FOR_USER,
+        current_plan=["Ziel klaeren", "Container starten"],
+        pending_step="Container starten",
+        objective_summary="Container-Auswahl abschliessen",
+    )
+    fake_store = MagicMock()
+    fake_store.get.return_value = snapshot
+
+    stored = []
+
+    def _event_list(tool_name, args):
+        events = [e for e in stored if e["id"] >= args.get("min_id", 0)]
+        events.sort(key=lambda e: e["id"], reverse=True)
+        return {"events": events[: args["limit"]]}
+
+    mock_hub = MagicMock()
+    mock_hub.call_tool.side_effect = _event_list
+
+    reset_typedstate_projection()
+    before = get_projection_stats()
+    with patch("mcp.hub.get_hub", return_value=mock_hub), \
+         patch("core.typedstate_csv_loader.maybe_load_csv_events", return_value=[]), \
+         patch("config.get_typedstate_mode", return_value="off"), \
+         patch("core.context_manager.get_task_loop_store", return_value=fake_store):
+        for turn in range(4):
+            for _ in range(40):  # Fenster (limit=100) rutscht ab Turn 3
+                n = len(stored) + 1
+                stored.append({
+                    "id": n,
+                    "conversation_id": "conv-cursor",
+                    "event_type": "container_exec",
+                    "created_at": f"2026-04-23T02:{n // 60:02d}:{n % 60:02d}.000000Z",
+                    "event_data": {"container_id": f"c{n}", "exit_code": 0},
+                })
+            result = cm.build_small_model_context(conversation_id="conv-cursor")
+            assert "TASK_CONTEXT Container-Auswahl abschliessen" in result
+
+    stats = get_projection_stats()
+    reset_typedstate_projection()
+    assert stats["full"] - before["full"] == 1
+    assert stats["delta"] - before["delta"] == 3
+    cursor_reads = [c.args[1] for c in mock_hub.call_tool.call_args_list if "min_id" in c.args[1]]
+    assert [a["min_id"] for a in cursor_reads] == [40, 80, 120]
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import importlib.util
+import os
+import sys
+import unittest
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+# Routing-Tests zählen HTTP-Calls: kein Vektor aus dem Cache eines anderen Tests
+pytestmark = pytest.mark.usefixtures("no_embedding_cache")
+
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_REPO_ROOT = os.path.abspath(os.path.join(_HERE, "..", ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+
+
+def _load_sqlmem_embedding():
+    """Fresh module load of sql-memory/embedding.py."""
+    path = os.path.join(_REPO_ROOT, "sql-memory", "embedding.py")
+    spec = importlib.util.spec_from_file_location("_sqlmem_embed_batch", path)
+    mod = importlib.util.module_from_spec(spec)
+    with patch("requests.get", side_effect=RuntimeError("offline")):
+        spec.loader.exec_module(mod)
+    return mod
+
+
+def _resp(status=200, payload=None):
+    resp = MagicMock()
+    resp.status_code = status
+    resp.json.return_value = payload or {}
+    if status >= 400:
+        resp.raise_for_status.side_effect = RuntimeError(f"HTTP {status}")
+    else:
+        resp.raise_for_status.return_value = None
+    return resp
+
+
+def _vec(text):
+    return [float(len(text)), 1.0]
+
+
+class _FakeOllama:
+    """Minimal fake for /api/embed and /api/embeddings."""
+
+    def __init__(self, batch_supported=True):
+        self.batch_supported = batch_supported
+        self.calls = []
+
+    def post(self, url, json=None, timeout=None):
+        self.calls.append((url, json))
+        if url.endswith("/api/embed"):
+            if not self.batch_supported:
+                return _resp(404)
+            return _resp(payload={"embeddings": [_vec(t) for t in json["input"]]})
+        return _resp(payload={"embedding": _vec(json["prompt"])})
+
+
+TARGET = {
+    "requested_policy": "auto",
+    "requested_target": "gpu",
+    "effective_target": "gpu",
+    "fallback_reason": None,
+    "hard_error": False,
+    "error_code": None,
+    "endpoint": "http://ollama:11434",
+    "options": {},
+    "fallback_endpoint": None,
+    "fallback_policy": "best_effort",
+    "reason": "test",
+    "target": "gpu",
+}
+
+
+class TestSqlMemoryEmbeddingBatch(unittest.TestCase):
+    def setUp(self):
+        self.mod = _load_sqlmem_embedding()
+        self.texts = ["alpha", "", "be", "gamma-long", "d"]
+
+    def _run(self, fake, **kwargs):
+        with patch.object(self.mod, "_resolve_embedding_target", return_value=dict(TARGET)), patch.object(
+            self.mod, "_resolve_embedding_model", return_value="m"
+        ), patch.object(self.mod.requests, "post", side_effect=fake.post):
+            return self.mod.get_embeddings_batch(self.texts, **kwargs)
+
+    def test_batches_preserve_input_order(self):
+        fake = _FakeOllama()
+        result = self._run(fake, batch_size=2)
+
+        self.assertEqual(result, [_vec("alpha"), None, _vec("be"), _vec("gamma-long"), _vec("d")])
+        embed_calls = [c for c in fake.calls if c[0].endswith("/api/embed")]
+        self.assertEqual(len(embed_calls), 2)
+        self.assertEqual(embed_calls[0][1]["input"], ["alpha", "be"])
+
+    def test_falls_back_to_per_text_on_old_server(self):
+        fake = _FakeOllama(batch_supported=False)
+        result = self._run(fake, batch_size=10)
+
+        self.assertEqual(result, [_vec("alpha"), None, _vec("be"), _vec("gamma-long"), _vec("d")])
+        self.assertEqual(sum(1 for c in fake.calls if c[0].endswith("/api/embed")), 1)
+        self.assertEqual(sum(1 for c in fake.calls if c[0].endswith("/api/embeddings")), 4)
+
+        # Unsupported endpoint is remembered; no second /api/embed probe.
+        fake.calls.clear()
+        self._run(fake, batch_size=10)
+        self.assertFalse(any(c[0].endswith("/api/embed") for c in fake.calls))
+
+    def test_batch_with_metadata_sets_version(self):
+        fake = _FakeOllama()
+        with patch.object(self.mod, "_canonical_policy", return_value="auto"), patch.object(
+            self.mod, "_resolve_embedding_target", return_value=dict(TARGET)
+        ), patch.object(self.mod, "_resolve_embedding_model", return_value="m"), patch.object(
+            self.mod.requests, "post", side_effect=fake.post
+        ):
+            rows = self.mod.get_embeddings_batch_with_metadata(["x", ""])
+
+        self.assertIsNone(rows[1])
+        self.assertEqual(rows[0]["embedding_dim"], 2)
+        self.assertEqual(rows[0]["embedding_version"], self.mod.compute_embedding_version_id("m", "auto"))
+
+
+class TestArchiveEmbeddingBatch(unittest.TestCase):
+    def setUp(self):
+        import core.lifecycle.archive as arch
+
+        self.arch = arch
+        self.arch._BATCH_SUPPORT.clear()
+
+    def tearDown(self):
+        self.arch._BATCH_SUPPORT.clear()
+
+    def _run(self, fake, texts, **kwargs):
+        with patch.object(self.arch, "_resolve_embedding_decision", return_value=dict(TARGET)), patch.object(
+            self.arch, "get_embedding_model", return_value="m"
+        ), patch.object(self.arch, "get_embedding_runtime_policy", return_value="auto"), patch.object(
+            self.arch.requests, "post", side_effect=fake.post
+        ):
+            return self.arch._get_embeddings_batch(texts, **kwargs)
+
+    def test_archive_batch_order_and_chunking(self):
+        fake = _FakeOllama()
+        texts = ["one", "two", "", "three"]
+        result = self._run(fake, texts, batch_size=2)
+        self.assertEqual(result, [_vec("one"), _vec("two"), None, _vec("three")])
+        self.assertEqual(sum(1 for c in fake.calls if c[0].endswith("/api/embed")), 2)
+
+    def test_archive_batch_per_text_fallback(self):
+        fake = _FakeOllama(batch_supported=False)
+        result = self._run(fake, ["one", "two"])
+        self.assertEqual(result, [_vec("one"), _vec("two")])
+        self.assertEqual(sum(1 for c in fake.calls if c[0].endswith("/api/embeddings")), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
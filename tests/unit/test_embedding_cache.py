@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import importlib.util
+import os
+import sqlite3
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_REPO_ROOT = os.path.abspath(os.path.join(_HERE, "..", ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+_SQL_MEMORY_PATH = os.path.join(_REPO_ROOT, "sql-memory")
+if _SQL_MEMORY_PATH not in sys.path:
+    sys.path.insert(0, _SQL_MEMORY_PATH)
+
+from utils.embedding.cache import EmbeddingCache, text_hash  # noqa: E402
+from tests.unit.test_embedding_batch import TARGET, _FakeOllama, _load_sqlmem_embedding, _vec  # noqa: E402
+
+
+class TestEmbeddingCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "memory.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_memory_tier_lru_eviction_and_stats(self):
+        cache = EmbeddingCache(None, max_entries=2)
+        cache.put("a", "v1", [1.0])
+        cache.put("b", "v1", [2.0])
+        self.assertEqual(cache.get("a", "v1"), [1.0])  # "a" becomes most recent
+        cache.put("c", "v1", [3.0])  # evicts "b"
+
+        self.assertIsNone(cache.get("b", "v1"))
+        self.assertEqual(cache.get("c", "v1"), [3.0])
+        self.assertIsNone(cache.get("a", "v2"))  # version is part of the key
+
+        stats = cache.get_stats()
+        self.assertEqual(stats["memory_hits"], 2)
+        self.assertEqual(stats["misses"], 2)
+        self.assertEqual(stats["evictions"], 1)
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_sqlite_tier_is_shared_between_instances(self):
+        writer = EmbeddingCache(self.db_path)
+        writer.put("shared text", "v1", [0.5, -0.25])
+
+        reader = EmbeddingCache(self.db_path)
+        self.assertEqual(reader.get("shared text", "v1"), [0.5, -0.25])
+        self.assertEqual(reader.get_stats()["sqlite_hits"], 1)
+        # Promoted into the memory tier.
+        self.assertEqual(reader.get("shared text", "v1"), [0.5, -0.25])
+        self.assertEqual(reader.get_stats()["memory_hits"], 1)
+
+        conn = sqlite3.connect(self.db_path)
+        try:
+            row = conn.execute(
+                "SELECT text_hash, embedding_dim, typeof(embedding) FROM embedding_cache"
+            ).fetchone()
+        finally:
+            conn.close()
+        self.assertEqual(row, (text_hash("shared text"), 2, "blob"))
+
+    def test_sqlite_failure_is_a_miss(self):
+        cache = EmbeddingCache(os.path.join(self.tmp.name, "missing-dir", "x.db"))
+        cache.put("t", "v1", [1.0])
+        cache.clear_memory()
+        self.assertIsNone(cache.get("t", "v1"))
+        self.assertGreaterEqual(cache.get_stats()["errors"], 2)
+
+
+class TestSqlMemoryEmbeddingUsesCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.mod = _load_sqlmem_embedding()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _patches(self, fake):
+        return [
+            patch.dict(os.environ, {"EMBEDDING_CACHE_ENABLED": "true"}),
+            patch.object(self.mod, "_EMBED_CACHE_DB_PATH", os.path.join(self.tmp.name, "memory.db")),
+            patch.object(self.mod, "_resolve_embedding_target", return_value=dict(TARGET)),
+            patch.object(self.mod, "_resolve_embedding_model", return_value="m"),
+            patch.object(self.mod, "_canonical_policy", return_value="auto"),
+            patch.object(self.mod.requests, "post", side_effect=fake.post),
+        ]
+
+    def test_repeated_texts_skip_the_embedder(self):
+        fake = _FakeOllama()
+        patches = self._patches(fake)
+        for p in patches:
+            p.start()
+        try:
+            self.assertEqual(self.mod.get_embedding("alpha"), _vec("alpha"))
+            calls_after_first = len(fake.calls)
+
+            result = self.mod.get_embeddings_batch(["alpha", "beta", "alpha"])
+            self.assertEqual(result, [_vec("alpha"), _vec("beta"), _vec("alpha")])
+            embed_calls = [c for c in fake.calls[calls_after_first:] if c[0].endswith("/api/embed")]
+            self.assertEqual(embed_calls[0][1]["input"], ["beta"])
+
+            fake.calls.clear()
+            self.assertEqual(self.mod.get_embedding("beta"), _vec("beta"))
+            self.assertEqual(fake.calls, [])
+
+            stats = self.mod.get_embedding_cache_stats()
+            self.assertTrue(stats["enabled"])
+            self.assertGreaterEqual(stats["hits"], 2)
+        finally:
+            for p in reversed(patches):
+                p.stop()
+
+    def test_disabled_cache_always_calls_embedder(self):
+        fake = _FakeOllama()
+        with patch.dict(os.environ, {"EMBEDDING_CACHE_ENABLED": "false"}), patch.object(
+            self.mod, "_resolve_embedding_target", return_value=dict(TARGET)
+        ), patch.object(self.mod, "_resolve_embedding_model", return_value="m"), patch.object(
+            self.mod.requests, "post", side_effect=fake.post
+        ):
+            self.mod.get_embedding("alpha")
+            self.mod.get_embedding("alpha")
+            self.assertEqual(self.mod.get_embedding_cache_stats(), {"enabled": False})
+        self.assertEqual(len(fake.calls), 2)
+
+
+class TestArchiveEmbeddingUsesCache(unittest.TestCase):
+    def setUp(self):
+        import core.lifecycle.archive as arch
+
+        self.arch = arch
+        self.tmp = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_archive_single_and_batch_share_cache(self):
+        fake = _FakeOllama()
+        db_path = os.path.join(self.tmp.name, "memory.db")
+        with patch.dict(os.environ, {"EMBEDDING_CACHE_ENABLED": "true"}), patch.object(
+            self.arch, "DB_PATH", db_path
+        ), patch.object(self.arch, "_resolve_embedding_decision", return_value=dict(TARGET)), patch.object(
+            self.arch, "get_embedding_model", return_value="m"
+        ), patch.object(self.arch, "get_embedding_runtime_policy", return_value="auto"), patch.object(
+            self.arch.requests, "post", side_effect=fake.post
+        ):
+            first = self.arch._get_embedding("  summary one  ")
+            fake.calls.clear()
+            batch = self.arch._get_embeddings_batch(["summary one", "summary two"])
+
+        self.assertEqual(batch[0], first)
+        self.assertEqual(batch[1], _vec("summary two"))
+        embed_calls = [c for c in fake.calls if c[0].endswith("/api/embed")]
+        self.assertEqual(len(embed_calls), 1)
+        self.assertEqual(embed_calls[0][1]["input"], ["summary two"])
+
+
+class TestCrossWriterCacheKey(unittest.TestCase):
+    def setUp(self):
+        import core.lifecycle.archive as arch
+
+        self.arch = arch
+        self.sqlmem = _load_sqlmem_embedding()
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "memory.db")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_key_function_is_identical_in_both_mirrors(self):
+        import embedding_cache as mirror
+        from utils.embedding import cache as core_cache
+
+        for text in ("plain", "  padded \n", "x" * 2500):
+            self.assertEqual(core_cache.cache_key_text(text), mirror.cache_key_text(text))
+            self.assertEqual(core_cache.cache_key_text(text), text.strip())
+        # Archive schickt (und cached) den gekappten Text als Modell-Input.
+        long_text = "  " + "y" * 2500
+        self.assertEqual(self.arch._embedding_input(long_text), "y" * 2000)
+
+    def test_sql_memory_vector_is_reused_by_archive(self):
+        fake = _FakeOllama()
+        env = patch.dict(os.environ, {"EMBEDDING_CACHE_ENABLED": "true"})
+        sqlmem_patches = [
+            patch.object(self.sqlmem, "_EMBED_CACHE_DB_PATH", self.db_path),
+            patch.object(self.sqlmem, "_resolve_embedding_target", return_value=dict(TARGET)),
+            patch.object(self.sqlmem, "_resolve_embedding_model", return_value="m"),
+            patch.object(self.sqlmem, "_canonical_policy", return_value="auto"),
+            patch.object(self.sqlmem, "get_active_embedding_version", return_value="v-shared"),
+            patch.object(self.sqlmem.requests, "post", side_effect=fake.post),
+        ]
+        arch_patches = [
+            patch.object(self.arch, "DB_PATH", self.db_path),
+            patch.object(self.arch, "_get_active_embedding_context", return_value={"embedding_version": "v-shared"}),
+            patch.object(self.arch.requests, "post", side_effect=AssertionError("archive hit the embedder")),
+        ]
+        with env:
+            for p in sqlmem_patches:
+                p.start()
+            try:
+                vec = self.sqlmem.get_embedding("  shared fact \n")
+            finally:
+                for p in reversed(sqlmem_patches):
+                    p.stop()
+            for p in arch_patches:
+                p.start()
+            try:
+                self.assertEqual(self.arch._get_embedding("shared fact"), vec)
+                self.assertEqual(self.arch._get_embeddings_batch(["\tshared fact  "]), [vec])
+            finally:
+                for p in reversed(arch_patches):
+                    p.stop()
+
+
+if __name__ == "__main__":
+    unittest.main()
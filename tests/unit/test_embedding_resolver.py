@@ -25,6 +25,11 @@ import time
 import unittest
 from unittest.mock import patch, MagicMock
 
+import pytest
+
+# Routing-Tests zählen HTTP-Calls: kein Vektor aus dem Cache eines anderen Tests
+pytestmark = pytest.mark.usefixtures("no_embedding_cache")
+
 _HERE = os.path.dirname(os.path.abspath(__file__))
 _REPO_ROOT = os.path.abspath(os.path.join(_HERE, "..", ".."))
 if not os.path.isfile(os.path.join(_REPO_ROOT, "config", "__init__.py")):
@@ -0,0 +1,132 @@
+"""
+Unit Tests: concurrent Layer-0 signal stage (run_tool_selection_stage)
+
+Tests:
+- tool selection, query budget and domain routing overlap (total ≈ max, not sum)
+- the provisional query budget is reconciled with the final tool selection
+- a signal missing the shared deadline falls back to its default; the
+  reconcile step never extends that deadline
+- per-signal timings are reported
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from core.orchestrator_pipeline_stages import run_tool_selection_stage
+
+
+def _orch(select_delay=0.0, budget_delay=0.0, domain_delay=0.0, tools=("run_skill",)):
+    calls = {"budget": [], "domain": []}
+
+    async def _select(user_text, context_summary="", embedding_ctx=None):
+        await asyncio.sleep(select_delay)
+        return list(tools)
+
+    async def _budget(user_text, *, selected_tools=None, tone_signal=None, embedding_ctx=None):
+        calls["budget"].append(selected_tools)
+        await asyncio.sleep(budget_delay)
+        return {"query_type": "action" if selected_tools else "provisional"}
+
+    async def _domain(user_text, *, selected_tools=None, embedding_ctx=None):
+        calls["domain"].append(selected_tools)
+        await asyncio.sleep(domain_delay)
+        return {"domain_tag": "SKILL" if selected_tools else "provisional"}
+
+    orch = SimpleNamespace(
+        tool_selector=SimpleNamespace(select_tools=_select),
+        _filter_tool_selector_candidates=lambda t, _text, forced_mode=None: t,
+        _classify_query_budget_signal=_budget,
+        _classify_domain_signal=_domain,
+    )
+    return orch, calls
+
+
+async def _run(orch, text="starte bitte den skill für mich jetzt", timings=None):
+    return await run_tool_selection_stage(
+        orch, text, SimpleNamespace(messages=[]), None, {}, lambda _m: None,
+        signal_timings=timings,
+    )
+
+
+@pytest.mark.asyncio
+async def test_signals_run_concurrently():
+    orch, _ = _orch(select_delay=0.15, budget_delay=0.15, domain_delay=0.15, tools=())
+    started = time.monotonic()
+    await _run(orch)
+    assert time.monotonic() - started < 0.35
+
+
+@pytest.mark.asyncio
+async def test_provisional_signals_reconciled_with_selection():
+    orch, calls = _orch()
+    timings = {}
+    tools, budget, domain, _ = await _run(orch, timings=timings)
+
+    assert tools == ["run_skill"]
+    assert calls["budget"] == [None, ["run_skill"]]
+    assert calls["domain"] == [None]
+    assert budget == {"query_type": "action"}
+    assert domain == {"domain_tag": "provisional"}
+    assert timings["reconciled"] is True
+    for key in ("tool_selector_ms", "query_budget_ms", "domain_router_ms", "reconcile_ms", "total_ms"):
+        assert timings[key] >= 0.0
+
+
+@pytest.mark.asyncio
+async def test_no_reconcile_without_tools():
+    orch, calls = _orch(tools=())
+    timings = {}
+    tools, budget, _, _ = await _run(orch, text="was denkst du über das wetter heute", timings=timings)
+
+    assert tools == []
+    assert calls["budget"] == [None]
+    assert budget == {"query_type": "provisional"}
+    assert timings["reconciled"] is False
+
+
+@pytest.mark.asyncio
+async def test_deadline_falls_back_to_defaults():
+    orch, _ = _orch(select_delay=5.0, tools=())
+    timings = {}
+    with patch("config.get_layer0_signal_deadline_s", return_value=0.1):
+        started = time.monotonic()
+        tools, budget, _, _ = await _run(orch, text="kurz", timings=timings)
+
+    assert time.monotonic() - started < 1.0
+    assert timings["timed_out"] == ["tool_selector"]
+    # selection missed the deadline -> short-input bypass still applies
+    assert tools == ["request_container", "run_skill", "home_write"]
+    # ... but no time is left to reconcile the budget
+    assert budget == {"query_type": "provisional"}
+    assert timings["reconciled"] is False
+
+
+@pytest.mark.asyncio
+async def test_reconcile_stays_inside_shared_deadline():
+    orch, calls = _orch(budget_delay=0.2)
+    timings = {}
+    with patch("config.get_layer0_signal_deadline_s", return_value=0.3):
+        started = time.monotonic()
+        _, budget, _, _ = await _run(orch, timings=timings)
+
+    assert time.monotonic() - started < 0.38
+    assert calls["budget"] == [None, ["run_skill"]]
+    assert timings["timed_out"] == ["query_budget"]
+    assert budget == {"query_type": "provisional"}
+    assert timings["reconciled"] is False
+
+
+@pytest.mark.asyncio
+async def test_failing_signal_uses_default():
+    orch, _ = _orch(tools=())
+
+    async def _boom(*_a, **_kw):
+        raise RuntimeError("router down")
+
+    orch._classify_domain_signal = _boom
+    _, _, domain, _ = await _run(orch, text="was denkst du über das wetter heute")
+    assert domain == {}
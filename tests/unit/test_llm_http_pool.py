@@ -0,0 +1,142 @@
+"""
+Unit Tests: pooled keep-alive clients in core/llm_provider_client.py
+
+Tests:
+- repeated calls in one loop reuse the client of their (provider, endpoint)
+- per-call timeouts still apply on the shared client
+- HTTP/2 only for https endpoints when h2 is available
+- shutdown hook closes the pool; a new loop gets fresh clients
+- LLM_HTTP_POOL_ENABLE=false keeps the short-lived legacy path
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+import core.llm_provider_client as client
+
+_RealAsyncClient = httpx.AsyncClient
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setenv("LLM_HTTP_POOL_ENABLE", "true")
+    monkeypatch.setattr(client, "_HTTP_POOL", client._LLMHttpPool())
+    created = []
+    seen = []
+
+    def _handler(request):
+        seen.append(request)
+        if request.url.path.endswith("/api/generate"):
+            return httpx.Response(200, json={"response": "ok"})
+        return httpx.Response(200, json={"choices": [{"message": {"content": "oa"}}]})
+
+    def _factory(**kwargs):
+        created.append(dict(kwargs))
+        kwargs.pop("http2", None)
+        kwargs.pop("limits", None)
+        return _RealAsyncClient(transport=httpx.MockTransport(_handler), **kwargs)
+
+    monkeypatch.setattr(client.httpx, "AsyncClient", _factory)
+    return created, seen
+
+
+def _generate(endpoint="http://ollama:11434", timeout_s=7.0):
+    return client.complete_prompt(
+        provider="ollama", model="m", prompt="hi", timeout_s=timeout_s, ollama_endpoint=endpoint,
+    )
+
+
+def test_reuses_client_per_endpoint(pool):
+    created, seen = pool
+
+    async def _run():
+        out = [await _generate(), await _generate(timeout_s=3.0), await _generate("http://other:11434")]
+        return out
+
+    assert asyncio.run(_run()) == ["ok", "ok", "ok"]
+    assert len(created) == 2
+    assert [r.extensions["timeout"]["read"] for r in seen] == [7.0, 3.0, 7.0]
+
+    snap = client.get_http_pool_snapshot()
+    row = snap["ollama@http://ollama:11434"]
+    assert (row["created"], row["requests"], row["reused"], row["in_flight"]) == (1, 2, 1, 0)
+    assert row["http2"] is False
+    assert "ollama@http://other:11434" in snap
+
+
+def test_http2_only_for_https_when_available(pool, monkeypatch):
+    created, _ = pool
+    monkeypatch.setattr(client, "_HTTP2_AVAILABLE", True)
+    monkeypatch.setattr(client, "_resolve_cloud_api_key", _fake_key)
+
+    async def _run():
+        await _generate()
+        await client.complete_prompt(provider="openai", model="gpt", prompt="hi", timeout_s=5)
+
+    asyncio.run(_run())
+    assert [c["http2"] for c in created] == [False, True]
+    assert created[1]["limits"].max_connections == client.get_llm_http_pool_max_connections()
+
+
+async def _fake_key(_provider):
+    return "sk-test"
+
+
+def test_shutdown_closes_and_new_loop_gets_fresh_client(pool):
+    created, _ = pool
+
+    async def _first():
+        await _generate()
+        return await client.aclose_http_pool()
+
+    assert asyncio.run(_first()) == 1
+    assert client.get_http_pool_snapshot()["ollama@http://ollama:11434"]["open_clients"] == 0
+
+    asyncio.run(_generate())  # loop 2
+    asyncio.run(_generate())  # loop 3: client of dead loop 2 is dropped
+    row = client.get_http_pool_snapshot()["ollama@http://ollama:11434"]
+    assert len(created) == 3
+    assert row["open_clients"] == 1
+    assert row["closed"] == 2
+
+
+def test_disabled_pool_uses_short_lived_clients(pool, monkeypatch):
+    created, _ = pool
+    monkeypatch.setenv("LLM_HTTP_POOL_ENABLE", "false")
+
+    async def _run():
+        await _generate()
+        await _generate()
+
+    asyncio.run(_run())
+    assert [c.get("timeout") for c in created] == [7.0, 7.0]
+    assert client.get_http_pool_snapshot() == {}
+
+
+def test_stream_prompt_through_pool(pool, monkeypatch):
+    created, _ = pool
+    lines = "\n".join(json.dumps(x) for x in ({"response": "a"}, {"response": "b", "done": True}))
+
+    def _stream_handler(request):
+        return httpx.Response(200, text=lines)
+
+    def _factory(**kwargs):
+        created.append(kwargs)
+        return _RealAsyncClient(transport=httpx.MockTransport(_stream_handler))
+
+    monkeypatch.setattr(client.httpx, "AsyncClient", _factory)
+
+    async def _run():
+        chunks = []
+        for _ in range(2):
+            async for chunk in client.stream_prompt(
+                provider="ollama", model="m", prompt="hi", ollama_endpoint="http://ollama:11434",
+            ):
+                chunks.append(chunk)
+        return chunks
+
+    assert asyncio.run(_run()) == ["a", "b", "a", "b"]
+    assert len(created) == 1
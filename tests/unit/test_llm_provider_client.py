@@ -218,11 +218,12 @@ class TestLLMProviderClient(unittest.TestCase):
             async def __aexit__(self, exc_type, exc, tb):
                 return False
 
-            def stream(self, method, url, json=None, headers=None):
+            def stream(self, method, url, json=None, headers=None, timeout=None):
                 called["method"] = method
                 called["url"] = url
                 called["json"] = json or {}
                 called["headers"] = headers or {}
+                called["timeout"] = timeout
                 return _Resp()
 
         with patch.object(client, "_resolve_cloud_api_key", return_value="x"), \
@@ -241,6 +242,7 @@ class TestLLMProviderClient(unittest.TestCase):
 
         self.assertEqual(out, "ok-cloud")
         self.assertEqual(called["url"], "https://ollama.example/api/chat")
+        self.assertEqual(called["timeout"], 5)  # gepoolter Client: Timeout pro Request
         self.assertIn("messages", called["json"])
         self.assertNotIn("prompt", called["json"])
 
@@ -271,7 +273,7 @@ class TestLLMProviderClient(unittest.TestCase):
             async def __aexit__(self, exc_type, exc, tb):
                 return False
 
-            def stream(self, method, url, json=None, headers=None):
+            def stream(self, method, url, json=None, headers=None, timeout=None):
                 called["method"] = method
                 called["url"] = url
                 called["json"] = json or {}
@@ -331,7 +333,7 @@ class TestLLMProviderClient(unittest.TestCase):
             async def __aexit__(self, exc_type, exc, tb):
                 return False
 
-            def stream(self, method, url, json=None, headers=None):
+            def stream(self, method, url, json=None, headers=None, timeout=None):
                 payload = json or {}
                 calls.append(str(payload.get("model") or ""))
                 status = 404 if payload.get("model") == "gpt-4.1" else 200
@@ -375,13 +377,15 @@ class TestLLMProviderClient(unittest.TestCase):
                 return self._payload
 
         class _Client:
+            is_closed = False  # Pool nutzt den Client fuer den Fallback-Call erneut
+
             async def __aenter__(self):
                 return self
 
             async def __aexit__(self, exc_type, exc, tb):
                 return False
 
-            async def post(self, url, json=None, headers=None):
+            async def post(self, url, json=None, headers=None, timeout=None):
                 payload = json or {}
                 model = str(payload.get("model") or "")
                 calls.append(model)
@@ -440,13 +444,15 @@ class TestLLMProviderClient(unittest.TestCase):
                 yield '{"message":{"content":"stream"},"done":true}'
 
         class _Client:
+            is_closed = False  # Pool nutzt den Client fuer den Fallback-Call erneut
+
             async def __aenter__(self):
                 return self
 
             async def __aexit__(self, exc_type, exc, tb):
                 return False
 
-            def stream(self, method, url, json=None, headers=None):
+            def stream(self, method, url, json=None, headers=None, timeout=None):
                 payload = json or {}
                 model = str(payload.get("model") or "")
                 calls.append(model)
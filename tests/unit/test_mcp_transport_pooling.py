@@ -0,0 +1,228 @@
+"""
+Unit Tests: pooled MCP HTTP/SSE transports and native async hub calls
+
+Tests:
+- HTTPTransport.call_tool_async reuses one httpx client per loop (format
+  detection + streamable session handshake included)
+- sync path goes through the pooled requests.Session, not requests.post
+- SSETransport.call_tool_async collects the SSE result
+- MCPHub.call_tool_async awaits native transports without thread offload,
+  falls back to the worker thread for sync-only transports
+- per-MCP latency histograms in list_mcps()
+"""
+
+import asyncio
+import json
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+
+import mcp.transports.pool as pool_mod
+from mcp.hub import MCPHub
+from mcp.latency import LatencyHistogram
+from mcp.transports.http import HTTPTransport
+from mcp.transports.sse import SSETransport
+
+_RealAsyncClient = httpx.AsyncClient
+
+
+def _patch_async_client(monkeypatch, handler):
+    created = []
+
+    def _factory(**kwargs):
+        created.append(kwargs)
+        return _RealAsyncClient(transport=httpx.MockTransport(handler), timeout=kwargs.get("timeout"))
+
+    monkeypatch.setattr(pool_mod.httpx, "AsyncClient", _factory)
+    return created
+
+
+def _tool_result(payload):
+    return {"content": [{"type": "text", "text": json.dumps(payload)}]}
+
+
+def test_http_async_reuses_pooled_client(monkeypatch):
+    seen = []
+
+    def _handler(request):
+        body = json.loads(request.content)
+        seen.append(body["method"])
+        if body["method"] == "tools/list":
+            return httpx.Response(200, json={"result": {"tools": []}})
+        return httpx.Response(200, json={"result": _tool_result({"ok": body["params"]["name"]})})
+
+    created = _patch_async_client(monkeypatch, _handler)
+    transport = HTTPTransport("http://mcp.local/mcp")
+
+    async def _run():
+        return await asyncio.gather(
+            transport.call_tool_async("a", {}),
+            transport.call_tool_async("b", {}),
+        )
+
+    with patch("mcp.transports.http.requests.post", side_effect=AssertionError("no sync I/O")):
+        results = asyncio.run(_run())
+
+    assert results == [{"ok": "a"}, {"ok": "b"}]
+    assert transport.get_format() == HTTPTransport.FORMAT_JSON
+    assert seen.count("tools/call") == 2
+    assert len(created) == 1
+
+
+def test_http_async_streamable_session_handshake(monkeypatch):
+    headers_seen = []
+
+    def _handler(request):
+        body = json.loads(request.content)
+        if body["method"] == "tools/list" and "mcp-session-id" not in request.headers:
+            return httpx.Response(400, json={"error": {"message": "Bad Request: Missing session ID"}})
+        if body["method"] == "initialize":
+            return httpx.Response(200, json={"result": {}}, headers={"Mcp-Session-Id": "sess-1234567"})
+        headers_seen.append(request.headers.get("mcp-session-id"))
+        sse = "event: message\ndata: " + json.dumps({"result": _tool_result({"v": 1})}) + "\n\n"
+        return httpx.Response(200, text=sse, headers={"Content-Type": "text/event-stream"})
+
+    _patch_async_client(monkeypatch, _handler)
+    transport = HTTPTransport("http://mcp.local/mcp")
+
+    assert asyncio.run(transport.call_tool_async("t", {})) == {"v": 1}
+    assert transport.get_format() == HTTPTransport.FORMAT_STREAMABLE
+    assert headers_seen == ["sess-1234567"]
+
+
+class _SyncResp:
+    def __init__(self, payload):
+        self.status_code = 200
+        self.headers = {"Content-Type": "application/json"}
+        self._payload = payload
+        self.closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.closed = True
+
+    def json(self):
+        return self._payload
+
+    def raise_for_status(self):
+        return None
+
+
+def test_http_sync_uses_pooled_session(monkeypatch):
+    monkeypatch.setenv("MCP_HTTP_POOL_MAXSIZE", "7")
+    transport = HTTPTransport("http://mcp.local/mcp")
+    adapter = transport._http.get_adapter("http://mcp.local/mcp")
+    assert adapter._pool_maxsize == 7
+
+    calls = []
+    probes = []
+
+    def _post(url, json=None, **kwargs):
+        calls.append(json["method"])
+        if json["method"] == "tools/list":
+            probes.append(_SyncResp({"result": {"tools": []}}))
+            return probes[-1]
+        return _SyncResp({"result": _tool_result({"sync": True})})
+
+    with patch.object(transport._http, "post", side_effect=_post), \
+         patch("mcp.transports.http.requests.post", side_effect=AssertionError("unpooled")):
+        assert transport.call_tool("t", {}) == {"sync": True}
+        assert transport.call_tool("t", {}) == {"sync": True}
+    assert calls == ["tools/list", "tools/call", "tools/call"]
+    # Format-Probe läuft mit stream=True → Verbindung muss zurück in den Pool
+    assert transport._format == HTTPTransport.FORMAT_JSON
+    assert [p.closed for p in probes] == [True]
+
+
+def test_sse_async_collects_result(monkeypatch):
+    def _handler(request):
+        events = [
+            {"jsonrpc": "2.0", "method": "progress"},
+            {"result": _tool_result({"done": True})},
+        ]
+        text = "".join(f"data: {json.dumps(e)}\n\n" for e in events)
+        return httpx.Response(200, text=text, headers={"Content-Type": "text/event-stream"})
+
+    created = _patch_async_client(monkeypatch, _handler)
+    transport = SSETransport("http://mcp.local/sse")
+
+    async def _run():
+        return [await transport.call_tool_async("t", {}) for _ in range(3)]
+
+    assert asyncio.run(_run()) == [{"done": True}] * 3
+    assert len(created) == 1
+
+
+class _NativeTransport:
+    def __init__(self, result, delay=0.0):
+        self.result = result
+        self.delay = delay
+
+    async def call_tool_async(self, tool_name, arguments):
+        await asyncio.sleep(self.delay)
+        return self.result
+
+    def call_tool(self, tool_name, arguments):
+        raise AssertionError("sync path must not be used")
+
+    def health_check(self):
+        return True
+
+    def get_format(self):
+        return "json"
+
+
+def _hub_with(transports, tools):
+    hub = MCPHub()
+    hub._initialized = True
+    hub._transports = transports
+    hub._tools_cache = tools
+    return hub
+
+
+def test_hub_async_native_path_records_latency():
+    from mcp_registry import MCPS
+
+    mcp_name = next(iter(MCPS))
+    hub = _hub_with({mcp_name: _NativeTransport({"ok": True}, delay=0.01)}, {"tool_x": mcp_name})
+
+    async def _run():
+        return await asyncio.gather(*(hub.call_tool_async("tool_x", {}) for _ in range(4)))
+
+    with patch("mcp.hub.asyncio.to_thread", side_effect=AssertionError("no thread offload")):
+        results = asyncio.run(_run())
+
+    assert results == [{"ok": True}] * 4
+    row = next(r for r in hub.list_mcps() if r["name"] == mcp_name)
+    assert row["latency"]["count"] == 4
+    assert row["latency"]["errors"] == 0
+    assert row["latency"]["p95_ms"] >= 10
+
+
+def test_hub_async_falls_back_to_thread_for_sync_transports():
+    sync_transport = MagicMock()
+    sync_transport.call_tool.return_value = {"error": "boom"}
+    hub = _hub_with({"legacy": sync_transport}, {"tool_y": "legacy"})
+
+    assert asyncio.run(hub.call_tool_async("tool_y", {"a": 1})) == {"error": "boom"}
+    sync_transport.call_tool.assert_called_once_with("tool_y", {"a": 1})
+    assert hub.get_latency_stats()["legacy"]["errors"] == 1
+
+
+def test_latency_histogram_percentiles():
+    hist = LatencyHistogram()
+    for ms in [3] * 90 + [40] * 9 + [70000]:
+        hist.observe(ms)
+    snap = hist.snapshot()
+    assert snap["count"] == 100
+    assert snap["p50_ms"] == 5.0
+    assert snap["p95_ms"] == 50.0
+    assert snap["p99_ms"] == 50.0
+    assert snap["max_ms"] == 70000.0
+    assert snap["buckets"]["le_inf"] == 1
@@ -0,0 +1,189 @@
+"""
+Unit Tests: process-wide memory retrieval cache
+
+Tests:
+- repeated lookups across requests reuse backend results
+- memory writes through MCPHub bump the version and invalidate entries
+- results read before a concurrent write are not stored
+- TTL / LRU bounds and hit-rate metrics
+- failing backends and empty results are not cached
+"""
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+import core.memory_retrieval_cache as mrc
+from core.context_manager import ContextManager
+
+
+@pytest.fixture
+def shared_cache(monkeypatch):
+    monkeypatch.setenv("MEMORY_RETRIEVAL_CACHE_ENABLE", "true")
+    monkeypatch.setattr(mrc, "_cache", None)
+    monkeypatch.setattr(mrc, "_cache_cfg", None)
+    cache = mrc.get_memory_retrieval_cache()
+    assert cache is not None
+    return cache
+
+
+@pytest.fixture
+def backends():
+    with patch("core.context_manager.get_fact_for_query", return_value="fact value") as fact, \
+         patch("core.context_manager.graph_search", return_value=[{"content": "graph node"}]) as graph, \
+         patch("core.context_manager.semantic_search", return_value=[{"content": "hit"}]) as semantic, \
+         patch("core.context_manager.search_memory_fallback", return_value="fallback text") as fallback:
+        yield fact, graph, semantic, fallback
+
+
+def _calls(mocks):
+    return tuple(m.call_count for m in mocks)
+
+
+def _search(cm, key="k1", conv="conv"):
+    return cm._search_memory_multi_context(key=key, conversation_id=conv, include_system=False)
+
+
+class TestSharedRetrievalCache:
+
+    def test_reuses_results_across_requests(self, shared_cache, backends):
+        cm = ContextManager()
+        content_1, found_1 = _search(cm)
+        after_first = _calls(backends)
+
+        content_2, found_2 = _search(cm)
+
+        assert (content_1, found_1) == (content_2, found_2)
+        assert "fact value" in content_2
+        assert _calls(backends) == after_first
+        stats = shared_cache.get_stats()
+        assert stats["hits"] == 4
+        assert stats["hit_rate"] == 0.5
+
+    def test_key_includes_conversation(self, shared_cache, backends):
+        cm = ContextManager()
+        _search(cm, conv="a")
+        after_first = _calls(backends)
+        _search(cm, conv="b")
+        assert all(now > before for now, before in zip(_calls(backends), after_first))
+
+    def test_memory_write_via_hub_invalidates(self, shared_cache, backends):
+        from mcp.hub import MCPHub
+
+        cm = ContextManager()
+        _search(cm)
+        after_first = _calls(backends)
+
+        hub = MCPHub()
+        hub.initialize = MagicMock()
+        transport = MagicMock()
+        transport.call_tool.return_value = {"ok": True}
+        hub._tools_cache = {"memory_fact_save": "sql-memory", "memory_recent": "sql-memory"}
+        hub._transports = {"sql-memory": transport}
+
+        hub.call_tool("memory_recent", {})
+        _search(cm)
+        assert _calls(backends) == after_first
+
+        hub.call_tool("memory_fact_save", {"key": "k1", "value": "v"})
+        _search(cm)
+        assert all(now > before for now, before in zip(_calls(backends), after_first))
+        assert shared_cache.get_stats()["stale"] >= 1
+
+    def test_fast_lane_memory_save_invalidates(self, shared_cache, backends):
+        from mcp.hub import MCPHub
+
+        cm = ContextManager()
+        _search(cm)
+        after_first = _calls(backends)
+
+        hub = MCPHub()
+        hub.initialize = MagicMock()
+        hub._tool_definitions = {"memory_save": {"name": "memory_save", "execution": "direct"}}
+        executor = MagicMock()
+        executor.execute.return_value = {"ok": True}
+        with patch("core.tools.fast_lane.executor.FastLaneExecutor", return_value=executor):
+            hub.call_tool("memory_save", {"conversation_id": "conv", "content": "x"})
+
+        executor.execute.assert_called_once()
+        _search(cm)
+        assert all(now > before for now, before in zip(_calls(backends), after_first))
+
+    def test_system_fact_save_invalidates(self, shared_cache):
+        from mcp.hub import MCPHub
+
+        version = mrc.get_memory_version()
+        MCPHub()._save_system_fact(MagicMock(), "tool_x", "desc")
+        assert mrc.get_memory_version() == version + 1
+
+    def test_failed_backend_is_not_cached(self, shared_cache, backends):
+        fact, graph, semantic, _ = backends
+        fact.return_value = None
+        graph.return_value = []
+        semantic.side_effect = RuntimeError("down")
+        cm = ContextManager()
+        _search(cm)
+
+        semantic.side_effect = None
+        content, found = _search(cm)
+
+        assert found is True
+        assert "hit" in content
+
+    def test_empty_results_are_not_shared(self, shared_cache, backends):
+        # Hub-Timeouts kommen als None/""/[] ohne Exception zurück
+        for mock, empty in zip(backends, (None, [], [], "")):
+            mock.return_value = empty
+        cm = ContextManager()
+        _search(cm)
+        after_first = _calls(backends)
+
+        _search(cm)
+
+        assert all(now == 2 * before for now, before in zip(_calls(backends), after_first))
+        assert shared_cache.get_stats()["stores"] == 0
+
+
+class TestMemoryRetrievalCacheUnit:
+
+    def test_put_skips_result_read_before_write(self):
+        cache = mrc.MemoryRetrievalCache(ttl_s=60, max_entries=16)
+        key = cache.make_key("conv", "fact", "k")
+        version = mrc.get_memory_version()
+        mrc.bump_memory_version()
+
+        assert cache.put(key, "old", version=version) is False
+        assert cache.get(key) == (False, None)
+
+    def test_ttl_expiry(self):
+        cache = mrc.MemoryRetrievalCache(ttl_s=5, max_entries=16)
+        key = cache.make_key("conv", "fact", "k")
+        with patch.object(mrc.time, "monotonic", return_value=100.0):
+            cache.put(key, "v", version=mrc.get_memory_version())
+        with patch.object(mrc.time, "monotonic", return_value=103.0):
+            assert cache.get(key) == (True, "v")
+        with patch.object(mrc.time, "monotonic", return_value=106.0):
+            assert cache.get(key) == (False, None)
+
+    def test_lru_eviction(self):
+        cache = mrc.MemoryRetrievalCache(ttl_s=60, max_entries=16)
+        version = mrc.get_memory_version()
+        for i in range(16):
+            cache.put(cache.make_key("c", "fact", str(i)), i, version=version)
+        cache.get(cache.make_key("c", "fact", "0"))
+        cache.put(cache.make_key("c", "fact", "new"), "n", version=version)
+
+        assert cache.get(cache.make_key("c", "fact", "0")) == (True, 0)
+        assert cache.get(cache.make_key("c", "fact", "1")) == (False, None)
+        assert cache.get_stats()["evictions"] == 1
+
+    def test_enabled_by_default(self, monkeypatch):
+        monkeypatch.delenv("MEMORY_RETRIEVAL_CACHE_ENABLE", raising=False)
+        monkeypatch.setattr(mrc, "_cache", None)
+        monkeypatch.setattr(mrc, "_cache_cfg", None)
+        assert mrc.get_memory_retrieval_cache() is not None
+
+    def test_disabled_returns_none(self, monkeypatch):
+        monkeypatch.setenv("MEMORY_RETRIEVAL_CACHE_ENABLE", "false")
+        assert mrc.get_memory_retrieval_cache() is None
+        assert mrc.get_memory_retrieval_cache_stats() is None
@@ -0,0 +1,169 @@
+"""
+Unit Tests: shared prototype registry (core/prototype_registry.py)
+
+Tests:
+- all classifiers' prototypes are embedded in one batched request
+- matrix scoring equals plain cosine similarity (NumPy and fallback)
+- vectors persist per embedding model; a cold start skips re-embedding
+- per-text fallback when the batch API is unavailable
+- an edited prototype text is re-embedded alone
+"""
+
+import math
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+import core.prototype_registry as pr
+
+
+def _vec_for(text):
+    # deterministic pseudo-embedding
+    return [float(len(text) % 7 + 1), float(sum(map(ord, text)) % 11), 1.0]
+
+
+def _batch_mock():
+    async def _batch(texts, timeout_s=10.0):
+        return [_vec_for(t) for t in texts]
+
+    return AsyncMock(side_effect=_batch)
+
+
+def _cos(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    return dot / (math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b)))
+
+
+@pytest.fixture
+def model():
+    with patch.object(pr, "get_embedding_model", return_value="embed-a") as m, \
+         patch.object(pr, "get_embedding_runtime_policy", return_value="auto"):
+        yield m
+
+
+@pytest.fixture
+def shared_registry(tmp_path, monkeypatch, model):
+    path = str(tmp_path / "protos.json")
+    monkeypatch.setattr(pr, "get_embedding_prototype_cache_path", lambda: path)
+    monkeypatch.setattr(pr, "_registry", None)
+    return pr.get_prototype_registry()
+
+
+@pytest.mark.asyncio
+async def test_all_classifiers_share_one_batched_request(shared_registry):
+    from core.domain_router_hybrid import DomainRouterHybridClassifier
+    from core.query_budget_hybrid import QueryBudgetHybridClassifier
+    from core.tone_hybrid import ToneHybridClassifier
+
+    tone = ToneHybridClassifier()
+    budget = QueryBudgetHybridClassifier()
+    domain = DomainRouterHybridClassifier()
+    # registration happens lazily; register all first, as on a warm process
+    shared_registry.register("tone", tone._TONE_PROTOTYPES)
+    shared_registry.register("act", tone._ACT_PROTOTYPES)
+    shared_registry.register("query_budget", budget._QUERY_PROTOTYPES)
+    shared_registry.register("domain", domain._PROTOTYPES)
+
+    batch = _batch_mock()
+    single = AsyncMock(side_effect=AssertionError("no per-text calls"))
+    with patch.object(pr, "fetch_embeddings_batch", batch), \
+         patch.object(tone, "_embed_text", single), \
+         patch.object(budget, "_embed_text", single), \
+         patch.object(domain, "_embed", single):
+        assert await tone._ensure_prototype_vectors()
+        assert await budget._ensure_prototype_vectors()
+        assert await domain._ensure_prototypes()
+
+    assert batch.await_count == 1
+    sent = batch.await_args.args[0]
+    expected = (
+        set(tone._TONE_PROTOTYPES.values()) | set(tone._ACT_PROTOTYPES.values())
+        | set(budget._QUERY_PROTOTYPES.values()) | set(domain._PROTOTYPES.values())
+    )
+    assert set(sent) == expected
+    assert shared_registry.get_stats()["namespaces"] == {
+        "tone": 3, "act": 6, "query_budget": 4, "domain": 4,
+    }
+
+
+@pytest.mark.asyncio
+async def test_matrix_scores_match_cosine(model):
+    protos = {"a": "alpha", "b": "beta gamma", "c": "delta"}
+    query = [0.3, -1.2, 2.0]
+
+    reg = pr.PrototypeRegistry("")
+    reg.register("ns", protos)
+    with patch.object(pr, "fetch_embeddings_batch", _batch_mock()):
+        matrix = await reg.ensure("ns", AsyncMock())
+    with_np = matrix.scores(query)
+
+    for label, text in protos.items():
+        assert with_np[label] == pytest.approx(_cos(query, _vec_for(text)))
+
+    with patch.object(pr, "_np", None):
+        fallback = pr.PrototypeMatrix(matrix.labels, [pr._unit(_vec_for(protos[l])) for l in matrix.labels])
+        assert fallback.scores(query) == pytest.approx(with_np)
+    assert matrix.scores([1.0, 2.0]) == {}
+
+
+@pytest.mark.asyncio
+async def test_persisted_vectors_skip_reembedding_per_model(tmp_path, model):
+    path = str(tmp_path / "protos.json")
+    protos = {"a": "alpha", "b": "beta"}
+
+    first = pr.PrototypeRegistry(path)
+    first.register("ns", protos)
+    with patch.object(pr, "fetch_embeddings_batch", _batch_mock()):
+        assert await first.ensure("ns", AsyncMock()) is not None
+
+    cold = pr.PrototypeRegistry(path)
+    cold.register("ns", protos)
+    untouched = AsyncMock(side_effect=AssertionError("must load from disk"))
+    with patch.object(pr, "fetch_embeddings_batch", untouched):
+        matrix = await cold.ensure("ns", untouched)
+    assert matrix is not None and set(matrix.labels) == {"a", "b"}
+    assert cold.get_stats()["disk_loaded"] == 2
+
+    model.return_value = "embed-b"
+    batch = _batch_mock()
+    with patch.object(pr, "fetch_embeddings_batch", batch):
+        await cold.ensure("ns", AsyncMock())
+    assert batch.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_falls_back_to_per_text_embedding(model):
+    reg = pr.PrototypeRegistry("")
+    reg.register("ns", {"a": "alpha", "b": "beta"})
+    single = AsyncMock(side_effect=lambda t: _vec_for(t))
+    with patch.object(pr, "fetch_embeddings_batch", AsyncMock(return_value=None)):
+        matrix = await reg.ensure("ns", single)
+    assert single.await_count == 2
+    assert set(matrix.labels) == {"a", "b"}
+
+
+@pytest.mark.asyncio
+async def test_edited_prototype_reembeds_only_changed_text(model):
+    reg = pr.PrototypeRegistry("")
+    reg.register("ns", {"a": "alpha", "b": "beta"})
+    with patch.object(pr, "fetch_embeddings_batch", _batch_mock()):
+        await reg.ensure("ns", AsyncMock())
+
+    reg.register("ns", {"a": "alpha", "b": "beta v2"})
+    batch = _batch_mock()
+    with patch.object(pr, "fetch_embeddings_batch", batch):
+        matrix = await reg.ensure("ns", AsyncMock())
+    assert batch.await_args.args[0] == ["beta v2"]
+    assert matrix.scores(_vec_for("beta v2"))["b"] == pytest.approx(1.0)
+
+
+@pytest.mark.asyncio
+async def test_failed_embedding_backs_off(model):
+    reg = pr.PrototypeRegistry("")
+    reg.register("ns", {"a": "alpha"})
+    batch = AsyncMock(return_value=None)
+    single = AsyncMock(return_value=None)
+    with patch.object(pr, "fetch_embeddings_batch", batch):
+        assert await reg.ensure("ns", single) is None
+        assert await reg.ensure("ns", single) is None
+    assert batch.await_count == 1
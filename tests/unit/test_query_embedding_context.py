@@ -0,0 +1,174 @@
+"""
+Unit Tests: per-turn shared query embedding (core/query_embedding_context.py)
+
+Tests:
+- one fetch per distinct text, concurrent callers share the in-flight request
+- tone / query-budget / domain classifiers reuse the turn's embedding
+- ToolSelector forwards the shared vector to memory_semantic_search
+- run_tool_selection_stage logs the saved calls
+"""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from core.query_embedding_context import QueryEmbeddingContext
+
+
+def _counting_fetch(vec=(0.1, 0.2, 0.3), delay=0.0):
+    calls = []
+
+    async def _fetch(text):
+        calls.append(text)
+        if delay:
+            await asyncio.sleep(delay)
+        return list(vec)
+
+    return _fetch, calls
+
+
+@pytest.mark.asyncio
+async def test_embeds_each_text_once_and_reports_saved():
+    ctx = QueryEmbeddingContext()
+    fetch, calls = _counting_fetch(delay=0.01)
+
+    results = await asyncio.gather(
+        ctx.embed("hallo welt", fetch),
+        ctx.embed(" hallo welt ", fetch),
+        ctx.embed("hallo welt", fetch),
+        ctx.embed("anderer text", fetch),
+    )
+
+    assert all(r == [0.1, 0.2, 0.3] for r in results)
+    assert calls == ["hallo welt", "anderer text"]
+    assert ctx.get_stats() == {"requests": 4, "computed": 2, "saved": 2, "texts": 2}
+
+
+@pytest.mark.asyncio
+async def test_failed_fetch_is_shared_not_retried():
+    ctx = QueryEmbeddingContext()
+    calls = []
+
+    async def _fail(text):
+        calls.append(text)
+        raise RuntimeError("embedding host down")
+
+    assert await ctx.embed("x", _fail) is None
+    assert await ctx.embed("x", _fail) is None
+    assert calls == ["x"]
+
+
+@pytest.mark.asyncio
+async def test_hybrid_classifiers_share_one_embedding():
+    from core.domain_router_hybrid import DomainRouterHybridClassifier
+    from core.query_budget_hybrid import QueryBudgetHybridClassifier
+    from core.tone_hybrid import ToneHybridClassifier
+
+    ctx = QueryEmbeddingContext()
+    text = "hmm ok und was meinst du dazu eigentlich"
+    fetch, calls = _counting_fetch()
+
+    tone = ToneHybridClassifier()
+    budget = QueryBudgetHybridClassifier()
+    domain = DomainRouterHybridClassifier()
+    proto = AsyncMock(return_value=True)
+
+    with patch.object(tone, "_embed_text", side_effect=fetch), \
+         patch.object(tone, "_ensure_prototype_vectors", proto):
+        await tone._embedding_classify(text, ctx)
+    with patch.object(budget, "_embed_text", side_effect=fetch), \
+         patch.object(budget, "_ensure_prototype_vectors", proto), \
+         patch("core.query_budget_hybrid.get_query_budget_embedding_enable", return_value=True):
+        await budget._embedding_refine(text, ctx)
+    with patch.object(domain, "_embed", side_effect=fetch):
+        assert await domain._embed_query(text, ctx) == [0.1, 0.2, 0.3]
+
+    assert calls == [text]
+    assert ctx.saved == 2
+
+
+@pytest.mark.asyncio
+async def test_tool_selector_forwards_shared_vector():
+    from core.tool_selector import ToolSelector
+
+    class _Hub:
+        def __init__(self):
+            self.args = None
+
+        def get_mcp_for_tool(self, name):
+            return "sql-memory" if name == "memory_semantic_search" else None
+
+        async def call_tool_async(self, _name, args):
+            self.args = args
+            return {"results": [{"metadata": {"key": "tool_run_skill"}}]}
+
+    hub = _Hub()
+    ctx = QueryEmbeddingContext()
+    with patch("core.tool_selector.get_hub", return_value=hub), \
+         patch("core.tool_selector.ENABLE_TOOL_SELECTOR", True), \
+         patch("core.tool_selector.fetch_query_embedding", AsyncMock(return_value=[0.5, 0.5])), \
+         patch("core.tool_selector.get_embedding_model", return_value="embed-model"):
+        selector = ToolSelector()
+        out = await selector.select_tools("bitte führe den skill jetzt aus", embedding_ctx=ctx)
+        # a classifier asking for the same text afterwards gets it for free
+        again = await ctx.embed("bitte führe den skill jetzt aus", AsyncMock(return_value=None))
+
+    assert out == ["run_skill"]
+    assert hub.args["query_embedding"] == [0.5, 0.5]
+    assert hub.args["query_embedding_model"] == "embed-model"
+    assert again == [0.5, 0.5]
+    assert ctx.saved == 1
+
+
+@pytest.mark.asyncio
+async def test_tool_selection_stage_threads_context_and_logs_savings():
+    from core.orchestrator_pipeline_stages import run_tool_selection_stage
+
+    ctx = QueryEmbeddingContext()
+    orch = SimpleNamespace(
+        tool_selector=SimpleNamespace(select_tools=AsyncMock(return_value=["run_skill"])),
+        _filter_tool_selector_candidates=lambda tools, _text, forced_mode=None: tools,
+        _classify_query_budget_signal=AsyncMock(return_value={}),
+        _classify_domain_signal=AsyncMock(return_value={}),
+    )
+    logs = []
+
+    await run_tool_selection_stage(
+        orch, "starte bitte den skill für mich", SimpleNamespace(messages=[]), None, {}, logs.append,
+        embedding_ctx=ctx,
+    )
+
+    assert orch.tool_selector.select_tools.await_args.kwargs["embedding_ctx"] is ctx
+    assert orch._classify_query_budget_signal.await_args.kwargs["embedding_ctx"] is ctx
+    assert orch._classify_domain_signal.await_args.kwargs["embedding_ctx"] is ctx
+    assert any("query_embeddings requests=0 computed=0 saved=0" in line for line in logs)
+
+
+def test_vector_store_search_uses_forwarded_query_embedding(tmp_path):
+    import importlib
+    import json
+    import os
+    import sqlite3
+    import sys
+
+    sql_memory = os.path.join(os.path.dirname(__file__), "..", "..", "sql-memory")
+    if sql_memory not in sys.path:
+        sys.path.insert(0, sql_memory)
+    vector_store = importlib.import_module("vector_store")
+    vs = vector_store.VectorStore(str(tmp_path / "memory.db"))
+    conn = sqlite3.connect(str(tmp_path / "memory.db"))
+    conn.execute(
+        "INSERT INTO embeddings (conversation_id, content, content_type, metadata, embedding, "
+        "embedding_model, embedding_dim, embedding_version) VALUES ('c1', 'row', 'fact', '{}', ?, 'm', 2, 'v')",
+        (json.dumps([1.0, 0.0]),),
+    )
+    conn.commit()
+    conn.close()
+
+    with patch.object(vector_store, "get_embedding", side_effect=AssertionError("must not embed")), \
+         patch.object(vector_store, "get_active_embedding_version", return_value="v"):
+        rows = vs.search("query", conversation_id="c1", min_similarity=0.0, query_embedding=[1.0, 0.0])
+
+    assert [r["content"] for r in rows] == ["row"]
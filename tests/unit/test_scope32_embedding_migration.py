@@ -120,7 +120,7 @@ class TestScope32VectorStore(unittest.TestCase):
             "runtime_policy": "auto",
         }
         with patch.object(self.vector_store, "get_active_embedding_version", return_value="v-new"), patch.object(
-            self.vector_store, "get_embedding_with_metadata", return_value=emb_payload
+            self.vector_store, "get_embeddings_batch_with_metadata", return_value=[emb_payload]
         ):
             result = self.vs.backfill_embeddings(batch_size=10)
 
@@ -136,7 +136,10 @@ class TestScope32VectorStore(unittest.TestCase):
             self.assertEqual(row[0], "new-model")
             self.assertEqual(row[1], 3)
             self.assertEqual(row[2], "v-new")
-            self.assertEqual(json.loads(row[3]), [0.3, 0.4, 0.5])
+            vector_math = importlib.import_module("vector_math")
+            self.assertIsInstance(row[3], bytes)
+            for got, want in zip(vector_math.unpack_embedding(row[3]), [0.3, 0.4, 0.5]):
+                self.assertAlmostEqual(got, want, places=6)
         finally:
             conn.close()
 
@@ -227,7 +230,7 @@ class TestScope32ArchiveManager(unittest.TestCase):
         finally:
             conn.close()
 
-        with patch.object(self.archive_mod, "_get_embedding", return_value=[0.9, 0.8, 0.7]), patch.object(
+        with patch.object(self.archive_mod, "_get_embeddings_batch", return_value=[[0.9, 0.8, 0.7]]), patch.object(
             self.archive_mod, "get_embedding_model", return_value="new-model"
         ), patch.object(self.archive_mod, "get_embedding_runtime_policy", return_value="auto"):
             mgr = self.archive_mod.TaskArchiveManager()
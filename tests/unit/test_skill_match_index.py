@@ -0,0 +1,199 @@
+"""
+Unit Tests: indexed skill matching in SkillMiniControl (mini_control_core.py)
+
+Tests:
+  1. BM25 ranking over name/trigger/description, prefix terms still match
+  2. sync() re-indexes only changed skills and is a no-op for unchanged sources
+  3. installed.json / draft manifests are cached and reloaded on change
+  4. lookup with thousands of installed + draft skills stays sub-millisecond
+  5. infix/suffix and 3-char substring hits are found like the legacy scan
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import json
+import os
+import statistics
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_REPO_ROOT = os.path.abspath(os.path.join(_HERE, "..", ".."))
+_SKILL_SERVER = os.path.join(_REPO_ROOT, "mcp-servers", "skill-server")
+
+
+def _load_core():
+    sys_mocks = {
+        "skill_cim_light": MagicMock(
+            SkillCIMLight=MagicMock,
+            ValidationResult=MagicMock,
+            get_skill_cim=MagicMock(return_value=MagicMock()),
+        ),
+        "cim_rag": MagicMock(),
+        "httpx": MagicMock(),
+    }
+    with patch.dict(sys.modules, sys_mocks):
+        spec = importlib.util.spec_from_file_location(
+            "skill_server_mini_control_core_index",
+            os.path.join(_SKILL_SERVER, "mini_control_core.py"),
+        )
+        mod = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(mod)
+    return mod
+
+
+@pytest.fixture(scope="module")
+def core():
+    return _load_core()
+
+
+def _ctrl(core, skills_dir):
+    ctrl = core.SkillMiniControl(cim=MagicMock(), skills_dir=str(skills_dir))
+    ctrl._is_skill_discovery_enabled = MagicMock(return_value=False)
+    return ctrl
+
+
+def _write_registry(skills_dir, skills):
+    reg = skills_dir / "_registry"
+    reg.mkdir(parents=True, exist_ok=True)
+    tmp = reg / "installed.json.tmp"
+    tmp.write_text(json.dumps({"schema_version": 2, "skills": skills}), encoding="utf-8")
+    os.replace(tmp, reg / "installed.json")
+
+
+def _write_draft(skills_dir, name, description, triggers):
+    draft = skills_dir / "_drafts" / name
+    draft.mkdir(parents=True, exist_ok=True)
+    (draft / "manifest.json").write_text(
+        json.dumps({"description": description, "triggers": triggers}), encoding="utf-8"
+    )
+
+
+def test_bm25_ranks_fields_and_matches_prefixes(core):
+    index = core.SkillMatchIndex()
+    index.sync(
+        {
+            "weather_skill": {"description": "current weather and forecast", "triggers": ["weather"]},
+            "news_digest": {"description": "daily news incl. weather section", "triggers": ["news"]},
+            "math_helper": {"description": "calculate expressions", "triggers": ["calculator"]},
+        },
+        {},
+    )
+    ranked = [name for name, _ in index.search(["weather", "today"])]
+    assert ranked[:2] == ["weather_skill", "news_digest"]
+    assert [name for name, _ in index.search(["calc"])] == ["math_helper"]
+    assert index.search(["unrelated"]) == []
+
+
+def test_sync_is_incremental(core):
+    index = core.SkillMatchIndex()
+    installed = {f"skill_{i}": {"description": f"does thing {i}", "triggers": [f"t{i:03d}"]} for i in range(50)}
+    drafts = {}
+    assert index.sync(installed, drafts) is True
+    assert index.stats["reindexed"] == 50
+
+    assert index.sync(installed, drafts) is False  # gleiche Objekte → No-op
+    assert index.stats["syncs"] == 1
+
+    installed = dict(installed)
+    installed["skill_7"] = {"description": "now handles invoices", "triggers": ["invoice"]}
+    del installed["skill_8"]
+    drafts = {"draft_x": {"description": "experimental", "triggers": [], "is_draft": True}}
+    index.sync(installed, drafts)
+    assert index.stats["reindexed"] == 52 and index.stats["removed"] == 1
+    assert index.search(["invoice"])[0][0] == "skill_7"
+    assert all(name != "skill_8" for name, _ in index.search(["thing"], limit=100))
+    assert "skill_7" not in index._postings.get("thing", {})
+
+
+def test_sources_are_cached_until_they_change(core, tmp_path, monkeypatch):
+    monkeypatch.setattr(core, "SKILL_INDEX_POLL_S", 3600.0)
+    _write_registry(tmp_path, {"weather_skill": {"description": "weather", "triggers": ["weather"]}})
+    _write_draft(tmp_path, "draft_a", "draft alpha", ["alpha"])
+    ctrl = _ctrl(core, tmp_path)
+
+    installed = ctrl._load_installed_skills()
+    drafts = ctrl._load_draft_skills()
+    with patch.object(core.json, "load", side_effect=AssertionError("re-read")):
+        assert ctrl._load_installed_skills() is installed
+        assert ctrl._load_draft_skills() is drafts
+
+    _write_registry(tmp_path, {"stock_skill": {"description": "stock quotes", "triggers": ["stock"]}})
+    assert set(ctrl._load_installed_skills()) == {"stock_skill"}
+
+    # neuer Draft-Ordner → sofort sichtbar (mtime von _drafts)
+    _write_draft(tmp_path, "draft_b", "draft beta", ["beta"])
+    assert set(ctrl._load_draft_skills()) == {"draft_a", "draft_b"}
+
+    # Manifest-Edit im bestehenden Ordner → beim nächsten Poll
+    _write_draft(tmp_path, "draft_a", "draft alpha v2", ["gamma"])
+    assert ctrl._load_draft_skills()["draft_a"]["triggers"] == ["alpha"]
+    monkeypatch.setattr(core, "SKILL_INDEX_POLL_S", 0.0)
+    assert ctrl._load_draft_skills()["draft_a"]["triggers"] == ["gamma"]
+
+    match = asyncio.run(ctrl._find_matching_skill("gamma", "run gamma please"))
+    assert match["name"] == "draft_a" and match["is_draft"] is True
+
+
+def test_lookup_is_sub_millisecond_with_thousands_of_skills(core, tmp_path, monkeypatch):
+    monkeypatch.setattr(core, "SKILL_INDEX_POLL_S", 3600.0)
+    words = ["alpha", "bravo", "charlie", "delta", "echo", "foxtrot", "golf", "hotel", "india", "juliet"]
+    installed = {
+        f"skill_{i}": {
+            "description": f"{words[i % 10]} {words[(i // 10) % 10]} helper number {i}",
+            "triggers": [f"{words[(i // 100) % 10]} task", f"code{i}"],
+        }
+        for i in range(3000)
+    }
+    installed["weather_skill"] = {"description": "current weather and forecast", "triggers": ["weather"]}
+    _write_registry(tmp_path, installed)
+    for i in range(1000):
+        _write_draft(tmp_path, f"draft_{i}", f"draft {words[i % 10]} tool {i}", [f"dcode{i}"])
+    ctrl = _ctrl(core, tmp_path)
+
+    first = asyncio.run(ctrl._find_matching_skill("weather", "show the weather forecast for berlin"))
+    assert first["name"] == "weather_skill"
+
+    async def measure():
+        timings = []
+        for i in range(60):
+            started = time.perf_counter()
+            match = await ctrl._find_matching_skill("lookup", f"please run code{i * 7} now")
+            timings.append((time.perf_counter() - started) * 1000)
+            assert match["name"] == f"skill_{i * 7}"
+        return timings
+
+    timings = asyncio.run(measure())
+    assert statistics.median(timings) < 1.0, f"median={statistics.median(timings):.3f}ms"
+
+
+def test_substring_matches_match_legacy_scan(core, tmp_path, monkeypatch):
+    monkeypatch.setattr(core, "SKILL_INDEX_POLL_S", 3600.0)
+    skills = {
+        "send_email": {"description": "sends messages via smtp", "triggers": []},
+        "getweather": {"description": "forecast lookup", "triggers": []},
+        "pdftools": {"description": "merge and split documents", "triggers": []},
+        "ticket_bot": {"description": "opens tickets", "triggers": ["jira-sync"]},
+        "notes": {"description": "simple notebook", "triggers": ["memo"]},
+    }
+    _write_registry(tmp_path, skills)
+    ctrl = _ctrl(core, tmp_path)
+
+    for query, expected in [
+        ("check my mail", "send_email"),      # Infix
+        ("what's the weather", "getweather"),  # Suffix
+        ("merge this pdf", "pdftools"),        # 3 Zeichen, Präfix
+        ("run sync now", "ticket_bot"),        # Infix im Trigger
+    ]:
+        match = asyncio.run(ctrl._find_matching_skill("", query))
+        assert match is not None and match["name"] == expected, query
+        terms = list({t.lower() for t in ctrl._extract_keywords(query)})
+        legacy = max(ctrl._calculate_match_score(n, i, terms) for n, i in skills.items())
+        assert match["match_score"] == legacy
+
+    assert asyncio.run(ctrl._find_matching_skill("", "unrelated gibberish")) is None
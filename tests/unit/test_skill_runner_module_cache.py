@@ -0,0 +1,135 @@
+"""
+Unit Tests: compiled-module cache in SkillRunner (tool_executor/engine/skill_runner.py)
+
+Tests:
+  1. second run reuses the compiled code (warm), module body still re-executes
+  2. stateless manifests keep the initialized namespace between runs
+  3. editing the entrypoint recompiles; touching without change does not
+  4. invalidate_skill drops the entry (install/uninstall path)
+  5. skill_run_complete carries cold/warm timing
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_REPO_ROOT = os.path.abspath(os.path.join(_HERE, "..", ".."))
+_TOOL_EXECUTOR_DIR = os.path.join(_REPO_ROOT, "tool_executor")
+
+if _TOOL_EXECUTOR_DIR not in sys.path:
+    sys.path.insert(0, _TOOL_EXECUTOR_DIR)
+
+
+def _load_skill_runner_module():
+    spec = importlib.util.spec_from_file_location(
+        "skill_runner_module_cache_test_mod",
+        os.path.join(_TOOL_EXECUTOR_DIR, "engine", "skill_runner.py"),
+    )
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+_SOURCE = (
+    "import time\n"
+    "LOADS = [1]\n"
+    "def run(n=1):\n"
+    "    LOADS.append(n)\n"
+    "    return len(LOADS)\n"
+)
+
+
+@pytest.fixture
+def mod():
+    return _load_skill_runner_module()
+
+
+def _write_skill(root, name, source=_SOURCE, stateless=False):
+    skill_dir = root / name
+    skill_dir.mkdir(exist_ok=True)
+    (skill_dir / "main.py").write_text(source, encoding="utf-8")
+    if stateless:
+        (skill_dir / "manifest.yaml").write_text(f"name: {name}\nstateless: true\n", encoding="utf-8")
+    return skill_dir
+
+
+def _run(runner, name, **args):
+    result = asyncio.run(runner.run(name, args=args))
+    assert result.success, result.error
+    return result.result
+
+
+def test_warm_run_reuses_code_but_reexecutes_module(mod, tmp_path):
+    _write_skill(tmp_path, "demo")
+    runner = mod.SkillRunner(skills_dir=str(tmp_path), timeout_seconds=5)
+
+    with patch.object(mod, "compile", wraps=compile, create=True) as compile_spy:
+        assert _run(runner, "demo") == 2
+        assert _run(runner, "demo") == 2  # frischer Namespace: LOADS neu
+        assert compile_spy.call_count == 1
+
+    stats = runner.get_module_cache_stats()
+    assert (stats["cold"], stats["warm"], stats["namespace_reuse"]) == (1, 1, 0)
+    assert stats["skills"]["demo"]["hits"] == 1
+
+
+def test_stateless_skill_keeps_namespace(mod, tmp_path):
+    if mod.yaml is None:
+        pytest.skip("PyYAML not installed")
+    _write_skill(tmp_path, "counter", stateless=True)
+    runner = mod.SkillRunner(skills_dir=str(tmp_path), timeout_seconds=5)
+
+    assert [_run(runner, "counter") for _ in range(3)] == [2, 3, 4]
+    assert runner.get_module_cache_stats()["namespace_reuse"] == 2
+
+
+def test_file_change_recompiles_only_on_new_content(mod, tmp_path):
+    skill_dir = _write_skill(tmp_path, "demo")
+    runner = mod.SkillRunner(skills_dir=str(tmp_path), timeout_seconds=5)
+    _run(runner, "demo")
+    first_key = next(iter(runner._module_cache.values())).key
+
+    main = skill_dir / "main.py"
+    st = main.stat()
+    os.utime(main, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    _run(runner, "demo")
+    assert runner.get_module_cache_stats()["cold"] == 1
+
+    main.write_text("def run(n=1):\n    return 'v2'\n", encoding="utf-8")
+    os.utime(main, ns=(st.st_atime_ns, st.st_mtime_ns + 2_000_000))
+    assert _run(runner, "demo") == "v2"
+    assert runner.get_module_cache_stats()["cold"] == 2
+    new_key = next(iter(runner._module_cache.values())).key
+    assert new_key[:2] == first_key[:2] and new_key[2] != first_key[2]
+
+
+def test_invalidate_skill_forces_cold_load(mod, tmp_path):
+    _write_skill(tmp_path, "demo")
+    _write_skill(tmp_path, "other")
+    runner = mod.SkillRunner(skills_dir=str(tmp_path), timeout_seconds=5)
+    _run(runner, "demo")
+    _run(runner, "other")
+
+    assert runner.invalidate_skill("demo") == 1
+    assert set(runner.get_module_cache_stats()["skills"]) == {"other"}
+    _run(runner, "demo")
+    assert runner.get_module_cache_stats()["cold"] == 3
+    assert runner.invalidate_skill() == 2
+
+
+def test_run_complete_event_reports_cache_timing(mod, tmp_path):
+    _write_skill(tmp_path, "demo")
+    runner = mod.SkillRunner(skills_dir=str(tmp_path), timeout_seconds=5)
+    with patch.object(mod.EventLogger, "emit") as emit:
+        _run(runner, "demo")
+        _run(runner, "demo")
+    done = [c.args[1] for c in emit.call_args_list if c.args[0] == "skill_run_complete"]
+    assert [p["module_cache"] for p in done] == ["cold", "warm"]
+    assert all(p["load_ms"] >= 0 and p["cold_load_ms"] > 0 for p in done)
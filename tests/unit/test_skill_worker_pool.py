@@ -0,0 +1,233 @@
+"""
+Unit Tests: pre-forked skill worker pool (tool_executor/engine/skill_worker_pool.py)
+
+Tests:
+  1. slow synchronous skills run concurrently and do not block the event loop
+  2. a skill that swallows the soft timeout is killed and the worker respawned
+  3. CPU limit stops a busy loop before the wall-clock timeout
+  4. full pool + full queue rejects with SkillPoolSaturated
+  5. sandbox restrictions still apply inside the worker
+  6. invalidate_skill() reaches every worker's module cache
+  7. initial workers and respawns use the forkserver when the module is importable by name
+  8. the fork fallback works when the pool is started on a running event loop
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import os
+import sys
+import time
+
+import pytest
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_REPO_ROOT = os.path.abspath(os.path.join(_HERE, "..", ".."))
+_TOOL_EXECUTOR_DIR = os.path.join(_REPO_ROOT, "tool_executor")
+
+if _TOOL_EXECUTOR_DIR not in sys.path:
+    sys.path.insert(0, _TOOL_EXECUTOR_DIR)
+
+if not hasattr(os, "fork"):  # pragma: no cover - Windows
+    pytest.skip("pre-forked pool requires fork()", allow_module_level=True)
+
+
+def _load_pool_module():
+    spec = importlib.util.spec_from_file_location(
+        "skill_worker_pool_test_mod",
+        os.path.join(_TOOL_EXECUTOR_DIR, "engine", "skill_worker_pool.py"),
+    )
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    return mod
+
+
+_SKILLS = {
+    "sleepy": "import time\ndef run(s=0.5):\n    time.sleep(s)\n    return 'slept'\n",
+    "stubborn": (
+        "def run():\n"
+        "    while True:\n"
+        "        try:\n"
+        "            while True:\n"
+        "                pass\n"
+        "        except Exception:\n"
+        "            pass\n"
+    ),
+    "spin": "def run():\n    x = 0\n    while True:\n        x += 1\n",
+    "sneaky": "import os\ndef run():\n    return os.getcwd()\n",
+    "echo": "def run(value=None):\n    return {'value': value}\n",
+    "versioned": "def run():\n    return 'v1'\n",
+}
+
+
+@pytest.fixture(scope="module")
+def mod():
+    return _load_pool_module()
+
+
+@pytest.fixture
+def skills_dir(tmp_path):
+    for name, code in _SKILLS.items():
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "main.py").write_text(code, encoding="utf-8")
+    return str(tmp_path)
+
+
+@pytest.fixture
+def make_pool(mod, skills_dir):
+    pools = []
+
+    def _make(**kwargs):
+        opts = {"size": 2, "timeout_seconds": 5, "cpu_seconds": 0, "max_queue": 4, "kill_grace_s": 0.5}
+        opts.update(kwargs)
+        pool = mod.SkillWorkerPool(skills_dir=skills_dir, **opts).start()
+        pools.append(pool)
+        return pool
+
+    yield _make
+    for pool in pools:
+        pool.stop()
+
+
+def test_sync_skills_run_concurrently(make_pool):
+    pool = make_pool(size=3)
+
+    async def scenario():
+        ticks = []
+
+        async def ticker():
+            for _ in range(5):
+                ticks.append(time.perf_counter())
+                await asyncio.sleep(0.05)
+
+        started = time.perf_counter()
+        results = await asyncio.gather(
+            *(pool.run("sleepy", args={"s": 0.5}) for _ in range(3)), ticker()
+        )
+        return time.perf_counter() - started, results[:3], ticks
+
+    elapsed, results, ticks = asyncio.run(scenario())
+    assert [r.result for r in results] == ["slept"] * 3
+    assert elapsed < 1.2  # parallel, nicht 3 × 0.5s seriell
+    assert max(b - a for a, b in zip(ticks, ticks[1:])) < 0.3  # Event-Loop blieb frei
+
+    metrics = pool.get_metrics()
+    assert metrics["completed"] == 3 and metrics["busy"] == 0 and metrics["idle"] == 3
+
+
+def test_runaway_skill_is_killed_and_worker_respawned(make_pool):
+    pool = make_pool(size=1, timeout_seconds=1)
+    old_pid = pool._workers[0].pid
+
+    result = asyncio.run(pool.run("stubborn"))
+    assert not result.success
+    assert "worker killed" in result.error
+
+    metrics = pool.get_metrics()
+    assert metrics["timeouts"] == 1 and metrics["respawns"] == 1 and metrics["alive"] == 1
+    assert pool._workers[0].pid != old_pid
+
+    again = asyncio.run(pool.run("echo", args={"value": 7}))
+    assert again.success and again.result == {"value": 7}
+
+
+def test_cpu_limit_stops_busy_loop(mod, make_pool):
+    if mod.resource is None:
+        pytest.skip("resource module not available")
+    pool = make_pool(size=1, timeout_seconds=20, cpu_seconds=1)
+
+    started = time.perf_counter()
+    result = asyncio.run(pool.run("spin"))
+    assert time.perf_counter() - started < 10
+    assert not result.success
+    assert result.error.startswith("SkillCpuLimitExceeded")
+    assert pool.get_metrics()["cpu_limit"] == 1
+
+
+def test_backpressure_rejects_when_queue_full(mod, make_pool):
+    pool = make_pool(size=1, max_queue=1)
+
+    async def scenario():
+        first = asyncio.create_task(pool.run("sleepy", args={"s": 0.4}))
+        await asyncio.sleep(0.05)
+        second = asyncio.create_task(pool.run("echo", args={"value": 2}))
+        await asyncio.sleep(0.05)
+        assert pool.get_metrics()["queued"] == 1
+        with pytest.raises(mod.SkillPoolSaturated):
+            await pool.run("echo")
+        return await first, await second
+
+    first, second = asyncio.run(scenario())
+    assert first.result == "slept" and second.result == {"value": 2}
+    metrics = pool.get_metrics()
+    assert metrics["rejected"] == 1
+    assert metrics["avg_wait_ms"] > 0
+
+
+def test_sandbox_still_enforced_in_worker(make_pool):
+    pool = make_pool(size=1)
+    result = asyncio.run(pool.run("sneaky"))
+    assert not result.success
+    assert "not allowed" in result.error
+
+
+def test_invalidate_reaches_worker_module_cache(mod, make_pool, skills_dir):
+    pool = make_pool(size=2, start_method="fork")
+    main = os.path.join(skills_dir, "versioned", "main.py")
+
+    async def run_all():
+        return [r.result for r in await asyncio.gather(*(pool.run("versioned") for _ in range(2)))]
+
+    assert asyncio.run(run_all()) == ["v1", "v1"]
+
+    # Reinstall mit gleicher Größe und mtime: Stat-Signatur unverändert
+    st = os.stat(main)
+    with open(main, "w", encoding="utf-8") as fh:
+        fh.write("def run():\n    return 'v2'\n")
+    os.utime(main, ns=(st.st_atime_ns, st.st_mtime_ns))
+    assert asyncio.run(pool.run("versioned")).result == "v1"
+
+    pool.invalidate_skill("versioned")
+    assert asyncio.run(run_all()) == ["v2", "v2"]
+    assert all(not w.pending_invalidations for w in pool._workers)
+
+
+def test_workers_use_forkserver_when_importable(mod, skills_dir):
+    # per Pfad geladen → nicht importierbar → fork
+    assert mod._worker_context("forkserver").get_start_method() == "fork"
+
+    engine_dir = os.path.join(_TOOL_EXECUTOR_DIR, "engine")
+    sys.path.insert(0, engine_dir)
+    try:
+        named = importlib.import_module("skill_worker_pool")
+        if "forkserver" not in named.multiprocessing.get_all_start_methods():
+            pytest.skip("forkserver start method not available")
+        pool = named.SkillWorkerPool(skills_dir=skills_dir, size=1, timeout_seconds=1, cpu_seconds=0,
+                                     kill_grace_s=0.5, start_method="forkserver").start()
+        try:
+            assert pool._ctx.get_start_method() == "forkserver"
+            assert type(pool._workers[0].process).__name__ == "ForkServerProcess"
+            assert not asyncio.run(pool.run("stubborn")).success
+            assert pool.get_metrics()["respawns"] == 1
+            again = asyncio.run(pool.run("echo", args={"value": 3}))
+            assert again.success and again.result == {"value": 3}
+        finally:
+            pool.stop()
+    finally:
+        sys.path.remove(engine_dir)
+        sys.modules.pop("skill_worker_pool", None)
+
+
+def test_fork_fallback_started_on_running_loop(mod, skills_dir):
+    async def scenario():
+        # wie der uvicorn-Startup-Hook: Start im laufenden Event-Loop, ohne Loop-Reset im Kind
+        pool = mod.SkillWorkerPool(skills_dir=skills_dir, size=1, timeout_seconds=5, cpu_seconds=0,
+                                   start_method="fork").start()
+        try:
+            return await pool.run("echo", args={"value": 5})
+        finally:
+            pool.stop()
+
+    result = asyncio.run(scenario())
+    assert result.success and result.result == {"value": 5}
@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+import importlib
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_REPO_ROOT = os.path.abspath(os.path.join(_HERE, "..", ".."))
+_SQL_MEMORY_PATH = os.path.join(_REPO_ROOT, "sql-memory")
+if _SQL_MEMORY_PATH not in sys.path:
+    sys.path.insert(0, _SQL_MEMORY_PATH)
+
+
+def _clustered_vectors(n, dim=16, clusters=12, seed=3):
+    rng = random.Random(seed)
+    centers = [[rng.gauss(0, 1) for _ in range(dim)] for _ in range(clusters)]
+    out = []
+    for i in range(n):
+        c = centers[i % clusters]
+        out.append([v + rng.gauss(0, 0.15) for v in c])
+    return out
+
+
+class TestAnnIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "memory.db")
+        self.vector_store = importlib.import_module("vector_store")
+        self.vm = importlib.import_module("vector_math")
+        self.ann = importlib.import_module("ann_index")
+        self.vs = self.vector_store.VectorStore(self.db_path)
+        self.assertIsNotNone(self.vs._ann)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _insert_many(self, vectors, version="v1", conv="c1", ctype="fact"):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            conn.executemany(
+                """
+                INSERT INTO embeddings
+                (conversation_id, content, content_type, metadata, embedding,
+                 embedding_model, embedding_dim, embedding_version, embedding_norm)
+                VALUES (?, ?, ?, '{}', ?, 'm', ?, ?, ?)
+                """,
+                [
+                    (conv, f"row-{i}", ctype, self.vm.pack_embedding(v), len(v), version,
+                     self.vm.vector_norm(v))
+                    for i, v in enumerate(vectors)
+                ],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _exact(self, query, limit):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            rows = conn.execute(
+                "SELECT id, embedding, embedding_norm FROM embeddings WHERE embedding_version = 'v1'"
+            ).fetchall()
+        finally:
+            conn.close()
+        return self.vm.top_k_cosine(query, rows, limit, -1.0)
+
+    def test_small_partition_is_exact(self):
+        vectors = _clustered_vectors(60)
+        self._insert_many(vectors)
+        hits = self.vs._ann.search("v1", vectors[5], 5, -1.0)
+        self.assertEqual([k for k, _ in hits], [k for k, _ in self._exact(vectors[5], 5)])
+        stats = self.vs.get_ann_stats()
+        self.assertEqual(stats["partitions"]["v1"]["mode"], "exact")
+
+    def test_ivf_partition_recall_and_persistence(self):
+        vectors = _clustered_vectors(900)
+        self._insert_many(vectors)
+        with patch.object(self.ann, "ANN_MIN_PARTITION", 200):
+            hits = self.vs._ann.search("v1", vectors[7], 10, -1.0)
+            stats = self.vs._ann.get_stats()
+            self.assertEqual(stats["partitions"]["v1"]["mode"], "ivf")
+            exact = {k for k, _ in self._exact(vectors[7], 10)}
+            recall = len(exact & {k for k, _ in hits}) / 10
+            self.assertGreaterEqual(recall, 0.8)
+
+            # Fresh index instance loads the persisted partition instead of rebuilding.
+            fresh = self.ann.AnnIndex(self.db_path)
+            again = fresh.search("v1", vectors[7], 10, -1.0)
+            self.assertEqual(fresh.stats["loads"], 1)
+            self.assertEqual(fresh.stats["builds"], 0)
+            self.assertEqual([k for k, _ in again], [k for k, _ in hits])
+
+    def test_checksum_mismatch_applies_delta_without_rebuild(self):
+        vectors = _clustered_vectors(40)
+        self._insert_many(vectors[:20])
+        self.vs._ann.search("v1", vectors[0], 3, -1.0)
+        self.assertEqual(self.vs._ann.stats["builds"], 1)
+
+        # Out-of-process writer (e.g. archive) adds rows behind the index's back.
+        self._insert_many([vectors[30]], conv="c9")
+        with patch.object(self.ann, "ANN_CHECKSUM_TTL_S", 0.0):
+            hits = self.vs._ann.search("v1", vectors[30], 1, -1.0, conversation_id="c9")
+        self.assertEqual(self.vs._ann.stats["builds"], 1)
+        self.assertEqual(self.vs._ann.stats["delta_added"], 1)
+        self.assertEqual(len(hits), 1)
+        self.assertAlmostEqual(hits[0][1], 1.0, places=5)
+
+    def test_out_of_process_delete_keeps_trained_lists(self):
+        vectors = _clustered_vectors(900)
+        self._insert_many(vectors)
+        with patch.object(self.ann, "ANN_MIN_PARTITION", 200):
+            first = self.vs._ann.search("v1", vectors[7], 1, -1.0)[0][0]
+            part = self.vs._ann._parts["v1"]
+            centroids = part.centroids
+
+            conn = sqlite3.connect(self.db_path)
+            conn.execute("DELETE FROM embeddings WHERE id = ?", (first,))
+            conn.commit()
+            conn.close()
+            self._insert_many([vectors[7]], conv="c2")
+
+            with patch.object(self.ann, "ANN_CHECKSUM_TTL_S", 0.0):
+                hits = self.vs._ann.search("v1", vectors[7], 5, -1.0)
+
+        stats = self.vs._ann.stats
+        self.assertEqual(stats["builds"], 1)
+        self.assertEqual((stats["delta_added"], stats["delta_removed"]), (1, 1))
+        self.assertIs(self.vs._ann._parts["v1"].centroids, centroids)  # kein Retrain
+        self.assertNotIn(first, [k for k, _ in hits])
+        self.assertAlmostEqual(hits[0][1], 1.0, places=5)
+
+    def test_selective_filter_scores_only_matching_rows(self):
+        vectors = _clustered_vectors(900)
+        self._insert_many(vectors[:880], conv="big")
+        self._insert_many(vectors[880:885], conv="small")
+        self._insert_many(vectors[885:887], conv="global")
+        with patch.object(self.ann, "ANN_MIN_PARTITION", 200):
+            self.vs._ann.search("v1", vectors[0], 1, -1.0)
+            part = self.vs._ann._parts["v1"]
+            with patch.object(part, "_score", wraps=part._score) as score:
+                hits = self.vs._ann.search("v1", vectors[0], 10, -1.0, conversation_id="small")
+
+        self.assertEqual(len(hits), 7)  # 5 eigene + 2 globale
+        scored_rows = score.call_args[0][1]
+        self.assertEqual(len(scored_rows), 7)
+        self.assertEqual(len(set(part.conv_codes[scored_rows].tolist())), 2)
+
+    def test_add_and_backfill_update_index_incrementally(self):
+        vectors = _clustered_vectors(30)
+        self._insert_many(vectors[:10])
+        self.vs._ann.search("v1", vectors[0], 1, -1.0)
+
+        payload = {
+            "embedding": vectors[20],
+            "embedding_model": "m",
+            "embedding_dim": 16,
+            "embedding_version": "v1",
+            "runtime_policy": "auto",
+        }
+        with patch.object(self.vector_store, "get_embedding_with_metadata", return_value=payload):
+            new_id = self.vs.add("c1", "fresh", "fact")
+
+        with patch.object(self.ann, "ANN_CHECKSUM_TTL_S", 0.0):
+            hits = self.vs._ann.search("v1", vectors[20], 1, -1.0)
+        self.assertEqual(hits[0][0], new_id)
+        self.assertEqual(self.vs._ann.stats["builds"], 1)
+
+        moved = dict(payload, embedding=vectors[21], embedding_version="v2")
+        with patch.object(self.vector_store, "get_active_embedding_version", return_value="v2"), patch.object(
+            self.vector_store, "get_embeddings_batch_with_metadata", return_value=[moved]
+        ):
+            self.vs.backfill_embeddings(batch_size=1)
+        self.assertEqual(self.vs._ann.get_stats()["partitions"]["v1"]["rows"], 10)
+
+    def test_vector_store_search_uses_index_with_filters(self):
+        vectors = _clustered_vectors(40)
+        self._insert_many(vectors[:20], conv="c1", ctype="fact")
+        self._insert_many(vectors[20:], conv="c2", ctype="memory")
+
+        with patch.object(self.vector_store, "get_embedding", return_value=vectors[25]), patch.object(
+            self.vector_store, "get_active_embedding_version", return_value="v1"
+        ):
+            results = self.vs.search("q", conversation_id="c1", content_type="fact", min_similarity=-1.0, limit=3)
+
+        self.assertEqual(len(results), 3)
+        self.assertTrue(all(r["type"] == "fact" for r in results))
+        self.assertGreaterEqual(self.vs._ann.stats["exact_searches"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch
+
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+_REPO_ROOT = os.path.abspath(os.path.join(_HERE, "..", ".."))
+if _REPO_ROOT not in sys.path:
+    sys.path.insert(0, _REPO_ROOT)
+_SQL_MEMORY_PATH = os.path.join(_REPO_ROOT, "sql-memory")
+if _SQL_MEMORY_PATH not in sys.path:
+    sys.path.insert(0, _SQL_MEMORY_PATH)
+
+
+def _insert(conn, conv, content, embedding, version="v1", content_type="fact"):
+    conn.execute(
+        """
+        INSERT INTO embeddings
+        (conversation_id, content, content_type, metadata, embedding,
+         embedding_model, embedding_dim, embedding_version)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """,
+        (conv, content, content_type, "{}", embedding, "m", 3, version),
+    )
+
+
+class TestVectorMath(unittest.TestCase):
+    def setUp(self):
+        self.vm = importlib.import_module("vector_math")
+
+    def test_pack_roundtrip_and_legacy_json(self):
+        blob = self.vm.pack_embedding([0.5, -1.0, 2.0])
+        self.assertEqual(len(blob), 12)
+        self.assertEqual(self.vm.unpack_embedding(blob), [0.5, -1.0, 2.0])
+        self.assertEqual(self.vm.unpack_embedding("[0.5, -1.0, 2.0]"), [0.5, -1.0, 2.0])
+        self.assertIsNone(self.vm.unpack_embedding("not-json"))
+        self.assertIsNone(self.vm.unpack_embedding(b"\x00\x01"))
+
+    def test_top_k_matches_pure_python_fallback(self):
+        rng = random.Random(7)
+        query = [rng.uniform(-1, 1) for _ in range(16)]
+        candidates = []
+        for i in range(200):
+            vec = [rng.uniform(-1, 1) for _ in range(16)]
+            raw = self.vm.pack_embedding(vec) if i % 2 else json.dumps(vec)
+            candidates.append((i, raw, None))
+
+        fast = self.vm.top_k_cosine(query, candidates, limit=10, min_similarity=-1.0)
+        with patch.object(self.vm, "_np", None):
+            slow = self.vm.top_k_cosine(query, candidates, limit=10, min_similarity=-1.0)
+
+        self.assertEqual([k for k, _ in fast], [k for k, _ in slow])
+        for (_, a), (_, b) in zip(fast, slow):
+            self.assertAlmostEqual(a, b, places=5)
+
+    def test_top_k_respects_min_similarity_and_dim_mismatch(self):
+        candidates = [
+            (1, self.vm.pack_embedding([1.0, 0.0]), 1.0),
+            (2, self.vm.pack_embedding([0.0, 1.0]), 1.0),
+            (3, self.vm.pack_embedding([1.0, 0.0, 0.0]), 1.0),
+        ]
+        hits = self.vm.top_k_cosine([1.0, 0.0], candidates, limit=5, min_similarity=0.5)
+        self.assertEqual([k for k, _ in hits], [1])
+
+        hits_all = self.vm.top_k_cosine([1.0, 0.0], candidates, limit=5, min_similarity=0.0)
+        self.assertEqual(sorted(k for k, _ in hits_all), [1, 2, 3])
+
+
+class TestVectorStoreBinaryStorage(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmp.name, "memory.db")
+        self.vector_store = importlib.import_module("vector_store")
+        self.vm = importlib.import_module("vector_math")
+        self.vs = self.vector_store.VectorStore(self.db_path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _conn(self):
+        return sqlite3.connect(self.db_path)
+
+    def test_add_stores_float32_blob_with_norm(self):
+        emb_payload = {
+            "embedding": [3.0, 4.0],
+            "embedding_model": "m",
+            "embedding_dim": 2,
+            "embedding_version": "v1",
+            "runtime_policy": "auto",
+        }
+        with patch.object(self.vector_store, "get_embedding_with_metadata", return_value=emb_payload):
+            row_id = self.vs.add("c1", "hello", "fact")
+
+        conn = self._conn()
+        try:
+            raw, norm, kind = conn.execute(
+                "SELECT embedding, embedding_norm, typeof(embedding) FROM embeddings WHERE id = ?",
+                (row_id,),
+            ).fetchone()
+        finally:
+            conn.close()
+        self.assertEqual(kind, "blob")
+        self.assertEqual(self.vm.unpack_embedding(raw), [3.0, 4.0])
+        self.assertAlmostEqual(norm, 5.0)
+
+    def test_search_reads_legacy_json_and_blob_rows_with_filters(self):
+        conn = self._conn()
+        try:
+            _insert(conn, "c1", "legacy-json", json.dumps([1.0, 0.0, 0.0]))
+            _insert(conn, "c1", "blob-row", self.vm.pack_embedding([0.9, 0.1, 0.0]))
+            _insert(conn, "global", "global-row", self.vm.pack_embedding([0.8, 0.2, 0.0]))
+            _insert(conn, "c2", "other-conv", self.vm.pack_embedding([1.0, 0.0, 0.0]))
+            _insert(conn, "c1", "wrong-type", self.vm.pack_embedding([1.0, 0.0, 0.0]), content_type="tool_def")
+            _insert(conn, "c1", "old-version", self.vm.pack_embedding([1.0, 0.0, 0.0]), version="v0")
+            conn.commit()
+        finally:
+            conn.close()
+
+        with patch.object(self.vector_store, "get_embedding", return_value=[1.0, 0.0, 0.0]), patch.object(
+            self.vector_store, "get_active_embedding_version", return_value="v1"
+        ):
+            results = self.vs.search("q", conversation_id="c1", content_type="fact", min_similarity=0.1)
+
+        self.assertEqual(
+            [r["content"] for r in results],
+            ["legacy-json", "blob-row", "global-row"],
+        )
+        self.assertEqual(results[0]["similarity"], 1.0)
+        self.assertEqual(results[0]["metadata"], {})
+        self.assertEqual(results[0]["embedding_version"], "v1")
+
+    def test_search_limit_returns_best_rows(self):
+        conn = self._conn()
+        try:
+            for i in range(50):
+                _insert(conn, "c1", f"row-{i}", self.vm.pack_embedding([1.0, i / 50.0, 0.0]))
+            conn.commit()
+        finally:
+            conn.close()
+
+        with patch.object(self.vector_store, "get_embedding", return_value=[1.0, 0.0, 0.0]), patch.object(
+            self.vector_store, "get_active_embedding_version", return_value="v1"
+        ):
+            results = self.vs.search("q", conversation_id="c1", limit=3, min_similarity=0.0)
+
+        self.assertEqual([r["content"] for r in results], ["row-0", "row-1", "row-2"])
+
+    def test_migrate_legacy_embeddings_converts_in_batches(self):
+        conn = self._conn()
+        try:
+            for i in range(5):
+                _insert(conn, "c1", f"legacy-{i}", json.dumps([float(i + 1), 0.0, 0.0]))
+            _insert(conn, "c1", "broken", "not-json")
+            conn.commit()
+        finally:
+            conn.close()
+
+        first = self.vs.migrate_legacy_embeddings(batch_size=2, max_batches=1)
+        self.assertEqual(first["converted"], 2)
+        self.assertEqual(first["remaining_legacy"], 4)
+
+        rest = self.vs.migrate_legacy_embeddings(batch_size=2)
+        self.assertEqual(rest["converted"], 3)
+        self.assertEqual(rest["failed"], 1)
+        self.assertEqual(rest["remaining_legacy"], 1)
+
+        conn = self._conn()
+        try:
+            rows = conn.execute(
+                "SELECT embedding, embedding_norm FROM embeddings "
+                "WHERE content LIKE 'legacy-%' ORDER BY id"
+            ).fetchall()
+        finally:
+            conn.close()
+        for i, (raw, norm) in enumerate(rows):
+            self.assertIsInstance(raw, bytes)
+            self.assertEqual(self.vm.unpack_embedding(raw), [float(i + 1), 0.0, 0.0])
+            self.assertAlmostEqual(norm, float(i + 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
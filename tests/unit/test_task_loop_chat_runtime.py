@@ -14,7 +14,7 @@ from core.task_loop.contracts import (
     TaskLoopStepType,
     TERMINAL_STATES,
 )
-from core.task_loop.store import TaskLoopStore
+from core.task_loop.store import SqliteTaskLoopStore, TaskLoopStore
 
 
 def test_task_loop_candidate_is_explicit_only():
@@ -169,6 +169,26 @@ def test_continue_chat_task_loop_can_cancel_waiting_loop():
     assert result.snapshot.state.value == "cancelled"
 
 
+def test_continue_chat_task_loop_reports_loop_advanced_by_other_worker(tmp_path):
+    db_path = str(tmp_path / "task_loops.sqlite")
+    worker_a = SqliteTaskLoopStore(db_path=db_path)
+    worker_b = SqliteTaskLoopStore(db_path=db_path)
+    first = start_chat_task_loop(
+        "Bitte schrittweise arbeiten",
+        "conv-loop",
+        store=worker_a,
+        auto_continue=False,
+    )
+    continue_chat_task_loop(worker_b.get("conv-loop"), "stoppen", store=worker_b)
+
+    result = continue_chat_task_loop(first.snapshot, "weiter", store=worker_a)
+
+    assert result.done_reason == "task_loop_version_conflict"
+    assert result.snapshot.state == TaskLoopState.CANCELLED
+    assert "anderen Anfrage" in result.content
+    assert worker_a.get("conv-loop").state == TaskLoopState.CANCELLED
+
+
 def test_continue_chat_task_loop_does_not_advance_runtime_waiting_user_tool_step_on_plain_continue():
     store = TaskLoopStore()
     snapshot = TaskLoopSnapshot(
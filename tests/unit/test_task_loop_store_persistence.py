@@ -0,0 +1,243 @@
+"""
+Unit Tests: persistent, bounded task-loop store (core/task_loop/store.py)
+
+Tests:
+  1. snapshots roundtrip through the compact payload unchanged
+  2. two store instances on one DB (= two workers) see each other's writes
+  3. a stale worker gets TaskLoopVersionConflict instead of clobbering
+  4. the hot tier and the memory store stay LRU-bounded
+  5. COMPLETED/CANCELLED loops are evicted after the terminal TTL
+  6. compare-and-set survives hot-tier eviction
+  7. commit_task_loop_snapshot resolves conflicts (supersede, keep theirs, rebase)
+  8. the test session never writes the shared /tmp store
+"""
+
+from dataclasses import replace
+
+import pytest
+
+from core.task_loop.contracts import (
+    RiskLevel,
+    StopReason,
+    TaskLoopSnapshot,
+    TaskLoopState,
+    TaskLoopStepStatus,
+    TaskLoopStepType,
+)
+from core.task_loop.store import (
+    SqliteTaskLoopStore,
+    TaskLoopStore,
+    TaskLoopVersionConflict,
+    commit_task_loop_snapshot,
+    decode_task_loop_snapshot,
+    encode_task_loop_snapshot,
+    make_task_loop_store,
+)
+
+
+def _snapshot(conv="conv-1", **overrides):
+    base = TaskLoopSnapshot(
+        objective_id="obj-1",
+        conversation_id=conv,
+        plan_id="plan-1",
+        state=TaskLoopState.EXECUTING,
+        step_index=2,
+        current_step_id="step-2",
+        current_step_type=TaskLoopStepType.TOOL_EXECUTION,
+        current_step_status=TaskLoopStepStatus.RUNNING,
+        current_plan=["Plan", "Ausführen", "Prüfen"],
+        plan_steps=[{"step_id": "step-1", "title": "Plan"}],
+        completed_steps=["Plan"],
+        pending_step="Ausführen",
+        risk_level=RiskLevel.NEEDS_CONFIRMATION,
+        tool_trace=[{"tool": "exec_in_container", "ok": True}],
+        last_step_result={"status": "ok", "exit_code": 0},
+        workspace_event_ids=["ev-1"],
+        error_count=1,
+    )
+    return replace(base, **overrides)
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "task_loops.sqlite")
+
+
+def test_snapshot_roundtrip_is_lossless():
+    snap = _snapshot(state=TaskLoopState.BLOCKED, stop_reason=StopReason.RISK_GATE_REQUIRED)
+    payload = encode_task_loop_snapshot(snap)
+    assert ": " not in payload  # kompakt, ohne Whitespace-Separatoren
+    assert decode_task_loop_snapshot(payload) == snap
+
+
+def test_workers_share_snapshots(db_path):
+    worker_a = SqliteTaskLoopStore(db_path=db_path)
+    worker_b = SqliteTaskLoopStore(db_path=db_path)
+
+    first = worker_a.put(_snapshot())
+    assert worker_b.get("conv-1") == first
+
+    advanced = replace(first, step_index=3, pending_step="Prüfen")
+    worker_b.put(advanced)
+    assert worker_a.get("conv-1") == advanced
+    assert worker_a.get_versioned("conv-1")[0] == 2
+
+    # unveränderte Version → Hot-Tier, kein erneutes Dekodieren
+    decodes = worker_a.stats()["decodes"]
+    assert worker_a.get_active("conv-1") == advanced
+    assert worker_a.stats()["decodes"] == decodes
+    assert worker_a.stats()["hot_hits"] >= 1
+
+    worker_b.clear("conv-1")
+    assert worker_a.get("conv-1") is None
+
+
+def test_stale_worker_cannot_clobber(db_path):
+    worker_a = SqliteTaskLoopStore(db_path=db_path)
+    worker_b = SqliteTaskLoopStore(db_path=db_path)
+    worker_a.put(_snapshot())
+    worker_b.get("conv-1")
+
+    worker_a.put(_snapshot(step_index=5))
+    with pytest.raises(TaskLoopVersionConflict) as exc:
+        worker_b.put(_snapshot(step_index=3))
+    assert (exc.value.expected, exc.value.actual) == (1, 2)
+    assert worker_b.stats()["conflicts"] == 1
+
+    # nach erneutem Lesen darf B weiterschreiben
+    assert worker_b.get("conv-1").step_index == 5
+    worker_b.put(_snapshot(step_index=6))
+    assert worker_a.get("conv-1").step_index == 6
+
+    with pytest.raises(TaskLoopVersionConflict):
+        worker_a.put(_snapshot(step_index=7), expected_version=1)
+
+
+def test_hot_tier_and_memory_store_are_bounded(db_path):
+    store = SqliteTaskLoopStore(db_path=db_path, hot_max_entries=4)
+    for i in range(20):
+        store.put(_snapshot(conv=f"conv-{i}"))
+    assert store.stats()["hot_entries"] == 4
+    assert len(store) == 20
+    assert store.get("conv-0").conversation_id == "conv-0"  # aus SQLite nachgeladen
+
+    memory = TaskLoopStore(max_entries=3)
+    for i in range(5):
+        memory.put(_snapshot(conv=f"conv-{i}"))
+    memory.get("conv-2")
+    memory.put(_snapshot(conv="conv-5"))
+    assert len(memory) == 3
+    assert memory.get("conv-2") is not None
+    assert memory.get("conv-3") is None
+
+
+def test_terminal_loops_expire_after_ttl(db_path, monkeypatch):
+    import core.task_loop.store as store_mod
+
+    clock = [1000.0]
+    monkeypatch.setattr(store_mod.time, "time", lambda: clock[0])
+
+    store = SqliteTaskLoopStore(db_path=db_path, terminal_ttl_s=60, prune_interval_s=0)
+    store.put(_snapshot(conv="done", state=TaskLoopState.COMPLETED))
+    store.put(_snapshot(conv="cancelled", state=TaskLoopState.CANCELLED, stop_reason=StopReason.USER_CANCELLED))
+    store.put(_snapshot(conv="running"))
+    assert store.get("done") is not None
+    assert store.get_active("done") is None
+
+    clock[0] += 61
+    store.put(_snapshot(conv="running", step_index=4))
+    assert store.get("done") is None
+    assert store.get("cancelled") is None
+    assert store.get_active("running").step_index == 4
+
+    memory = TaskLoopStore(terminal_ttl_s=60)
+    memory.put(_snapshot(conv="done", state=TaskLoopState.COMPLETED))
+    memory.put(_snapshot(conv="running"))
+    clock[0] += 61
+    assert memory.get("done") is None
+    assert memory.get("running") is not None
+
+
+def test_factory_respects_backend_env(monkeypatch, db_path):
+    monkeypatch.setenv("TRION_TASK_LOOP_STORE_BACKEND", "memory")
+    assert type(make_task_loop_store()) is TaskLoopStore
+
+    monkeypatch.setenv("TRION_TASK_LOOP_STORE_BACKEND", "sqlite")
+    monkeypatch.setenv("TRION_TASK_LOOP_STORE_DB", db_path)
+    assert isinstance(make_task_loop_store(), SqliteTaskLoopStore)
+
+
+def test_version_check_survives_hot_tier_eviction(db_path):
+    worker_a = SqliteTaskLoopStore(db_path=db_path, hot_max_entries=1)
+    worker_b = SqliteTaskLoopStore(db_path=db_path)
+    worker_a.put(_snapshot())
+    worker_a.get("conv-1")
+    worker_a.put(_snapshot(conv="other"))  # verdraengt conv-1 aus dem Hot-Tier
+    assert worker_a.stats()["hot_entries"] == 1
+
+    worker_b.get("conv-1")
+    worker_b.put(_snapshot(step_index=5))
+    with pytest.raises(TaskLoopVersionConflict):
+        worker_a.put(_snapshot(step_index=3))
+    # ohne erneutes Lesen bleibt A blockiert
+    with pytest.raises(TaskLoopVersionConflict):
+        worker_a.put(_snapshot(step_index=3))
+    assert worker_b.get("conv-1").step_index == 5
+
+
+def test_commit_resolves_conflicts(db_path):
+    worker_a = SqliteTaskLoopStore(db_path=db_path)
+    worker_b = SqliteTaskLoopStore(db_path=db_path)
+    worker_a.put(_snapshot())
+    worker_b.get("conv-1")
+    worker_a.put(_snapshot(step_index=4))
+
+    # B ist weiter fortgeschritten -> wird nach erneutem Lesen geschrieben
+    stored, written = commit_task_loop_snapshot(worker_b, _snapshot(step_index=6))
+    assert written and stored.step_index == 6
+    assert worker_a.get("conv-1").step_index == 6
+
+    # A ist zurueckgefallen -> der Stand von B bleibt
+    worker_b.put(_snapshot(step_index=7))
+    stored, written = commit_task_loop_snapshot(worker_a, _snapshot(step_index=7, pending_step="alt"))
+    assert not written
+    assert stored.step_index == 7 and stored.pending_step == "Ausführen"
+
+    # Abbruch gewinnt immer gegen einen laufenden Stand desselben Loops
+    worker_b.put(_snapshot(step_index=8))
+    cancelled = _snapshot(step_index=7, state=TaskLoopState.CANCELLED, stop_reason=StopReason.USER_CANCELLED)
+    stored, written = commit_task_loop_snapshot(worker_a, cancelled)
+    assert written and worker_b.get("conv-1").state is TaskLoopState.CANCELLED
+
+    # rebase wendet die eigene Aenderung auf den aktuellen Stand an
+    worker_b.put(_snapshot(step_index=9))
+    stored, written = commit_task_loop_snapshot(
+        worker_a,
+        _snapshot(step_index=7, error_count=0),
+        rebase=lambda current: replace(current, error_count=current.error_count + 10),
+    )
+    assert written
+    assert (stored.step_index, stored.error_count) == (9, 11)
+    assert worker_b.get("conv-1") == stored
+
+
+def test_commit_keeps_other_objective(db_path):
+    worker_a = SqliteTaskLoopStore(db_path=db_path)
+    worker_b = SqliteTaskLoopStore(db_path=db_path)
+    worker_a.put(_snapshot())
+    worker_b.get("conv-1")
+    worker_a.put(_snapshot(objective_id="obj-2", step_index=0))
+
+    stored, written = commit_task_loop_snapshot(worker_b, _snapshot(step_index=9))
+    assert not written and stored.objective_id == "obj-2"
+
+    worker_a.clear("conv-1")
+    stored, written = commit_task_loop_snapshot(worker_b, _snapshot(step_index=10))
+    assert (stored, written) == (None, False)
+
+
+def test_session_store_is_isolated_from_shared_tmp_db():
+    from core.task_loop.store import get_task_loop_store
+
+    store = get_task_loop_store()
+    assert getattr(store, "_db_path", "") != "/tmp/trion_task_loop_store.sqlite"
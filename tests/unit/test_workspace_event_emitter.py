@@ -5,6 +5,7 @@ Phase 1 — kein Behavior-Change:
   - persist() baut korrektes SSE-dict und parst entry_id robust
   - persist_container() normalisiert container_evt korrekt
   - persist_and_broadcast() ruft emit_activity auf, gibt sse_dict=None zurück
+  - broadcast() spiegelt transiente Stream-Events ohne Persistierung
   - graceful None wenn Fast-Lane fehlt oder entry_id nicht parsbar
 
 Alle Tests mocken die Fast-Lane (hub.call_tool) — kein DB-Aufruf.
@@ -286,6 +287,23 @@ class TestEmitterPersistAndBroadcast:
         _mock_ws_stream.emit_activity.assert_not_called()
 
 
+class TestEmitterBroadcast:
+    def test_mirrors_stream_event_without_persisting(self):
+        emitter = WorkspaceEventEmitter()
+        ws = sys.modules["container_commander.ws_stream"]
+        hub = MagicMock()
+        with patch.object(ws, "emit_activity") as emit, patch("mcp.hub.get_hub", return_value=hub):
+            ok = emitter.broadcast({"type": "layer0_signals", "timings": {"total_ms": 3.0}}, conversation_id="conv-12")
+        assert ok is True
+        emit.assert_called_once_with("layer0_signals", conversation_id="conv-12", timings={"total_ms": 3.0})
+        hub.call_tool.assert_not_called()
+
+    def test_failure_is_non_fatal(self):
+        ws = sys.modules["container_commander.ws_stream"]
+        with patch.object(ws, "emit_activity", side_effect=Exception("ws down")):
+            assert WorkspaceEventEmitter().broadcast({"type": "layer0_signals"}) is False
+
+
 # ---------------------------------------------------------------------------
 # Singleton
 # ---------------------------------------------------------------------------
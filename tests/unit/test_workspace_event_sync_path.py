@@ -145,7 +145,7 @@ def _make_orch(thinking_plan: dict, verification: dict) -> MagicMock:
     return orch
 
 
-async def _run_sync(orch, request):
+async def _run_sync(orch, request, tool_selection=None):
     """Ruft process_request direkt auf."""
     from core.orchestrator_sync_flow_utils import process_request
 
@@ -156,7 +156,7 @@ async def _run_sync(orch, request):
 
     # Pipeline-Stages mocken
     with patch("core.orchestrator_pipeline_stages.run_tool_selection_stage",
-               new=AsyncMock(return_value=([], None, None, None))), \
+               new=tool_selection or AsyncMock(return_value=([], None, None, None))), \
          patch("core.orchestrator_pipeline_stages.run_plan_finalization",
                return_value=(request._mock_children.get("_thinking_plan", orch.thinking._default_plan()), "interactive")), \
          patch("core.orchestrator_pipeline_stages.run_pre_control_gates", return_value=(None, None)), \
@@ -323,3 +323,22 @@ async def test_sync_path_task_loop_short_circuits_before_pipeline():
     assert "task_loop_started" in entry_types
     assert "task_loop_reflection" in entry_types
     assert "task_loop_completed" in entry_types
+
+
+@pytest.mark.asyncio
+async def test_sync_path_emits_layer0_signals_like_stream():
+    """Sync-Pfad spiegelt das layer0_signals-Event des Stream-Pfads (WebSocket)."""
+    orch = _make_orch(_make_thinking_plan(), _make_verification())
+    request = _make_request()
+
+    async def _selection(*_a, signal_timings=None, **_kw):
+        signal_timings.update({"tool_selector_ms": 1.0, "reconciled": False})
+        return [], None, None, None
+
+    with patch("core.workspace_event_emitter.WorkspaceEventEmitter.broadcast") as broadcast:
+        await _run_sync(orch, request, tool_selection=AsyncMock(side_effect=_selection))
+
+    broadcast.assert_called_once_with(
+        {"type": "layer0_signals", "timings": {"tool_selector_ms": 1.0, "reconciled": False}},
+        conversation_id="conv-sync-test",
+    )
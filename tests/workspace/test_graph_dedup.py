@@ -0,0 +1,189 @@
+# tests/workspace/test_graph_dedup.py
+"""
+Unit Tests: near-duplicate detection (graph/dedup.py) + bulk merge
+
+Tests:
+- MinHash/LSH finds lexical near-duplicates in any node type
+- streaming scan covers nodes beyond the old 1000-node window, sub-quadratically
+- embedding k-NN finds semantic duplicates with different wording
+- source types are not mixed by default
+- GraphStore.merge_nodes / graph_merge_nodes(clusters=...) merge in bulk
+"""
+
+import random
+from unittest.mock import patch
+
+import pytest
+
+
+@pytest.fixture
+def dedup():
+    from graph import dedup as dedup_module
+    return dedup_module
+
+
+def _cluster_sets(result):
+    return [set(c["node_ids"]) for c in result["clusters"]]
+
+
+class TestFindDuplicateClusters:
+
+    def test_lexical_near_duplicates_any_type(self, graph_store, dedup):
+        """
+        GIVEN: Near-identical skill nodes and an unrelated skill
+        WHEN: find_duplicate_clusters runs
+        THEN: The near-identical pair forms one lexical cluster
+        """
+        a = graph_store.add_node("skill", "Weather skill: fetch the forecast for a given city")
+        b = graph_store.add_node("skill", "weather skill:  Fetch the forecast for a given city.")
+        graph_store.add_node("skill", "Calendar skill: list upcoming meetings")
+
+        result = dedup.find_duplicate_clusters(graph_store.db_path, include_semantic=False)
+
+        assert _cluster_sets(result) == [{a, b}]
+        cluster = result["clusters"][0]
+        assert cluster["kinds"] == ["lexical"]
+        assert cluster["source_types"] == ["skill"]
+        assert cluster["score"] >= 0.85
+
+    def test_streaming_scan_is_subquadratic(self, graph_store, dedup):
+        """
+        GIVEN: 1200 distinct facts plus a duplicate of the very first one at the end
+        WHEN: find_duplicate_clusters runs with small batches
+        THEN: The pair is found and comparisons stay far below n^2
+        """
+        rng = random.Random(4)
+        words = ["alpha", "beta", "gamma", "delta", "omega", "sigma", "kappa", "zeta"]
+        first = graph_store.add_node("fact", "the server rack lives in the basement next to the boiler")
+        for i in range(1200):
+            graph_store.add_node("fact", f"{i} " + " ".join(rng.choice(words) for _ in range(6)))
+        dup = graph_store.add_node("fact", "The server rack lives in the basement next to the boiler!")
+
+        result = dedup.find_duplicate_clusters(graph_store.db_path, include_semantic=False, batch_size=100)
+
+        assert {first, dup} in _cluster_sets(result)
+        n = result["stats"]["nodes"]
+        assert n == 1202
+        assert result["stats"]["comparisons"] < n * n / 20
+
+    def test_semantic_duplicates_via_embeddings(self, graph_store, dedup):
+        """
+        GIVEN: Two differently worded nodes with near-identical embeddings
+        WHEN: find_duplicate_clusters runs with semantic detection
+        THEN: They form a semantic cluster
+        """
+        base = [0.3, -0.1, 0.8, 0.2, 0.5, -0.4, 0.1, 0.9]
+        a = graph_store.add_node("fact", "Danny prefers dark mode", embedding=base)
+        b = graph_store.add_node("fact", "Dark theme is what the user likes", embedding=[v * 1.01 for v in base])
+        graph_store.add_node("fact", "unrelated", embedding=[-v for v in base])
+
+        result = dedup.find_duplicate_clusters(graph_store.db_path, semantic_threshold=0.99)
+
+        assert _cluster_sets(result) == [{a, b}]
+        assert result["clusters"][0]["kinds"] == ["semantic"]
+
+    def test_types_not_mixed_unless_cross_type(self, graph_store, dedup):
+        """
+        GIVEN: A fact and a skill with identical content
+        WHEN: find_duplicate_clusters runs
+        THEN: No cluster by default; one cluster with cross_type=True
+        """
+        a = graph_store.add_node("fact", "identical content across types")
+        b = graph_store.add_node("skill", "identical content across types")
+
+        assert dedup.find_duplicate_clusters(graph_store.db_path, include_semantic=False)["clusters"] == []
+        crossed = dedup.find_duplicate_clusters(graph_store.db_path, include_semantic=False, cross_type=True)
+        assert _cluster_sets(crossed) == [{a, b}]
+
+    def test_primary_is_highest_confidence(self, graph_store, dedup):
+        """
+        GIVEN: Duplicates at confidence 0.5 and 0.9
+        WHEN: Clusters are built
+        THEN: The 0.9 node is node_ids[0]
+        """
+        graph_store.add_node("fact", "docker setup uses eleven containers", confidence=0.5)
+        high = graph_store.add_node("fact", "Docker setup uses eleven containers", confidence=0.9)
+
+        result = dedup.find_duplicate_clusters(graph_store.db_path, include_semantic=False)
+        assert result["clusters"][0]["node_ids"][0] == high
+
+
+class TestBulkMerge:
+
+    def test_merge_nodes_redirects_edges(self, graph_store):
+        """
+        GIVEN: primary, dup (with in/out edges) and a neighbor
+        WHEN: merge_nodes([primary, dup])
+        THEN: dup deleted, edges moved to primary, no self-loops
+        """
+        primary = graph_store.add_node("fact", "p")
+        dup = graph_store.add_node("fact", "d")
+        other = graph_store.add_node("fact", "o")
+        graph_store.add_edge(dup, other, "semantic", weight=0.4)
+        graph_store.add_edge(other, dup, "temporal", weight=1.0)
+        graph_store.add_edge(primary, dup, "semantic", weight=0.9)
+
+        result = graph_store.merge_nodes([primary, dup])
+
+        assert result == {"merged": 1, "primary_node": primary, "deleted_nodes": [dup]}
+        assert graph_store.get_node(dup) is None
+        edges = {(e["source"], e["target"], e["type"]) for e in graph_store.get_edges(primary)}
+        assert edges == {(primary, other, "semantic"), (other, primary, "temporal")}
+
+    def test_merge_large_cluster_beyond_sqlite_variable_limit(self, graph_store):
+        """
+        GIVEN: A 600-node duplicate cluster linked to a neighbor
+        WHEN: merge_nodes is called with all of them
+        THEN: The merge succeeds despite SQLite's 999-variable default
+        """
+        import sqlite3
+        import graph.graph_store as gs_module
+
+        ids = [graph_store.add_node("fact", f"dup {i}") for i in range(600)]
+        other = graph_store.add_node("fact", "o")
+        for node_id in ids[1:]:
+            graph_store.add_edge(node_id, other, "semantic", weight=0.01)
+
+        real_connect = sqlite3.connect
+
+        def _connect_with_default_limit(*args, **kwargs):
+            # Neuere SQLite-Builds erlauben 32766 Variablen; Default älterer Builds erzwingen.
+            conn = real_connect(*args, **kwargs)
+            conn.setlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER, 999)
+            return conn
+
+        with patch.object(gs_module.sqlite3, "connect", _connect_with_default_limit):
+            result = graph_store.merge_nodes(ids)
+
+        assert result["merged"] == 599
+        assert all(graph_store.get_node(i) is None for i in ids[1:])
+        edges = [e for e in graph_store.get_edges(ids[0]) if e["target"] == other]
+        assert len(edges) == 1 and edges[0]["weight"] == pytest.approx(1.0)
+
+    def test_merge_tool_accepts_clusters(self, graph_store):
+        """
+        GIVEN: Two duplicate clusters
+        WHEN: graph_merge_nodes(clusters=...) is called once
+        THEN: Both clusters are merged
+        """
+        import memory_mcp.tools as tools_module
+
+        registered = {}
+
+        class MockMCP:
+            def tool(self, func):
+                registered[func.__name__] = func
+                return func
+
+        tools_module.register_tools(MockMCP())
+        a1, a2 = graph_store.add_node("fact", "a"), graph_store.add_node("fact", "a")
+        b1, b2, b3 = (graph_store.add_node("fact", "b") for _ in range(3))
+
+        with patch.object(tools_module, "get_graph_store", return_value=graph_store):
+            result = registered["graph_merge_nodes"](clusters=[[a1, a2], [b1, b2, b3]])
+
+        assert result["structuredContent"]["merged"] == 3
+        assert result["structuredContent"]["clusters"] == 2
+        assert [graph_store.get_node(n) is not None for n in (a1, a2, b1, b2, b3)] == [
+            True, False, True, False, False,
+        ]
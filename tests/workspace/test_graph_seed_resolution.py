@@ -0,0 +1,129 @@
+# tests/workspace/test_graph_seed_resolution.py
+"""
+Unit Tests: content_hash seed resolution for memory_graph_search
+
+Tests:
+- add_node() stores content_hash
+- find_nodes_by_contents() resolves all seeds in one indexed query
+- backfill_content_hashes() fixes nodes created before the migration
+- memory_graph_search reports seed_resolution stats
+"""
+
+import sqlite3
+import sys
+from unittest.mock import MagicMock, patch
+
+
+class TestContentHashLookup:
+
+    def test_add_node_sets_hash_and_lookup_resolves(self, graph_store):
+        """
+        GIVEN: Nodes of different source types (older than any type window)
+        WHEN: find_nodes_by_contents with their contents
+        THEN: Each content maps to its node, unknown content is absent
+        """
+        from graph.graph_store import content_hash
+
+        fact = graph_store.add_node("fact", "Danny likes pizza")
+        for i in range(60):
+            graph_store.add_node("fact", f"filler {i}")
+        skill = graph_store.add_node("skill", "  skill: weather  ")
+
+        resolved = graph_store.find_nodes_by_contents(
+            ["Danny likes pizza", "skill: weather", "unknown"]
+        )
+        assert resolved == {"Danny likes pizza": fact, "skill: weather": skill}
+
+        conn = sqlite3.connect(graph_store.db_path)
+        try:
+            stored = conn.execute(
+                "SELECT content_hash FROM graph_nodes WHERE id = ?", (fact,)
+            ).fetchone()[0]
+        finally:
+            conn.close()
+        assert stored == content_hash("Danny likes pizza")
+
+    def test_duplicate_content_resolves_to_newest(self, graph_store):
+        """
+        GIVEN: Two nodes with identical content
+        WHEN: The content is resolved
+        THEN: The newest node wins
+        """
+        graph_store.add_node("fact", "same")
+        newer = graph_store.add_node("fact", "same")
+        assert graph_store.find_nodes_by_contents(["same"]) == {"same": newer}
+
+    def test_backfill_hashes_legacy_nodes(self, graph_store):
+        """
+        GIVEN: Nodes without content_hash (pre-migration rows)
+        WHEN: backfill_content_hashes runs
+        THEN: All nodes become resolvable
+        """
+        ids = [graph_store.add_node("fact", f"legacy {i}") for i in range(5)]
+        conn = sqlite3.connect(graph_store.db_path)
+        conn.execute("UPDATE graph_nodes SET content_hash = NULL")
+        conn.commit()
+        conn.close()
+        assert graph_store.find_nodes_by_contents(["legacy 0"]) == {}
+
+        result = graph_store.backfill_content_hashes(batch_size=2)
+
+        assert result == {"updated": 5, "remaining": 0}
+        assert graph_store.find_nodes_by_contents(["legacy 0", "legacy 4"]) == {
+            "legacy 0": ids[0],
+            "legacy 4": ids[4],
+        }
+
+
+class TestGraphSearchSeedResolution:
+
+    def _register(self, graph_store, seeds):
+        registered = {}
+
+        class MockMCP:
+            def tool(self, func):
+                registered[func.__name__] = func
+                return func
+
+        import memory_mcp.tools as tools_module
+
+        vs = MagicMock()
+        vs.search.return_value = seeds
+        vs_module = MagicMock()
+        vs_module.get_vector_store.return_value = vs
+
+        patches = [
+            patch.object(tools_module, "get_graph_store", return_value=graph_store),
+            patch.dict(sys.modules, {"vector_store": vs_module}),
+        ]
+        tools_module.register_tools(MockMCP())
+        return registered, patches
+
+    def test_graph_search_uses_hash_and_reports_stats(self, graph_store):
+        """
+        GIVEN: Two seeds, one backed by a graph node with a neighbor
+        WHEN: memory_graph_search runs
+        THEN: The walk starts from the resolved node and stats show 1/2 resolved
+        """
+        root = graph_store.add_node("fact", "Server runs on Proxmox")
+        neighbor = graph_store.add_node("fact", "Proxmox host has 64GB")
+        graph_store.add_edge(root, neighbor, "semantic", weight=0.9)
+
+        seeds = [
+            {"content": "Server runs on Proxmox", "similarity": 0.9},
+            {"content": "not in graph", "similarity": 0.8},
+        ]
+        registered, patches = self._register(graph_store, seeds)
+        for p in patches:
+            p.start()
+        try:
+            with patch.object(graph_store, "get_nodes_by_type") as by_type:
+                result = registered["memory_graph_search"]("proxmox")
+        finally:
+            for p in reversed(patches):
+                p.stop()
+
+        by_type.assert_not_called()
+        assert result["source"] == "graph_walk"
+        assert result["seed_resolution"] == {"seeds": 2, "resolved": 1}
+        assert {r["node_id"] for r in result["results"]} == {root, neighbor}
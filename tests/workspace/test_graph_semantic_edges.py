@@ -0,0 +1,143 @@
+# tests/workspace/test_graph_semantic_edges.py
+"""
+Unit Tests: k-NN semantic edges in GraphBuilder
+
+Tests:
+- new nodes link to similar nodes older than the last 100
+- k / threshold limit the number of semantic edges
+- relink_semantic_edges() rebuilds semantic edges for the whole graph
+- pure-Python scan fallback without NumPy
+- node deletes/merges are applied as deltas, not rebuilds
+"""
+
+import random
+from unittest.mock import patch
+
+import pytest
+
+
+def _vec(seed, dim=8):
+    rng = random.Random(seed)
+    return [rng.uniform(-1, 1) for _ in range(dim)]
+
+
+def _near(base, seed, noise=0.02):
+    rng = random.Random(seed)
+    return [v + rng.uniform(-noise, noise) for v in base]
+
+
+@pytest.fixture
+def builder(graph_store):
+    import graph.graph_store as gs_module
+    from graph import graph_builder
+
+    gs_module._graph_store = graph_store
+    yield graph_builder
+    gs_module._graph_store = None
+
+
+def _semantic_targets(store, node_id):
+    return {e["target"] for e in store.get_edges(node_id) if e["type"] == "semantic" and e["source"] == node_id}
+
+
+class TestSemanticEdges:
+
+    def test_links_node_older_than_recent_window(self, graph_store, builder):
+        """
+        GIVEN: A related node followed by 150 unrelated nodes
+        WHEN: A new node with a near-identical embedding is built
+        THEN: It gets a semantic edge to the old related node
+        """
+        base = _vec(1)
+        old = graph_store.add_node("fact", "old related", embedding=base)
+        for i in range(150):
+            graph_store.add_node("fact", f"unrelated {i}", embedding=_vec(1000 + i))
+
+        new = builder.build_node_with_edges("fact", "new related", embedding=_near(base, 2))
+
+        assert old in _semantic_targets(graph_store, new)
+
+    def test_k_and_threshold_limit_edges(self, graph_store, builder):
+        """
+        GIVEN: 8 near-identical nodes
+        WHEN: Semantic edges are created with k=3
+        THEN: Exactly 3 edges; an impossible threshold creates none
+        """
+        base = _vec(5)
+        for i in range(8):
+            graph_store.add_node("fact", f"twin {i}", embedding=_near(base, 10 + i))
+        node = graph_store.add_node("fact", "probe", embedding=base)
+
+        builder._create_semantic_edges(node, base, k=3)
+        assert len(_semantic_targets(graph_store, node)) == 3
+
+        other = graph_store.add_node("fact", "probe 2", embedding=base)
+        builder._create_semantic_edges(other, base, threshold=1.01)
+        assert _semantic_targets(graph_store, other) == set()
+
+    def test_relink_replaces_semantic_edges(self, graph_store, builder):
+        """
+        GIVEN: Two similar nodes, one unrelated, and a stale semantic edge
+        WHEN: relink_semantic_edges runs in small batches
+        THEN: Stale edge removed, similar pair linked both ways, temporal edges kept
+        """
+        base = _vec(7)
+        a = graph_store.add_node("fact", "a", embedding=base)
+        b = graph_store.add_node("fact", "b", embedding=_near(base, 8))
+        c = graph_store.add_node("fact", "c", embedding=[-v for v in base])
+        graph_store.add_edge(a, c, "semantic", weight=0.9)
+        graph_store.add_edge(a, c, "temporal", weight=1.0)
+
+        stats = builder.relink_semantic_edges(batch_size=2, k=5, threshold=0.7)
+
+        assert stats["nodes"] == 3
+        assert stats["batches"] == 2
+        assert stats["edges_removed"] == 1
+        assert _semantic_targets(graph_store, a) == {b}
+        assert _semantic_targets(graph_store, b) == {a}
+        assert _semantic_targets(graph_store, c) == set()
+        assert any(e["type"] == "temporal" for e in graph_store.get_edges(c))
+
+    def test_scan_fallback_without_numpy(self, graph_store, builder):
+        """
+        GIVEN: NumPy unavailable
+        WHEN: Semantic edges are created
+        THEN: The exact SQL scan finds the same neighbor
+        """
+        from graph import node_index
+
+        base = _vec(9)
+        old = graph_store.add_node("fact", "old", embedding=base)
+        with patch.object(node_index, "_np", None):
+            new = builder.build_node_with_edges("fact", "new", embedding=_near(base, 3))
+            idx = node_index.get_node_index(graph_store.db_path)
+            assert idx.stats["scan_searches"] >= 1
+
+        assert _semantic_targets(graph_store, new) == {old}
+
+    def test_delete_and_merge_apply_delta_without_rebuild(self, graph_store, builder):
+        """
+        GIVEN: A built node index
+        WHEN: Nodes are deleted and merged behind its back
+        THEN: The next search drops them via a delta sync, no rebuild
+        """
+        pytest.importorskip("numpy")
+        import ann_index
+        from graph import node_index
+
+        base = _vec(11)
+        a = graph_store.add_node("fact", "a", embedding=base)
+        b = graph_store.add_node("fact", "b", embedding=_near(base, 12))
+        c = graph_store.add_node("fact", "c", embedding=_near(base, 13))
+        graph_store.add_node("fact", "other dim", embedding=_vec(14, dim=4))
+        idx = node_index.GraphNodeIndex(graph_store.db_path)
+        assert {n for n, _ in idx.search(base, 5, 0.5)} == {a, b, c}
+
+        graph_store.delete_node(c)
+        graph_store.merge_nodes([a, b])
+        with patch.object(ann_index, "ANN_CHECKSUM_TTL_S", 0.0):
+            hits = idx.search(base, 5, 0.5)
+
+        assert [n for n, _ in hits] == [a]
+        assert idx.stats["builds"] == 1
+        assert idx.stats["delta_syncs"] == 1
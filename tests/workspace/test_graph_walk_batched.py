@@ -0,0 +1,109 @@
+# tests/workspace/test_graph_walk_batched.py
+"""
+Unit Tests: set-based GraphStore.graph_walk
+
+Tests:
+- one SQLite connection per walk, one node + one edge query per level
+- min_weight / edge_types filters
+- max_nodes budget
+- result shape unchanged (get_node fields + depth)
+"""
+
+import sqlite3
+from unittest.mock import patch
+
+
+def _chain(store, n, edge_type="temporal", weight=1.0):
+    ids = [store.add_node("fact", f"node {i}") for i in range(n)]
+    for a, b in zip(ids, ids[1:]):
+        store.add_edge(a, b, edge_type, weight=weight)
+    return ids
+
+
+class TestGraphWalkBatched:
+
+    def test_walk_uses_single_connection(self, graph_store):
+        """
+        GIVEN: A chain of 6 nodes
+        WHEN: graph_walk with depth=5
+        THEN: Exactly one sqlite3.connect call, all nodes found with depths 0..4
+        """
+        ids = _chain(graph_store, 6)
+        real_connect = sqlite3.connect
+
+        with patch("graph.graph_store.sqlite3.connect", side_effect=real_connect) as connect:
+            results = graph_store.graph_walk([ids[0]], depth=5, limit=10)
+
+        assert connect.call_count == 1
+        assert [r["id"] for r in results] == ids[:5]
+        assert [r["depth"] for r in results] == [0, 1, 2, 3, 4]
+
+    def test_result_shape_matches_get_node(self, graph_store):
+        """
+        GIVEN: A single node
+        WHEN: graph_walk starts at it
+        THEN: Result carries all get_node fields plus depth
+        """
+        node_id = graph_store.add_node("fact", "shape", conversation_id="c1", confidence=0.7)
+        result = graph_store.graph_walk([node_id], depth=1)[0]
+
+        expected = dict(graph_store.get_node(node_id), depth=0)
+        assert result == expected
+
+    def test_min_weight_filters_edges(self, graph_store):
+        """
+        GIVEN: root --0.9--> strong, root --0.2--> weak
+        WHEN: graph_walk with min_weight=0.5
+        THEN: Only the strong neighbor is reached
+        """
+        root = graph_store.add_node("fact", "root")
+        strong = graph_store.add_node("fact", "strong")
+        weak = graph_store.add_node("fact", "weak")
+        graph_store.add_edge(root, strong, "semantic", weight=0.9)
+        graph_store.add_edge(root, weak, "semantic", weight=0.2)
+
+        ids = {r["id"] for r in graph_store.graph_walk([root], depth=2, min_weight=0.5)}
+        assert ids == {root, strong}
+
+    def test_edge_type_filter(self, graph_store):
+        """
+        GIVEN: root --temporal--> a, root --semantic--> b
+        WHEN: graph_walk with edge_types="semantic"
+        THEN: Only b is reached
+        """
+        root = graph_store.add_node("fact", "root")
+        a = graph_store.add_node("fact", "a")
+        b = graph_store.add_node("fact", "b")
+        graph_store.add_edge(root, a, "temporal")
+        graph_store.add_edge(root, b, "semantic")
+
+        ids = {r["id"] for r in graph_store.graph_walk([root], depth=2, edge_types="semantic")}
+        assert ids == {root, b}
+        ids = {r["id"] for r in graph_store.graph_walk([root], depth=2, edge_types=["semantic", "temporal"])}
+        assert ids == {root, a, b}
+
+    def test_node_budget_caps_walk(self, graph_store):
+        """
+        GIVEN: A hub with 20 outgoing edges
+        WHEN: graph_walk with max_nodes=5
+        THEN: At most 5 nodes visited, limit not reached
+        """
+        hub = graph_store.add_node("fact", "hub")
+        for i in range(20):
+            graph_store.add_edge(hub, graph_store.add_node("fact", f"leaf {i}"), "semantic")
+
+        results = graph_store.graph_walk([hub], depth=3, limit=50, max_nodes=5)
+        assert len(results) == 5
+        assert results[0]["id"] == hub
+
+    def test_cycles_and_duplicate_seeds(self, graph_store):
+        """
+        GIVEN: A 3-cycle and duplicated start ids
+        WHEN: graph_walk with depth=5
+        THEN: Every node appears exactly once
+        """
+        ids = _chain(graph_store, 3)
+        graph_store.add_edge(ids[2], ids[0], "temporal")
+
+        results = graph_store.graph_walk([ids[0], ids[0], ids[1]], depth=5)
+        assert sorted(r["id"] for r in results) == sorted(ids)
@@ -220,6 +220,47 @@ def _install_package_in_executor_venv(package_name: str) -> tuple[bool, str]:
 def health_check():
     return {"status": "active", "layer": 4, "role": "execution_runtime", "version": "1.1.0"}
 
+
+def _skill_worker_pool():
+    # Lazy: Tests mocken `engine` in sys.modules, das Pool-Modul ist dort nicht registriert
+    from engine.skill_worker_pool import get_skill_worker_pool
+    return get_skill_worker_pool()
+
+
+def _invalidate_skill_caches(skill_name: str) -> None:
+    # Pool-Worker haben eigene SkillRunner-Modul-Caches → mit invalidieren.
+    # Nie importiertes Pool-Modul = kein laufender Pool (und in Tests ist
+    # `engine` evtl. gemockt).
+    get_skill_runner().invalidate_skill(skill_name)
+    pool_module = sys.modules.get("engine.skill_worker_pool")
+    pool = pool_module.get_skill_worker_pool() if pool_module is not None else None
+    if pool is not None and pool.is_running():
+        pool.invalidate_skill(skill_name)
+
+
+@app.on_event("startup")
+def start_skill_worker_pool():
+    # Pre-fork vor dem ersten Request: Skills laufen nicht im Event-Loop
+    pool = _skill_worker_pool()
+    if pool is not None:
+        pool.start()
+
+
+@app.on_event("shutdown")
+def stop_skill_worker_pool():
+    pool = _skill_worker_pool()
+    if pool is not None:
+        pool.stop()
+
+
+@app.get("/v1/skills/pool")
+def skill_pool_metrics():
+    """Worker pool utilisation (busy/idle/queued, timeouts, respawns)."""
+    pool = _skill_worker_pool()
+    if pool is None:
+        return {"enabled": False}
+    return {"enabled": True, **pool.get_metrics()}
+
 @app.post("/v1/skills/create")
 async def create_skill(request: CreateSkillRequest):
     """
@@ -332,6 +373,7 @@ async def create_skill(request: CreateSkillRequest):
             manifest_data=manifest_data,
             is_draft=is_draft,
         )
+        _invalidate_skill_caches(os.path.basename(install_result.get("path") or request.name))
         EventLogger.emit(
             "validation_complete",
             {"name": request.name, "action": action, "score": cd.get("validation_score", 0.0)},
@@ -387,6 +429,7 @@ async def create_skill(request: CreateSkillRequest):
             manifest_data=manifest_data,
             is_draft=is_draft,
         )
+        _invalidate_skill_caches(os.path.basename(install_result.get("path") or request.name))
         return {
             **decision.to_dict(),
             "installation": install_result,
@@ -411,12 +454,25 @@ async def run_skill(request: RunSkillRequest):
         "action": request.action
     }, status="received")
     
-    runner = get_skill_runner()
-    result = await runner.run(
-        skill_name=request.name,
-        action=request.action,
-        args=request.args
-    )
+    pool = _skill_worker_pool()
+    if pool is not None and pool.is_running():
+        from engine.skill_worker_pool import SkillPoolSaturated
+        try:
+            result = await pool.run(
+                skill_name=request.name,
+                action=request.action,
+                args=request.args
+            )
+        except SkillPoolSaturated as e:
+            EventLogger.emit("skill_run_rejected", {"name": request.name, "reason": str(e)}, status="rejected")
+            raise HTTPException(status_code=429, detail=str(e))
+    else:
+        runner = get_skill_runner()
+        result = await runner.run(
+            skill_name=request.name,
+            action=request.action,
+            args=request.args
+        )
     
     if not result.success:
         EventLogger.emit("skill_run_failed", {
@@ -483,6 +539,7 @@ async def install_skill_from_registry(request: InstallSkillRequest):
             "gap_question": skill_data.get("gap_question"),
             "preferred_model": skill_data.get("preferred_model"),
             "default_params": skill_data.get("default_params", {}),
+            "stateless": skill_data.get("stateless") is True,
         }
         install_result = installer.save_skill(
             name=request.name,
@@ -490,6 +547,7 @@ async def install_skill_from_registry(request: InstallSkillRequest):
             manifest_data=manifest_data,
             is_draft=False,
         )
+        _invalidate_skill_caches(os.path.basename(install_result.get("path") or request.name))
 
         EventLogger.emit("skill_installed_from_registry", {
             "name": request.name,
@@ -522,6 +580,8 @@ async def uninstall_skill(request: UninstallSkillRequest):
     """
     installer = SkillInstaller(skills_dir=os.getenv("SKILLS_DIR", "/skills"))
     result = installer.uninstall_skill(request.name)
+    if result.get("success"):
+        _invalidate_skill_caches(request.name)
     return result
 
 @app.post("/v1/validation/code")
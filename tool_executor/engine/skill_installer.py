@@ -114,6 +114,9 @@ class SkillInstaller:
             "preferred_model": manifest_data.get("preferred_model") or None,
             "default_params": manifest_data.get("default_params", {}),
         }
+        if manifest_data.get("stateless") is True:
+            # SkillRunner darf den initialisierten Modul-Namespace wiederverwenden
+            manifest["stateless"] = True
         
         with open(target_dir / "manifest.yaml", "w") as f:
             yaml.dump(manifest, f, default_flow_style=False)
@@ -11,18 +11,26 @@ Security Features:
 
 import importlib.util
 import asyncio
+import hashlib
 import os
 import sys
 import signal
 import json
 import re
+import time
 import urllib.request
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Optional, Callable
+from typing import Dict, Any, Optional, Callable, Tuple
 from dataclasses import dataclass
 from contextlib import contextmanager
 import threading
 
+try:
+    import yaml
+except ImportError:  # pragma: no cover - yaml ships with the executor image
+    yaml = None
+
 # Observability
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from observability.events import EventLogger
@@ -97,6 +105,12 @@ BLOCKED_MODULES = {
 
 EXECUTOR_PYTHON_VENV = os.getenv("EXECUTOR_PYTHON_VENV", "/tmp/trion-tool-executor-venv")
 
+# Compiled-module cache: (skill, entrypoint, sha256) -> code object.
+# Skills whose manifest declares `stateless: true` also keep their initialized
+# module namespace between runs.
+SKILL_MODULE_CACHE = os.getenv("SKILL_MODULE_CACHE", "true").strip().lower() not in {"0", "false", "no", "off"}
+SKILL_MODULE_CACHE_MAX = int(os.getenv("SKILL_MODULE_CACHE_MAX", "128"))
+
 
 def _venv_site_packages_paths(venv_dir: str) -> list[str]:
     """Return candidate site-packages paths for the configured venv."""
@@ -264,6 +278,44 @@ def create_restricted_import() -> Callable:
     return restricted_import
 
 
+@dataclass
+class _CompiledSkill:
+    """Cached compile result for one skill entrypoint."""
+    skill_name: str
+    path: str
+    content_hash: str
+    file_sig: tuple
+    code: Any
+    stateless: bool = False
+    namespace: Optional[Dict[str, Any]] = None
+    cold_load_ms: float = 0.0
+    hits: int = 0
+
+    @property
+    def key(self) -> Tuple[str, str, str]:
+        return (self.skill_name, self.path, self.content_hash)
+
+
+def _stat_sig(path: Path) -> Optional[tuple]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
+
+def _manifest_declares_stateless(skill_dir: Path) -> bool:
+    manifest_path = skill_dir / "manifest.yaml"
+    if yaml is None or not manifest_path.exists():
+        return False
+    try:
+        with open(manifest_path, "r") as f:
+            manifest = yaml.safe_load(f) or {}
+    except Exception:
+        return False
+    return isinstance(manifest, dict) and manifest.get("stateless") is True
+
+
 class TimeoutError(Exception):
     """Raised when skill execution times out."""
     pass
@@ -295,6 +347,9 @@ class SkillRunner:
         self._inject_executor_venv_site_packages()
         self.restricted_builtins = create_restricted_builtins()
         self.restricted_import = create_restricted_import()
+        self._module_cache: "OrderedDict[Tuple[str, str], _CompiledSkill]" = OrderedDict()
+        self._module_cache_lock = threading.Lock()
+        self._module_cache_stats = {"cold": 0, "warm": 0, "namespace_reuse": 0, "invalidations": 0}
 
     def _inject_executor_venv_site_packages(self):
         """
@@ -317,13 +372,9 @@ class SkillRunner:
         
         return None
     
-    def _load_module_sandboxed(self, skill_name: str, entrypoint: Path) -> Any:
-        """Load a skill module with sandbox restrictions."""
-        
-        # Read the source code
-        with open(entrypoint, 'r') as f:
-            source_code = f.read()
-        
+    def _build_restricted_globals(self, skill_name: str, entrypoint: Path) -> Dict[str, Any]:
+        """Fresh restricted module globals (incl. get_secret) for one skill."""
+
         # Inject get_secret() — resolves encrypted API keys at runtime
         _secrets_resolve_url = os.getenv(
             "SECRETS_API_URL",
@@ -386,12 +437,106 @@ class SkillRunner:
         
         # Add restricted import to builtins
         self.restricted_builtins['__import__'] = self.restricted_import
-        
-        # Compile and execute in sandbox
-        compiled = compile(source_code, str(entrypoint), 'exec')
-        exec(compiled, restricted_globals)
-        
+
         return restricted_globals
+
+    def _compiled_skill(self, skill_name: str, entrypoint: Path) -> Tuple[_CompiledSkill, bool]:
+        """
+        Return the cached compile result for `entrypoint` and whether it was a hit.
+        A changed stat signature (entrypoint or manifest) triggers a re-hash; only a
+        changed content hash forces a recompile and drops a kept namespace.
+        """
+        cache_key = (skill_name, str(entrypoint))
+        file_sig = (_stat_sig(entrypoint), _stat_sig(entrypoint.parent / "manifest.yaml"))
+        with self._module_cache_lock:
+            entry = self._module_cache.get(cache_key)
+            if entry is not None and entry.file_sig == file_sig:
+                self._module_cache.move_to_end(cache_key)
+                return entry, True
+
+        started = time.perf_counter()
+        source = entrypoint.read_bytes()
+        content_hash = hashlib.sha256(source).hexdigest()
+        stateless = _manifest_declares_stateless(entrypoint.parent)
+        if entry is not None and entry.content_hash == content_hash:
+            entry.file_sig = file_sig
+            if entry.stateless != stateless:
+                entry.stateless = stateless
+                entry.namespace = None
+            return entry, True
+
+        code = compile(source, str(entrypoint), 'exec')
+        entry = _CompiledSkill(
+            skill_name=skill_name,
+            path=str(entrypoint),
+            content_hash=content_hash,
+            file_sig=file_sig,
+            code=code,
+            stateless=stateless,
+            cold_load_ms=(time.perf_counter() - started) * 1000,
+        )
+        if SKILL_MODULE_CACHE:
+            with self._module_cache_lock:
+                self._module_cache[cache_key] = entry
+                self._module_cache.move_to_end(cache_key)
+                while len(self._module_cache) > max(1, SKILL_MODULE_CACHE_MAX):
+                    self._module_cache.popitem(last=False)
+        return entry, False
+
+    def _load_module_cached(self, skill_name: str, entrypoint: Path) -> Tuple[Dict[str, Any], str, _CompiledSkill]:
+        """
+        Load a skill module with sandbox restrictions.
+        Returns (module globals, cache mode, entry); mode is "cold", "warm"
+        (cached code, fresh module body) or "namespace" (stateless skill reused).
+        """
+        entry, hit = self._compiled_skill(skill_name, entrypoint)
+        if hit and entry.stateless and entry.namespace is not None:
+            mode = "namespace"
+            module_globals = entry.namespace
+        else:
+            mode = "warm" if hit else "cold"
+            module_globals = self._build_restricted_globals(skill_name, entrypoint)
+            exec(entry.code, module_globals)
+            if entry.stateless and SKILL_MODULE_CACHE:
+                entry.namespace = module_globals
+        with self._module_cache_lock:
+            if hit:
+                entry.hits += 1
+            self._module_cache_stats["namespace_reuse" if mode == "namespace" else mode] += 1
+        return module_globals, mode, entry
+
+    def _load_module_sandboxed(self, skill_name: str, entrypoint: Path) -> Any:
+        """Load a skill module with sandbox restrictions."""
+        module_globals, _mode, _entry = self._load_module_cached(skill_name, entrypoint)
+        return module_globals
+
+    def invalidate_skill(self, skill_name: Optional[str] = None) -> int:
+        """Drop cached modules for one skill (install/uninstall) or all skills."""
+        with self._module_cache_lock:
+            keys = [k for k in self._module_cache if skill_name is None or k[0] == skill_name]
+            for key in keys:
+                self._module_cache.pop(key, None)
+            self._module_cache_stats["invalidations"] += len(keys)
+        if keys:
+            EventLogger.emit("skill_module_cache_invalidated", {"skill": skill_name, "entries": len(keys)})
+        return len(keys)
+
+    def get_module_cache_stats(self) -> Dict[str, Any]:
+        with self._module_cache_lock:
+            return {
+                **self._module_cache_stats,
+                "enabled": SKILL_MODULE_CACHE,
+                "entries": len(self._module_cache),
+                "skills": {
+                    entry.skill_name: {
+                        "content_hash": entry.content_hash[:12],
+                        "stateless": entry.stateless,
+                        "hits": entry.hits,
+                        "cold_load_ms": round(entry.cold_load_ms, 3),
+                    }
+                    for entry in self._module_cache.values()
+                },
+            }
     
     async def run(
         self, 
@@ -410,7 +555,6 @@ class SkillRunner:
         Returns:
             ExecutionResult with success status and result/error
         """
-        import time
         start_time = time.time()
         args = args or {}
         violations = []
@@ -432,7 +576,9 @@ class SkillRunner:
         try:
             # 2. Load module in sandbox with timeout
             with timeout_context(self.timeout_seconds):
-                module_globals = self._load_module_sandboxed(skill_name, entrypoint)
+                load_started = time.perf_counter()
+                module_globals, cache_mode, cache_entry = self._load_module_cached(skill_name, entrypoint)
+                load_ms = (time.perf_counter() - load_started) * 1000
                 
                 # 3. Find and call the action
                 if action not in module_globals:
@@ -460,7 +606,10 @@ class SkillRunner:
                 EventLogger.emit("skill_run_complete", {
                     "skill": skill_name,
                     "action": action,
-                    "execution_time_ms": execution_time
+                    "execution_time_ms": execution_time,
+                    "module_cache": cache_mode,
+                    "load_ms": round(load_ms, 3),
+                    "cold_load_ms": round(cache_entry.cold_load_ms, 3),
                 })
                 
                 return ExecutionResult(
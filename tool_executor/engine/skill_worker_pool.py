@@ -0,0 +1,475 @@
+"""
+Pre-forked Skill Worker Pool - Layer 4 Tool Executor
+
+Runs skills in a fixed set of forked worker processes instead of the API
+event loop. Every worker owns its own SkillRunner (same restricted builtins /
+import sandbox, same module cache) and executes one call at a time on its main
+thread, so SIGALRM timeouts work again.
+
+Limits per call:
+- wall clock: SIGALRM inside the worker, plus a hard deadline in the parent
+  (timeout + grace) after which the worker is SIGKILLed and respawned
+- CPU: RLIMIT_CPU soft limit relative to the worker's current usage
+  (SIGXCPU → SkillCpuLimitExceeded)
+
+Backpressure: at most `size` calls run, at most `max_queue` wait; further
+calls raise SkillPoolSaturated immediately.
+
+Cache coherence: invalidate_skill() queues the skill name for every worker;
+it is sent along with that worker's next call, before the skill runs.
+
+Workers (initial and replacements) come from a forkserver
+(SKILL_WORKER_START_METHOD) when this module is importable by name, so none
+is forked from the live, multi-threaded API process; otherwise they are
+forked. Respawns happen off the event loop (asyncio.to_thread).
+"""
+
+import asyncio
+import importlib.util
+import multiprocessing
+import os
+import pickle
+import signal
+import sys
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - non-Unix
+    resource = None
+
+# Observability
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from observability.events import EventLogger
+
+
+def _load_skill_runner():
+    """
+    Load skill_runner by absolute path so the pool also works when
+    sys.modules["engine"] has been mocked in tests (see skill_installer).
+    """
+    _name = "_skill_runner_impl"
+    if _name in sys.modules:
+        return sys.modules[_name]
+    _path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "skill_runner.py")
+    spec = importlib.util.spec_from_file_location(_name, _path)
+    mod = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(mod)
+    sys.modules[_name] = mod
+    return mod
+
+
+SKILL_WORKER_POOL = os.getenv("SKILL_WORKER_POOL", "true").strip().lower() not in {"0", "false", "no", "off"}
+SKILL_WORKER_POOL_SIZE = int(os.getenv("SKILL_WORKER_POOL_SIZE", str(os.cpu_count() or 2)))
+SKILL_WORKER_QUEUE_MAX = int(os.getenv("SKILL_WORKER_QUEUE_MAX", "32"))
+SKILL_CPU_LIMIT_SECONDS = int(os.getenv("SKILL_CPU_LIMIT_SECONDS", os.getenv("SKILL_TIMEOUT", "30")))
+SKILL_WORKER_KILL_GRACE_S = float(os.getenv("SKILL_WORKER_KILL_GRACE_S", "2"))
+SKILL_WORKER_START_METHOD = os.getenv("SKILL_WORKER_START_METHOD", "forkserver").strip().lower()
+
+
+class SkillPoolSaturated(RuntimeError):
+    """Raised when all workers are busy and the wait queue is full."""
+
+
+class SkillCpuLimitExceeded(Exception):
+    """Raised inside a worker when a skill exceeds its CPU budget."""
+
+
+# === WORKER PROCESS ===
+
+def _on_cpu_limit(signum, frame):
+    raise SkillCpuLimitExceeded("Skill exceeded its CPU time limit")
+
+
+def _set_cpu_limit(cpu_seconds: int) -> Optional[tuple]:
+    if resource is None or cpu_seconds <= 0:
+        return None
+    previous = resource.getrlimit(resource.RLIMIT_CPU)
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    soft = int(usage.ru_utime + usage.ru_stime) + int(cpu_seconds)
+    hard = previous[1]
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+    return previous
+
+
+def _picklable(payload: Dict[str, Any]) -> Dict[str, Any]:
+    try:
+        pickle.dumps(payload)
+        return payload
+    except Exception:
+        return {**payload, "result": repr(payload.get("result"))}
+
+
+def _worker_main(conn, skills_dir: str, timeout_seconds: int) -> None:
+    """Worker loop: one request at a time, `None` means shut down."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    if resource is not None:
+        signal.signal(signal.SIGXCPU, _on_cpu_limit)
+
+    runner = _load_skill_runner().SkillRunner(skills_dir=skills_dir, timeout_seconds=timeout_seconds)
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            break
+        if msg is None:
+            break
+
+        for skill in msg.get("invalidate") or ():
+            runner.invalidate_skill(skill or None)
+        runner.timeout_seconds = int(msg.get("timeout") or timeout_seconds)
+        previous = _set_cpu_limit(int(msg.get("cpu") or 0))
+        try:
+            result = asyncio.run(runner.run(msg["skill"], action=msg["action"], args=msg.get("args") or {}))
+            payload = result.to_dict()
+        except SkillCpuLimitExceeded as e:
+            payload = {"success": False, "result": None, "error": f"SkillCpuLimitExceeded: {e}",
+                       "execution_time_ms": 0, "sandbox_violations": []}
+        finally:
+            if previous is not None:
+                resource.setrlimit(resource.RLIMIT_CPU, previous)
+        try:
+            conn.send({"id": msg.get("id"), "result": _picklable(payload)})
+        except (BrokenPipeError, OSError):
+            break
+
+
+# === PARENT SIDE ===
+
+def _worker_context(method: str):
+    """
+    Start context for all workers; falls back to fork.
+    forkserver/spawn children unpickle _worker_main by module name, so this
+    module must be importable as `__name__` from the same file.
+    """
+    fork = multiprocessing.get_context("fork")
+    if method in ("", "fork") or method not in multiprocessing.get_all_start_methods():
+        return fork
+    try:
+        spec = importlib.util.find_spec(__name__)
+    except (ImportError, ValueError, AttributeError):
+        return fork
+    if spec is None or not spec.origin or os.path.abspath(spec.origin) != os.path.abspath(__file__):
+        return fork
+    return multiprocessing.get_context(method)
+
+
+class _Worker:
+    def __init__(self, process, conn):
+        self.process = process
+        self.conn = conn
+        self.calls = 0
+        self.started_at = time.time()
+        # Skill-Namen, deren Modul-Cache beim nächsten Call verworfen wird ("" = alle)
+        self.pending_invalidations: set = set()
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self.process.pid
+
+    def kill(self) -> None:
+        try:
+            if self.process.is_alive():
+                self.process.kill()
+            self.process.join(timeout=2)
+        except Exception:
+            pass
+        try:
+            self.conn.close()
+        except Exception:
+            pass
+
+
+class SkillWorkerPool:
+    """Fixed-size pool of pre-forked skill workers."""
+
+    def __init__(
+        self,
+        skills_dir: str = "/skills",
+        size: int = SKILL_WORKER_POOL_SIZE,
+        timeout_seconds: int = 30,
+        cpu_seconds: int = SKILL_CPU_LIMIT_SECONDS,
+        max_queue: int = SKILL_WORKER_QUEUE_MAX,
+        kill_grace_s: float = SKILL_WORKER_KILL_GRACE_S,
+        start_method: str = SKILL_WORKER_START_METHOD,
+    ):
+        self.skills_dir = skills_dir
+        self.size = max(1, int(size))
+        self.timeout_seconds = int(timeout_seconds)
+        self.cpu_seconds = int(cpu_seconds)
+        self.max_queue = max(0, int(max_queue))
+        self.kill_grace_s = float(kill_grace_s)
+        self._ctx = _worker_context(start_method)
+        self._lock = threading.Lock()
+        self._workers: list = []
+        self._idle: deque = deque()
+        self._waiters: deque = deque()
+        self._busy = 0
+        self._next_id = 0
+        self._running = False
+        self._metrics = {
+            "completed": 0, "failed": 0, "timeouts": 0, "cpu_limit": 0,
+            "crashes": 0, "respawns": 0, "rejected": 0,
+            "wait_ms_total": 0.0, "run_ms_total": 0.0,
+        }
+
+    # ── lifecycle ───────────────────────────────────────────────
+
+    def _spawn(self) -> _Worker:
+        parent_conn, child_conn = self._ctx.Pipe(duplex=True)
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(child_conn, self.skills_dir, self.timeout_seconds),
+            name="skill-worker",
+            daemon=True,
+        )
+        process.start()
+        child_conn.close()
+        return _Worker(process, parent_conn)
+
+    def start(self) -> "SkillWorkerPool":
+        with self._lock:
+            if self._running:
+                return self
+            self._running = True
+            for _ in range(self.size):
+                worker = self._spawn()
+                self._workers.append(worker)
+                self._idle.append(worker)
+        EventLogger.emit("skill_pool_started", {"size": self.size, "max_queue": self.max_queue})
+        return self
+
+    def stop(self) -> None:
+        with self._lock:
+            self._running = False
+            workers, self._workers = self._workers, []
+            self._idle.clear()
+            waiters, self._waiters = list(self._waiters), deque()
+        for fut in waiters:
+            fut.get_loop().call_soon_threadsafe(_cancel_if_pending, fut)
+        for worker in workers:
+            try:
+                worker.conn.send(None)
+                worker.process.join(timeout=1)
+            except Exception:
+                pass
+            worker.kill()
+
+    def is_running(self) -> bool:
+        return self._running
+
+    def invalidate_skill(self, skill_name: Optional[str] = None) -> None:
+        """Drop a skill's (or all) cached modules in every worker before its next call."""
+        with self._lock:
+            for worker in self._workers:
+                worker.pending_invalidations.add(skill_name or "")
+        EventLogger.emit("skill_pool_invalidated", {"skill": skill_name, "workers": len(self._workers)})
+
+    def _replace(self, worker: _Worker, reason: str) -> _Worker:
+        """Blocking (join + start); call via asyncio.to_thread from the event loop."""
+        worker.kill()
+        if not self._running:
+            return worker
+        # Neuer Worker hat einen leeren Modul-Cache → keine offenen Invalidierungen
+        fresh = self._spawn()
+        with self._lock:
+            self._workers = [fresh if w is worker else w for w in self._workers]
+            self._metrics["respawns"] += 1
+        EventLogger.emit("skill_worker_respawned", {"old_pid": worker.pid, "new_pid": fresh.pid, "reason": reason},
+                         status="warning")
+        return fresh
+
+    def _replace_and_release(self, worker: _Worker, reason: str) -> None:
+        self._release(self._replace(worker, reason))
+
+    # ── scheduling ──────────────────────────────────────────────
+
+    async def _acquire(self) -> _Worker:
+        with self._lock:
+            if not self._running:
+                raise SkillPoolSaturated("Skill worker pool is not running")
+            if self._idle:
+                self._busy += 1
+                return self._idle.popleft()
+            if len(self._waiters) >= self.max_queue:
+                self._metrics["rejected"] += 1
+                raise SkillPoolSaturated(
+                    f"Skill worker pool saturated ({self.size} busy, {len(self._waiters)} queued)"
+                )
+            fut = asyncio.get_running_loop().create_future()
+            self._waiters.append(fut)
+        try:
+            return await fut
+        except asyncio.CancelledError:
+            with self._lock:
+                if fut in self._waiters:
+                    self._waiters.remove(fut)
+            if fut.done() and not fut.cancelled():
+                self._release(fut.result())
+            raise
+
+    def _release(self, worker: _Worker) -> None:
+        with self._lock:
+            if not self._running:
+                self._busy = max(0, self._busy - 1)
+                return
+            while self._waiters:
+                fut = self._waiters.popleft()
+                if not fut.done():
+                    fut.get_loop().call_soon_threadsafe(self._hand_over, fut, worker)
+                    return
+            self._busy = max(0, self._busy - 1)
+            self._idle.append(worker)
+
+    def _hand_over(self, fut: asyncio.Future, worker: _Worker) -> None:
+        if fut.done():
+            self._release(worker)
+        else:
+            fut.set_result(worker)
+
+    async def _wait_readable(self, worker: _Worker, timeout: float) -> bool:
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        fd = worker.conn.fileno()
+        loop.add_reader(fd, lambda: ready.done() or ready.set_result(True))
+        try:
+            await asyncio.wait_for(ready, timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            loop.remove_reader(fd)
+
+    async def run(
+        self,
+        skill_name: str,
+        action: str = "run",
+        args: Optional[Dict[str, Any]] = None,
+        timeout_seconds: Optional[int] = None,
+        cpu_seconds: Optional[int] = None,
+    ):
+        """Execute one skill call in a worker. Returns an ExecutionResult."""
+        ExecutionResult = _load_skill_runner().ExecutionResult
+        timeout = int(timeout_seconds or self.timeout_seconds)
+        cpu = self.cpu_seconds if cpu_seconds is None else int(cpu_seconds)
+
+        queued_at = time.perf_counter()
+        worker = await self._acquire()
+        started = time.perf_counter()
+        with self._lock:
+            self._next_id += 1
+            call_id = self._next_id
+            self._metrics["wait_ms_total"] += (started - queued_at) * 1000
+
+        recycle = ""
+        msg = {"id": call_id, "skill": skill_name, "action": action,
+               "args": args or {}, "timeout": timeout, "cpu": cpu}
+        try:
+            with self._lock:
+                invalidate, worker.pending_invalidations = sorted(worker.pending_invalidations), set()
+            try:
+                worker.conn.send({**msg, "invalidate": invalidate})
+            except (BrokenPipeError, OSError):
+                worker = await asyncio.to_thread(self._replace, worker, "dead_before_call")
+                worker.conn.send(msg)
+
+            if not await self._wait_readable(worker, timeout + self.kill_grace_s):
+                recycle = "timeout"
+                result = ExecutionResult(
+                    success=False,
+                    error=f"Skill execution timed out after {timeout} seconds (worker killed)",
+                    execution_time_ms=(time.perf_counter() - started) * 1000,
+                )
+            else:
+                try:
+                    payload = worker.conn.recv()["result"]
+                    result = ExecutionResult(**payload)
+                except (EOFError, OSError):
+                    recycle = "crash"
+                    result = ExecutionResult(
+                        success=False,
+                        error="Skill worker died during execution",
+                        execution_time_ms=(time.perf_counter() - started) * 1000,
+                    )
+                error = result.error or ""
+                if not recycle and error.startswith("Skill execution timed out"):
+                    recycle = "timeout"
+                elif not recycle and error.startswith("SkillCpuLimitExceeded"):
+                    recycle = "cpu_limit"
+        except asyncio.CancelledError:
+            # Aufrufer weg, Worker rechnet evtl. noch → nicht wiederverwenden;
+            # Ersatz im Hintergrund-Thread, das Cancel wird sofort weitergereicht
+            asyncio.get_running_loop().run_in_executor(None, self._replace_and_release, worker, "cancelled")
+            raise
+
+        run_ms = (time.perf_counter() - started) * 1000
+        with self._lock:
+            worker.calls += 1
+            self._metrics["run_ms_total"] += run_ms
+            self._metrics["completed" if result.success else "failed"] += 1
+            if recycle == "timeout":
+                self._metrics["timeouts"] += 1
+            elif recycle == "cpu_limit":
+                self._metrics["cpu_limit"] += 1
+            elif recycle == "crash":
+                self._metrics["crashes"] += 1
+        if recycle:
+            EventLogger.emit("skill_worker_limit", {"skill": skill_name, "reason": recycle, "pid": worker.pid},
+                             status="error")
+            worker = await asyncio.to_thread(self._replace, worker, recycle)
+        self._release(worker)
+        return result
+
+    # ── metrics ─────────────────────────────────────────────────
+
+    def get_metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            m = dict(self._metrics)
+            finished = m["completed"] + m["failed"]
+            return {
+                "running": self._running,
+                "size": self.size,
+                "alive": sum(1 for w in self._workers if w.process.is_alive()),
+                "busy": self._busy,
+                "idle": len(self._idle),
+                "queued": len(self._waiters),
+                "max_queue": self.max_queue,
+                "utilisation": round(self._busy / self.size, 3),
+                "completed": m["completed"],
+                "failed": m["failed"],
+                "timeouts": m["timeouts"],
+                "cpu_limit": m["cpu_limit"],
+                "crashes": m["crashes"],
+                "respawns": m["respawns"],
+                "rejected": m["rejected"],
+                "avg_wait_ms": round(m["wait_ms_total"] / finished, 3) if finished else 0.0,
+                "avg_run_ms": round(m["run_ms_total"] / finished, 3) if finished else 0.0,
+            }
+
+
+def _cancel_if_pending(fut: asyncio.Future) -> None:
+    if not fut.done():
+        fut.cancel()
+
+
+# Singleton instance
+_pool_instance: Optional[SkillWorkerPool] = None
+
+
+def get_skill_worker_pool() -> Optional[SkillWorkerPool]:
+    """Pool singleton; None when SKILL_WORKER_POOL is disabled."""
+    global _pool_instance
+    if not SKILL_WORKER_POOL:
+        return None
+    if _pool_instance is None:
+        _pool_instance = SkillWorkerPool(
+            skills_dir=os.getenv("SKILLS_DIR", "/skills"),
+            timeout_seconds=int(os.getenv("SKILL_TIMEOUT", "30")),
+        )
+    return _pool_instance
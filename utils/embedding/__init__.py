@@ -16,3 +16,8 @@ from utils.embedding.metrics import (  # noqa: F401
     get_metrics,
     reset_metrics,
 )
+from utils.embedding.cache import (  # noqa: F401
+    EmbeddingCache,
+    cache_enabled,
+    get_embedding_cache,
+)
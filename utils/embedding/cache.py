@@ -0,0 +1,233 @@
+"""
+utils/embedding/cache.py — Content-addressed Embedding Cache
+
+Two tiers, keyed by (sha256(text), embedding_version):
+  1. In-process LRU (OrderedDict, EMBEDDING_CACHE_MAX_ENTRIES)
+  2. SQLite table `embedding_cache` in the shared memory DB, so the
+     archive (core) and sql-memory containers reuse each other's vectors.
+
+Vectors are stored as float32 little-endian BLOBs (same format as the
+embeddings table). Every failure is fail-open: a broken cache is a miss.
+
+sql-memory/embedding_cache.py is an inline mirror of this module
+(sql-memory runs in a separate container without access to utils/).
+
+Disable with EMBEDDING_CACHE_ENABLED=false (routing tests opt out via the
+`no_embedding_cache` fixture in tests/conftest.py).
+"""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import sqlite3
+import struct
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_SQLITE_MAX_ROWS = 200_000
+_PRUNE_EVERY_PUTS = 1000
+
+
+def cache_enabled() -> bool:
+    """Read per call so tests/operators can toggle without re-import."""
+    raw = str(os.getenv("EMBEDDING_CACHE_ENABLED", "true")).strip().lower()
+    return raw not in {"0", "false", "no", "off"}
+
+
+def cache_key_text(text: str) -> str:
+    """
+    Normalised cache text = the model input both writers send (stripped).
+    get()/put() key through this, so sql-memory and the archive hit each
+    other's entries regardless of surrounding whitespace.
+    """
+    return str(text or "").strip()
+
+
+def text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _pack(vec: List[float]) -> bytes:
+    return struct.pack(f"<{len(vec)}f", *vec)
+
+
+def _unpack(raw: bytes) -> Optional[List[float]]:
+    if not raw or len(raw) % 4 != 0:
+        return None
+    return list(struct.unpack(f"<{len(raw) // 4}f", raw))
+
+
+class EmbeddingCache:
+    """LRU memory tier in front of an SQLite tier."""
+
+    def __init__(
+        self,
+        db_path: Optional[str],
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        sqlite_max_rows: int = DEFAULT_SQLITE_MAX_ROWS,
+    ):
+        self.db_path = db_path
+        self.max_entries = max(1, int(max_entries))
+        self.sqlite_max_rows = max(1, int(sqlite_max_rows))
+        self._lru: "OrderedDict[Tuple[str, str], List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._schema_ready = False
+        self._puts_since_prune = 0
+        self._stats: Dict[str, int] = {
+            "memory_hits": 0,
+            "sqlite_hits": 0,
+            "misses": 0,
+            "puts": 0,
+            "evictions": 0,
+            "errors": 0,
+        }
+
+    # ── SQLite tier ────────────────────────────────────────────────────
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        if not self.db_path:
+            return None
+        conn = sqlite3.connect(self.db_path, timeout=5.0)
+        if not self._schema_ready:
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS embedding_cache (
+                    text_hash TEXT NOT NULL,
+                    embedding_version TEXT NOT NULL,
+                    embedding BLOB NOT NULL,
+                    embedding_dim INTEGER,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    PRIMARY KEY (text_hash, embedding_version)
+                )
+                """
+            )
+            conn.commit()
+            self._schema_ready = True
+        return conn
+
+    def _sqlite_get(self, key: Tuple[str, str]) -> Optional[List[float]]:
+        try:
+            conn = self._connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    "SELECT embedding FROM embedding_cache "
+                    "WHERE text_hash = ? AND embedding_version = ?",
+                    key,
+                ).fetchone()
+            finally:
+                conn.close()
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.warning(f"[EmbeddingCache] sqlite read failed: {e}")
+            return None
+        return _unpack(row[0]) if row else None
+
+    def _sqlite_put(self, key: Tuple[str, str], vec: List[float]) -> None:
+        try:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO embedding_cache "
+                    "(text_hash, embedding_version, embedding, embedding_dim) "
+                    "VALUES (?, ?, ?, ?)",
+                    (key[0], key[1], _pack(vec), len(vec)),
+                )
+                self._puts_since_prune += 1
+                if self._puts_since_prune >= _PRUNE_EVERY_PUTS:
+                    # INSERT OR REPLACE assigns a fresh rowid -> rowid order ~ write recency.
+                    conn.execute(
+                        "DELETE FROM embedding_cache WHERE rowid <= "
+                        "(SELECT MAX(rowid) FROM embedding_cache) - ?",
+                        (self.sqlite_max_rows,),
+                    )
+                    self._puts_since_prune = 0
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.warning(f"[EmbeddingCache] sqlite write failed: {e}")
+
+    # ── Memory tier ────────────────────────────────────────────────────
+
+    def _remember(self, key: Tuple[str, str], vec: List[float]) -> None:
+        with self._lock:
+            self._lru[key] = vec
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    # ── Public API ─────────────────────────────────────────────────────
+
+    def get(self, text: str, embedding_version: str) -> Optional[List[float]]:
+        """Cached vector for (text, version) or None (counted as miss)."""
+        key = (text_hash(cache_key_text(text)), embedding_version)
+        with self._lock:
+            vec = self._lru.get(key)
+            if vec is not None:
+                self._lru.move_to_end(key)
+                self._stats["memory_hits"] += 1
+                return vec
+        vec = self._sqlite_get(key)
+        if vec is not None:
+            self._stats["sqlite_hits"] += 1
+            self._remember(key, vec)
+            return vec
+        self._stats["misses"] += 1
+        return None
+
+    def put(self, text: str, embedding_version: str, vector: List[float]) -> None:
+        if not vector:
+            return
+        key = (text_hash(cache_key_text(text)), embedding_version)
+        self._stats["puts"] += 1
+        self._remember(key, list(vector))
+        self._sqlite_put(key, list(vector))
+
+    def clear_memory(self) -> None:
+        with self._lock:
+            self._lru.clear()
+
+    def get_stats(self) -> Dict[str, object]:
+        with self._lock:
+            size = len(self._lru)
+        hits = self._stats["memory_hits"] + self._stats["sqlite_hits"]
+        lookups = hits + self._stats["misses"]
+        return {
+            **self._stats,
+            "hits": hits,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+            "memory_entries": size,
+            "max_entries": self.max_entries,
+        }
+
+
+_caches: Dict[str, EmbeddingCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_embedding_cache(db_path: Optional[str]) -> EmbeddingCache:
+    """Process-wide cache instance per DB path."""
+    key = str(db_path or "")
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = EmbeddingCache(
+                db_path,
+                max_entries=int(os.getenv("EMBEDDING_CACHE_MAX_ENTRIES", str(DEFAULT_MAX_ENTRIES))),
+                sqlite_max_rows=int(
+                    os.getenv("EMBEDDING_CACHE_SQLITE_MAX_ROWS", str(DEFAULT_SQLITE_MAX_ROWS))
+                ),
+            )
+            _caches[key] = cache
+        return cache